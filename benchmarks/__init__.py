@@ -0,0 +1,9 @@
+"""Benchmark suite for obsidian-search-tool.
+
+Measures the client round trip, the search formatters and SearchResponse
+property access across result sizes against a local mock server, stores
+the results as JSON baselines and compares runs to flag regressions.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
@@ -0,0 +1,124 @@
+"""Benchmark suite command line.
+
+Usage:
+    python -m benchmarks run [--quick] [--output FILE] [--compare-to BASELINE]
+    python -m benchmarks compare BASELINE CURRENT [--threshold 0.1]
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.compare import compare_reports, format_comparisons
+from benchmarks.suite import (
+    DEFAULT_SIZES,
+    DEFAULT_TABLE_MAX_ROWS,
+    QUICK_SIZES,
+    STAGES,
+    StageResult,
+    run_suite,
+)
+from obsidian_search_tool.core.storage import write_json_atomic
+
+
+def _print_result(result: StageResult) -> None:
+    output = f"  out {result.output_bytes / 1024:>10.1f} KiB" if result.output_bytes else ""
+    click.echo(
+        f"{result.stage:<16}{result.rows:>8} rows  {result.ops_per_sec:>12.1f} ops/s  "
+        f"p50 {result.p50_ms:>11.3f} ms  p99 {result.p99_ms:>11.3f} ms  "
+        f"peak {result.peak_memory_bytes / (1024 * 1024):>8.1f} MiB{output}",
+        err=True,
+    )
+
+
+def _report_comparison(baseline_path: Path, current: dict[str, Any], threshold: float) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    comparisons = compare_reports(baseline, current, threshold)
+    click.echo(format_comparisons(comparisons))
+    if any(item.regression for item in comparisons):
+        sys.exit(1)
+
+
+@click.group()
+def main() -> None:
+    """Benchmark the client and formatters against a local mock server."""
+
+
+@main.command()
+@click.option("--quick", is_flag=True, help=f"Only sizes {', '.join(map(str, QUICK_SIZES))}")
+@click.option(
+    "--sizes",
+    type=str,
+    default=None,
+    help=f"Comma-separated result sizes (default: {','.join(map(str, DEFAULT_SIZES))})",
+)
+@click.option(
+    "--stage",
+    "stages",
+    multiple=True,
+    type=click.Choice(STAGES),
+    help="Stage to run (repeatable; default: all)",
+)
+@click.option("--min-time", default=1.0, show_default=True, help="Seconds per stage and size")
+@click.option(
+    "--table-max-rows",
+    default=DEFAULT_TABLE_MAX_ROWS,
+    show_default=True,
+    help="Largest size to run format_table at",
+)
+@click.option("--output", type=click.Path(path_type=Path), help="Write the JSON report here")
+@click.option(
+    "--compare-to",
+    type=click.Path(exists=True, path_type=Path),
+    help="Baseline report to compare against (exit 1 on regression)",
+)
+@click.option("--threshold", default=0.1, show_default=True, help="Allowed relative slowdown")
+def run(
+    quick: bool,
+    sizes: str | None,
+    stages: tuple[str, ...],
+    min_time: float,
+    table_max_rows: int,
+    output: Path | None,
+    compare_to: Path | None,
+    threshold: float,
+) -> None:
+    """Run the benchmark suite."""
+    if sizes:
+        selected = tuple(int(size) for size in sizes.split(","))
+    else:
+        selected = QUICK_SIZES if quick else DEFAULT_SIZES
+    report = run_suite(
+        sizes=selected,
+        stages=stages or STAGES,
+        min_time=min_time,
+        table_max_rows=table_max_rows,
+        progress=_print_result,
+    )
+    if output is not None:
+        write_json_atomic(output, report)
+        click.echo(f"Wrote {output}", err=True)
+    else:
+        click.echo(json.dumps(report, indent=2))
+    if compare_to is not None:
+        _report_comparison(compare_to, report, threshold)
+
+
+@main.command()
+@click.argument("baseline", type=click.Path(exists=True, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, path_type=Path))
+@click.option("--threshold", default=0.1, show_default=True, help="Allowed relative slowdown")
+def compare(baseline: Path, current: Path, threshold: float) -> None:
+    """Compare two stored reports (exit 1 on regression)."""
+    report = json.loads(current.read_text(encoding="utf-8"))
+    _report_comparison(baseline, report, threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Compare benchmark reports against a baseline.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+# Metrics where larger is worse
+COMPARED_METRICS = ("p50_ms", "p99_ms", "peak_memory_bytes")
+
+
+@dataclass
+class Comparison:
+    """Change of one metric for one stage and size.
+
+    Attributes:
+        stage: Stage name
+        rows: Result size
+        metric: Metric name
+        baseline: Baseline value
+        current: Current value
+        change: Relative change ((current - baseline) / baseline)
+        regression: Whether the change exceeds the threshold
+    """
+
+    stage: str
+    rows: int
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    regression: bool
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1
+) -> list[Comparison]:
+    """Compare two reports produced by run_suite().
+
+    Only stage/size pairs present in both reports are compared. A metric
+    regresses when it grows by more than threshold relative to the baseline.
+
+    Args:
+        baseline: Baseline report
+        current: Current report
+        threshold: Allowed relative growth (0.1 = 10%)
+
+    Returns:
+        Comparisons for every shared stage, size and metric
+    """
+    previous = {(row["stage"], row["rows"]): row for row in baseline["results"]}
+    comparisons: list[Comparison] = []
+    for row in current["results"]:
+        before = previous.get((row["stage"], row["rows"]))
+        if before is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = float(before[metric]), float(row[metric])
+            change = (new - old) / old if old else 0.0
+            comparisons.append(
+                Comparison(row["stage"], row["rows"], metric, old, new, change, change > threshold)
+            )
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    """Render comparisons as an aligned text report.
+
+    Args:
+        comparisons: Result of compare_reports()
+
+    Returns:
+        Text table with one line per comparison, regressions marked
+    """
+    lines = [
+        f"{'stage':<16}{'rows':>8}  {'metric':<18}{'baseline':>14}{'current':>14}{'change':>9}"
+    ]
+    for item in comparisons:
+        marker = "  REGRESSION" if item.regression else ""
+        lines.append(
+            f"{item.stage:<16}{item.rows:>8}  {item.metric:<18}"
+            f"{item.baseline:>14.3f}{item.current:>14.3f}{item.change:>+9.1%}{marker}"
+        )
+    regressions = sum(item.regression for item in comparisons)
+    lines.append("")
+    lines.append(f"{regressions} regression(s) in {len(comparisons)} comparisons")
+    return "\n".join(lines)
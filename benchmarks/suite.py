@@ -0,0 +1,333 @@
+"""Benchmark stages and measurement.
+
+Each stage is timed over repeated iterations on the same input; peak memory
+is measured in a separate, traced iteration so tracemalloc does not slow the
+timed ones. The mock server runs in a subprocess so it does not compete with
+the client for the GIL, and it memoizes responses so the client stage
+measures the client rather than the mock's query evaluation.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+from obsidian_search_tool import __version__
+from obsidian_search_tool.core.client import ObsidianClient, ObsidianConnectionError
+from obsidian_search_tool.core.models import SearchResponse
+from obsidian_search_tool.core.parallel import gil_enabled, map_parallel
+from obsidian_search_tool.utils import (
+    format_search_compact,
+    format_search_json,
+    format_search_table,
+    format_search_text,
+)
+
+DEFAULT_SIZES = (10, 1_000, 10_000, 100_000, 500_000)
+QUICK_SIZES = (10, 1_000, 10_000)
+STAGES = (
+    "client",
+    "format_json",
+    "format_compact",
+    "format_text",
+    "format_table",
+    "properties",
+    "render_batch",
+    "render_batch_mt",
+)
+# Rich tables are quadratic-ish in practice; larger sizes take minutes per iteration
+DEFAULT_TABLE_MAX_ROWS = 10_000
+QUERY_TEMPLATE = "TABLE file.name, file.folder, file.mtime, status, priority, tags LIMIT {rows}"
+API_KEY = "bench-key"
+# SearchResponse property reads per timed iteration (a single read is too fast to time)
+PROPERTY_READS = 1_000
+# Response bodies decoded and formatted per render_batch iteration
+BATCH_RESPONSES = 8
+
+
+@dataclass
+class StageResult:
+    """Measurements for one stage at one result size.
+
+    Attributes:
+        stage: Stage name
+        rows: Result rows processed per iteration
+        iterations: Timed iterations
+        ops_per_sec: Iterations per second
+        rows_per_sec: Rows processed per second
+        mean_ms: Mean latency per iteration
+        p50_ms: Median latency per iteration
+        p99_ms: 99th percentile latency per iteration
+        peak_memory_bytes: Peak traced Python allocations during one iteration
+        output_bytes: UTF-8 size of the string the operation returns (0 for other results)
+    """
+
+    stage: str
+    rows: int
+    iterations: int
+    ops_per_sec: float
+    rows_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_bytes: int
+    output_bytes: int = 0
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of samples.
+
+    Args:
+        samples: Measurements (need not be sorted)
+        fraction: Percentile as a fraction (0.5 for p50)
+
+    Returns:
+        The percentile value (0.0 for no samples)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure(
+    stage: str,
+    rows: int,
+    operation: Callable[[], Any],
+    min_time: float,
+    min_iterations: int = 3,
+    max_iterations: int = 1_000,
+    reads_per_iteration: int = 1,
+) -> StageResult:
+    """Time an operation and measure its peak memory.
+
+    Runs one warm-up iteration, then iterates until both min_time and
+    min_iterations are reached (or max_iterations), then one traced iteration.
+
+    Args:
+        stage: Stage name
+        rows: Rows processed per iteration
+        operation: Callable to benchmark
+        min_time: Minimum seconds of timed iterations
+        min_iterations: Minimum timed iterations
+        max_iterations: Maximum timed iterations
+        reads_per_iteration: Operations performed per call, for per-op latencies
+
+    Returns:
+        StageResult
+    """
+    output = operation()
+    samples: list[float] = []
+    started = time.perf_counter()
+    while len(samples) < max_iterations and (
+        len(samples) < min_iterations or time.perf_counter() - started < min_time
+    ):
+        before = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - before) / reads_per_iteration)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        operation()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    mean = sum(samples) / len(samples)
+    return StageResult(
+        stage=stage,
+        rows=rows,
+        iterations=len(samples) * reads_per_iteration,
+        ops_per_sec=round(1 / mean, 3) if mean else 0.0,
+        rows_per_sec=round(rows / mean, 1) if mean else 0.0,
+        mean_ms=round(mean * 1000, 6),
+        p50_ms=round(percentile(samples, 0.5) * 1000, 6),
+        p99_ms=round(percentile(samples, 0.99) * 1000, 6),
+        peak_memory_bytes=max(peak, 0),
+        output_bytes=len(output.encode("utf-8")) if isinstance(output, str) else 0,
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port: int = probe.getsockname()[1]
+        return port
+
+
+@contextmanager
+def mock_server(notes: int, seed: int = 0, startup_timeout: float = 600.0) -> Iterator[str]:
+    """Run the mock server in a subprocess.
+
+    Args:
+        notes: Synthetic vault size
+        seed: Vault seed
+        startup_timeout: Seconds to wait for the vault to be generated
+
+    Yields:
+        Base URL of the server
+
+    Raises:
+        RuntimeError: If the server does not come up in time
+    """
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "obsidian_search_tool.testing",
+        f"--notes={notes}",
+        f"--seed={seed}",
+        f"--port={port}",
+        f"--api-key={API_KEY}",
+        "--memoize",
+    ]
+    process = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        # Without a breaker, so refused connections during startup do not open it
+        client = ObsidianClient(
+            base_url=base_url, api_key=API_KEY, timeout=5, retries=0, circuit_threshold=0
+        )
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                client.status()
+                break
+            except ObsidianConnectionError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Mock server did not start") from None
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    stages: Sequence[str] = STAGES,
+    min_time: float = 1.0,
+    table_max_rows: int = DEFAULT_TABLE_MAX_ROWS,
+    progress: Callable[[StageResult], None] | None = None,
+) -> dict[str, Any]:
+    """Run the benchmark suite.
+
+    Args:
+        sizes: Result sizes (rows) to benchmark
+        stages: Stages to run (subset of STAGES)
+        min_time: Minimum seconds of timed iterations per stage and size
+        table_max_rows: Largest size the format_table stage runs at
+        progress: Callback invoked with each result as it completes
+
+    Returns:
+        JSON-serializable report with environment metadata and results
+    """
+    results: list[StageResult] = []
+
+    def record(result: StageResult) -> None:
+        results.append(result)
+        if progress is not None:
+            progress(result)
+
+    with mock_server(max(sizes)) as base_url:
+        client = ObsidianClient(base_url=base_url, api_key=API_KEY, timeout=600, cache_ttl=0)
+        for size in sizes:
+            query = QUERY_TEMPLATE.format(rows=size)
+            response = client.search_dataview(query)
+            if not response.success or response.result_count != size:
+                raise RuntimeError(f"Mock server returned {response.result_count} rows, not {size}")
+
+            if "client" in stages:
+                record(measure("client", size, lambda: client.search_dataview(query), min_time))
+            if "format_json" in stages:
+                record(measure("format_json", size, lambda: format_search_json(response), min_time))
+            if "format_compact" in stages:
+                record(
+                    measure(
+                        "format_compact", size, lambda: format_search_compact(response), min_time
+                    )
+                )
+            if "format_text" in stages:
+                record(measure("format_text", size, lambda: format_search_text(response), min_time))
+            if "format_table" in stages and size <= table_max_rows:
+                record(
+                    measure("format_table", size, lambda: format_search_table(response), min_time)
+                )
+            bodies = [json.dumps(response.results).encode("utf-8")] * BATCH_RESPONSES
+            # The same work inline and on one thread per CPU; only the
+            # free-threaded build can run the threads in parallel
+            for stage, workers in (("render_batch", 1), ("render_batch_mt", os.cpu_count() or 1)):
+                if stage in stages:
+                    record(
+                        measure(
+                            stage,
+                            size * BATCH_RESPONSES,
+                            partial(_render_batch, bodies, query, workers),
+                            min_time,
+                        )
+                    )
+            if "properties" in stages:
+                record(
+                    measure(
+                        "properties",
+                        size,
+                        lambda: _read_properties(response),
+                        min_time,
+                        reads_per_iteration=PROPERTY_READS,
+                    )
+                )
+
+    return {
+        "metadata": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "package_version": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "gil_enabled": gil_enabled(),
+            "cpu_count": os.cpu_count(),
+            "min_time": min_time,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _render(body: bytes, query: str) -> str:
+    """Decode a raw response body and format it as search JSON."""
+    data = {"query": query, "search_type": "dataview", "results": json.loads(body)}
+    return format_search_json(SearchResponse(success=True, data=data, error=None))
+
+
+def _render_batch(bodies: Sequence[bytes], query: str, workers: int) -> list[str]:
+    rendered: list[str] = map_parallel(lambda body: _render(body, query), bodies, workers)
+    return rendered
+
+
+def _read_properties(response: SearchResponse) -> None:
+    for _ in range(PROPERTY_READS):
+        _ = (
+            response.query,
+            response.search_type,
+            response.timestamp,
+            response.results,
+            response.result_count,
+        )
@@ -17,10 +17,15 @@ __version__ = "0.1.0"
 from obsidian_search_tool.core.client import (
     ObsidianAPIError,
     ObsidianAuthError,
+    ObsidianCircuitOpenError,
     ObsidianClient,
     ObsidianClientError,
     ObsidianConnectionError,
+    ObsidianDeadlineError,
 )
+from obsidian_search_tool.core.compact import decode_compact, encode_compact
+from obsidian_search_tool.core.concurrency import priority_scope
+from obsidian_search_tool.core.deadline import Deadline, deadline_scope
 from obsidian_search_tool.core.models import AuthResponse, SearchResponse, StatusResponse
 
 __all__ = [
@@ -32,7 +37,17 @@ __all__ = [
     "ObsidianClientError",
     "ObsidianAuthError",
     "ObsidianConnectionError",
+    "ObsidianDeadlineError",
+    "ObsidianCircuitOpenError",
     "ObsidianAPIError",
+    # Deadlines
+    "Deadline",
+    "deadline_scope",
+    # Scheduling
+    "priority_scope",
+    # Compact output
+    "encode_compact",
+    "decode_compact",
     # Models
     "StatusResponse",
     "AuthResponse",
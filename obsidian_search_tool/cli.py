@@ -4,14 +4,63 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+from pathlib import Path
+
 import click
 
-from obsidian_search_tool.commands import auth, completion, search, status
+from obsidian_search_tool.commands import (
+    auth,
+    bench,
+    completion,
+    export,
+    metadata,
+    search,
+    stats,
+    status,
+    views,
+)
+from obsidian_search_tool.core.metrics import REGISTRY
+from obsidian_search_tool.core.tracing import start_tracing, stop_tracing
 
 
 @click.group()
 @click.version_option(version="0.1.0", prog_name="obsidian-search-tool")
-def main() -> None:
+@click.option(
+    "--profile",
+    type=click.Choice(["cpu", "mem"]),
+    default=None,
+    help="Profile the command: cpu (pstats + collapsed stacks) or mem (tracemalloc report)",
+)
+@click.option(
+    "--profile-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("."),
+    show_default=True,
+    help="Directory to write profiles to",
+)
+@click.option(
+    "--trace",
+    "trace_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="OBSIDIAN_TRACE_FILE",
+    default=None,
+    help="Write search/request/decode/format spans to FILE (Chrome trace format)",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="OBSIDIAN_METRICS_FILE",
+    default=None,
+    help="Write request metrics to FILE in OpenMetrics text format on exit",
+)
+@click.pass_context
+def main(
+    ctx: click.Context,
+    profile: str | None,
+    profile_dir: Path,
+    trace_file: Path | None,
+    metrics_file: Path | None,
+) -> None:
     """Obsidian Search Tool - Search your Obsidian vault via CLI.
 
     A command-line tool for searching an Obsidian vault through the Obsidian
@@ -37,24 +86,41 @@ def main() -> None:
         obsidian-search-tool auth
 
         # Search with Dataview DQL (default)
-        obsidian-search-tool search --query 'TABLE file.name FROM #project'
+        obsidian-search-tool search 'TABLE file.name FROM #project'
 
         # Search with JsonLogic
         obsidian-search-tool search --type jsonlogic \\
-            --query '{"in": [{"var": "frontmatter.tags"}, "project"]}'
+            '{"in": [{"var": "frontmatter.tags"}, "project"]}'
 
     \b
     COMMANDS:
         status    Check API connectivity
         auth      Validate authentication
         search    Search vault with Dataview DQL or JsonLogic
+        metadata  Manage the local metadata snapshot used by search --local
+        bench     Load-test the search endpoint with a query corpus
+        stats     Show the most expensive recorded queries and the slow-query log
+        views     Save queries and serve their results from local storage
+        export    Stream query results into a SQLite table
 
     \b
     ENVIRONMENT VARIABLES:
-        OBSIDIAN_API_KEY   - API token (required, from plugin settings)
-        OBSIDIAN_BASE_URL  - API URL (default: http://127.0.0.1:27123)
-        OBSIDIAN_TIMEOUT   - Request timeout in seconds (default: 30)
-        OBSIDIAN_VERBOSE   - Enable verbose logging (true/false)
+        OBSIDIAN_API_KEY           - API token (required, from plugin settings)
+        OBSIDIAN_BASE_URL          - API URL (default: http://127.0.0.1:27123)
+        OBSIDIAN_TIMEOUT           - Request timeout in seconds (default: 30)
+        OBSIDIAN_VERBOSE           - Enable verbose logging (true/false)
+        OBSIDIAN_LOG_JSON          - Also write JSON Lines logs to this file ("-" for stderr)
+        OBSIDIAN_TRACE_FILE        - Same as --trace
+        OBSIDIAN_METRICS_FILE      - Same as --metrics-file
+        OBSIDIAN_STATS_DB          - Record query statistics to this SQLite file
+        OBSIDIAN_VAULTS_FILE       - Vault profiles for search --vaults (TOML)
+        OBSIDIAN_MAX_CONCURRENCY   - Most requests in flight per API (default: 8, 0 = no limit)
+        OBSIDIAN_RETRIES           - Retries of failed searches (default: 2, 0 = no retries)
+        OBSIDIAN_CIRCUIT_THRESHOLD - Failures in a row that stop requests (default: 5)
+        OBSIDIAN_PRIORITY          - Default for search --priority (default: normal)
+        OBSIDIAN_COALESCE          - Share requests among identical searches (default: 1)
+        OBSIDIAN_CACHE_CODEC       - Compress stored snapshots and views: none, gzip or zstd
+        OBSIDIAN_WORKERS           - Threads for batch searches (default: CPUs if free-threaded)
 
     \b
     EXAMPLES:
@@ -62,20 +128,31 @@ def main() -> None:
         obsidian-search-tool status
 
         # Search with TABLE query
-        obsidian-search-tool search --query 'TABLE file.name, author WHERE author'
+        obsidian-search-tool search 'TABLE file.name, author WHERE author'
 
         # Search with text output
-        obsidian-search-tool search --query 'TABLE file.name' --text
+        obsidian-search-tool search 'TABLE file.name' --text
 
         # Search with table output
-        obsidian-search-tool search --query 'TABLE file.name, status' --table
+        obsidian-search-tool search 'TABLE file.name, status' --table
 
         # Search from stdin
         echo 'TABLE file.name FROM #meeting' | obsidian-search-tool search --stdin
 
         # JsonLogic search
         obsidian-search-tool search --type jsonlogic \\
-            --query '{"in": [{"var": "frontmatter.tags"}, "aws"]}'
+            '{"in": [{"var": "frontmatter.tags"}, "aws"]}'
+
+    \b
+    PROFILING AND TRACING:
+        # CPU: writes <command>-<time>-<pid>.pstats and .collapsed (flame graphs)
+        obsidian-search-tool --profile cpu search 'TABLE file.name'
+
+        # Memory: writes a tracemalloc top-N allocation report (.mem.txt)
+        obsidian-search-tool --profile mem --profile-dir /tmp search 'TABLE file.name'
+
+        # Trace spans; open the file in ui.perfetto.dev or chrome://tracing
+        obsidian-search-tool --trace search.trace.json search 'TABLE file.name'
 
     \b
     For detailed help on any command, use:
@@ -85,7 +162,33 @@ def main() -> None:
     Documentation: https://github.com/dnvriend/obsidian-search-tool
     Obsidian Local REST API: https://github.com/coddingtonbear/obsidian-local-rest-api
     """
-    pass
+    if metrics_file is not None:
+        ctx.call_on_close(lambda: REGISTRY.write(metrics_file))
+
+    if trace_file is not None:
+        start_tracing(trace_file)
+
+        def write_trace() -> None:
+            path = stop_tracing()
+            if path is not None:
+                click.echo(f"Wrote {path}", err=True)
+
+        ctx.call_on_close(write_trace)
+
+    if profile is None:
+        return
+    # Imported only when profiling so an unprofiled run pays nothing for it
+    from obsidian_search_tool.core.profiling import Profiler
+
+    profiler = Profiler(profile, profile_dir, prefix=ctx.invoked_subcommand or "main")
+
+    def report() -> None:
+        for path in profiler.outputs:
+            click.echo(f"Wrote {path}", err=True)
+
+    # Close callbacks run last-in first-out: the profiler stops before the report
+    ctx.call_on_close(report)
+    ctx.with_resource(profiler)
 
 
 # Register commands
@@ -93,6 +196,11 @@ main.add_command(status)
 main.add_command(auth)
 main.add_command(search)
 main.add_command(completion)
+main.add_command(metadata)
+main.add_command(bench)
+main.add_command(stats)
+main.add_command(views)
+main.add_command(export)
 
 
 if __name__ == "__main__":
@@ -4,8 +4,23 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+from obsidian_search_tool.commands.bench_commands import bench
 from obsidian_search_tool.commands.completion_commands import completion
+from obsidian_search_tool.commands.export_commands import export
+from obsidian_search_tool.commands.metadata_commands import metadata
 from obsidian_search_tool.commands.search_commands import search
+from obsidian_search_tool.commands.stats_commands import stats
 from obsidian_search_tool.commands.status_commands import auth, status
+from obsidian_search_tool.commands.views_commands import views
 
-__all__ = ["search", "status", "auth", "completion"]
+__all__ = [
+    "search",
+    "status",
+    "auth",
+    "completion",
+    "metadata",
+    "bench",
+    "stats",
+    "views",
+    "export",
+]
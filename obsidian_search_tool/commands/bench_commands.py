@@ -0,0 +1,192 @@
+"""Load-test command implementation for Obsidian Search Tool.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import click
+
+from obsidian_search_tool.core.bench import bench_client, load_corpus, run_benchmark
+from obsidian_search_tool.core.client import ObsidianAuthError, ObsidianClient
+from obsidian_search_tool.core.metrics import REGISTRY
+from obsidian_search_tool.logging_config import get_logger, setup_logging
+from obsidian_search_tool.utils import format_error_json, format_json
+
+logger = get_logger(__name__)
+
+
+def _format_bench_text(data: dict[str, Any]) -> str:
+    latency = data["latency_ms"]
+    lines = ["# Benchmark Results", ""]
+    lines.append(f"**API URL:** {data['api_url']}")
+    rate = f", target {data['target_rate']} req/s" if data["target_rate"] else ""
+    lines.append(f"**Mode:** {data['mode']} ({data['concurrency']} workers{rate})")
+    lines.append(f"**Duration:** {data['elapsed_seconds']}s")
+    lines.append(
+        f"**Requests:** {data['requests']} ({data['succeeded']} succeeded, {data['failed']} failed)"
+    )
+    lines.append(f"**Throughput:** {data['throughput_rps']} req/s")
+    lines.append("")
+    lines.append("## Latency (ms)")
+    lines.append("")
+    lines.append(" | ".join(f"{name}: {value}" for name, value in latency.items()))
+    lines.append("")
+    lines.append("## Histogram")
+    lines.append("")
+    lines.append("```")
+    lines.append(f"{'Value (ms)':>12} {'Percentile':>12} {'TotalCount':>11} {'1/(1-P)':>10}")
+    for row in data["histogram"]:
+        inverse = f"{row['inverse']:.2f}" if row["inverse"] is not None else "inf"
+        lines.append(
+            f"{row['value_ms']:>12.3f} {row['percentile'] / 100:>12.6f} "
+            f"{row['total_count']:>11} {inverse:>10}"
+        )
+    lines.append("```")
+    if data["errors"]:
+        lines.append("")
+        lines.append("## Errors")
+        lines.append("")
+        for code, count in data["errors"].items():
+            lines.append(f"- {code}: {count}")
+    return "\n".join(lines)
+
+
+@click.command()
+@click.argument("corpus", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--duration",
+    "-d",
+    type=click.FloatRange(min=0, min_open=True),
+    default=30.0,
+    show_default=True,
+    help="Seconds to generate load for",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Worker threads (maximum requests in flight)",
+)
+@click.option(
+    "--rate",
+    "-r",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Requests per second; enables open-loop mode",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(min=0, max=65535),
+    default=None,
+    help="Serve live OpenMetrics at http://127.0.0.1:PORT/metrics during the run",
+)
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def bench(
+    corpus: Path,
+    duration: float,
+    concurrency: int,
+    rate: float | None,
+    metrics_port: int | None,
+    output_text: bool,
+    verbose: int,
+) -> None:
+    """Load-test the search endpoint by replaying a query corpus.
+
+    The corpus is NDJSON: one query per line, either a JSON string (DQL) or
+    an object {"query": ..., "type": "dataview" | "jsonlogic"}. Queries are
+    sent round-robin against OBSIDIAN_BASE_URL for --duration seconds.
+
+    \b
+    MODES:
+    - Closed loop (default): --concurrency workers send back-to-back.
+      Measures maximum throughput.
+    - Open loop (--rate): requests start on a fixed schedule and latency is
+      measured from the scheduled start, so queueing behind slow responses
+      is counted (no coordinated omission). --concurrency caps requests in
+      flight.
+
+    \b
+    EXAMPLES:
+        # Maximum throughput with 8 concurrent searches for 60 seconds
+        obsidian-search-tool bench queries.ndjson -c 8 -d 60
+
+    \b
+        # Latency at a steady 20 requests per second
+        obsidian-search-tool bench queries.ndjson --rate 20 -c 32 --text
+
+    \b
+        # Scrape request, error and latency metrics while the test runs
+        obsidian-search-tool bench queries.ndjson -d 300 --metrics-port 9464
+
+    \b
+        # Against the mock server
+        python -m obsidian_search_tool.testing --notes 10000 &
+        OBSIDIAN_BASE_URL=http://127.0.0.1:27124 OBSIDIAN_API_KEY=test-key \\
+            obsidian-search-tool bench queries.ndjson
+
+    \b
+    OUTPUT:
+    Throughput, latency percentiles, an HdrHistogram-style percentile
+    distribution and failed requests by error code.
+    """
+    setup_logging(verbose)
+    logger.info("Bench command started")
+
+    try:
+        queries = load_corpus(corpus)
+    except (OSError, ValueError) as e:
+        click.echo(format_error_json(str(e), "INPUT_ERROR", 400))
+        sys.exit(1)
+
+    try:
+        client = ObsidianClient(cache_ttl=0)
+    except ObsidianAuthError as e:
+        click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
+        sys.exit(1)
+
+    mode = f"open loop at {rate} req/s" if rate else "closed loop"
+    logger.info(
+        "Replaying %d queries for %ss (%s, %d workers)", len(queries), duration, mode, concurrency
+    )
+    metrics_server = REGISTRY.serve(metrics_port) if metrics_port is not None else None
+    try:
+        result = run_benchmark(
+            queries,
+            duration,
+            concurrency=concurrency,
+            rate=rate,
+            client_factory=bench_client,
+        )
+    except Exception as e:
+        logger.error("Unexpected error: %s: %s", type(e).__name__, e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(f"Unexpected error: {e}", "UNKNOWN_ERROR", 500))
+        sys.exit(1)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+
+    data = {"api_url": client.base_url, **result.to_dict()}
+    logger.info("Bench completed: %d requests, %d failed", result.requests, result.failed)
+    if output_text:
+        click.echo(_format_bench_text(data))
+    else:
+        click.echo(format_json({"success": True, "data": data}))
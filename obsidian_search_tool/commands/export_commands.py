@@ -0,0 +1,200 @@
+"""Export commands for Obsidian Search Tool.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any
+
+import click
+
+from obsidian_search_tool.core.client import (
+    ObsidianAuthError,
+    ObsidianClient,
+    ObsidianClientError,
+    error_code,
+)
+from obsidian_search_tool.core.export import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_SAMPLE_SIZE,
+    DEFAULT_TRANSACTION_ROWS,
+    FAIL,
+    FILENAME_COLUMN,
+    IF_EXISTS,
+    ExportError,
+    export_sqlite,
+)
+from obsidian_search_tool.logging_config import get_logger, setup_logging
+from obsidian_search_tool.utils import format_error_json, format_json
+
+logger = get_logger(__name__)
+
+
+def _format_export_text(data: dict[str, Any]) -> str:
+    lines = [
+        "# Export Complete",
+        "",
+        f"- Table: {data['database']} → {data['table']}",
+        f"- Rows: {data['rows']} in {data['pages']} pages",
+        f"- Duration: {data['duration_ms']:.0f} ms",
+        f"- Indexes: {', '.join(data['indexes']) or 'none'}",
+        "",
+        "| Column | Type |",
+        "|--------|------|",
+    ]
+    lines.extend(f"| {column['name']} | {column['type']} |" for column in data["columns"])
+    return "\n".join(lines)
+
+
+@click.group()
+def export() -> None:
+    """Export search results for analysis in other tools.
+
+    \b
+    EXAMPLES:
+        # Load every project note into projects.db, 10k rows per request
+        obsidian-search-tool export sqlite projects.db --page-size 10000 \\
+            'TABLE status, priority, file.tags FROM "projects"'
+
+    \b
+        # Then query it with SQL
+        sqlite3 projects.db 'SELECT status, count(*) FROM results GROUP BY status'
+    """
+    pass
+
+
+@export.command()
+@click.argument("database", type=click.Path(dir_okay=False, path_type=Path))
+@click.argument("query")
+@click.option(
+    "--type",
+    "query_type",
+    type=click.Choice(["dataview", "jsonlogic"], case_sensitive=False),
+    default="dataview",
+    help="Query type: dataview (DQL TABLE) or jsonlogic (JSON format). Default: dataview",
+)
+@click.option("--table", default="results", show_default=True, help="Table to load the rows into")
+@click.option(
+    "--if-exists",
+    type=click.Choice(IF_EXISTS),
+    default=FAIL,
+    show_default=True,
+    help="What to do when the table exists",
+)
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Fetch DQL results in keyset pages of N rows instead of one response",
+)
+@click.option(
+    "--index",
+    "indexes",
+    multiple=True,
+    help=f"Column to index after the load (repeatable; default: {FILENAME_COLUMN})",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Rows per executemany call",
+)
+@click.option(
+    "--transaction-rows",
+    type=click.IntRange(min=1),
+    default=DEFAULT_TRANSACTION_ROWS,
+    show_default=True,
+    help="Rows per transaction",
+)
+@click.option(
+    "--sample-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SAMPLE_SIZE,
+    show_default=True,
+    help="Rows used to infer column types",
+)
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def sqlite(
+    database: Path,
+    query: str,
+    query_type: str,
+    table: str,
+    if_exists: str,
+    page_size: int | None,
+    indexes: tuple[str, ...],
+    batch_size: int,
+    transaction_rows: int,
+    sample_size: int,
+    output_text: bool,
+    verbose: int,
+) -> None:
+    """Run a query and stream its rows into a SQLite table.
+
+    The table has a filename column and one column per query column, typed
+    INTEGER, REAL or TEXT from the first rows; lists and objects are stored
+    as JSON. With --page-size, DQL queries are fetched in pages ordered by
+    file.path, so memory stays bounded however many rows match; queries
+    with LIMIT, GROUP BY, FLATTEN or WITHOUT ID cannot be paged.
+
+    \b
+    Examples:
+        obsidian-search-tool export sqlite notes.db 'TABLE file.mtime, file.size'
+        obsidian-search-tool export sqlite notes.db --table tasks --if-exists replace \\
+            --page-size 5000 --index status 'TABLE status, due FROM #task'
+    """
+    setup_logging(verbose)
+    logger.info("Export command started")
+    try:
+        # Every page is a distinct query; caching them would only hold memory
+        client = ObsidianClient(cache_ttl=0, resilient=True)
+        result = export_sqlite(
+            client,
+            database,
+            table,
+            query,
+            query_type=query_type.lower(),
+            page_size=page_size,
+            if_exists=if_exists,
+            indexes=indexes or (FILENAME_COLUMN,),
+            batch_size=batch_size,
+            transaction_rows=transaction_rows,
+            sample_size=sample_size,
+        )
+    except ExportError as e:
+        logger.error("Export failed: %s", e)
+        click.echo(format_error_json(str(e), "EXPORT_ERROR", 400))
+        sys.exit(1)
+    except sqlite3.Error as e:
+        logger.error("SQLite error: %s", e)
+        click.echo(format_error_json(f"SQLite error: {e}", "EXPORT_ERROR", 500))
+        sys.exit(1)
+    except ObsidianAuthError as e:
+        click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
+        sys.exit(1)
+    except ObsidianClientError as e:
+        logger.error("Export query failed: %s", e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(str(e), error_code(e), 500))
+        sys.exit(1)
+
+    data = result.to_dict()
+    if output_text:
+        click.echo(_format_export_text(data))
+    else:
+        click.echo(format_json({"success": True, "data": data}))
@@ -0,0 +1,184 @@
+"""Metadata snapshot commands for Obsidian Search Tool.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import sys
+from datetime import UTC, datetime
+
+import click
+
+from obsidian_search_tool.core.client import (
+    ObsidianAPIError,
+    ObsidianAuthError,
+    ObsidianClient,
+    ObsidianClientError,
+    ObsidianConnectionError,
+)
+from obsidian_search_tool.core.metadata import (
+    MetadataSnapshot,
+    fetch_snapshot,
+    load_snapshot,
+    save_snapshot,
+    snapshot_path,
+)
+from obsidian_search_tool.logging_config import get_logger, setup_logging
+from obsidian_search_tool.utils import format_error_json, format_json
+
+logger = get_logger(__name__)
+
+
+def _snapshot_data(snapshot: MetadataSnapshot) -> dict[str, object]:
+    return {
+        "api_url": snapshot.base_url,
+        "path": str(snapshot_path(snapshot.base_url)),
+        "notes": len(snapshot),
+        "fetched_at": datetime.fromtimestamp(snapshot.fetched_at, UTC).isoformat(),
+        "age_seconds": round(snapshot.age, 1),
+    }
+
+
+def _format_snapshot_text(title: str, data: dict[str, object]) -> str:
+    return f"""# {title}
+
+**API URL:** {data["api_url"]}
+**Notes:** {data["notes"]}
+**Fetched At:** {data["fetched_at"]}
+**Age:** {data["age_seconds"]}s
+**Path:** {data["path"]}
+"""
+
+
+@click.group()
+def metadata() -> None:
+    """Manage the local vault metadata snapshot.
+
+    The snapshot mirrors file paths, sizes, timestamps, tags and frontmatter
+    of every note. `search --local` uses it to answer indexable predicates
+    without asking the plugin to scan the whole vault.
+
+    \b
+    EXAMPLES:
+        # Fetch a fresh snapshot
+        obsidian-search-tool metadata refresh
+
+    \b
+        # Show snapshot age and size
+        obsidian-search-tool metadata status
+    """
+    pass
+
+
+@metadata.command()
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def refresh(output_text: bool, verbose: int) -> None:
+    """Fetch a fresh metadata snapshot from the vault.
+
+    Runs a single Dataview query that returns per-note metadata and stores
+    it under OBSIDIAN_CACHE_DIR (default: ~/.cache/obsidian-search-tool).
+
+    \b
+    Examples:
+        obsidian-search-tool metadata refresh
+        obsidian-search-tool metadata refresh --text
+    """
+    setup_logging(verbose)
+    logger.info("Metadata refresh command started")
+
+    try:
+        client = ObsidianClient(resilient=True)
+        snapshot = fetch_snapshot(client)
+        path = save_snapshot(snapshot)
+        logger.info("Stored metadata snapshot at %s", path)
+
+        data = _snapshot_data(snapshot)
+        if output_text:
+            click.echo(_format_snapshot_text("Metadata Snapshot Refreshed", data))
+        else:
+            click.echo(format_json({"success": True, "data": data}))
+
+    except ObsidianAuthError as e:
+        logger.error("Authentication error: %s", e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
+        sys.exit(1)
+    except ObsidianConnectionError as e:
+        logger.error("Connection error: %s", e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(str(e), "CONNECTION_ERROR", 503))
+        sys.exit(1)
+    except ObsidianAPIError as e:
+        logger.error("API error [%s]: %s - %s", e.status_code, e.error_code, e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(str(e), e.error_code, e.status_code))
+        sys.exit(1)
+    except ObsidianClientError as e:
+        logger.error("Client error: %s", e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(str(e), "CLIENT_ERROR", 500))
+        sys.exit(1)
+    except Exception as e:
+        logger.error("Unexpected error: %s: %s", type(e).__name__, e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(f"Unexpected error: {e}", "UNKNOWN_ERROR", 500))
+        sys.exit(1)
+
+
+@metadata.command("status")
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def metadata_status(output_text: bool, verbose: int) -> None:
+    """Show the stored metadata snapshot for the configured vault.
+
+    \b
+    Examples:
+        obsidian-search-tool metadata status
+    """
+    setup_logging(verbose)
+
+    try:
+        client = ObsidianClient(resilient=True)
+    except ObsidianAuthError as e:
+        click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
+        sys.exit(1)
+
+    snapshot = load_snapshot(client.base_url)
+    if snapshot is None:
+        click.echo(
+            format_error_json(
+                "No metadata snapshot stored. Run 'obsidian-search-tool metadata refresh'.",
+                "NOT_FOUND",
+                404,
+            )
+        )
+        sys.exit(1)
+
+    data = _snapshot_data(snapshot)
+    if output_text:
+        click.echo(_format_snapshot_text("Metadata Snapshot", data))
+    else:
+        click.echo(format_json({"success": True, "data": data}))
@@ -4,7 +4,13 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+import json
 import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any, TextIO
 
 import click
 
@@ -15,16 +21,114 @@ from obsidian_search_tool.core.client import (
     ObsidianClientError,
     ObsidianConnectionError,
 )
+from obsidian_search_tool.core.concurrency import DEFAULT_PRIORITY, PRIORITIES, priority_scope
+from obsidian_search_tool.core.deadline import Deadline, deadline_scope, parse_seconds
+from obsidian_search_tool.core.metadata import load_snapshot
+from obsidian_search_tool.core.planner import execute_plan, plan_query
+from obsidian_search_tool.core.storage import (
+    CODECS,
+    NONE,
+    check_codec,
+    codec_for_path,
+    open_atomic,
+)
+from obsidian_search_tool.core.timings import timings_report
+from obsidian_search_tool.core.tracing import span
+from obsidian_search_tool.core.vaults import VaultConfigError, search_vaults, select_profiles
+from obsidian_search_tool.core.watch import DEFAULT_FULL_EVERY, QueryWatcher
 from obsidian_search_tool.logging_config import get_logger, setup_logging
 from obsidian_search_tool.utils import (
     format_error_json,
+    format_plan_json,
+    format_plan_text,
+    format_search_compact,
     format_search_json,
     format_search_table,
     format_search_text,
+    format_timings_text,
+    write_search_compact,
+    write_search_json,
 )
 
 logger = get_logger(__name__)
 
+OUTPUT_FORMATS = ("json", "text", "table", "compact")
+
+
+def _parse_deadline(ctx: click.Context, param: click.Parameter, value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return parse_seconds(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+# Writes formatted output to a text stream as it is produced
+Writer = Callable[[TextIO], None]
+
+
+def _emit(output: str | Writer, path: Path | None, codec: str) -> None:
+    """Print output, or write it to path with the given compression.
+
+    Output is either formatted text or a writer; a writer streams into
+    stdout or the file, so large results are never held as one string.
+    """
+    if path is None:
+        if isinstance(output, str):
+            click.echo(output)
+            return
+        output(sys.stdout)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return
+    with open_atomic(path, codec) as handle:
+        if isinstance(output, str):
+            handle.write(output)
+        else:
+            output(handle)
+        handle.write("\n")
+    logger.info("Wrote %s (%s)", path, codec)
+    click.echo(f"Wrote {path}", err=True)
+
+
+def _format_vaults_text(vaults: list[dict[str, Any]]) -> str:
+    lines = ["## Vaults", ""]
+    for vault in vaults:
+        if vault["ok"]:
+            lines.append(
+                f"- {vault['vault']}: {vault['rows']} rows in {vault['elapsed_ms']:.0f} ms"
+            )
+        else:
+            error = vault["error"]
+            lines.append(f"- {vault['vault']}: failed [{error['code']}] {error['message']}")
+    return "\n".join(lines)
+
+
+def _watch(
+    client: ObsidianClient,
+    query: str,
+    query_type: str,
+    interval: float,
+    full_every: int,
+    probe: bool,
+    polls: int | None,
+) -> None:
+    """Print each change to the query's results as one NDJSON line."""
+    watcher = QueryWatcher(client, query, query_type, probe=probe, full_every=full_every)
+    logger.info("Watching query every %ss: %.100s", interval, query)
+    try:
+        for event in watcher.run(interval, max_polls=polls):
+            click.echo(json.dumps(event.to_dict(), ensure_ascii=False))
+    except KeyboardInterrupt:
+        pass
+    logger.info(
+        "Watch finished: %d polls, %d queries, %d skipped by the freshness probe",
+        watcher.polls,
+        watcher.queries,
+        watcher.skipped,
+    )
+
 
 @click.command()
 @click.argument("query_text", type=str, required=False, default=None)
@@ -62,6 +166,109 @@ logger = get_logger(__name__)
     is_flag=True,
     help="Output as pretty-printed table",
 )
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default=None,
+    help="Output format; 'compact' lists column names once and dictionary-encodes values",
+)
+@click.option(
+    "--max-cell",
+    type=click.IntRange(min=1),
+    default=None,
+    help="With --format compact, truncate strings longer than N characters",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the output to this file atomically instead of stdout",
+)
+@click.option(
+    "--compress",
+    type=click.Choice(("auto", *CODECS)),
+    default="auto",
+    show_default=True,
+    help="Compression of --output; auto picks gzip for .gz and zstd for .zst files",
+)
+@click.option(
+    "--local",
+    "use_local",
+    is_flag=True,
+    help="Answer indexable predicates from the local metadata snapshot",
+)
+@click.option(
+    "--explain",
+    is_flag=True,
+    help="Show the query plan and estimated cost instead of running the query",
+)
+@click.option(
+    "--timings",
+    "show_timings",
+    is_flag=True,
+    help="Report connect, TTFB, transfer, decode and format times, bytes, rows and memory",
+)
+@click.option(
+    "--deadline",
+    envvar="OBSIDIAN_DEADLINE",
+    default=None,
+    callback=_parse_deadline,
+    help="End-to-end time limit, e.g. 2s or 500ms; partial results are marked incomplete",
+)
+@click.option(
+    "--priority",
+    type=click.Choice(PRIORITIES),
+    envvar="OBSIDIAN_PRIORITY",
+    default=DEFAULT_PRIORITY,
+    show_default=True,
+    help="Scheduling class for the concurrency limit; interactive requests are served first",
+)
+@click.option(
+    "--vaults",
+    "vault_names",
+    default=None,
+    help="Search these named vault profiles concurrently (comma-separated, or 'all')",
+)
+@click.option(
+    "--vaults-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="OBSIDIAN_VAULTS_FILE",
+    default=None,
+    help="Vault profiles file (default: ~/.config/obsidian-search-tool/vaults.toml)",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Re-run the query on an interval and print added/removed/changed rows as NDJSON",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=5.0,
+    show_default=True,
+    help="Seconds between polls in --watch mode",
+)
+@click.option(
+    "--full-every",
+    type=click.IntRange(min=1),
+    default=DEFAULT_FULL_EVERY,
+    show_default=True,
+    help="In --watch mode, run the query at least every N polls even if the vault looks unchanged",
+)
+@click.option(
+    "--probe/--no-probe",
+    default=True,
+    help="In --watch mode, skip polls when the newest note is unchanged (default: probe)",
+)
+@click.option(
+    "--polls",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop --watch after N polls (default: until interrupted)",
+)
 @click.option(
     "-v",
     "--verbose",
@@ -75,6 +282,22 @@ def search(
     output_json: bool,
     output_text: bool,
     output_table: bool,
+    output_format: str | None,
+    max_cell: int | None,
+    output_path: Path | None,
+    compress: str,
+    use_local: bool,
+    explain: bool,
+    show_timings: bool,
+    deadline: float | None,
+    priority: str,
+    vault_names: str | None,
+    vaults_file: Path | None,
+    watch: bool,
+    interval: float,
+    full_every: int,
+    probe: bool,
+    polls: int | None,
     verbose: int,
 ) -> None:
     """Search Obsidian vault using Dataview DQL or JsonLogic queries.
@@ -94,6 +317,11 @@ def search(
     - --json: JSON output (default, machine-readable)
     - --text / -t: Markdown-formatted text output
     - --table: Pretty-printed table output (best for TABLE results)
+    - --output FILE: Write to FILE atomically; compressed with gzip for .gz
+      and zstd (Python 3.14+) for .zst names, or as set by --compress
+    - --format compact: Single-line JSON with column names listed once and
+      repeated values (folders, tags, status) dictionary-encoded; decode it
+      with obsidian_search_tool.decode_compact
 
     \b
     DATAVIEW DQL EXAMPLES:
@@ -143,12 +371,81 @@ def search(
         # Pretty table output
         obsidian-search-tool search 'TABLE file.name, author' --table
 
+    \b
+        # Large export, compressed while it is written
+        obsidian-search-tool search 'TABLE file.tags FROM "archive"' -o archive.json.zst
+
+        # Compact output for agents, long cells cut to 200 characters
+        obsidian-search-tool search 'TABLE status, file.tags' --format compact --max-cell 200
+
+    \b
+    LOCAL METADATA PLANNER:
+        # Route indexable predicates (path prefix, tags, mtime ranges,
+        # frontmatter equality) to the snapshot from 'metadata refresh';
+        # TABLE queries over file.* and frontmatter fields run fully locally
+        obsidian-search-tool search --local \\
+            'TABLE file.name FROM #project WHERE file.mtime >= date(today) - dur(7 days)'
+
+        # Show the chosen plan and estimated cost without running it
+        obsidian-search-tool search --explain 'TABLE file.name FROM "daily"'
+
+    \b
+    TIMINGS:
+        # Break down where the time went (added to the JSON data block,
+        # or appended as a Timings section for --text and --table)
+        obsidian-search-tool search --timings 'TABLE file.name FROM "daily"'
+
+    \b
+    DEADLINES:
+        # Return whatever is available after 2 seconds; every request gets
+        # connect and read timeouts from the time left. A search cut short
+        # succeeds with "incomplete": true instead of failing
+        obsidian-search-tool search --deadline 2s --vaults all 'TABLE file.name FROM #project'
+
+    \b
+    PRIORITY:
+        # Requests over the concurrency limit (OBSIDIAN_MAX_CONCURRENCY) wait
+        # for a slot; interactive ones are served ahead of normal and bulk,
+        # and bulk requests never hold more than half of the slots
+        obsidian-search-tool search --priority bulk 'TABLE file.name FROM "archive"'
+
+    \b
+    MULTIPLE VAULTS:
+        # Profiles live in ~/.config/obsidian-search-tool/vaults.toml:
+        #   [vaults.work]
+        #   base_url = "http://127.0.0.1:27123"
+        #   api_key_env = "WORK_OBSIDIAN_API_KEY"
+        # Rows are tagged with their vault and merged by the query's SORT
+        obsidian-search-tool search --vaults work,research \\
+            'TABLE file.mtime FROM #project SORT file.mtime DESC LIMIT 20'
+
+    \b
+        # Every configured vault
+        obsidian-search-tool search --vaults all --table 'TABLE status FROM "projects"'
+
+    \b
+    WATCH MODE:
+        # Poll every 10 seconds; print one NDJSON event per added, removed
+        # or changed row (all rows are "added" on the first poll)
+        obsidian-search-tool search --watch --interval 10 \\
+            'TABLE status FROM "projects" WHERE status != "done"'
+
+    \b
+        # Before each poll a one-row probe checks the newest note's mtime and
+        # skips the query when it is unchanged; deletions and time-dependent
+        # results are picked up by a full run every --full-every polls
+        obsidian-search-tool search --watch --full-every 5 'TABLE file.name FROM #todo'
+
     \b
     ENVIRONMENT VARIABLES:
         OBSIDIAN_API_KEY - API token (required, from plugin settings)
         OBSIDIAN_BASE_URL - API URL (default: http://127.0.0.1:27123)
         OBSIDIAN_TIMEOUT - Request timeout in seconds (default: 30)
         OBSIDIAN_VERBOSE - Enable verbose logging (true/false)
+        OBSIDIAN_METADATA_MAX_AGE - Max snapshot age for --local in seconds (default: 3600)
+        OBSIDIAN_VAULTS_FILE - Vault profiles file for --vaults
+        OBSIDIAN_DEADLINE - Default for --deadline
+        OBSIDIAN_PRIORITY - Default for --priority
 
     \b
     COMMON ERRORS:
@@ -170,7 +467,7 @@ def search(
     # Setup logging
     setup_logging(verbose)
     logger.info("Search command started")
-    logger.debug(f"Query type: {query_type}, use_stdin: {use_stdin}")
+    logger.debug("Query type: %s, use_stdin: %s", query_type, use_stdin)
 
     # Validate query input
     if query_text and use_stdin:
@@ -199,7 +496,7 @@ def search(
     if use_stdin:
         logger.debug("Reading query from stdin")
         query = sys.stdin.read().strip()
-        logger.debug(f"Received query from stdin: {query[:100]}...")
+        logger.debug("Received query from stdin: %.100s...", query)
         if not query:
             click.echo(
                 format_error_json(
@@ -210,40 +507,172 @@ def search(
             )
             sys.exit(1)
 
+    # --text and --table are shorthands for --format text and --format table
+    output_text = output_text or output_format == "text"
+    output_table = output_table or output_format == "table"
+    compact = output_format == "compact"
+
+    if watch and (
+        use_local or explain or show_timings or output_text or output_table or compact or deadline
+    ):
+        click.echo(
+            format_error_json(
+                "--watch prints NDJSON events and cannot be combined with "
+                "--local, --explain, --timings, --text, --table, --format or --deadline",
+                "INPUT_ERROR",
+                400,
+            )
+        )
+        sys.exit(1)
+
+    if watch and output_path is not None:
+        click.echo(
+            format_error_json(
+                "--watch streams events to stdout and cannot be combined with --output",
+                "INPUT_ERROR",
+                400,
+            )
+        )
+        sys.exit(1)
+
+    codec = codec_for_path(output_path) if output_path and compress == "auto" else compress
+    try:
+        check_codec(NONE if output_path is None else codec)
+    except ValueError as e:
+        click.echo(format_error_json(str(e), "INPUT_ERROR", 400))
+        sys.exit(1)
+
+    if vault_names is not None and (use_local or explain or show_timings or watch):
+        click.echo(
+            format_error_json(
+                "--vaults cannot be combined with --local, --explain, --timings or --watch",
+                "INPUT_ERROR",
+                400,
+            )
+        )
+        sys.exit(1)
+
     # Determine output format (default to JSON if none specified)
     # Note: output_json is passed as parameter but we don't need to reassign it
 
     # At this point, query is guaranteed to be non-None due to validation above
     assert query is not None, "Query should be validated by this point"
 
+    started = time.perf_counter()
+    # The deadline starts with the command, so it covers client setup and every request
+    scope = deadline_scope(Deadline(deadline) if deadline is not None else None)
+    prioritized = priority_scope(priority)
     try:
         # Create client and perform search
-        logger.debug("Initializing Obsidian client")
-        client = ObsidianClient()
-
-        if query_type.lower() == "dataview":
-            logger.info(f"Executing Dataview query: {query[:100]}...")
-            logger.debug(f"Full query: {query}")
-            response = client.search_dataview(query)
-        else:  # jsonlogic
-            logger.info(f"Executing JsonLogic query: {query[:100]}...")
-            logger.debug(f"Full query: {query}")
-            response = client.search_jsonlogic(query)
+        if vault_names is not None:
+            names = [name.strip() for name in vault_names.split(",") if name.strip()]
+            profiles = select_profiles(names, vaults_file)
+            with scope, prioritized, span("search", type=query_type.lower(), vaults=len(profiles)):
+                response = search_vaults(
+                    profiles,
+                    query,
+                    query_type.lower(),
+                    lambda profile: profile.client(resilient=True),
+                )
+            if response.data is not None and response.data["incomplete"]:
+                logger.warning("Some vaults failed; results are incomplete")
+            output: str | Writer
+            if output_table:
+                output = format_search_table(response)
+            elif output_text:
+                vaults = (response.data or response.error or {}).get("vaults", [])
+                output = f"{format_search_text(response).rstrip()}\n\n{_format_vaults_text(vaults)}"
+            elif compact:
+                output = partial(write_search_compact, response, max_cell=max_cell)
+            else:
+                output = partial(write_search_json, response)
+            _emit(output, output_path, codec)
+            if not response.success:
+                sys.exit(1)
+            return
 
-        logger.info(f"Search completed: {response.result_count} results found")
+        logger.debug("Initializing Obsidian client")
+        if watch:
+            # Every poll must reach the API; a cached result would hide changes
+            with prioritized:
+                _watch(
+                    ObsidianClient(cache_ttl=0, resilient=True),
+                    query,
+                    query_type.lower(),
+                    interval,
+                    full_every,
+                    probe,
+                    polls,
+                )
+            return
+        client = ObsidianClient(resilient=True)
+
+        with scope, prioritized, span("search", type=query_type.lower(), local=use_local):
+            if use_local or explain:
+                snapshot = load_snapshot(client.base_url)
+                plan = plan_query(query, query_type.lower(), snapshot)
+                logger.info("Query plan: strategy=%s", plan.strategy)
+                if explain:
+                    output = format_plan_text(plan) if output_text else format_plan_json(plan)
+                    _emit(output, output_path, codec)
+                    return
+                response = execute_plan(client, plan, snapshot)
+            elif query_type.lower() == "dataview":
+                logger.info("Executing Dataview query: %.100s...", query)
+                logger.debug("Full query: %s", query)
+                response = client.search_dataview(query)
+            else:  # jsonlogic
+                logger.info("Executing JsonLogic query: %.100s...", query)
+                logger.debug("Full query: %s", query)
+                response = client.search_jsonlogic(query)
+
+        logger.info("Search completed: %d results found", response.result_count)
+        if response.incomplete:
+            logger.warning("Deadline exceeded; results are incomplete")
 
         # Format and output response
-        if output_table:
-            logger.debug("Formatting output as table")
-            output = format_search_table(response)
-        elif output_text:
-            logger.debug("Formatting output as text")
-            output = format_search_text(response)
-        else:  # JSON
-            logger.debug("Formatting output as JSON")
-            output = format_search_json(response)
-
-        click.echo(output)
+        format_started = time.perf_counter()
+        with span("format", rows=response.result_count):
+            if output_table:
+                logger.debug("Formatting output as table")
+                output = format_search_table(response)
+            elif output_text:
+                logger.debug("Formatting output as text")
+                output = format_search_text(response)
+            elif show_timings:
+                # Formatted once up front so the report can time it
+                output = (
+                    format_search_compact(response, max_cell)
+                    if compact
+                    else format_search_json(response)
+                )
+            elif compact:
+                logger.debug("Streaming output as compact JSON")
+                output = partial(write_search_compact, response, max_cell=max_cell)
+            else:  # JSON
+                logger.debug("Streaming output as JSON")
+                output = partial(write_search_json, response)
+        finished = time.perf_counter()
+
+        if show_timings:
+            timings = timings_report(
+                client.timings,
+                format_ms=(finished - format_started) * 1000,
+                rows=response.result_count,
+                total_ms=(finished - started) * 1000,
+            )
+            if isinstance(output, str):
+                output = f"{output.rstrip()}\n\n{format_timings_text(timings)}"
+            elif response.data is not None:
+                # Re-serialize with the report; format_ms is the first pass
+                response.data["timings"] = timings
+                output = (
+                    partial(write_search_compact, response, max_cell=max_cell)
+                    if compact
+                    else partial(write_search_json, response)
+                )
+
+        _emit(output, output_path, codec)
 
         # Exit with error code if search failed
         if not response.success:
@@ -252,28 +681,32 @@ def search(
 
         logger.info("Search command completed successfully")
 
+    except VaultConfigError as e:
+        logger.error("Vault configuration error: %s", e)
+        click.echo(format_error_json(str(e), "CONFIG_ERROR", 400))
+        sys.exit(1)
     except ObsidianAuthError as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
         sys.exit(1)
     except ObsidianConnectionError as e:
-        logger.error(f"Connection error: {str(e)}")
+        logger.error("Connection error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "CONNECTION_ERROR", 503))
         sys.exit(1)
     except ObsidianAPIError as e:
-        logger.error(f"API error [{e.status_code}]: {e.error_code} - {str(e)}")
+        logger.error("API error [%s]: %s - %s", e.status_code, e.error_code, e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), e.error_code, e.status_code))
         sys.exit(1)
     except ObsidianClientError as e:
-        logger.error(f"Client error: {str(e)}")
+        logger.error("Client error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "CLIENT_ERROR", 500))
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {type(e).__name__}: {str(e)}")
+        logger.error("Unexpected error: %s: %s", type(e).__name__, e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(f"Unexpected error: {e}", "UNKNOWN_ERROR", 500))
         sys.exit(1)
@@ -0,0 +1,190 @@
+"""Query statistics command for Obsidian Search Tool.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any
+
+import click
+
+from obsidian_search_tool.core.query_stats import DEFAULT_SLOW_MS, SORT_KEYS, QueryStatsStore
+from obsidian_search_tool.logging_config import get_logger, setup_logging
+from obsidian_search_tool.utils import format_error_json, format_json
+
+logger = get_logger(__name__)
+
+
+def _cell(text: str, width: int = 80) -> str:
+    text = " ".join(text.split()).replace("|", "\\|")
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def _format_top_text(data: dict[str, Any]) -> str:
+    lines = [
+        "# Query Statistics",
+        "",
+        f"**Database:** {data['db']}",
+        f"**Records:** {data['records']}",
+        f"**Sorted By:** {data['sort']}",
+        "",
+    ]
+    if not data["queries"]:
+        lines.append("No queries recorded.")
+        return "\n".join(lines)
+    lines.append("| Count | Errors | Total ms | Mean ms | p95 ms | Max ms | Rows | Type | Query |")
+    lines.append("|------:|-------:|---------:|--------:|-------:|-------:|-----:|------|-------|")
+    for stat in data["queries"]:
+        lines.append(
+            f"| {stat['count']} | {stat['errors']} | {stat['total_ms']:.1f} "
+            f"| {stat['mean_ms']:.1f} | {stat['p95_ms']:.1f} | {stat['max_ms']:.1f} "
+            f"| {stat['mean_rows']:.0f} | {stat['query_type']} | `{_cell(stat['canonical'])}` |"
+        )
+    return "\n".join(lines)
+
+
+def _format_slow_text(data: dict[str, Any]) -> str:
+    lines = [
+        "# Slow Query Log",
+        "",
+        f"**Database:** {data['db']}",
+        f"**Threshold:** {data['threshold_ms']} ms",
+        "",
+    ]
+    if not data["slow_queries"]:
+        lines.append("No queries at or above the threshold.")
+        return "\n".join(lines)
+    lines.append("| Recorded At | Latency ms | Rows | Status | Type | Query |")
+    lines.append("|-------------|-----------:|-----:|--------|------|-------|")
+    for record in data["slow_queries"]:
+        rows = record["rows"] if record["rows"] is not None else "-"
+        lines.append(
+            f"| {record['recorded_at']} | {record['latency_ms']:.1f} | {rows} "
+            f"| {record['status']} | {record['query_type']} | `{_cell(record['query'])}` |"
+        )
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option(
+    "--db",
+    "db_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="OBSIDIAN_STATS_DB",
+    default=None,
+    help="Query stats database (default: OBSIDIAN_STATS_DB)",
+)
+@click.option(
+    "--sort",
+    type=click.Choice(SORT_KEYS),
+    default="total",
+    show_default=True,
+    help="Rank queries by total time, p95 latency or execution count",
+)
+@click.option("--limit", "-n", type=click.IntRange(min=1), default=10, show_default=True)
+@click.option("--slow", is_flag=True, help="Show the slow-query log instead of the top queries")
+@click.option(
+    "--threshold",
+    "threshold_ms",
+    type=click.FloatRange(min=0),
+    envvar="OBSIDIAN_SLOW_QUERY_MS",
+    default=DEFAULT_SLOW_MS,
+    show_default=True,
+    help="Slow-query threshold in ms (default: OBSIDIAN_SLOW_QUERY_MS)",
+)
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def stats(
+    db_path: Path | None,
+    sort: str,
+    limit: int,
+    slow: bool,
+    threshold_ms: float,
+    output_text: bool,
+    verbose: int,
+) -> None:
+    """Show the most expensive queries recorded by the client.
+
+    Recording is opt-in: set OBSIDIAN_STATS_DB to a file path and every
+    search is logged with its latency, row count and response size. Queries
+    that differ only in literal values are grouped together.
+
+    \b
+    EXAMPLES:
+        # Enable recording
+        export OBSIDIAN_STATS_DB=~/.cache/obsidian-search-tool/stats.db
+
+    \b
+        # Top 10 queries by total time spent
+        obsidian-search-tool stats --text
+
+    \b
+        # Worst tail latency
+        obsidian-search-tool stats --sort p95 -n 5
+
+    \b
+        # Slow-query log: executions that took 500 ms or more
+        obsidian-search-tool stats --slow --threshold 500 --text
+
+    \b
+    ENVIRONMENT VARIABLES:
+        OBSIDIAN_STATS_DB        - Stats database; enables recording
+        OBSIDIAN_STATS_SAMPLE    - Fraction of fast queries recorded (default: 1)
+        OBSIDIAN_SLOW_QUERY_MS   - Slow threshold; slow queries are always recorded
+                                   (default: 1000)
+        OBSIDIAN_STATS_MAX_ROWS  - Records kept, oldest dropped first (default: 100000)
+    """
+    setup_logging(verbose)
+    logger.info("Stats command started")
+
+    if db_path is None or not db_path.exists():
+        location = f" at {db_path}" if db_path is not None else ""
+        click.echo(
+            format_error_json(
+                f"No query stats database{location}. Set OBSIDIAN_STATS_DB to record queries.",
+                "INPUT_ERROR",
+                400,
+            )
+        )
+        sys.exit(1)
+
+    try:
+        store = QueryStatsStore(db_path)
+        try:
+            data: dict[str, Any] = {"db": str(db_path), "records": store.count()}
+            if slow:
+                records = store.slow_queries(threshold_ms, limit)
+                data.update(
+                    threshold_ms=threshold_ms,
+                    slow_queries=[record.to_dict() for record in records],
+                )
+            else:
+                data.update(
+                    sort=sort, queries=[stat.to_dict() for stat in store.top_queries(sort, limit)]
+                )
+        finally:
+            store.close()
+    except (sqlite3.Error, ValueError) as e:
+        logger.error("Stats database error: %s", e)
+        logger.debug("Full traceback:", exc_info=True)
+        click.echo(format_error_json(f"Cannot read {db_path}: {e}", "STATS_ERROR", 500))
+        sys.exit(1)
+
+    if output_text:
+        click.echo(_format_slow_text(data) if slow else _format_top_text(data))
+    else:
+        click.echo(format_json({"success": True, "data": data}))
@@ -91,10 +91,10 @@ def status(output_json: bool, output_text: bool, verbose: int) -> None:
     try:
         # Create client and check status
         logger.debug("Initializing Obsidian client")
-        client = ObsidianClient()
+        client = ObsidianClient(resilient=True)
         logger.debug("Checking API status")
         response = client.status()
-        logger.info(f"Status check successful: {response.status}")
+        logger.info("Status check successful: %s", response.status)
 
         # Format and output response
         if output_text:
@@ -108,22 +108,22 @@ def status(output_json: bool, output_text: bool, verbose: int) -> None:
         logger.info("Status command completed successfully")
 
     except ObsidianAuthError as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
         sys.exit(1)
     except ObsidianConnectionError as e:
-        logger.error(f"Connection error: {str(e)}")
+        logger.error("Connection error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "CONNECTION_ERROR", 503))
         sys.exit(1)
     except ObsidianClientError as e:
-        logger.error(f"Client error: {str(e)}")
+        logger.error("Client error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "CLIENT_ERROR", 500))
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {type(e).__name__}: {str(e)}")
+        logger.error("Unexpected error: %s: %s", type(e).__name__, e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(f"Unexpected error: {e}", "UNKNOWN_ERROR", 500))
         sys.exit(1)
@@ -203,10 +203,10 @@ def auth(output_json: bool, output_text: bool, verbose: int) -> None:
     try:
         # Create client and check authentication
         logger.debug("Initializing Obsidian client")
-        client = ObsidianClient()
+        client = ObsidianClient(resilient=True)
         logger.debug("Checking authentication")
         response = client.check_auth()
-        logger.info(f"Authentication check successful: {response.status}")
+        logger.info("Authentication check successful: %s", response.status)
 
         # Format and output response
         if output_text:
@@ -220,22 +220,22 @@ def auth(output_json: bool, output_text: bool, verbose: int) -> None:
         logger.info("Auth command completed successfully")
 
     except ObsidianAuthError as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
         sys.exit(1)
     except ObsidianConnectionError as e:
-        logger.error(f"Connection error: {str(e)}")
+        logger.error("Connection error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "CONNECTION_ERROR", 503))
         sys.exit(1)
     except ObsidianClientError as e:
-        logger.error(f"Client error: {str(e)}")
+        logger.error("Client error: %s", e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(str(e), "CLIENT_ERROR", 500))
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {type(e).__name__}: {str(e)}")
+        logger.error("Unexpected error: %s: %s", type(e).__name__, e)
         logger.debug("Full traceback:", exc_info=True)
         click.echo(format_error_json(f"Unexpected error: {e}", "UNKNOWN_ERROR", 500))
         sys.exit(1)
@@ -0,0 +1,390 @@
+"""Saved view commands for Obsidian Search Tool.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import sys
+from datetime import UTC, datetime
+from typing import Any
+
+import click
+
+from obsidian_search_tool.core.client import (
+    ObsidianAuthError,
+    ObsidianClient,
+    ObsidianClientError,
+    error_code,
+)
+from obsidian_search_tool.core.deadline import parse_seconds
+from obsidian_search_tool.core.models import SearchResponse
+from obsidian_search_tool.core.views import (
+    SavedView,
+    ViewError,
+    delete_view,
+    list_views,
+    load_view,
+    refresh_view,
+    save_view,
+    validate_name,
+    view_path,
+)
+from obsidian_search_tool.logging_config import get_logger, setup_logging
+from obsidian_search_tool.utils import (
+    format_error_json,
+    format_json,
+    format_search_json,
+    format_search_table,
+    format_search_text,
+)
+
+logger = get_logger(__name__)
+
+
+def _parse_interval(ctx: click.Context, param: click.Parameter, value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return parse_seconds(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
+def _view_data(view: SavedView) -> dict[str, Any]:
+    age = view.age
+    return {
+        "name": view.name,
+        "query": view.query,
+        "interval_seconds": view.interval,
+        "rows": len(view.rows),
+        "watermark": view.watermark,
+        "refreshed_at": _isoformat(view.refreshed_at),
+        "age_seconds": None if age is None else round(age, 1),
+        "due": view.due(),
+        "last_refresh": view.last_refresh,
+    }
+
+
+def _format_views_text(title: str, views: list[dict[str, Any]]) -> str:
+    lines = [f"# {title}", ""]
+    if not views:
+        lines.append("No views saved.")
+        return "\n".join(lines)
+    lines.append("| Name | Rows | Refreshed At | Last Refresh | Interval | Due |")
+    lines.append("|------|-----:|--------------|--------------|---------:|-----|")
+    for view in views:
+        last = view["last_refresh"]
+        summary = (
+            f"{last['mode']}: +{last['added']} ~{last['changed']} -{last['removed']}"
+            if last
+            else "never"
+        )
+        interval = "-" if view["interval_seconds"] is None else f"{view['interval_seconds']:g}s"
+        lines.append(
+            f"| {view['name']} | {view['rows']} | {view['refreshed_at'] or '-'} | {summary} "
+            f"| {interval} | {'yes' if view['due'] else 'no'} |"
+        )
+    return "\n".join(lines)
+
+
+def _client(cache_ttl: int | None = None) -> ObsidianClient:
+    """Create a client, exiting with AUTH_ERROR if it is not configured."""
+    try:
+        return ObsidianClient(cache_ttl=cache_ttl, resilient=True)
+    except ObsidianAuthError as e:
+        click.echo(format_error_json(str(e), "AUTH_ERROR", 401))
+        sys.exit(1)
+
+
+def _load_or_exit(base_url: str, name: str) -> SavedView:
+    try:
+        view = load_view(base_url, name)
+    except ViewError as e:
+        click.echo(format_error_json(str(e), "INVALID_VIEW_NAME", 400))
+        sys.exit(1)
+    if view is None:
+        click.echo(
+            format_error_json(
+                f"No view named '{name}'. Save it with 'obsidian-search-tool views save'.",
+                "NOT_FOUND",
+                404,
+            )
+        )
+        sys.exit(1)
+    return view
+
+
+def _refresh(client: ObsidianClient, view: SavedView, full: bool) -> dict[str, Any]:
+    """Refresh and store one view, reporting failures instead of raising."""
+    try:
+        refresh_view(client, view, full=full)
+    except ObsidianClientError as e:
+        logger.error("Refreshing view %s failed: %s", view.name, e)
+        logger.debug("Full traceback:", exc_info=True)
+        return {"name": view.name, "ok": False, "error": {"code": error_code(e), "message": str(e)}}
+    save_view(view)
+    return {"name": view.name, "ok": True, **view.last_refresh}
+
+
+def _format_refresh_text(results: list[dict[str, Any]]) -> str:
+    lines = ["# Views Refreshed", ""]
+    if not results:
+        lines.append("No views due.")
+    for result in results:
+        if result["ok"]:
+            lines.append(
+                f"- {result['name']}: {result['mode']}, {result['rows']} rows "
+                f"(+{result['added']} ~{result['changed']} -{result['removed']}) "
+                f"in {result['duration_ms']:.0f} ms"
+            )
+        else:
+            error = result["error"]
+            lines.append(f"- {result['name']}: FAILED [{error['code']}] {error['message']}")
+    return "\n".join(lines)
+
+
+@click.group()
+def views() -> None:
+    """Manage saved queries materialized in local storage.
+
+    A view stores the result of a DQL query so dashboards can read it
+    instantly. Refreshes fetch only the rows of notes modified since the
+    previous refresh and drop rows of deleted or no longer matching notes.
+
+    \b
+    EXAMPLES:
+        # Save and materialize a view, refreshed at most every 5 minutes
+        obsidian-search-tool views save active-projects --every 5m \\
+            'TABLE status FROM "projects" WHERE status = "active" SORT file.mtime DESC'
+
+    \b
+        # Refresh every view that is due (run this from cron)
+        obsidian-search-tool views refresh
+
+    \b
+        # Read the stored result
+        obsidian-search-tool views get active-projects --table
+    """
+    pass
+
+
+@views.command()
+@click.argument("name")
+@click.argument("query")
+@click.option(
+    "--every",
+    "interval",
+    callback=_parse_interval,
+    help="Refresh at most this often when 'views refresh' runs without names (e.g. 30s, 5m)",
+)
+@click.option("--no-refresh", is_flag=True, help="Save the query without materializing it")
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def save(name: str, query: str, interval: float | None, no_refresh: bool, verbose: int) -> None:
+    """Save a DQL query as a view and materialize it.
+
+    Saving a different query under an existing name discards the stored rows.
+
+    \b
+    Examples:
+        obsidian-search-tool views save inbox 'TABLE file.ctime FROM "inbox"'
+        obsidian-search-tool views save todo --every 10m 'TABLE status WHERE status'
+    """
+    setup_logging(verbose)
+    try:
+        validate_name(name)
+    except ViewError as e:
+        click.echo(format_error_json(str(e), "INVALID_VIEW_NAME", 400))
+        sys.exit(1)
+
+    client = _client(cache_ttl=0)
+    view = load_view(client.base_url, name)
+    if view is None or view.query != query:
+        view = SavedView(name, query, client.base_url)
+    view.interval = interval
+    data: dict[str, Any] = {}
+    if not no_refresh:
+        data = _refresh(client, view, full=True)
+        if not data["ok"]:
+            error = data["error"]
+            click.echo(format_error_json(error["message"], error["code"], 500))
+            sys.exit(1)
+    else:
+        save_view(view)
+    logger.info("Saved view %s at %s", name, view_path(client.base_url, name))
+    click.echo(format_json({"success": True, "data": _view_data(view)}))
+
+
+@views.command()
+@click.argument("names", nargs=-1)
+@click.option("--full", is_flag=True, help="Re-run whole queries instead of fetching changes")
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def refresh(names: tuple[str, ...], full: bool, output_text: bool, verbose: int) -> None:
+    """Bring views up to date.
+
+    Without names, refreshes every view whose --every interval has elapsed
+    (views saved without --every are always due). Named views are refreshed
+    regardless of their interval. Exits with status 1 if any refresh failed.
+
+    \b
+    Examples:
+        obsidian-search-tool views refresh
+        obsidian-search-tool views refresh inbox todo --full
+    """
+    setup_logging(verbose)
+    logger.info("Views refresh command started")
+
+    client = _client(cache_ttl=0)
+    if names:
+        selected = [_load_or_exit(client.base_url, name) for name in dict.fromkeys(names)]
+    else:
+        selected = [view for view in list_views(client.base_url) if view.due()]
+    results = [_refresh(client, view, full) for view in selected]
+
+    failed = [result for result in results if not result["ok"]]
+    if output_text:
+        click.echo(_format_refresh_text(results))
+    else:
+        click.echo(format_json({"success": not failed, "data": {"views": results}}))
+    if failed:
+        sys.exit(1)
+
+
+@views.command()
+@click.argument("name")
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "--table",
+    "output_table",
+    is_flag=True,
+    help="Output as pretty-printed table",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def get(name: str, output_text: bool, output_table: bool, verbose: int) -> None:
+    """Print a view's stored result without querying the vault.
+
+    The output has the shape of 'search' output, plus the view name,
+    refresh time and age.
+
+    \b
+    Examples:
+        obsidian-search-tool views get inbox
+        obsidian-search-tool views get inbox --table
+    """
+    setup_logging(verbose)
+    client = _client()
+    view = _load_or_exit(client.base_url, name)
+    if view.refreshed_at is None:
+        click.echo(
+            format_error_json(
+                f"View '{name}' has not been materialized yet. "
+                f"Run 'obsidian-search-tool views refresh {name}'.",
+                "NOT_MATERIALIZED",
+                404,
+            )
+        )
+        sys.exit(1)
+
+    age = view.age or 0.0
+    response = SearchResponse(
+        success=True,
+        data={
+            "query": view.query,
+            "search_type": "dataview",
+            "timestamp": _isoformat(view.refreshed_at),
+            "results": view.results(),
+            "view": view.name,
+            "refreshed_at": _isoformat(view.refreshed_at),
+            "age_seconds": round(age, 1),
+        },
+        error=None,
+    )
+    if output_table:
+        click.echo(format_search_table(response))
+    elif output_text:
+        click.echo(format_search_text(response))
+    else:
+        click.echo(format_search_json(response))
+
+
+@views.command("list")
+@click.option(
+    "--text",
+    "-t",
+    "output_text",
+    is_flag=True,
+    help="Output as markdown-formatted text",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def list_command(output_text: bool, verbose: int) -> None:
+    """List saved views with their size, age and last refresh.
+
+    \b
+    Examples:
+        obsidian-search-tool views list --text
+    """
+    setup_logging(verbose)
+    client = _client()
+    data = [_view_data(view) for view in list_views(client.base_url)]
+    if output_text:
+        click.echo(_format_views_text("Saved Views", data))
+    else:
+        click.echo(format_json({"success": True, "data": {"views": data}}))
+
+
+@views.command()
+@click.argument("name")
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def delete(name: str, verbose: int) -> None:
+    """Delete a saved view and its stored result.
+
+    \b
+    Examples:
+        obsidian-search-tool views delete inbox
+    """
+    setup_logging(verbose)
+    client = _client()
+    _load_or_exit(client.base_url, name)
+    delete_view(client.base_url, name)
+    click.echo(format_json({"success": True, "data": {"name": name, "deleted": True}}))
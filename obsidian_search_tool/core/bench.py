@@ -0,0 +1,297 @@
+"""Load generator for the search endpoint.
+
+Replays a query corpus against the API in one of two modes:
+
+- closed loop (default): ``concurrency`` workers each send the next query as
+  soon as the previous one completes. Measures capacity, but a slow response
+  delays the requests that would have followed it, hiding queueing delay
+  (coordinated omission).
+- open loop (``rate`` set): requests are scheduled at a fixed rate regardless
+  of how fast responses come back, and latency is measured from each
+  request's scheduled start. Requests waiting for a free worker accrue that
+  wait as latency, as real callers would.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from obsidian_search_tool.core.client import ObsidianClient, ObsidianClientError, error_code
+from obsidian_search_tool.core.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+QUERY_TYPES = ("dataview", "jsonlogic")
+
+
+@dataclass(frozen=True)
+class BenchQuery:
+    """A query from the corpus.
+
+    Attributes:
+        query: Query text
+        query_type: "dataview" or "jsonlogic"
+    """
+
+    query: str
+    query_type: str = "dataview"
+
+
+def load_corpus(path: Path) -> list[BenchQuery]:
+    """Load an NDJSON query corpus.
+
+    Each non-empty line is either a JSON string (a DQL query) or an object
+    ``{"query": ..., "type": "dataview" | "jsonlogic"}``. JsonLogic queries
+    may be given as objects; they are serialized for sending.
+
+    Args:
+        path: Corpus file
+
+    Returns:
+        Queries in file order
+
+    Raises:
+        ValueError: If a line is invalid or the corpus is empty
+    """
+    queries: list[BenchQuery] = []
+    with path.open(encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e}") from e
+            if isinstance(entry, str):
+                queries.append(BenchQuery(entry))
+                continue
+            if not isinstance(entry, dict) or "query" not in entry:
+                raise ValueError(f"{path}:{number}: expected a string or an object with 'query'")
+            query_type = str(entry.get("type", "dataview")).lower()
+            if query_type not in QUERY_TYPES:
+                raise ValueError(f"{path}:{number}: unknown query type '{query_type}'")
+            query = entry["query"]
+            text = query if isinstance(query, str) else json.dumps(query, ensure_ascii=False)
+            queries.append(BenchQuery(text, query_type))
+    if not queries:
+        raise ValueError(f"{path}: corpus is empty")
+    return queries
+
+
+@dataclass
+class _WorkerStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class BenchResult:
+    """Outcome of a load test.
+
+    Attributes:
+        mode: "open-loop" or "closed-loop"
+        duration: Requested duration in seconds
+        concurrency: Worker count
+        rate: Target requests per second (open loop only)
+        elapsed: Seconds from the first request to the last completion
+        histogram: Latency histogram in microseconds
+        errors: Failed request counts by error code
+    """
+
+    mode: str
+    duration: float
+    concurrency: int
+    rate: float | None
+    elapsed: float
+    histogram: LatencyHistogram
+    errors: Counter[str]
+
+    @property
+    def requests(self) -> int:
+        """Number of completed requests, successful or not."""
+        return self.histogram.count
+
+    @property
+    def failed(self) -> int:
+        """Number of failed requests."""
+        return sum(self.errors.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for JSON output (latencies in milliseconds)."""
+        histogram = self.histogram
+        latency = {
+            "min": histogram.min,
+            "mean": histogram.mean,
+            "p50": histogram.value_at_percentile(50),
+            "p90": histogram.value_at_percentile(90),
+            "p99": histogram.value_at_percentile(99),
+            "p999": histogram.value_at_percentile(99.9),
+            "max": histogram.max,
+        }
+        return {
+            "mode": self.mode,
+            "duration_seconds": self.duration,
+            "concurrency": self.concurrency,
+            "target_rate": self.rate,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "requests": self.requests,
+            "succeeded": self.requests - self.failed,
+            "failed": self.failed,
+            "throughput_rps": round(self.requests / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {name: round(value / 1000, 3) for name, value in latency.items()},
+            "histogram": [
+                {
+                    "value_ms": round(row.value / 1000, 3),
+                    "percentile": round(row.percentile, 6),
+                    "total_count": row.total_count,
+                    "inverse": round(row.inverse, 2) if row.inverse is not None else None,
+                }
+                for row in histogram.percentile_distribution()
+            ],
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+def _execute(client: ObsidianClient, item: BenchQuery) -> str | None:
+    """Run one query and return its error code, or None on success."""
+    try:
+        if item.query_type == "jsonlogic":
+            response = client.search_jsonlogic(item.query)
+        else:
+            response = client.search_dataview(item.query)
+    except ObsidianClientError as e:
+        return error_code(e)
+    except Exception as e:
+        logger.debug("Unexpected error during benchmark request: %s", e, exc_info=True)
+        return "UNKNOWN_ERROR"
+    if response.success:
+        return None
+    return str((response.error or {}).get("code", "API_ERROR"))
+
+
+def bench_client() -> ObsidianClient:
+    """Create a client that sends every request as issued.
+
+    The benchmark sets the load itself and measures how the server copes, so
+    caching, coalescing, the adaptive concurrency limit, retries and the
+    circuit breaker are all turned off.
+
+    Returns:
+        ObsidianClient configured from the environment
+    """
+    return ObsidianClient(
+        cache_ttl=0, max_concurrency=0, retries=0, circuit_threshold=0, coalesce=False
+    )
+
+
+def run_benchmark(
+    corpus: Sequence[BenchQuery],
+    duration: float,
+    concurrency: int = 4,
+    rate: float | None = None,
+    client_factory: Callable[[], ObsidianClient] | None = None,
+) -> BenchResult:
+    """Replay a corpus against the API for a fixed duration.
+
+    Queries are sent round-robin in corpus order. Each worker thread uses its
+    own client (and so its own connection pool), with result caching off.
+
+    Args:
+        corpus: Queries to replay
+        duration: Seconds to generate load for
+        concurrency: Worker threads (maximum requests in flight)
+        rate: Requests per second for open-loop mode; None for closed loop
+        client_factory: Creates a client per worker (default: bench_client)
+
+    Returns:
+        BenchResult
+
+    Raises:
+        ValueError: If the corpus is empty or a parameter is out of range
+        ObsidianAuthError: If the API key is missing
+    """
+    if not corpus:
+        raise ValueError("Corpus is empty")
+    if duration <= 0 or concurrency <= 0 or (rate is not None and rate <= 0):
+        raise ValueError("Duration, concurrency and rate must be positive")
+    factory = client_factory or bench_client
+    # Fail fast on configuration errors before starting threads
+    factory()
+
+    local = threading.local()
+    registry: list[_WorkerStats] = []
+    registry_lock = threading.Lock()
+
+    def worker_state() -> tuple[ObsidianClient, _WorkerStats]:
+        if not hasattr(local, "client"):
+            local.client = factory()
+            local.stats = _WorkerStats()
+            with registry_lock:
+                registry.append(local.stats)
+        return local.client, local.stats
+
+    def send(index: int, scheduled: float) -> None:
+        client, stats = worker_state()
+        error = _execute(client, corpus[index % len(corpus)])
+        stats.histogram.record(int((time.perf_counter() - scheduled) * 1_000_000))
+        if error is not None:
+            stats.errors[error] += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    if rate is None:
+
+        def closed_loop(offset: int) -> None:
+            index = offset
+            while time.perf_counter() < deadline:
+                send(index, time.perf_counter())
+                index += concurrency
+
+        threads = [
+            threading.Thread(target=closed_loop, args=(offset,), daemon=True)
+            for offset in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            index = 0
+            while True:
+                scheduled = started + index / rate
+                if scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(send, index, scheduled)
+                index += 1
+    elapsed = time.perf_counter() - started
+
+    histogram = LatencyHistogram()
+    errors: Counter[str] = Counter()
+    for stats in registry:
+        histogram.merge(stats.histogram)
+        errors.update(stats.errors)
+    return BenchResult(
+        mode="closed-loop" if rate is None else "open-loop",
+        duration=duration,
+        concurrency=concurrency,
+        rate=rate,
+        elapsed=elapsed,
+        histogram=histogram,
+        errors=errors,
+    )
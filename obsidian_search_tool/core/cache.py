@@ -0,0 +1,181 @@
+"""In-memory TTL cache for search results.
+
+Entries are keyed by the exact request the client would send, so two searches
+share an entry only when the plugin would see identical requests. Cached
+values are the decoded JSON and are shared between callers; treat them as
+read-only.
+
+With a staleness bound (``max_stale``), an entry is kept for that long after
+it expires. The client serves it at once, marked as stale, and refreshes it in
+the background (stale-while-revalidate). start_refresh() ensures only one
+refresh per entry runs at a time.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached result.
+
+    Attributes:
+        value: Decoded JSON response
+        stored_at: Monotonic clock reading when the entry was stored
+    """
+
+    value: Any
+    stored_at: float
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Attributes:
+        ttl: Seconds an entry stays fresh
+        max_stale: Seconds past ttl an expired entry may still be served stale
+        max_entries: Maximum number of entries before the least recently used is evicted
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that found no fresh entry
+        stale_hits: Number of stale entries returned by get_stale()
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+        max_stale: float = 0.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays fresh (must be positive)
+            max_entries: Maximum number of entries (must be positive)
+            clock: Monotonic clock, replaceable in tests
+            max_stale: Seconds past ttl an expired entry may still be served stale
+                (0 disables stale serving)
+
+        Raises:
+            ValueError: If ttl or max_entries is not positive, or max_stale is negative
+        """
+        if ttl <= 0:
+            raise ValueError(f"Cache TTL must be positive, got {ttl}")
+        if max_entries <= 0:
+            raise ValueError(f"Cache size must be positive, got {max_entries}")
+        if max_stale < 0:
+            raise ValueError(f"Cache max staleness must not be negative, got {max_stale}")
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        """Return the fresh entry for key, if any.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The entry, or None if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() - entry.stored_at >= self.ttl:
+                if entry is not None and self._clock() - entry.stored_at >= self._retention:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get_stale(self, key: Hashable) -> CacheEntry | None:
+        """Return the expired entry for key if it is still within max_stale.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The entry, or None if absent, fresh or past the staleness bound
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            age = self._clock() - entry.stored_at
+            if age < self.ttl or age >= self._retention:
+                return None
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return entry
+
+    def age(self, entry: CacheEntry) -> float:
+        """Return the seconds since an entry was stored."""
+        return self._clock() - entry.stored_at
+
+    def start_refresh(self, key: Hashable) -> bool:
+        """Claim the background refresh of an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            False if a refresh of this entry is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key: Hashable) -> None:
+        """Release the claim taken by start_refresh().
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._refreshing.discard(key)
+
+    @property
+    def _retention(self) -> float:
+        """Seconds an entry is kept after it is stored."""
+        return self.ttl + self.max_stale
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Decoded JSON response
+        """
+        with self._lock:
+            self._entries[key] = CacheEntry(value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones."""
+        return len(self._entries)
@@ -4,17 +4,77 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+import json
 import logging
 import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import replace
 from datetime import UTC, datetime
-from typing import Any
+from types import TracebackType
+from typing import Any, Self
 
 import requests
-
+import urllib3
+
+from obsidian_search_tool.core.cache import ResultCache
+from obsidian_search_tool.core.concurrency import (
+    DEFAULT_MAX_CONCURRENCY,
+    AdaptiveLimiter,
+    current_priority,
+    max_concurrency_from_env,
+    priority_scope,
+    shared_limiter,
+)
+from obsidian_search_tool.core.deadline import Deadline, current_deadline
+from obsidian_search_tool.core.fusion import (
+    FusedBatch,
+    FusionError,
+    plan_fusion,
+    split_fused_results,
+)
+from obsidian_search_tool.core.hooks import ClientHooks, HookRequest, HookResponse
+from obsidian_search_tool.core.metrics import (
+    REGISTRY,
+    ClientMetrics,
+    MetricsRegistry,
+    query_type_label,
+)
 from obsidian_search_tool.core.models import AuthResponse, SearchResponse, StatusResponse
+from obsidian_search_tool.core.parallel import map_parallel
+from obsidian_search_tool.core.query_stats import QueryStatsStore
+from obsidian_search_tool.core.resilience import (
+    CLOSED,
+    DEFAULT_CIRCUIT_THRESHOLD,
+    DEFAULT_RETRIES,
+    RETRYABLE_STATUS,
+    CircuitBreaker,
+    RetryPolicy,
+    circuit_threshold_from_env,
+    retries_from_env,
+    shared_breaker,
+    shared_budget,
+)
+from obsidian_search_tool.core.singleflight import (
+    SHARED,
+    SingleFlight,
+    coalesce_from_env,
+    flight_key,
+)
+from obsidian_search_tool.core.timings import (
+    RequestTimings,
+    TimedHTTPAdapter,
+    consume_connect_time,
+    reset_connect_time,
+)
+from obsidian_search_tool.core.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Most bytes taken from a response body per read while a deadline is active
+BODY_CHUNK = 64 * 1024
+
 
 class ObsidianClientError(Exception):
     """Base exception for Obsidian client errors."""
@@ -34,6 +94,18 @@ class ObsidianConnectionError(ObsidianClientError):
     pass
 
 
+class ObsidianDeadlineError(ObsidianConnectionError):
+    """The operation deadline ran out before the request completed."""
+
+    pass
+
+
+class ObsidianCircuitOpenError(ObsidianConnectionError):
+    """The endpoint kept failing, so the request was not sent."""
+
+    pass
+
+
 class ObsidianAPIError(ObsidianClientError):
     """API error with status code and message."""
 
@@ -50,16 +122,155 @@ class ObsidianAPIError(ObsidianClientError):
         self.error_code = error_code
 
 
+def error_code(error: ObsidianClientError) -> str:
+    """Return the error code reported for a client exception.
+
+    Args:
+        error: Exception raised by ObsidianClient
+
+    Returns:
+        The API error code, or AUTH_ERROR, DEADLINE_EXCEEDED, CIRCUIT_OPEN,
+        CONNECTION_ERROR or CLIENT_ERROR
+    """
+    if isinstance(error, ObsidianAPIError):
+        # The plugin reports numeric codes (e.g. 40000) in its JSON body
+        return str(error.error_code)
+    if isinstance(error, ObsidianAuthError):
+        return "AUTH_ERROR"
+    if isinstance(error, ObsidianDeadlineError):
+        return "DEADLINE_EXCEEDED"
+    if isinstance(error, ObsidianCircuitOpenError):
+        return "CIRCUIT_OPEN"
+    if isinstance(error, ObsidianConnectionError):
+        return "CONNECTION_ERROR"
+    return "CLIENT_ERROR"
+
+
+def is_transient(error: ObsidianClientError) -> bool:
+    """Return whether a request that failed with this error may succeed if sent again.
+
+    Args:
+        error: Exception raised by ObsidianClient
+
+    Returns:
+        True for timeouts, connection failures and 5xx responses
+    """
+    if isinstance(error, ObsidianAPIError):
+        return error.status_code in RETRYABLE_STATUS
+    return isinstance(error, ObsidianConnectionError) and not isinstance(
+        error, ObsidianDeadlineError | ObsidianCircuitOpenError
+    )
+
+
+def mark_stale(data: dict[str, Any], age: float | None) -> None:
+    """Flag a search response's data as served from an expired cache entry.
+
+    Args:
+        data: Response data block
+        age: Seconds since the result was fetched, or None if it is not stale
+    """
+    if age is not None:
+        data["stale"] = True
+        data["cache_age_seconds"] = round(age, 3)
+
+
+def incomplete_response(query: str, search_type: str, error: ObsidianClientError) -> SearchResponse:
+    """Build the response for a search the deadline cut short.
+
+    Args:
+        query: Query text
+        search_type: "dataview" or "jsonlogic"
+        error: Error that ended the search
+
+    Returns:
+        Successful SearchResponse without results, marked incomplete
+    """
+    data = {
+        "query": query,
+        "search_type": search_type,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "results": [],
+        "incomplete": True,
+        "incomplete_reason": str(error),
+    }
+    return SearchResponse(success=True, data=data, error=None)
+
+
+def read_body(response: requests.Response, deadline: Deadline | None, limit: float) -> bytes:
+    """Read a streamed response body within the deadline.
+
+    The read timeout only bounds each socket read, so a body that keeps
+    trickling in could outlive the deadline. With a deadline the body is read
+    one socket read at a time, each given only the time left, and reading
+    stops once it runs out.
+
+    Args:
+        response: Response opened with stream=True
+        deadline: Active deadline, or None to read the whole body
+        limit: Per-read timeout that still applies (OBSIDIAN_TIMEOUT)
+
+    Returns:
+        Response body
+
+    Raises:
+        ObsidianDeadlineError: If the deadline runs out before the body is read
+        ObsidianConnectionError: If the connection fails while reading
+    """
+    if deadline is None:
+        return response.content
+    raw = response.raw
+    sock = getattr(getattr(raw, "connection", None), "sock", None)
+    # read1 (urllib3 2.3+) makes at most one socket read; read waits for a full chunk
+    read = getattr(raw, "read1", raw.read)
+    chunks: list[bytes] = []
+    try:
+        while not deadline.expired():
+            if sock is not None:
+                sock.settimeout(min(deadline.remaining(), limit))
+            chunk = read(BODY_CHUNK, decode_content=True)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    except (OSError, urllib3.exceptions.HTTPError) as e:
+        response.close()
+        if not deadline.expired():
+            raise ObsidianConnectionError(f"Network error: {e}") from e
+        raise ObsidianDeadlineError(
+            f"Deadline of {deadline.budget:g}s exceeded while reading the response"
+        ) from e
+    # The rest of the body is still unread, so the connection cannot be reused
+    response.close()
+    raise ObsidianDeadlineError(
+        f"Deadline of {deadline.budget:g}s exceeded while reading the response"
+    )
+
+
 class ObsidianClient:
     """Client for interacting with Obsidian Local REST API.
 
     This client provides search-only operations for querying an Obsidian vault
     using Dataview DQL (TABLE queries) and JsonLogic queries.
 
+    A client may be shared by many threads. Each thread sends its requests
+    through its own HTTP session and connection pool, since requests.Session
+    is not thread-safe; timings, the cache and the shared resilience state
+    are updated under locks. Sessions of finished threads are closed when
+    the next session is created, and close() closes all of them.
+
     Attributes:
         base_url: API base URL (from OBSIDIAN_BASE_URL env var)
         api_key: API authentication token (from OBSIDIAN_API_KEY env var)
         timeout: Request timeout in seconds (from OBSIDIAN_TIMEOUT env var)
+        timings: Per-phase timings accumulated over all requests made
+        last_timings: Timings of the most recent request
+        cache: Search result cache (None when caching is disabled)
+        hooks: Registered request lifecycle hooks
+        metrics: Metric handles this client records into
+        stats: Query statistics store (None unless OBSIDIAN_STATS_DB is set)
+        limiter: Adaptive concurrency limiter shared per endpoint (None when disabled)
+        retry_policy: Backoff policy for retrying idempotent requests
+        breaker: Circuit breaker shared per endpoint (None when disabled)
+        flights: Coalescing group for identical in-flight searches (None when disabled)
     """
 
     def __init__(
@@ -67,13 +278,46 @@ class ObsidianClient:
         base_url: str | None = None,
         api_key: str | None = None,
         timeout: int | None = None,
+        cache_ttl: float | None = None,
+        metrics: MetricsRegistry | None = None,
+        max_concurrency: int | None = None,
+        retries: int | None = None,
+        circuit_threshold: int | None = None,
+        coalesce: bool | None = None,
+        cache_max_stale: float | None = None,
+        resilient: bool = False,
     ) -> None:
         """Initialize Obsidian client.
 
+        Retries, the circuit breaker, the adaptive concurrency limit and request
+        coalescing are off unless resilient is set (as the CLI does), or turned
+        on one by one with their argument or environment variable.
+
         Args:
             base_url: API base URL (default: from OBSIDIAN_BASE_URL or http://127.0.0.1:27123)
             api_key: API key (default: from OBSIDIAN_API_KEY env var)
             timeout: Request timeout in seconds (default: from OBSIDIAN_TIMEOUT or 30)
+            cache_ttl: Seconds to cache search results (default: from OBSIDIAN_CACHE_TTL
+                or 0, which disables the cache)
+            metrics: Registry to record request metrics into (default: the shared
+                REGISTRY from obsidian_search_tool.core.metrics)
+            max_concurrency: Upper bound of the adaptive in-flight request limit
+                (default: from OBSIDIAN_MAX_CONCURRENCY, else 8 if resilient and
+                0 otherwise; 0 disables limiting)
+            retries: Retries of idempotent requests after transient failures
+                (default: from OBSIDIAN_RETRIES, else 2 if resilient and 0
+                otherwise; 0 disables retrying)
+            circuit_threshold: Consecutive transient failures that open the circuit
+                (default: from OBSIDIAN_CIRCUIT_THRESHOLD, else 5 if resilient and
+                0 otherwise; 0 disables the breaker)
+            coalesce: Share one request among concurrent identical searches
+                (default: from OBSIDIAN_COALESCE, else whether resilient is set;
+                0 disables coalescing)
+            cache_max_stale: Seconds past cache_ttl an expired result is still served
+                while it is refreshed in the background (default: from
+                OBSIDIAN_CACHE_MAX_STALE or 0, which disables stale serving)
+            resilient: Default to the CLI's retries, circuit breaker, concurrency
+                limit and coalescing instead of leaving them off
 
         Raises:
             ObsidianAuthError: If API key is not provided or found in environment
@@ -91,7 +335,100 @@ class ObsidianClient:
                 "Get the API key from Obsidian Local REST API plugin settings."
             )
 
-        logger.debug(f"Initialized ObsidianClient with base_url={self.base_url}")
+        resolved_cache_ttl = (
+            cache_ttl if cache_ttl is not None else float(os.getenv("OBSIDIAN_CACHE_TTL", "0"))
+        )
+        resolved_max_stale = (
+            cache_max_stale
+            if cache_max_stale is not None
+            else float(os.getenv("OBSIDIAN_CACHE_MAX_STALE", "0"))
+        )
+        self.cache = (
+            ResultCache(resolved_cache_ttl, max_stale=resolved_max_stale)
+            if resolved_cache_ttl > 0
+            else None
+        )
+        self.hooks = ClientHooks()
+        self.metrics = ClientMetrics(metrics if metrics is not None else REGISTRY)
+        self.stats = QueryStatsStore.from_env()
+        if self.stats is not None:
+            self.stats.attach(self)
+        resolved_max_concurrency = (
+            max_concurrency
+            if max_concurrency is not None
+            else max_concurrency_from_env(DEFAULT_MAX_CONCURRENCY if resilient else 0)
+        )
+        self.limiter: AdaptiveLimiter | None = (
+            shared_limiter(self.base_url, resolved_max_concurrency)
+            if resolved_max_concurrency > 0
+            else None
+        )
+        self.retry_policy = RetryPolicy(
+            retries
+            if retries is not None
+            else retries_from_env(DEFAULT_RETRIES if resilient else 0)
+        )
+        self._retry_budget = shared_budget(self.base_url)
+        resolved_threshold = (
+            circuit_threshold
+            if circuit_threshold is not None
+            else circuit_threshold_from_env(DEFAULT_CIRCUIT_THRESHOLD if resilient else 0)
+        )
+        self.breaker: CircuitBreaker | None = (
+            shared_breaker(self.base_url, resolved_threshold) if resolved_threshold > 0 else None
+        )
+        resolved_coalesce = coalesce if coalesce is not None else coalesce_from_env(resilient)
+        self.flights: SingleFlight | None = SHARED if resolved_coalesce else None
+        self.timings = RequestTimings()
+        self.last_timings: RequestTimings | None = None
+        self._timings_lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions: dict[threading.Thread, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+
+        logger.debug("Initialized ObsidianClient with base_url=%s", self.base_url)
+
+    def _thread_session(self) -> requests.Session:
+        """Return the calling thread's HTTP session, creating it on first use."""
+        thread = threading.current_thread()
+        session: requests.Session | None = getattr(self._local, "session", None)
+        if session is not None and self._sessions.get(thread) is session:
+            return session
+        session = requests.Session()
+        adapter = TimedHTTPAdapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with self._sessions_lock:
+            finished = [other for other in self._sessions if not other.is_alive()]
+            for other in finished:
+                self._sessions.pop(other).close()
+            self._sessions[thread] = session
+        self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP sessions of all threads.
+
+        The client stays usable; threads open new sessions on their next request.
+        """
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> Self:
+        """Use the client; its sessions are closed on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the sessions of all threads."""
+        self.close()
 
     def _get_headers(self, content_type: str = "application/json") -> dict[str, str]:
         """Build HTTP headers for API requests.
@@ -114,6 +451,8 @@ class ObsidianClient:
         endpoint: str,
         data: str | None = None,
         content_type: str = "application/json",
+        cacheable: bool = False,
+        idempotent: bool = False,
     ) -> dict[str, Any]:
         """Make HTTP request to Obsidian API.
 
@@ -122,40 +461,452 @@ class ObsidianClient:
             endpoint: API endpoint path
             data: Request body data
             content_type: Content-Type header value
+            cacheable: Whether the response may be served from and stored in the cache
+            idempotent: Whether the request may be sent again (implied for GET)
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            ObsidianCircuitOpenError: If the endpoint is failing and the request was not sent
+            ObsidianConnectionError: If network error occurs
+            ObsidianAPIError: If API returns error response
+        """
+        parsed, _ = self._request(method, endpoint, data, content_type, cacheable, idempotent)
+        return parsed
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        data: str | None = None,
+        content_type: str = "application/json",
+        cacheable: bool = False,
+        idempotent: bool = False,
+    ) -> tuple[dict[str, Any], float | None]:
+        """Make HTTP request to Obsidian API, reporting whether the result is stale.
+
+        Runs the registered hooks around the request and, for cacheable
+        requests, answers from the result cache when a fresh entry exists.
+        With a staleness bound (cache_max_stale), an expired entry within the
+        bound is returned at once and refreshed in the background.
+        A cacheable request identical to one already in flight waits for that
+        request and shares its result instead of being sent; hooks other than
+        before_request only run for the request that is sent. GET and
+        idempotent requests are retried after transient failures.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            data: Request body data
+            content_type: Content-Type header value
+            cacheable: Whether the response may be served from and stored in the cache
+            idempotent: Whether the request may be sent again (implied for GET)
+
+        Returns:
+            Tuple of (parsed JSON response, age in seconds if it is a stale
+            cached result, else None)
+
+        Raises:
+            ObsidianCircuitOpenError: If the endpoint is failing and the request was not sent
+            ObsidianConnectionError: If network error occurs
+            ObsidianAPIError: If API returns error response
+        """
+        request = HookRequest(
+            method, f"{self.base_url}{endpoint}", self._get_headers(content_type), data
+        )
+        hooks = self.hooks
+        unhooked = replace(request, headers=dict(request.headers)) if hooks.before_request else None
+        for before_hook in hooks.before_request:
+            before_hook(request)
+
+        metrics = self.metrics
+        query_type = query_type_label(content_type)
+        idempotent = idempotent or method == "GET"
+        cache = self.cache if cacheable else None
+        if cache is not None:
+            entry = cache.get(request.cache_key)
+            if entry is not None:
+                logger.debug("Cache hit: %s %s", method, request.url)
+                metrics.cache_hits.inc()
+                for cache_hook in hooks.on_cache_hit:
+                    cache_hook(request, entry.value)
+                return entry.value, None
+            entry = cache.get_stale(request.cache_key)
+            if entry is not None:
+                age = cache.age(entry)
+                logger.debug("Serving stale result (%.1fs old): %s %s", age, method, request.url)
+                metrics.cache_stale_hits.inc()
+                for cache_hook in hooks.on_cache_hit:
+                    cache_hook(request, entry.value)
+                self._refresh_in_background(
+                    request, unhooked or request, query_type, idempotent, cache
+                )
+                return entry.value, age
+            metrics.cache_misses.inc()
+
+        return self._load(request, query_type, idempotent, cacheable), None
+
+    def _load(
+        self,
+        request: HookRequest,
+        query_type: str,
+        idempotent: bool,
+        cacheable: bool,
+    ) -> dict[str, Any]:
+        """Fetch a result, sharing cacheable requests with identical ones in flight.
+
+        Args:
+            request: Request to send
+            query_type: query_type label of the request
+            idempotent: Whether the request may be retried
+            cacheable: Whether the result may be shared and stored in the cache
 
         Returns:
             Parsed JSON response
 
         Raises:
+            ObsidianCircuitOpenError: If the endpoint is failing and the request was not sent
             ObsidianConnectionError: If network error occurs
             ObsidianAPIError: If API returns error response
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = self._get_headers(content_type)
+        cache = self.cache if cacheable else None
+        flights = self.flights if cacheable else None
+        if flights is None:
+            return self._fetch(request, query_type, idempotent, cache)
+
+        key = flight_key(request, query_type)
+        while True:
+            deadline = current_deadline()
+            led = False
+
+            def fetch() -> dict[str, Any]:
+                nonlocal led
+                led = True
+                return self._fetch(request, query_type, idempotent, cache)
+
+            try:
+                shared_result, shared = flights.do(
+                    key, fetch, deadline.remaining() if deadline is not None else None
+                )
+            except TimeoutError as e:
+                assert deadline is not None
+                raise ObsidianDeadlineError(
+                    f"Deadline of {deadline.budget:g}s exceeded waiting for an identical request"
+                ) from e
+            except ObsidianDeadlineError:
+                # The leader ran out of its own deadline; ours may still allow a request
+                if led or (deadline is not None and deadline.expired()):
+                    raise
+                continue
+            if shared:
+                logger.debug("Coalesced with in-flight request: %s %s", request.method, request.url)
+                self.metrics.coalesced.inc((query_type,))
+            result: dict[str, Any] = shared_result
+            return result
+
+    def _refresh_in_background(
+        self,
+        request: HookRequest,
+        unhooked: HookRequest,
+        query_type: str,
+        idempotent: bool,
+        cache: ResultCache,
+    ) -> None:
+        """Re-fetch a stale cache entry on a daemon thread, once per key at a time.
 
-        logger.debug(f"API Request: {method} {url}")
-        if data:
-            logger.debug(f"Request data: {data[:200]}...")
+        The refresh runs at bulk priority and without the caller's deadline.
+        It is a request of its own: before_request hooks run for it on the
+        refresh thread, so hooks keeping per-request state see every event.
+
+        Args:
+            request: Request whose cached result is stale
+            unhooked: The same request before before_request hooks rewrote it
+            query_type: query_type label of the request
+            idempotent: Whether the request may be retried
+            cache: Cache the fresh result is stored in
+        """
+        key = request.cache_key
+        if not cache.start_refresh(key):
+            return
+
+        def refresh() -> None:
+            try:
+                fresh = replace(unhooked, headers=dict(unhooked.headers))
+                for before_hook in self.hooks.before_request:
+                    before_hook(fresh)
+                with priority_scope("bulk"):
+                    self._load(fresh, query_type, idempotent, cacheable=True)
+            except ObsidianClientError as e:
+                logger.warning("Background refresh failed, keeping stale result: %s", e)
+            except Exception:
+                logger.exception("Background refresh raised, keeping stale result")
+            finally:
+                cache.finish_refresh(key)
+
+        threading.Thread(target=refresh, name="obsidian-cache-refresh", daemon=True).start()
+
+    def _fetch(
+        self,
+        request: HookRequest,
+        query_type: str,
+        idempotent: bool,
+        cache: ResultCache | None,
+    ) -> dict[str, Any]:
+        """Send a request, record its metrics, cache its result and run its hooks.
 
+        Args:
+            request: Request to send
+            query_type: query_type label of the request
+            idempotent: Whether the request may be retried
+            cache: Cache to store the result in (None to skip)
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            ObsidianCircuitOpenError: If the endpoint is failing and the request was not sent
+            ObsidianConnectionError: If network error occurs
+            ObsidianAPIError: If API returns error response
+        """
+        metrics = self.metrics
+        hooks = self.hooks
+        metrics.requests.inc((request.method, query_type))
+        started = time.perf_counter()
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                data=data.encode("utf-8") if data else None,
-                timeout=self.timeout,
+            status_code, parsed, timings = self._send_with_retry(request, idempotent)
+        except ObsidianClientError as e:
+            metrics.latency.observe(time.perf_counter() - started, (query_type,))
+            metrics.errors.inc((error_code(e),))
+            for error_hook in hooks.on_error:
+                error_hook(request, e)
+            raise
+        metrics.latency.observe(time.perf_counter() - started, (query_type,))
+        metrics.response_bytes.inc((query_type,), timings.response_bytes)
+        if isinstance(parsed, list):
+            metrics.rows.inc((query_type,), len(parsed))
+
+        if cache is not None:
+            cache.put(request.cache_key, parsed)
+        if hooks.after_response:
+            response = HookResponse(status_code, parsed, timings)
+            for after_hook in hooks.after_response:
+                after_hook(request, response)
+        return parsed
+
+    def _send_with_retry(
+        self, request: HookRequest, idempotent: bool
+    ) -> tuple[int, dict[str, Any], RequestTimings]:
+        """Send a request through the circuit breaker, retrying transient failures.
+
+        Retries wait with exponential backoff and full jitter. A retry is only
+        sent while the shared retry budget has tokens and the active deadline
+        leaves time for the wait.
+
+        Args:
+            request: Request to send
+            idempotent: Whether the request may be retried
+
+        Returns:
+            Tuple of (status code, parsed JSON response, request timings)
+
+        Raises:
+            ObsidianCircuitOpenError: If the circuit is open
+            ObsidianDeadlineError: If the active deadline runs out
+            ObsidianConnectionError: If network error occurs
+            ObsidianAPIError: If API returns error response
+        """
+        breaker = self.breaker
+        policy = self.retry_policy
+        self._retry_budget.deposit()
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                self._record_circuit(breaker)
+                raise ObsidianCircuitOpenError(
+                    f"Circuit open for {self.base_url} after repeated failures; "
+                    f"not sending requests for {breaker.retry_after():.1f}s"
+                )
+            try:
+                result = self._send_limited(request)
+            except ObsidianDeadlineError:
+                if breaker is not None:
+                    breaker.abandon()
+                raise
+            except ObsidianClientError as e:
+                transient = is_transient(e)
+                if breaker is not None:
+                    if transient:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    self._record_circuit(breaker)
+                if not (idempotent and transient and attempt < policy.retries):
+                    raise
+                delay = policy.delay(attempt)
+                deadline = current_deadline()
+                if deadline is not None and deadline.remaining() <= delay:
+                    raise
+                if not self._retry_budget.withdraw():
+                    logger.warning("Retry budget exhausted, not retrying: %s", e)
+                    raise
+                attempt += 1
+                self.metrics.retries.inc((error_code(e),))
+                logger.info(
+                    "Retrying %s %s in %.2fs (retry %d of %d): %s",
+                    request.method,
+                    request.url,
+                    delay,
+                    attempt,
+                    policy.retries,
+                    e,
+                )
+                time.sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+                self._record_circuit(breaker)
+            return result
+
+    def _record_circuit(self, breaker: CircuitBreaker) -> None:
+        """Publish whether the endpoint's circuit is open as a gauge."""
+        self.metrics.circuit_open.set(0 if breaker.state == CLOSED else 1, (self.base_url,))
+
+    def _send_limited(self, request: HookRequest) -> tuple[int, dict[str, Any], RequestTimings]:
+        """Send a request within the endpoint's adaptive concurrency limit.
+
+        Waits for a free slot, scheduled by the active priority class and no
+        longer than the active deadline allows, and reports the request's
+        latency, or whether it failed from overload, to the limiter afterwards.
+
+        Args:
+            request: Request to send
+
+        Returns:
+            Tuple of (status code, parsed JSON response, request timings)
+
+        Raises:
+            ObsidianDeadlineError: If the deadline runs out while waiting or sending
+            ObsidianConnectionError: If network error occurs
+            ObsidianAPIError: If API returns error response
+        """
+        limiter = self.limiter
+        if limiter is None:
+            return self._send(request)
+        deadline = current_deadline()
+        priority = current_priority()
+        queued = time.perf_counter()
+        acquired = limiter.acquire(deadline.remaining() if deadline is not None else None, priority)
+        self.metrics.queue_wait.observe(time.perf_counter() - queued, (priority,))
+        if deadline is not None and not acquired:
+            raise ObsidianDeadlineError(
+                f"Deadline of {deadline.budget:g}s exceeded waiting for a request slot"
             )
+        self._record_concurrency(limiter)
+        started = time.perf_counter()
+        latency: float | None = None
+        overloaded = False
+        try:
+            result = self._send(request)
+            latency = time.perf_counter() - started
+            return result
+        except ObsidianAPIError as e:
+            overloaded = e.status_code >= 500
+            raise
+        except ObsidianDeadlineError:
+            # Our own budget ran out; says nothing about the server's load
+            raise
+        except ObsidianConnectionError:
+            overloaded = True
+            raise
+        finally:
+            limiter.release(latency, overloaded, priority)
+            self._record_concurrency(limiter)
+
+    def _record_concurrency(self, limiter: AdaptiveLimiter) -> None:
+        """Publish the limiter's current limit and in-flight count as gauges."""
+        labels = (self.base_url,)
+        self.metrics.concurrency_limit.set(int(limiter.limit), labels)
+        self.metrics.in_flight.set(limiter.in_flight, labels)
+
+    def _send(self, request: HookRequest) -> tuple[int, dict[str, Any], RequestTimings]:
+        """Send a request and decode its JSON response.
+
+        Args:
+            request: Request to send
 
-            logger.debug(f"API Response Status: {response.status_code}")
+        Returns:
+            Tuple of (status code, parsed JSON response, request timings)
 
-            # Handle error responses
-            if response.status_code >= 400:
-                self._handle_error_response(response)
+        Raises:
+            ObsidianDeadlineError: If the active deadline runs out
+            ObsidianConnectionError: If network error occurs
+            ObsidianAPIError: If API returns error response
+        """
+        logger.debug("API Request: %s %s", request.method, request.url)
+        if request.body:
+            logger.debug("Request data: %.200s...", request.body)
+
+        deadline = current_deadline()
+        timeout: float | tuple[float, float] = self.timeout
+        # Whether the deadline, rather than OBSIDIAN_TIMEOUT, sets this request's timeouts
+        deadline_bound = False
+        if deadline is not None:
+            if deadline.expired():
+                raise ObsidianDeadlineError(f"Deadline of {deadline.budget:g}s exceeded")
+            timeout = deadline.request_timeout(self.timeout)
+            deadline_bound = min(timeout) < self.timeout
 
-            # Parse JSON response
-            return response.json() if response.text else {}
+        try:
+            with span("request", method=request.method, url=request.url) as request_span:
+                # Stream so headers and body arrive separately and can be timed apart
+                reset_connect_time()
+                started = time.perf_counter()
+                response = self._thread_session().request(
+                    method=request.method,
+                    url=request.url,
+                    headers=request.headers,
+                    data=request.body.encode("utf-8") if request.body else None,
+                    timeout=timeout,
+                    stream=True,
+                )
+                headers_received = time.perf_counter()
+                logger.debug("API Response Status: %s", response.status_code)
+                if request_span is not None:
+                    request_span.args.update(status=response.status_code)
+
+                # Handle error responses
+                if response.status_code >= 400:
+                    self._handle_error_response(response)
+
+                body = read_body(response, deadline, self.timeout)
+                body_received = time.perf_counter()
+                if request_span is not None:
+                    request_span.args.update(bytes=len(body))
+
+                # Parse JSON response
+                with span("decode", bytes=len(body)):
+                    try:
+                        parsed: dict[str, Any] = json.loads(body) if body else {}
+                    except ValueError as e:
+                        raise ObsidianConnectionError(f"Network error: {e}") from e
+                decoded = time.perf_counter()
+
+            connect = consume_connect_time()
+            timings = RequestTimings(
+                requests=1,
+                connect_ms=connect * 1000,
+                ttfb_ms=(headers_received - started - connect) * 1000,
+                transfer_ms=(body_received - headers_received) * 1000,
+                decode_ms=(decoded - body_received) * 1000,
+                response_bytes=len(body),
+            )
+            self._record_timings(timings)
+            return response.status_code, parsed, timings
 
         except requests.exceptions.Timeout as e:
+            if deadline is not None and deadline_bound:
+                raise ObsidianDeadlineError(f"Deadline of {deadline.budget:g}s exceeded") from e
             raise ObsidianConnectionError(
                 f"Request timeout after {self.timeout}s. "
                 "Ensure Obsidian is running and the Local REST API plugin is enabled."
@@ -168,6 +919,59 @@ class ObsidianClient:
         except requests.exceptions.RequestException as e:
             raise ObsidianConnectionError(f"Network error: {e}") from e
 
+    def add_hook(self, event: str, callback: Callable[..., None]) -> Callable[..., None]:
+        """Register a request lifecycle hook.
+
+        Events are ``before_request``, ``after_response``, ``on_error`` and
+        ``on_cache_hit``; see ``obsidian_search_tool.core.hooks`` for the
+        arguments each receives.
+
+        Args:
+            event: Hook event name
+            callback: Callable invoked for the event
+
+        Returns:
+            The registered callback
+
+        Raises:
+            ValueError: If the event is unknown
+
+        Examples:
+            >>> client.add_hook("before_request", lambda req: req.headers.update({"X-Trace": "1"}))
+        """
+        self.hooks.callbacks(event).append(callback)
+        return callback
+
+    def remove_hook(self, event: str, callback: Callable[..., None]) -> None:
+        """Unregister a hook added with add_hook().
+
+        Args:
+            event: Hook event name
+            callback: Previously registered callable
+
+        Raises:
+            ValueError: If the event is unknown or the callback is not registered
+        """
+        self.hooks.callbacks(event).remove(callback)
+
+    def _record_timings(self, timings: RequestTimings) -> None:
+        """Store the timings of a completed request.
+
+        Args:
+            timings: Timings of the request
+        """
+        with self._timings_lock:
+            self.last_timings = timings
+            self.timings.add(timings)
+        logger.debug(
+            "Request timings: connect=%.1fms ttfb=%.1fms transfer=%.1fms decode=%.1fms bytes=%d",
+            timings.connect_ms,
+            timings.ttfb_ms,
+            timings.transfer_ms,
+            timings.decode_ms,
+            timings.response_bytes,
+        )
+
     def _handle_error_response(self, response: requests.Response) -> None:
         """Handle HTTP error responses.
 
@@ -270,13 +1074,15 @@ class ObsidianClient:
             >>> client.search_dataview('TABLE file.name, author WHERE author')
             >>> client.search_dataview('TABLE file.name FROM #meeting SORT file.mtime DESC')
         """
-        logger.info(f"Dataview DQL search: query='{query}'")
+        logger.info("Dataview DQL search: query='%s'", query)
 
         endpoint = "/search/"
         content_type = "application/vnd.olrapi.dataview.dql+txt"
 
         try:
-            response_data = self._make_request("POST", endpoint, query, content_type)
+            response_data, stale_age = self._request(
+                "POST", endpoint, query, content_type, cacheable=True, idempotent=True
+            )
 
             # Build successful response
             data = {
@@ -285,11 +1091,15 @@ class ObsidianClient:
                 "timestamp": datetime.now(UTC).isoformat(),
                 "results": response_data,
             }
+            mark_stale(data, stale_age)
 
             return SearchResponse(success=True, data=data, error=None)
 
+        except ObsidianDeadlineError as e:
+            logger.warning("Dataview search incomplete: %s", e)
+            return incomplete_response(query, "dataview", e)
         except ObsidianAPIError as e:
-            logger.error(f"Dataview search failed: {e}")
+            logger.error("Dataview search failed: %s", e)
             error = {
                 "message": str(e),
                 "code": e.error_code,
@@ -319,13 +1129,15 @@ class ObsidianClient:
             >>> client.search_jsonlogic('{"in": [{"var": "frontmatter.tags"}, "project"]}')
             >>> client.search_jsonlogic('{"startsWith": [{"var": "filename"}, "daily/"]}')
         """
-        logger.info(f"JsonLogic search: query='{query}'")
+        logger.info("JsonLogic search: query='%s'", query)
 
         endpoint = "/search/"
         content_type = "application/vnd.olrapi.jsonlogic+json"
 
         try:
-            response_data = self._make_request("POST", endpoint, query, content_type)
+            response_data, stale_age = self._request(
+                "POST", endpoint, query, content_type, cacheable=True, idempotent=True
+            )
 
             # Build successful response
             data = {
@@ -334,14 +1146,114 @@ class ObsidianClient:
                 "timestamp": datetime.now(UTC).isoformat(),
                 "results": response_data,
             }
+            mark_stale(data, stale_age)
 
             return SearchResponse(success=True, data=data, error=None)
 
+        except ObsidianDeadlineError as e:
+            logger.warning("JsonLogic search incomplete: %s", e)
+            return incomplete_response(query, "jsonlogic", e)
         except ObsidianAPIError as e:
-            logger.error(f"JsonLogic search failed: {e}")
+            logger.error("JsonLogic search failed: %s", e)
             error = {
                 "message": str(e),
                 "code": e.error_code,
                 "status_code": e.status_code,
             }
             return SearchResponse(success=False, data=None, error=error)
+
+    def search_jsonlogic_batch(
+        self,
+        queries: Sequence[str],
+        fuse: bool = True,
+        max_batch_size: int = 100,
+        workers: int | None = None,
+    ) -> list[SearchResponse]:
+        """Run many JsonLogic queries, optionally fused into fewer requests.
+
+        With fusion enabled, queries are combined into one ``or`` request per
+        batch that returns the fields each sub-query reads. Results are split
+        per query by re-evaluating every sub-predicate locally, so the plugin
+        scans the vault once per batch instead of once per query. Queries that
+        cannot be evaluated locally, or batches the API rejects, are run
+        individually so every query gets the same response it would on its own.
+
+        Requests are sent, and their responses decoded and split, on a thread
+        pool of ``workers`` threads; on the free-threaded build that work runs
+        on several cores at once.
+
+        Args:
+            queries: JsonLogic queries in JSON format
+            fuse: Combine queries into fused requests (default: True)
+            max_batch_size: Maximum number of queries per fused request
+            workers: Threads to run requests on (default: OBSIDIAN_WORKERS, else
+                the CPU count on the free-threaded build and 1 with the GIL)
+
+        Returns:
+            One SearchResponse per query, in input order
+
+        Raises:
+            ObsidianConnectionError: If connection fails
+
+        Examples:
+            >>> client.search_jsonlogic_batch([
+            ...     '{"in": [{"var": "frontmatter.tags"}, "project"]}',
+            ...     '{"glob": ["daily/*", {"var": "filename"}]}',
+            ... ])
+        """
+        if not fuse:
+            return map_parallel(self.search_jsonlogic, queries, workers)
+
+        batches, standalone = plan_fusion(queries, max_batch_size)
+        logger.info(
+            "JsonLogic batch search: %d queries, %d fused requests, %d standalone",
+            len(queries),
+            len(batches),
+            len(standalone),
+        )
+
+        content_type = "application/vnd.olrapi.jsonlogic+json"
+
+        def fused(batch: FusedBatch) -> dict[int, SearchResponse] | None:
+            """Run one fused request; None if its queries must run individually."""
+            try:
+                response_data, stale_age = self._request(
+                    "POST", "/search/", batch.query, content_type, cacheable=True, idempotent=True
+                )
+                split = split_fused_results(batch, response_data)
+            except ObsidianDeadlineError as e:
+                logger.warning("Fused search incomplete: %s", e)
+                return {
+                    index: incomplete_response(queries[index], "jsonlogic", e)
+                    for index in batch.indexes
+                }
+            except (ObsidianAPIError, FusionError) as e:
+                logger.warning("Fused search failed, running queries individually: %s", e)
+                return None
+
+            timestamp = datetime.now(UTC).isoformat()
+            split_responses = {}
+            for index, results in zip(batch.indexes, split, strict=True):
+                data = {
+                    "query": queries[index],
+                    "search_type": "jsonlogic",
+                    "timestamp": timestamp,
+                    "results": results,
+                }
+                mark_stale(data, stale_age)
+                split_responses[index] = SearchResponse(success=True, data=data, error=None)
+            return split_responses
+
+        responses: dict[int, SearchResponse] = {}
+        for batch, outcome in zip(batches, map_parallel(fused, batches, workers), strict=True):
+            if outcome is None:
+                standalone.extend(batch.indexes)
+            else:
+                responses.update(outcome)
+
+        individual = map_parallel(
+            lambda index: self.search_jsonlogic(queries[index]), standalone, workers
+        )
+        responses.update(zip(standalone, individual, strict=True))
+
+        return [responses[index] for index in range(len(queries))]
@@ -0,0 +1,235 @@
+"""Compact, column-oriented encoding of search results.
+
+The default JSON output repeats every column name in every row and is
+indented for humans. The compact encoding is meant for programs and language
+model agents, where bytes and tokens both count:
+
+- Column names are listed once; each row is an array of cells.
+- Columns whose string values repeat (status, folders, tags) are dictionary
+  encoded: the distinct values are listed once and cells hold their index.
+  List cells, such as file.tags, become lists of indexes.
+- File paths are split into a dictionary-encoded folder and the file name.
+- Strings longer than ``max_cell`` characters can be truncated.
+
+A payload looks like::
+
+    {"format": "compact/1", "columns": ["filename", "status", "tags"], "keys": 1,
+     "encodings": ["path", "dict", "dict"],
+     "dicts": [["projects"], ["active", "done"], ["project", "project/alpha"]],
+     "rows": [[[0, "alpha.md"], 0, [0, 1]], [[0, "beta.md"], 1, [0]]]}
+
+``encodings`` and ``dicts`` are aligned with ``columns`` (null for columns
+stored as is). The first ``keys`` columns are row fields (filename, and vault
+for multi-vault searches); the others are fields of the row's ``result``.
+``keys`` is null when results are not objects, so every column is a row
+field; ``columns`` is null when rows are not objects at all and are stored as
+is. decode_compact() turns a payload back into the usual ``results`` list.
+Truncated strings are not restored, and missing fields decode as null.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable
+from typing import Any, TextIO
+
+FORMAT = "compact/1"
+
+DICT = "dict"
+PATH = "path"
+
+# Suffix marking a truncated string cell
+ELLIPSIS = "…"
+
+
+def _truncate(value: Any, max_cell: int | None) -> tuple[Any, int]:
+    """Truncate long strings, also inside lists; return the value and cells cut."""
+    if max_cell is None:
+        return value, 0
+    if isinstance(value, str) and len(value) > max_cell:
+        return value[: max(max_cell - 1, 0)] + ELLIPSIS, 1
+    if isinstance(value, list):
+        cut = 0
+        items = []
+        for item in value:
+            item, count = _truncate(item, max_cell)
+            items.append(item)
+            cut += count
+        return items, cut
+    return value, 0
+
+
+def _strings(value: Any) -> list[str] | None:
+    """Return the strings of a dictionary-encodable cell, or None if it is not one."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    return None
+
+
+def _worth_encoding(values: Iterable[Any]) -> bool:
+    """Return whether a column's values repeat enough for a dictionary to pay off."""
+    distinct: set[str] = set()
+    total = 0
+    for value in values:
+        if value is None:
+            continue
+        strings = _strings(value)
+        if strings is None:
+            return False
+        distinct.update(strings)
+        total += len(strings)
+    return total > 1 and len(distinct) * 2 <= total
+
+
+def _split_path(path: str) -> tuple[str, str]:
+    folder, _, name = path.rpartition("/")
+    return folder, name
+
+
+def _columns(rows: list[dict[str, Any]]) -> tuple[list[str], int | None]:
+    """Return the column names (row fields first) and the number of row fields.
+
+    The count is None when not every row's result is an object to flatten.
+    """
+    flatten = all(isinstance(row.get("result"), dict) for row in rows)
+    keys: dict[str, None] = {}
+    fields: dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            if not (flatten and key == "result"):
+                keys.setdefault(key, None)
+        if flatten:
+            for key in row["result"]:
+                fields.setdefault(key, None)
+    return [*keys, *fields], len(keys) if flatten else None
+
+
+def encode_compact(results: list[Any], max_cell: int | None = None) -> dict[str, Any]:
+    """Encode search results in the compact format.
+
+    Args:
+        results: Search result rows
+        max_cell: Truncate strings longer than this many characters (None keeps all)
+
+    Returns:
+        JSON-serializable payload with format, columns, keys, encodings, dicts and rows
+    """
+    if not all(isinstance(row, dict) for row in results):
+        # Rows without fields cannot be split into columns
+        return {"format": FORMAT, "columns": None, "keys": None, "rows": results}
+
+    columns, nested = _columns(results)
+    key_count = len(columns) if nested is None else nested
+    truncated = 0
+    table: list[list[Any]] = []
+    for row in results:
+        fields = row["result"] if nested is not None else None
+        cells = []
+        for position, column in enumerate(columns):
+            source = row if position < key_count else fields
+            value, cut = _truncate(source.get(column) if source else None, max_cell)
+            truncated += cut
+            cells.append(value)
+        table.append(cells)
+
+    encodings: list[str | None] = [None] * len(columns)
+    dicts: list[list[str] | None] = [None] * len(columns)
+    for position, column in enumerate(columns):
+        if column == "filename" and position < key_count:
+            paths = [cells[position] for cells in table]
+            if all(isinstance(path, str) for path in paths) and _worth_encoding(
+                _split_path(path)[0] or None for path in paths
+            ):
+                index: dict[str, int] = {}
+                for cells in table:
+                    folder, name = _split_path(cells[position])
+                    cells[position] = [index.setdefault(folder, len(index)), name]
+                encodings[position], dicts[position] = PATH, list(index)
+            continue
+        if not _worth_encoding(cells[position] for cells in table):
+            continue
+        index = {}
+        for cells in table:
+            value = cells[position]
+            if isinstance(value, str):
+                cells[position] = index.setdefault(value, len(index))
+            elif isinstance(value, list):
+                cells[position] = [index.setdefault(item, len(index)) for item in value]
+        encodings[position], dicts[position] = DICT, list(index)
+
+    payload: dict[str, Any] = {
+        "format": FORMAT,
+        "columns": columns,
+        "keys": nested,
+        "encodings": encodings,
+        "dicts": dicts,
+        "rows": table,
+    }
+    if truncated:
+        payload["truncated"] = truncated
+    return payload
+
+
+def decode_compact(payload: dict[str, Any]) -> list[Any]:
+    """Decode a compact payload back into search result rows.
+
+    Args:
+        payload: Output of encode_compact(), or the ``data`` block of
+            ``search --format compact`` output
+
+    Returns:
+        Result rows as the API returns them ({"filename": ..., "result": {...}})
+
+    Raises:
+        ValueError: If the payload is not in a supported compact format
+    """
+    if payload.get("format") != FORMAT:
+        raise ValueError(f"Unsupported compact format: {payload.get('format')!r}")
+    columns: list[str] | None = payload["columns"]
+    if columns is None:
+        return list(payload["rows"])
+    nested: int | None = payload["keys"]
+    key_count = len(columns) if nested is None else nested
+    encodings: list[str | None] = payload.get("encodings") or [None] * len(columns)
+    dicts: list[list[str] | None] = payload.get("dicts") or [None] * len(columns)
+
+    def make_decoder(encoding: str | None, values: list[str]) -> Callable[[Any], Any] | None:
+        if encoding == PATH:
+            return lambda cell: f"{values[cell[0]]}/{cell[1]}" if values[cell[0]] else cell[1]
+        if encoding == DICT:
+            return lambda cell: (
+                [values[item] for item in cell] if isinstance(cell, list) else values[cell]
+            )
+        return None
+
+    decoders = [
+        make_decoder(encoding, values or [])
+        for encoding, values in zip(encodings, dicts, strict=True)
+    ]
+
+    rows = []
+    for cells in payload["rows"]:
+        decoded = [
+            cell if decoder is None or cell is None else decoder(cell)
+            for cell, decoder in zip(cells, decoders, strict=True)
+        ]
+        row = dict(zip(columns[:key_count], decoded[:key_count], strict=True))
+        if nested is not None:
+            row["result"] = dict(zip(columns[key_count:], decoded[key_count:], strict=True))
+        rows.append(row)
+    return rows
+
+
+def dumps_compact(data: Any) -> str:
+    """Serialize data as JSON without whitespace."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def dump_compact(data: Any, fh: TextIO) -> None:
+    """Write data to a text stream as JSON without whitespace."""
+    json.dump(data, fh, ensure_ascii=False, separators=(",", ":"))
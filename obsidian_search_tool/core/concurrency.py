@@ -0,0 +1,278 @@
+"""Adaptive concurrency limit for requests to one Obsidian instance.
+
+The Local REST API runs inside the Obsidian desktop app. Concurrent heavy
+queries slow down the UI and every other caller, so the client caps how many
+requests are in flight per endpoint. The cap adapts with AIMD (additive
+increase, multiplicative decrease):
+
+- every completed request while at least half the limit was in use raises
+  it by ``1 / limit``, about +1 per round of requests;
+- a 5xx, timeout or connection failure, or a smoothed latency above
+  ``tolerance`` times the no-load baseline, multiplies it by ``backoff``.
+
+The baseline is the lowest latency observed and drifts up slowly, so it
+follows a vault that grows. After a decrease, the requests that were already
+in flight under the old limit cannot cut it again.
+
+One limiter is shared by every client of an endpoint in the process, across
+threads, fused batches and vault fan-out.
+
+Requests waiting for a slot are scheduled by priority class (interactive,
+normal, bulk) with weighted fair queuing: each class gets slots in proportion
+to its weight while it has requests waiting, so bulk work keeps moving but
+an interactive search waits for at most a few bulk requests. Each class may
+also hold only a share of the limit, which keeps slots free for the other
+classes when a batch job floods the queue. The class comes from
+priority_scope(), which like deadline_scope() follows the code into worker
+threads started with ``contextvars.copy_context().run``.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Weight of a new sample in the smoothed latency
+_SMOOTHING = 0.2
+# Fraction of the gap to a slower sample the baseline moves by
+_BASELINE_DRIFT = 0.01
+
+# Priority classes, highest first (ties in the schedule go to the earlier class)
+PRIORITIES = ("interactive", "normal", "bulk")
+DEFAULT_PRIORITY = "normal"
+# Relative share of slots each class gets while several classes are waiting
+PRIORITY_WEIGHTS = {"interactive": 8.0, "normal": 4.0, "bulk": 1.0}
+# Largest fraction of the limit each class may hold (at least one slot)
+PRIORITY_CAPS = {"interactive": 1.0, "normal": 1.0, "bulk": 0.5}
+
+_current_priority: ContextVar[str] = ContextVar("obsidian_priority", default=DEFAULT_PRIORITY)
+
+
+def current_priority() -> str:
+    """Return the priority class active in this context."""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[str]:
+    """Send the enclosed block's requests with a priority class.
+
+    Args:
+        priority: "interactive", "normal" or "bulk"
+
+    Yields:
+        The priority class
+
+    Raises:
+        ValueError: If the priority class is unknown
+    """
+    if priority not in PRIORITY_WEIGHTS:
+        raise ValueError(f"Unknown priority '{priority}', expected one of {', '.join(PRIORITIES)}")
+    token = _current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(token)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter with a priority-class scheduler.
+
+    Attributes:
+        min_limit: Lowest limit
+        max_limit: Highest limit
+        tolerance: Smoothed latency above baseline * tolerance counts as overload
+        backoff: Factor the limit is multiplied by on overload
+        limit: Current limit (fractional; int(limit) requests may be in flight)
+        in_flight: Requests currently holding a slot
+    """
+
+    def __init__(
+        self,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        min_limit: int = 1,
+        initial_limit: int | None = None,
+        tolerance: float = 2.0,
+        backoff: float = 0.7,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            max_limit: Highest limit
+            min_limit: Lowest limit
+            initial_limit: Starting limit (default: min(2, max_limit))
+            tolerance: Smoothed latency above baseline * tolerance counts as overload
+            backoff: Factor the limit is multiplied by on overload (0-1)
+
+        Raises:
+            ValueError: If the limits or factors are out of range
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Need 1 <= min_limit <= max_limit, got {min_limit}, {max_limit}")
+        if not 0 < backoff < 1 or tolerance <= 1:
+            raise ValueError("backoff must be in (0, 1) and tolerance above 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        start = initial_limit if initial_limit is not None else min(2, max_limit)
+        self.limit = float(min(max(start, min_limit), max_limit))
+        self.in_flight = 0
+        self._baseline: float | None = None
+        self._smoothed: float | None = None
+        # Completions still to come from requests sent before the last decrease
+        self._holdoff = 0
+        self._condition = threading.Condition()
+        # Waiting requests per class, and the scheduler's virtual clock and
+        # per-class start tags (start-time fair queuing)
+        self._queues: dict[str, deque[object]] = {name: deque() for name in PRIORITIES}
+        self._class_in_flight = dict.fromkeys(PRIORITIES, 0)
+        self._tags = dict.fromkeys(PRIORITIES, 0.0)
+        self._virtual_time = 0.0
+
+    def acquire(self, timeout: float | None = None, priority: str = DEFAULT_PRIORITY) -> bool:
+        """Wait for a free slot and take it.
+
+        Args:
+            timeout: Seconds to wait at most (None waits indefinitely)
+            priority: Priority class of the request
+
+        Returns:
+            Whether a slot was taken; call release() exactly once if so
+
+        Raises:
+            ValueError: If the priority class is unknown
+        """
+        if priority not in PRIORITY_WEIGHTS:
+            raise ValueError(f"Unknown priority '{priority}'")
+        ticket = object()
+        with self._condition:
+            queue = self._queues[priority]
+            queue.append(ticket)
+            granted = self._condition.wait_for(
+                lambda: self.in_flight < int(self.limit) and self._next_ticket() is ticket,
+                timeout,
+            )
+            if not granted:
+                queue.remove(ticket)
+                # The head of the schedule may have changed
+                self._condition.notify_all()
+                return False
+            queue.popleft()
+            start = max(self._tags[priority], self._virtual_time)
+            self._virtual_time = start
+            self._tags[priority] = start + 1 / PRIORITY_WEIGHTS[priority]
+            self._class_in_flight[priority] += 1
+            self.in_flight += 1
+            # Another slot may still be free for the next in the schedule
+            self._condition.notify_all()
+            return True
+
+    def queued(self) -> dict[str, int]:
+        """Return the number of requests waiting, by priority class."""
+        with self._condition:
+            return {name: len(queue) for name, queue in self._queues.items()}
+
+    def _next_ticket(self) -> object | None:
+        """Return the waiting request the scheduler serves next."""
+        best: tuple[float, object] | None = None
+        for name in PRIORITIES:
+            queue = self._queues[name]
+            if not queue or self._class_in_flight[name] >= self._class_cap(name):
+                continue
+            start = max(self._tags[name], self._virtual_time)
+            if best is None or start < best[0]:
+                best = (start, queue[0])
+        return best[1] if best is not None else None
+
+    def _class_cap(self, priority: str) -> int:
+        """Return the most slots a priority class may hold at the current limit."""
+        return max(int(int(self.limit) * PRIORITY_CAPS[priority]), 1)
+
+    def release(
+        self, latency: float | None, overloaded: bool = False, priority: str = DEFAULT_PRIORITY
+    ) -> None:
+        """Return a slot and update the limit from the request's outcome.
+
+        Args:
+            latency: Request latency in seconds (None if it failed before a response)
+            overloaded: Whether the request failed in a way that signals overload
+                (5xx, timeout, connection failure)
+            priority: Priority class the slot was acquired with
+        """
+        with self._condition:
+            self._class_in_flight[priority] -= 1
+            # A limit that is mostly unused says nothing about whether it could be higher
+            saturated = self.in_flight * 2 >= self.limit
+            self.in_flight -= 1
+            held_off = self._holdoff > 0
+            if held_off:
+                self._holdoff -= 1
+            if latency is not None and not overloaded:
+                overloaded = self._observe(latency)
+            if overloaded:
+                if not held_off:
+                    self._decrease()
+            elif saturated and self.limit < self.max_limit:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+            self._condition.notify_all()
+
+    def _observe(self, latency: float) -> bool:
+        """Record a latency sample; return whether it indicates overload."""
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            self._baseline += (latency - self._baseline) * _BASELINE_DRIFT
+        if self._smoothed is None:
+            self._smoothed = latency
+        else:
+            self._smoothed += (latency - self._smoothed) * _SMOOTHING
+        return self._smoothed > self._baseline * self.tolerance
+
+    def _decrease(self) -> None:
+        previous = self.limit
+        self.limit = max(self.limit * self.backoff, float(self.min_limit))
+        self._holdoff = self.in_flight
+        # Start the next comparison fresh rather than from the overloaded average
+        self._smoothed = None
+        if int(previous) != int(self.limit):
+            logger.info("Concurrency limit lowered: %d -> %d", int(previous), int(self.limit))
+
+
+_limiters: dict[tuple[str, int], AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def max_concurrency_from_env(default: int = DEFAULT_MAX_CONCURRENCY) -> int:
+    """Return OBSIDIAN_MAX_CONCURRENCY, or default when unset (0 disables limiting)."""
+    return int(os.getenv("OBSIDIAN_MAX_CONCURRENCY", str(default)))
+
+
+def shared_limiter(base_url: str, max_limit: int) -> AdaptiveLimiter:
+    """Return the limiter shared by all clients of an endpoint.
+
+    Args:
+        base_url: API base URL
+        max_limit: Highest limit
+
+    Returns:
+        AdaptiveLimiter, created on first use
+    """
+    key = (base_url.rstrip("/"), max_limit)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveLimiter(max_limit=max_limit)
+        return limiter
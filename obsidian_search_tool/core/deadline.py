@@ -0,0 +1,114 @@
+"""End-to-end deadlines for client operations.
+
+A Deadline bounds the wall time of a whole operation, however many requests
+it makes. It is installed for a block of code with deadline_scope(), and the
+client sizes every request's connect and read timeouts from the time left.
+When the deadline runs out, searches return the rows gathered so far as a
+response marked ``incomplete`` instead of failing.
+
+The active deadline is held in a context variable, so it follows the code
+into worker threads started with ``contextvars.copy_context().run``.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Share of the remaining time a request may spend connecting; the rest is read budget
+CONNECT_SHARE = 0.25
+
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0}
+_DURATION = re.compile(r"\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*")
+
+_current: ContextVar[Deadline | None] = ContextVar("obsidian_deadline", default=None)
+
+
+def parse_seconds(text: str) -> float:
+    """Parse a duration such as "2s", "500ms", "1.5m" or "3" (seconds).
+
+    Args:
+        text: Duration text
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        ValueError: If the text is not a positive duration
+    """
+    match = _DURATION.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid duration '{text}', expected e.g. 2s, 500ms or 1.5m")
+    seconds = float(match.group(1)) * _UNITS[match.group(2) or "s"]
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive, got '{text}'")
+    return seconds
+
+
+class Deadline:
+    """A point in time an operation must finish by.
+
+    Attributes:
+        budget: Total seconds allowed
+        expires_at: Clock reading at which the deadline runs out
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """Start the deadline now.
+
+        Args:
+            seconds: Total seconds allowed
+            clock: Monotonic clock (for tests)
+        """
+        self.budget = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """Return the seconds left, never negative."""
+        return max(self.expires_at - self._clock(), 0.0)
+
+    def expired(self) -> bool:
+        """Return whether no time is left."""
+        return self.remaining() <= 0
+
+    def request_timeout(self, limit: float) -> tuple[float, float]:
+        """Split the time left into connect and read timeouts for one request.
+
+        Args:
+            limit: Per-request timeout that still applies (OBSIDIAN_TIMEOUT)
+
+        Returns:
+            (connect, read) timeouts in seconds; together at most the time left
+        """
+        remaining = self.remaining()
+        connect = min(remaining * CONNECT_SHARE, limit)
+        return connect, min(remaining - connect, limit)
+
+
+def current_deadline() -> Deadline | None:
+    """Return the deadline active in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Make a deadline active for the enclosed block.
+
+    Args:
+        deadline: Deadline to apply, or None for no deadline
+
+    Yields:
+        The deadline
+    """
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
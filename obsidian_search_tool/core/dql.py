@@ -0,0 +1,823 @@
+"""Dataview Query Language (DQL) parser.
+
+Parses TABLE queries into an abstract syntax tree: the TABLE header with its
+fields, the FROM source and the data commands (WHERE, SORT, LIMIT, GROUP BY,
+FLATTEN) in the order they appear. Raw clause text is kept so queries can be
+rewritten without re-serializing expressions.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+
+class DqlError(Exception):
+    """Base exception for DQL parsing errors."""
+
+    pass
+
+
+class DqlSyntaxError(DqlError):
+    """Query text could not be parsed."""
+
+    pass
+
+
+class UnsupportedDqlError(DqlError):
+    """Query is valid DQL but uses syntax this parser does not handle."""
+
+    pass
+
+
+# --- Expressions -------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Literal:
+    """String, number, boolean or null literal."""
+
+    value: Any
+
+
+@dataclass(frozen=True)
+class RawLiteral:
+    """Unquoted argument of date() or dur(), e.g. ``today`` or ``7 days``."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class LinkLiteral:
+    """Wiki link literal, e.g. ``[[note]]``."""
+
+    path: str
+
+
+@dataclass(frozen=True)
+class Variable:
+    """Bare field reference, e.g. ``author`` or ``file``."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class Member:
+    """Member access, e.g. ``file.name``."""
+
+    target: Expr
+    name: str
+
+
+@dataclass(frozen=True)
+class Index:
+    """Index access, e.g. ``file.tags[0]`` or ``row["key"]``."""
+
+    target: Expr
+    index: Expr
+
+
+@dataclass(frozen=True)
+class Call:
+    """Function call, e.g. ``contains(file.tags, "#project")``."""
+
+    name: str
+    args: tuple[Expr, ...]
+
+
+@dataclass(frozen=True)
+class Unary:
+    """Unary operation: ``!`` or ``-``."""
+
+    op: str
+    operand: Expr
+
+
+@dataclass(frozen=True)
+class Binary:
+    """Binary operation; ``op`` is one of and, or, =, !=, <, <=, >, >=, +, -, *, /, %."""
+
+    op: str
+    left: Expr
+    right: Expr
+
+
+Expr = Literal | RawLiteral | LinkLiteral | Variable | Member | Index | Call | Unary | Binary
+
+
+def member_path(expr: Expr) -> str | None:
+    """Return the dotted path of a field reference, e.g. "file.mtime".
+
+    Args:
+        expr: Expression node
+
+    Returns:
+        Dotted path, or None if the expression is not a plain field reference
+    """
+    if isinstance(expr, Variable):
+        return expr.name
+    if isinstance(expr, Member):
+        parent = member_path(expr.target)
+        return f"{parent}.{expr.name}" if parent is not None else None
+    return None
+
+
+_PRECEDENCE = {
+    "or": 1,
+    "and": 2,
+    "=": 3,
+    "!=": 3,
+    "<": 3,
+    "<=": 3,
+    ">": 3,
+    ">=": 3,
+    "+": 4,
+    "-": 4,
+    "*": 5,
+    "/": 5,
+    "%": 5,
+}
+
+
+def format_expression(expr: Expr) -> str:
+    """Render an expression back to DQL text.
+
+    Args:
+        expr: Expression node
+
+    Returns:
+        DQL expression text
+    """
+    return _format(expr, 0)
+
+
+def _format(expr: Expr, parent_precedence: int) -> str:
+    if isinstance(expr, Literal):
+        value = expr.value
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, str):
+            escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+            return f'"{escaped}"'
+        return str(value)
+    if isinstance(expr, RawLiteral):
+        return expr.text
+    if isinstance(expr, LinkLiteral):
+        return f"[[{expr.path}]]"
+    if isinstance(expr, Variable):
+        return expr.name
+    if isinstance(expr, Member):
+        return f"{_format(expr.target, 6)}.{expr.name}"
+    if isinstance(expr, Index):
+        return f"{_format(expr.target, 6)}[{_format(expr.index, 0)}]"
+    if isinstance(expr, Call):
+        return f"{expr.name}({', '.join(_format(arg, 0) for arg in expr.args)})"
+    if isinstance(expr, Unary):
+        return f"{expr.op}{_format(expr.operand, 6)}"
+    precedence = _PRECEDENCE[expr.op]
+    text = f"{_format(expr.left, precedence)} {expr.op} {_format(expr.right, precedence + 1)}"
+    return f"({text})" if precedence < parent_precedence else text
+
+
+def split_conjuncts(expr: Expr) -> list[Expr]:
+    """Split an expression on top-level ``and`` operators.
+
+    Args:
+        expr: Expression node
+
+    Returns:
+        Conjuncts in source order
+    """
+    if isinstance(expr, Binary) and expr.op == "and":
+        return split_conjuncts(expr.left) + split_conjuncts(expr.right)
+    return [expr]
+
+
+# --- Sources -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class TagSource:
+    """``FROM #tag`` (includes subtags)."""
+
+    tag: str
+
+
+@dataclass(frozen=True)
+class FolderSource:
+    """``FROM "folder"`` or ``FROM "path/to/file.md"``."""
+
+    path: str
+
+
+@dataclass(frozen=True)
+class LinkSource:
+    """``FROM [[note]]`` (incoming) or ``FROM outgoing([[note]])``."""
+
+    path: str
+    outgoing: bool = False
+
+
+@dataclass(frozen=True)
+class NegatedSource:
+    """``-source``."""
+
+    source: Source
+
+
+@dataclass(frozen=True)
+class BinarySource:
+    """``source and source`` / ``source or source``."""
+
+    op: str
+    left: Source
+    right: Source
+
+
+Source = TagSource | FolderSource | LinkSource | NegatedSource | BinarySource
+
+
+# --- Queries -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class QueryField:
+    """A TABLE column: expression plus its header name."""
+
+    expression: Expr
+    name: str
+
+
+@dataclass(frozen=True)
+class WhereCommand:
+    """WHERE clause."""
+
+    expression: Expr
+    text: str
+
+
+@dataclass(frozen=True)
+class SortCommand:
+    """SORT clause: list of (expression, descending) keys.
+
+    ``key_texts`` holds the source text of each key expression, without
+    its ASC/DESC modifier.
+    """
+
+    keys: tuple[tuple[Expr, bool], ...]
+    text: str
+    key_texts: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class LimitCommand:
+    """LIMIT clause."""
+
+    count: int
+    text: str
+
+
+@dataclass(frozen=True)
+class GroupByCommand:
+    """GROUP BY clause."""
+
+    expression: Expr
+    text: str
+
+
+@dataclass(frozen=True)
+class FlattenCommand:
+    """FLATTEN clause."""
+
+    expression: Expr
+    text: str
+
+
+Command = WhereCommand | SortCommand | LimitCommand | GroupByCommand | FlattenCommand
+
+
+@dataclass
+class Query:
+    """Parsed TABLE query.
+
+    Attributes:
+        text: Original query text
+        header: Raw TABLE header text including fields
+        fields: Projected columns
+        without_id: Whether the query uses TABLE WITHOUT ID
+        source: Parsed FROM source (None for the whole vault)
+        source_text: Raw FROM source text
+        commands: Data commands in source order
+    """
+
+    text: str
+    header: str
+    fields: list[QueryField]
+    without_id: bool = False
+    source: Source | None = None
+    source_text: str | None = None
+    commands: list[Command] = field(default_factory=list)
+
+    @property
+    def where(self) -> Expr | None:
+        """Combined WHERE expression of all WHERE commands."""
+        combined: Expr | None = None
+        for command in self.commands:
+            if isinstance(command, WhereCommand):
+                expression = command.expression
+                combined = expression if combined is None else Binary("and", combined, expression)
+        return combined
+
+    def render(self, source_text: str | None = None, commands: list[str] | None = None) -> str:
+        """Render the query text, optionally replacing the source or commands.
+
+        Args:
+            source_text: Replacement FROM source text (default: original)
+            commands: Replacement raw command texts (default: original)
+
+        Returns:
+            DQL query string
+        """
+        parts = [self.header]
+        source = source_text if source_text is not None else self.source_text
+        if source:
+            parts.append(f"FROM {source}")
+        parts.extend(commands if commands is not None else [c.text for c in self.commands])
+        return "\n".join(parts)
+
+
+# --- Tokenizer ---------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<link>\[\[[^\]]*\]\])
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<tag>\#[^\s,()"\[\]]+)
+  | (?P<op>=>|<=|>=|!=|[=<>+\-*/%!&|(),.:\[\]])
+  | (?P<ident>[^\W\d][\w\-]*)
+    """,
+    re.VERBOSE,
+)
+
+_COMMAND_KEYWORDS = {"from", "where", "sort", "limit", "group", "flatten"}
+
+
+def _tokenize(text: str) -> list[Token]:
+    tokens: list[Token] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise DqlSyntaxError(f"Unexpected character {text[position]!r} at {position}")
+        kind = match.lastgroup or ""
+        if kind != "ws":
+            tokens.append(Token(kind, match.group(), match.start(), match.end()))
+        position = match.end()
+    tokens.append(Token("eof", "", len(text), len(text)))
+    return tokens
+
+
+def _unquote(literal: str) -> str:
+    return re.sub(r"\\(.)", r"\1", literal[1:-1])
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    @property
+    def current(self) -> Token:
+        return self.tokens[self.position]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def at_keyword(self, *keywords: str) -> bool:
+        token = self.current
+        return token.kind == "ident" and token.value.lower() in keywords
+
+    def at_op(self, *ops: str) -> bool:
+        return self.current.kind == "op" and self.current.value in ops
+
+    def expect_op(self, op: str) -> Token:
+        if not self.at_op(op):
+            raise DqlSyntaxError(f"Expected {op!r} at {self.current.start}")
+        return self.advance()
+
+    def expect_keyword(self, keyword: str) -> Token:
+        if not self.at_keyword(keyword):
+            raise DqlSyntaxError(f"Expected {keyword.upper()} at {self.current.start}")
+        return self.advance()
+
+    # Expressions ------------------------------------------------------------
+
+    def expression(self) -> Expr:
+        return self._or()
+
+    def _or(self) -> Expr:
+        left = self._and()
+        while self.at_keyword("or") or self.at_op("|"):
+            self.advance()
+            left = Binary("or", left, self._and())
+        return left
+
+    def _and(self) -> Expr:
+        left = self._comparison()
+        while self.at_keyword("and") or self.at_op("&"):
+            self.advance()
+            left = Binary("and", left, self._comparison())
+        return left
+
+    def _comparison(self) -> Expr:
+        left = self._additive()
+        while self.at_op("=", "!=", "<", "<=", ">", ">="):
+            op = self.advance().value
+            left = Binary(op, left, self._additive())
+        return left
+
+    def _additive(self) -> Expr:
+        left = self._multiplicative()
+        while self.at_op("+", "-"):
+            op = self.advance().value
+            left = Binary(op, left, self._multiplicative())
+        return left
+
+    def _multiplicative(self) -> Expr:
+        left = self._unary()
+        while self.at_op("*", "/", "%"):
+            op = self.advance().value
+            left = Binary(op, left, self._unary())
+        return left
+
+    def _unary(self) -> Expr:
+        if self.at_op("!", "-"):
+            op = self.advance().value
+            return Unary(op, self._unary())
+        return self._postfix()
+
+    def _postfix(self) -> Expr:
+        expr = self._atom()
+        while True:
+            if self.at_op("."):
+                self.advance()
+                token = self.advance()
+                if token.kind != "ident":
+                    raise DqlSyntaxError(f"Expected field name at {token.start}")
+                expr = Member(expr, token.value)
+            elif self.at_op("["):
+                self.advance()
+                index = self.expression()
+                self.expect_op("]")
+                expr = Index(expr, index)
+            elif self.at_op("(") and isinstance(expr, Variable):
+                expr = Call(expr.name, self._call_args(expr.name))
+            else:
+                return expr
+
+    def _call_args(self, name: str) -> tuple[Expr, ...]:
+        open_token = self.expect_op("(")
+        if name.lower() in ("date", "dur") and self.current.kind != "string":
+            # date(today) and dur(7 days) take an unquoted literal
+            depth = 0
+            start = open_token.end
+            while True:
+                token = self.current
+                if token.kind == "eof":
+                    raise DqlSyntaxError(f"Unclosed {name}( at {open_token.start}")
+                if token.kind == "op" and token.value == "(":
+                    depth += 1
+                elif token.kind == "op" and token.value == ")":
+                    if depth == 0:
+                        break
+                    depth -= 1
+                self.advance()
+            raw = self.text[start : self.current.start].strip()
+            self.expect_op(")")
+            if re.fullmatch(r"[\w\s:.+\-]+", raw):
+                return (RawLiteral(raw),)
+            # Not a plain literal: re-parse the argument as an expression
+            return (_parse_expression(raw),)
+        args: list[Expr] = []
+        if not self.at_op(")"):
+            args.append(self.expression())
+            while self.at_op(","):
+                self.advance()
+                args.append(self.expression())
+        self.expect_op(")")
+        return tuple(args)
+
+    def _atom(self) -> Expr:
+        token = self.current
+        if token.kind == "string":
+            self.advance()
+            return Literal(_unquote(token.value))
+        if token.kind == "number":
+            self.advance()
+            number = float(token.value)
+            return Literal(
+                int(number) if number.is_integer() and "." not in token.value else number
+            )
+        if token.kind == "link":
+            self.advance()
+            return LinkLiteral(token.value[2:-2].split("|")[0])
+        if token.kind == "op" and token.value == "(":
+            self.advance()
+            expr = self.expression()
+            if self.at_op("=>"):
+                raise UnsupportedDqlError("Lambda expressions are not supported")
+            self.expect_op(")")
+            return expr
+        if token.kind == "op" and token.value == "[":
+            raise UnsupportedDqlError("List literals are not supported")
+        if token.kind == "ident":
+            self.advance()
+            lowered = token.value.lower()
+            if lowered == "true":
+                return Literal(True)
+            if lowered == "false":
+                return Literal(False)
+            if lowered == "null":
+                return Literal(None)
+            return Variable(token.value)
+        raise DqlSyntaxError(f"Unexpected token {token.value!r} at {token.start}")
+
+    # Sources ----------------------------------------------------------------
+
+    def source(self) -> Source:
+        left = self._source_and()
+        while self.at_keyword("or") or self.at_op("|"):
+            self.advance()
+            left = BinarySource("or", left, self._source_and())
+        return left
+
+    def _source_and(self) -> Source:
+        left = self._source_atom()
+        while self.at_keyword("and") or self.at_op("&"):
+            self.advance()
+            left = BinarySource("and", left, self._source_atom())
+        return left
+
+    def _source_atom(self) -> Source:
+        token = self.current
+        if token.kind == "op" and token.value in ("-", "!"):
+            self.advance()
+            return NegatedSource(self._source_atom())
+        if token.kind == "op" and token.value == "(":
+            self.advance()
+            inner = self.source()
+            self.expect_op(")")
+            return inner
+        if token.kind == "tag":
+            self.advance()
+            return TagSource(token.value)
+        if token.kind == "string":
+            self.advance()
+            return FolderSource(_unquote(token.value))
+        if token.kind == "link":
+            self.advance()
+            return LinkSource(token.value[2:-2].split("|")[0])
+        if token.kind == "ident" and token.value.lower() == "outgoing":
+            self.advance()
+            self.expect_op("(")
+            link = self.advance()
+            if link.kind != "link":
+                raise DqlSyntaxError(f"Expected link in outgoing() at {link.start}")
+            self.expect_op(")")
+            return LinkSource(link.value[2:-2].split("|")[0], outgoing=True)
+        raise DqlSyntaxError(f"Unexpected token {token.value!r} in FROM at {token.start}")
+
+    # Query ------------------------------------------------------------------
+
+    def query(self) -> Query:
+        first = self.current
+        if not self.at_keyword("table"):
+            if first.kind == "ident" and first.value.lower() in ("list", "task", "calendar"):
+                raise UnsupportedDqlError("Only TABLE dataview queries are supported")
+            raise DqlSyntaxError("Query must start with TABLE")
+        self.advance()
+
+        without_id = False
+        if self.at_keyword("without"):
+            self.advance()
+            self.expect_keyword("id")
+            without_id = True
+
+        fields: list[QueryField] = []
+        if not self.at_keyword(*_COMMAND_KEYWORDS) and self.current.kind != "eof":
+            fields.append(self._field())
+            while self.at_op(","):
+                self.advance()
+                fields.append(self._field())
+        header = self.text[first.start : self.tokens[self.position - 1].end]
+
+        query = Query(text=self.text, header=header, fields=fields, without_id=without_id)
+
+        if self.at_keyword("from"):
+            self.advance()
+            start = self.current.start
+            query.source = self.source()
+            query.source_text = self.text[start : self.tokens[self.position - 1].end]
+
+        while self.current.kind != "eof":
+            query.commands.append(self._command())
+        return query
+
+    def _field(self) -> QueryField:
+        start = self.current.start
+        expression = self.expression()
+        name = self.text[start : self.tokens[self.position - 1].end].strip()
+        if self.at_keyword("as"):
+            self.advance()
+            alias = self.advance()
+            if alias.kind == "string":
+                name = _unquote(alias.value)
+            elif alias.kind == "ident":
+                name = alias.value
+            else:
+                raise DqlSyntaxError(f"Expected alias at {alias.start}")
+        return QueryField(expression, name)
+
+    def _command(self) -> Command:
+        start_token = self.current
+        if self.at_keyword("where"):
+            self.advance()
+            expression = self.expression()
+            return WhereCommand(expression, self._span(start_token))
+        if self.at_keyword("sort"):
+            self.advance()
+            keys = [self._sort_key()]
+            while self.at_op(","):
+                self.advance()
+                keys.append(self._sort_key())
+            return SortCommand(
+                tuple((expression, descending) for expression, descending, _ in keys),
+                self._span(start_token),
+                tuple(text for _, _, text in keys),
+            )
+        if self.at_keyword("limit"):
+            self.advance()
+            token = self.advance()
+            if token.kind != "number" or "." in token.value:
+                raise DqlSyntaxError(f"LIMIT expects an integer at {token.start}")
+            return LimitCommand(int(token.value), self._span(start_token))
+        if self.at_keyword("group"):
+            self.advance()
+            self.expect_keyword("by")
+            expression = self.expression()
+            self._skip_alias()
+            return GroupByCommand(expression, self._span(start_token))
+        if self.at_keyword("flatten"):
+            self.advance()
+            expression = self.expression()
+            self._skip_alias()
+            return FlattenCommand(expression, self._span(start_token))
+        raise DqlSyntaxError(f"Unexpected token {start_token.value!r} at {start_token.start}")
+
+    def _sort_key(self) -> tuple[Expr, bool, str]:
+        start = self.current.start
+        expression = self.expression()
+        text = self.text[start : self.tokens[self.position - 1].end]
+        descending = False
+        if self.at_keyword("asc", "ascending"):
+            self.advance()
+        elif self.at_keyword("desc", "descending"):
+            self.advance()
+            descending = True
+        return expression, descending, text
+
+    def _skip_alias(self) -> None:
+        if self.at_keyword("as"):
+            self.advance()
+            self.advance()
+
+    def _span(self, start_token: Token) -> str:
+        return self.text[start_token.start : self.tokens[self.position - 1].end]
+
+
+def _parse_expression(text: str) -> Expr:
+    parser = _Parser(text)
+    expr = parser.expression()
+    if parser.current.kind != "eof":
+        raise DqlSyntaxError(f"Unexpected token {parser.current.value!r} at {parser.current.start}")
+    return expr
+
+
+def parse_expression(text: str) -> Expr:
+    """Parse a standalone DQL expression, e.g. a WHERE condition.
+
+    Args:
+        text: Expression text
+
+    Returns:
+        Expression AST
+
+    Raises:
+        DqlSyntaxError: If the text is not a valid expression
+        UnsupportedDqlError: If the expression uses unsupported syntax
+    """
+    return _parse_expression(text)
+
+
+def parse_query(text: str) -> Query:
+    """Parse a DQL TABLE query.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Parsed Query
+
+    Raises:
+        DqlSyntaxError: If the text is not a valid query
+        UnsupportedDqlError: If the query is not a TABLE query or uses unsupported syntax
+
+    Examples:
+        >>> query = parse_query('TABLE file.name FROM #project WHERE file.size > 1000')
+        >>> [f.name for f in query.fields]
+        ['file.name']
+    """
+    return _Parser(text).query()
+
+
+# Words normalize_query() upper-cases; DQL keywords are case-insensitive
+_NORMALIZED_KEYWORDS = {
+    "table",
+    "without",
+    "id",
+    "as",
+    "from",
+    "where",
+    "sort",
+    "limit",
+    "group",
+    "by",
+    "flatten",
+    "asc",
+    "ascending",
+    "desc",
+    "descending",
+    "and",
+    "or",
+}
+_NORMALIZED_LITERALS = {"string", "number", "link"}
+
+
+def normalize_query(text: str, keep_literals: bool = False) -> str:
+    """Reduce a DQL query to its shape for grouping similar queries.
+
+    String, number and link literals become ``?``, keywords are upper-cased
+    and whitespace runs collapse to one space. Field names and tags are kept.
+    Text that cannot be tokenized is only whitespace-collapsed.
+
+    Args:
+        text: Query text
+        keep_literals: Keep literals as written, giving a canonical form of
+            this exact query rather than of its shape
+
+    Returns:
+        Normalized query text
+
+    Examples:
+        >>> normalize_query('table file.name  from "daily" where file.size > 1000')
+        'TABLE file.name FROM ? WHERE file.size > ?'
+        >>> normalize_query('table file.name  from "daily"', keep_literals=True)
+        'TABLE file.name FROM "daily"'
+    """
+    try:
+        tokens = _tokenize(text)
+    except DqlSyntaxError:
+        return " ".join(text.split())
+    parts: list[str] = []
+    previous_end: int | None = None
+    for token in tokens[:-1]:
+        if previous_end is not None and token.start > previous_end:
+            parts.append(" ")
+        if token.kind in _NORMALIZED_LITERALS and not keep_literals:
+            parts.append("?")
+        elif token.kind == "ident" and token.value.lower() in _NORMALIZED_KEYWORDS:
+            parts.append(token.value.upper())
+        else:
+            parts.append(token.value)
+        previous_end = token.end
+    return "".join(parts)
@@ -0,0 +1,1176 @@
+"""Local evaluator for a subset of DQL TABLE queries.
+
+Evaluates TABLE queries against the metadata snapshot: the ``file.*`` fields
+the snapshot mirrors, frontmatter fields, FROM tags and folders, WHERE, SORT
+and LIMIT, and the common Dataview functions. Value ordering, truthiness,
+arithmetic and function vectorization follow Dataview so rows match what the
+plugin returns.
+
+Anything outside the subset raises UnsupportedDqlError, either when the query
+is compiled or while it is evaluated (a link value, an ambiguous LIMIT, an
+expression Dataview would reject), and callers run the query on the server
+instead. Inline fields (``key:: value``) are not part of the snapshot, so bare
+field names resolve to frontmatter only.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import re
+import unicodedata
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+from obsidian_search_tool.core.dql import (
+    BinarySource,
+    Call,
+    Expr,
+    FlattenCommand,
+    FolderSource,
+    GroupByCommand,
+    Index,
+    LimitCommand,
+    LinkLiteral,
+    Literal,
+    Member,
+    NegatedSource,
+    Query,
+    RawLiteral,
+    SortCommand,
+    Source,
+    TagSource,
+    Unary,
+    UnsupportedDqlError,
+    Variable,
+    WhereCommand,
+)
+from obsidian_search_tool.core.dql_values import (
+    Duration,
+    add_duration,
+    format_date,
+    parse_date,
+    parse_duration,
+    parse_iso_date,
+    to_epoch_ms,
+)
+from obsidian_search_tool.core.metadata import MetadataSnapshot, NoteMetadata
+
+# --- Values --------------------------------------------------------------------
+
+
+class _DerivedDuration(Duration):
+    """Duration produced by arithmetic.
+
+    Dataview normalizes these across units before serializing them, which is
+    not reproduced here; they may be compared but not returned in a column.
+    """
+
+
+def _derived(duration: Duration) -> Duration:
+    return _DerivedDuration(*duration._values())
+
+
+_LINK_VALUE = re.compile(r"!?\[\[.*\]\]")
+_DATE_PREFIX = re.compile(r"\d{4}-\d{2}")
+_DATE_VALUE = re.compile(
+    r"\d{4}-\d{2}(-\d{2}(T\d{2}(:\d{2}(:\d{2}(\.\d{1,3})?)?)?(Z|[+-]\d{2}(:?\d{2})?)?)?)?"
+)
+
+
+def _parse_field_value(value: Any) -> Any:
+    """Convert a raw frontmatter value as Dataview does for page fields."""
+    if isinstance(value, str):
+        if _LINK_VALUE.fullmatch(value.strip()):
+            raise UnsupportedDqlError("Link values are not supported by the local evaluator")
+        if _DATE_PREFIX.match(value):
+            parsed = parse_iso_date(value) if _DATE_VALUE.fullmatch(value) else None
+            if parsed is None:
+                raise UnsupportedDqlError(f"Cannot interpret date-like value {value!r}")
+            return parsed
+        duration = parse_duration(value)
+        return duration if duration is not None else value
+    if isinstance(value, list):
+        return [_parse_field_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _parse_field_value(item) for key, item in value.items()}
+    return value
+
+
+def _canonical_name(name: str) -> str:
+    """Dataview's canonical field name: "Due Date" is also reachable as due-date."""
+    return re.sub(r"\s+", "-", re.sub(r"[^\w\s-]", "", name).strip()).lower()
+
+
+def _frontmatter_field(note: NoteMetadata, name: str) -> Any:
+    frontmatter = note.frontmatter
+    if name in frontmatter:
+        return _parse_field_value(frontmatter[name])
+    for key, value in frontmatter.items():
+        if _canonical_name(key) == name:
+            return _parse_field_value(value)
+    return None
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    local = moment.astimezone()
+    if local.utcoffset() != moment.utcoffset():
+        # Fixed-offset date: keep its offset, as Luxon keeps the zone
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    return midnight.astimezone()
+
+
+def type_name(value: Any) -> str:
+    """Return the Dataview type name of a value (as typeof()).
+
+    Args:
+        value: Evaluated value
+
+    Returns:
+        "null", "boolean", "number", "string", "array", "object", "date" or "duration"
+
+    Raises:
+        UnsupportedDqlError: For values the local evaluator does not model
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int | float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, Duration):
+        return "duration"
+    raise UnsupportedDqlError(f"Unsupported value type: {type(value).__name__}")
+
+
+def is_truthy(value: Any) -> bool:
+    """Dataview truthiness.
+
+    Args:
+        value: Evaluated value
+
+    Returns:
+        False for null, 0, "", empty lists and objects, zero dates and durations
+    """
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int | float | str | list | dict):
+        return bool(value)
+    if isinstance(value, datetime):
+        return to_epoch_ms(value) != 0
+    if isinstance(value, Duration):
+        return value.to_milliseconds() != 0
+    return True
+
+
+def _char_class(char: str) -> int:
+    if char.isspace():
+        return 0
+    if char.isdigit():
+        return 2
+    if char.isalpha():
+        return 3
+    return 1
+
+
+@functools.lru_cache(maxsize=8192)
+def _collation_key(text: str) -> tuple[Any, ...]:
+    # Approximates String.prototype.localeCompare (ICU root collation):
+    # whitespace < punctuation < digits < letters, then accents, then case
+    # with lowercase first.
+    decomposed = unicodedata.normalize("NFD", text)
+    base = "".join(char for char in decomposed if not unicodedata.combining(char))
+    primary = tuple((_char_class(char), char.casefold()) for char in base)
+    return primary, decomposed.casefold(), tuple(char.isupper() for char in base), text
+
+
+def _compare_strings(left: str, right: str) -> int:
+    if left == right:
+        return 0
+    return -1 if _collation_key(left) < _collation_key(right) else 1
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def compare_values(left: Any, right: Any) -> int:
+    """Order two values as Dataview's compareValue() does.
+
+    Null sorts first, values of different types order by type name, strings
+    use locale-aware comparison and dates compare by instant and zone.
+
+    Args:
+        left: First value
+        right: Second value
+
+    Returns:
+        Negative, zero or positive
+    """
+    if left is None and right is None:
+        return 0
+    if left is None:
+        return -1
+    if right is None:
+        return 1
+    left_type = type_name(left)
+    right_type = type_name(right)
+    if left_type != right_type:
+        return -1 if left_type < right_type else 1
+    if left_type == "string":
+        return _compare_strings(left, right)
+    if left_type in ("number", "boolean"):
+        return _sign(left - right)
+    if left_type == "date":
+        left_ms, right_ms = to_epoch_ms(left), to_epoch_ms(right)
+        if left_ms < right_ms:
+            return -1
+        # Luxon's equals() also requires the same zone
+        return 0 if left_ms == right_ms and left.utcoffset() == right.utcoffset() else 1
+    if left_type == "duration":
+        if left._values() == right._values():
+            return 0
+        return -1 if left.to_milliseconds() < right.to_milliseconds() else 1
+    if left_type == "array":
+        for left_item, right_item in zip(left, right, strict=False):
+            result = compare_values(left_item, right_item)
+            if result:
+                return result
+        return _sign(len(left) - len(right))
+    left_keys, right_keys = sorted(left), sorted(right)
+    result = compare_values(left_keys, right_keys)
+    if result:
+        return result
+    for key in left_keys:
+        result = compare_values(left[key], right[key])
+        if result:
+            return result
+    return 0
+
+
+def _number(value: float) -> float:
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2**53:
+        return int(value)
+    return value
+
+
+def _js_string(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int | float):
+        number = _number(value)
+        text = str(number) if isinstance(number, int) else repr(number)
+        if "e" in text or "n" in text:
+            raise UnsupportedDqlError(f"Cannot render number {value!r} as JavaScript does")
+        return text
+    raise UnsupportedDqlError(f"Cannot convert {type_name(value)} to text locally")
+
+
+def to_json(value: Any) -> Any:
+    """Serialize an evaluated value as the plugin does over the REST API.
+
+    Args:
+        value: Evaluated value
+
+    Returns:
+        JSON-compatible value (dates and durations as ISO strings)
+
+    Raises:
+        UnsupportedDqlError: For values whose serialization is not reproduced
+    """
+    if value is None or isinstance(value, bool | str):
+        return value
+    if isinstance(value, int | float):
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return _number(value)
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, datetime):
+        return format_date(value)
+    if isinstance(value, _DerivedDuration):
+        raise UnsupportedDqlError("Computed durations are not serialized locally")
+    if isinstance(value, Duration):
+        return value.to_iso()
+    raise UnsupportedDqlError(f"Cannot serialize {type(value).__name__}")
+
+
+# --- Operators -----------------------------------------------------------------
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _arithmetic(op: str, left: Any, right: Any) -> Any:
+    if _is_number(left) and _is_number(right):
+        if op == "+":
+            return left + right
+        if op == "-":
+            return left - right
+        if op == "*":
+            return left * right
+        if right == 0:
+            raise UnsupportedDqlError("Division by zero")
+        return left / right if op == "/" else math.fmod(left, right)
+    if op == "+" and (isinstance(left, str) or isinstance(right, str)):
+        return _js_string(left) + _js_string(right)
+    if op == "*" and isinstance(left, str) and _is_number(right):
+        return left * max(int(right), 0)
+    if op == "*" and _is_number(left) and isinstance(right, str):
+        return right * max(int(left), 0)
+    if isinstance(left, datetime) and isinstance(right, Duration) and op in ("+", "-"):
+        return add_duration(left, right if op == "+" else -right)
+    if isinstance(left, Duration) and isinstance(right, datetime) and op == "+":
+        return add_duration(right, left)
+    if isinstance(left, datetime) and isinstance(right, datetime) and op == "-":
+        return _DerivedDuration(milliseconds=to_epoch_ms(left) - to_epoch_ms(right))
+    if isinstance(left, Duration) and isinstance(right, Duration) and op in ("+", "-"):
+        return _derived(left + right if op == "+" else left - right)
+    if isinstance(left, Duration) and _is_number(right) and op in ("*", "/"):
+        if op == "/" and right == 0:
+            raise UnsupportedDqlError("Division by zero")
+        factor = right if op == "*" else 1 / right
+        return _derived(Duration(*(value * factor for value in left._values())))
+    if _is_number(left) and isinstance(right, Duration) and op == "*":
+        return _derived(Duration(*(value * left for value in right._values())))
+    raise UnsupportedDqlError(
+        f"Operator {op!r} is not supported for {type_name(left)} and {type_name(right)}"
+    )
+
+
+def _binary(op: str, left: Any, right: Any) -> Any:
+    if op == "and":
+        return is_truthy(left) and is_truthy(right)
+    if op == "or":
+        return is_truthy(left) or is_truthy(right)
+    if op == "=":
+        return compare_values(left, right) == 0
+    if op == "!=":
+        return compare_values(left, right) != 0
+    if op == "<":
+        return compare_values(left, right) < 0
+    if op == "<=":
+        return compare_values(left, right) <= 0
+    if op == ">":
+        return compare_values(left, right) > 0
+    if op == ">=":
+        return compare_values(left, right) >= 0
+    return _arithmetic(op, left, right)
+
+
+def _unary(op: str, value: Any) -> Any:
+    if op == "!":
+        return not is_truthy(value)
+    if _is_number(value):
+        return -value
+    if isinstance(value, Duration):
+        return _derived(-value)
+    raise UnsupportedDqlError(f"Cannot negate {type_name(value)}")
+
+
+_DATE_PARTS: dict[str, Callable[[datetime], int]] = {
+    "year": lambda moment: moment.year,
+    "month": lambda moment: moment.month,
+    "day": lambda moment: moment.day,
+    "hour": lambda moment: moment.hour,
+    "minute": lambda moment: moment.minute,
+    "second": lambda moment: moment.second,
+    "millisecond": lambda moment: moment.microsecond // 1000,
+    "weekday": lambda moment: moment.isoweekday(),
+    "week": lambda moment: moment.isocalendar()[1],
+    "weekyear": lambda moment: moment.isocalendar()[0],
+}
+
+_DURATION_PARTS = {
+    "years",
+    "months",
+    "weeks",
+    "days",
+    "hours",
+    "minutes",
+    "seconds",
+    "milliseconds",
+}
+
+
+def _member(value: Any, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(name)
+    if isinstance(value, datetime) and name in _DATE_PARTS:
+        return _DATE_PARTS[name](value)
+    if isinstance(value, Duration) and name in _DURATION_PARTS:
+        return getattr(value, name)
+    raise UnsupportedDqlError(f"Field access .{name} on {type_name(value)} is not supported")
+
+
+def _index(value: Any, key: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(key, str):
+        return _member(value, key)
+    if isinstance(value, list) and _is_number(key) and float(key).is_integer():
+        position = int(key)
+        return value[position] if 0 <= position < len(value) else None
+    raise UnsupportedDqlError(f"Cannot index {type_name(value)} with {type_name(key)}")
+
+
+# --- Functions -----------------------------------------------------------------
+
+
+def _vectorized(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Apply function to each element when the first argument is a list."""
+
+    @functools.wraps(function)
+    def wrapper(first: Any, *rest: Any) -> Any:
+        if isinstance(first, list):
+            return [wrapper(item, *rest) for item in first]
+        return function(first, *rest)
+
+    return wrapper
+
+
+def _require(value: Any, kind: type | tuple[type, ...], function: str) -> Any:
+    if not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+        raise UnsupportedDqlError(f"{function}() does not accept {type_name(value)}")
+    return value
+
+
+def _contains(haystack: Any, needle: Any, fold: bool = False) -> Any:
+    if isinstance(needle, list):
+        return [_contains(haystack, item, fold) for item in needle]
+    if isinstance(haystack, list):
+        return any(_contains(item, needle, fold) for item in haystack)
+    if isinstance(haystack, str) and isinstance(needle, str):
+        return needle.lower() in haystack.lower() if fold else needle in haystack
+    if isinstance(haystack, dict) and isinstance(needle, str):
+        if fold:
+            return needle.lower() in {key.lower() for key in haystack}
+        return needle in haystack
+    if fold:
+        raise UnsupportedDqlError("icontains() is only supported on text, lists and objects")
+    return compare_values(haystack, needle) == 0
+
+
+def _fn_contains(haystack: Any, needle: Any) -> Any:
+    return _contains(haystack, needle)
+
+
+def _fn_icontains(haystack: Any, needle: Any) -> Any:
+    return _contains(haystack, needle, fold=True)
+
+
+def _fn_econtains(haystack: Any, needle: Any) -> bool:
+    if isinstance(haystack, list):
+        return any(compare_values(item, needle) == 0 for item in haystack)
+    if isinstance(haystack, str) and isinstance(needle, str):
+        return needle in haystack
+    if isinstance(haystack, dict) and isinstance(needle, str):
+        return needle in haystack
+    raise UnsupportedDqlError(f"econtains() does not accept {type_name(haystack)}")
+
+
+@_vectorized
+def _fn_containsword(text: Any, word: Any) -> bool:
+    _require(text, str, "containsword")
+    _require(word, str, "containsword")
+    pattern = rf"(?<!\w){re.escape(word)}(?!\w)"
+    return re.search(pattern, text, re.IGNORECASE | re.ASCII) is not None
+
+
+@_vectorized
+def _fn_startswith(text: Any, prefix: Any) -> bool:
+    return bool(_require(text, str, "startswith").startswith(_require(prefix, str, "startswith")))
+
+
+@_vectorized
+def _fn_endswith(text: Any, suffix: Any) -> bool:
+    return bool(_require(text, str, "endswith").endswith(_require(suffix, str, "endswith")))
+
+
+@_vectorized
+def _fn_lower(text: Any) -> str:
+    return str(_require(text, str, "lower").lower())
+
+
+@_vectorized
+def _fn_upper(text: Any) -> str:
+    return str(_require(text, str, "upper").upper())
+
+
+def _fn_length(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        # JavaScript counts UTF-16 code units
+        return len(value.encode("utf-16-le")) // 2
+    return len(_require(value, (list, dict), "length"))
+
+
+def _fn_default(value: Any, fallback: Any) -> Any:
+    if isinstance(fallback, list):
+        raise UnsupportedDqlError("default() with a list fallback is not supported")
+    if isinstance(value, list):
+        return [fallback if item is None else item for item in value]
+    return fallback if value is None else value
+
+
+def _fn_ldefault(value: Any, fallback: Any) -> Any:
+    return fallback if value is None else value
+
+
+def _fn_choice(condition: Any, left: Any, right: Any) -> Any:
+    return left if is_truthy(condition) else right
+
+
+def _fn_date(value: Any) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    return parse_date(_require(value, str, "date"))
+
+
+def _fn_dur(value: Any) -> Duration | None:
+    if value is None or isinstance(value, Duration):
+        return value
+    return parse_duration(_require(value, str, "dur"))
+
+
+@_vectorized
+def _fn_number(value: Any) -> float | None:
+    if _is_number(value):
+        return float(value)
+    match = re.search(r"-?[0-9]+(\.[0-9]+)?", _require(value, str, "number"))
+    return float(match.group()) if match else None
+
+
+@_vectorized
+def _fn_string(value: Any) -> str:
+    return _js_string(value)
+
+
+def _round_half_up(value: float) -> float:
+    # Math.round: halves round towards positive infinity
+    floor = math.floor(value)
+    return floor + 1 if value - floor >= 0.5 else floor
+
+
+@_vectorized
+def _fn_round(value: Any, digits: Any = None) -> float:
+    number = _require(value, (int, float), "round")
+    if digits is None or _require(digits, (int, float), "round") <= 0:
+        return _round_half_up(number)
+    # Number.prototype.toFixed rounds the exact binary value half away from zero
+    quantum = Decimal(1).scaleb(-int(digits))
+    return float(Decimal(number).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+@_vectorized
+def _fn_trunc(value: Any) -> int:
+    return int(math.trunc(_require(value, (int, float), "trunc")))
+
+
+@_vectorized
+def _fn_floor(value: Any) -> int:
+    return int(math.floor(_require(value, (int, float), "floor")))
+
+
+@_vectorized
+def _fn_ceil(value: Any) -> int:
+    return int(math.ceil(_require(value, (int, float), "ceil")))
+
+
+def _spread(args: tuple[Any, ...]) -> list[Any]:
+    return list(args[0]) if len(args) == 1 and isinstance(args[0], list) else list(args)
+
+
+def _fn_min(*args: Any) -> Any:
+    values = _spread(args)
+    if not values:
+        return None
+    return min(values, key=functools.cmp_to_key(compare_values))
+
+
+def _fn_max(*args: Any) -> Any:
+    values = _spread(args)
+    if not values:
+        return None
+    return max(values, key=functools.cmp_to_key(compare_values))
+
+
+def _numbers(values: Any, function: str) -> list[float]:
+    return [_require(value, (int, float), function) for value in _require(values, list, function)]
+
+
+def _fn_sum(values: Any) -> float | None:
+    numbers = _numbers(values, "sum")
+    return sum(numbers) if numbers else None
+
+
+def _fn_product(values: Any) -> float | None:
+    numbers = _numbers(values, "product")
+    return math.prod(numbers) if numbers else None
+
+
+def _fn_average(values: Any) -> float | None:
+    numbers = _numbers(values, "average")
+    return sum(numbers) / len(numbers) if numbers else None
+
+
+def _fn_nonnull(values: Any) -> list[Any]:
+    return [value for value in _require(values, list, "nonnull") if value is not None]
+
+
+def _fn_firstvalue(values: Any) -> Any:
+    return next(
+        (value for value in _require(values, list, "firstvalue") if value is not None), None
+    )
+
+
+def _fn_all(*args: Any) -> bool:
+    return all(is_truthy(value) for value in _spread(args))
+
+
+def _fn_any(*args: Any) -> bool:
+    return any(is_truthy(value) for value in _spread(args))
+
+
+def _fn_none(values: Any) -> bool:
+    return not any(is_truthy(value) for value in _require(values, list, "none"))
+
+
+def _fn_join(values: Any, delimiter: Any = ", ") -> str:
+    separator = _require(delimiter, str, "join")
+    if isinstance(values, list):
+        return str(separator.join(_js_string(value) for value in values))
+    return _js_string(values)
+
+
+def _fn_unique(values: Any) -> list[Any]:
+    unique: list[Any] = []
+    for value in _require(values, list, "unique"):
+        if not any(compare_values(value, seen) == 0 for seen in unique):
+            unique.append(value)
+    return unique
+
+
+def _fn_reverse(values: Any) -> list[Any]:
+    return list(reversed(_require(values, list, "reverse")))
+
+
+def _fn_sort(values: Any) -> list[Any]:
+    return sorted(_require(values, list, "sort"), key=functools.cmp_to_key(compare_values))
+
+
+def _fn_flat(values: Any, depth: Any = 1) -> list[Any]:
+    flattened: list[Any] = []
+    for value in _require(values, list, "flat"):
+        if isinstance(value, list) and depth >= 1:
+            flattened.extend(_fn_flat(value, depth - 1))
+        else:
+            flattened.append(value)
+    return flattened
+
+
+def _fn_slice(values: Any, start: Any = None, end: Any = None) -> list[Any]:
+    items = _require(values, list, "slice")
+    return list(
+        items[int(start) if start is not None else None : int(end) if end is not None else None]
+    )
+
+
+def _fn_list(*args: Any) -> list[Any]:
+    return list(args)
+
+
+def _fn_object(*args: Any) -> dict[str, Any]:
+    if len(args) % 2:
+        raise UnsupportedDqlError("object() expects key/value pairs")
+    return {
+        _require(key, str, "object"): value
+        for key, value in zip(args[::2], args[1::2], strict=True)
+    }
+
+
+@_vectorized
+def _fn_replace(text: Any, pattern: Any, replacement: Any) -> str:
+    return str(
+        _require(text, str, "replace").replace(
+            _require(pattern, str, "replace"), _require(replacement, str, "replace")
+        )
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _js_regex(pattern: str) -> re.Pattern[str]:
+    # JavaScript named groups use (?<name>...); \w, \d and \b are ASCII-only
+    return re.compile(re.sub(r"\(\?<(?![=!])", "(?P<", pattern), re.ASCII)
+
+
+def _js_replacement(replacement: str) -> str:
+    parts: list[str] = []
+    position = 0
+    while position < len(replacement):
+        char = replacement[position]
+        following = replacement[position + 1 : position + 2]
+        if char == "\\":
+            parts.append("\\\\")
+        elif char == "$" and following == "$":
+            parts.append("$")
+            position += 1
+        elif char == "$" and following == "&":
+            parts.append(r"\g<0>")
+            position += 1
+        elif char == "$" and following.isdigit():
+            digits = re.match(r"\d{1,2}", replacement[position + 1 :])
+            assert digits is not None
+            parts.append(rf"\g<{int(digits.group())}>")
+            position += len(digits.group())
+        else:
+            parts.append(char)
+        position += 1
+    return "".join(parts)
+
+
+def _fn_regextest(pattern: Any, text: Any) -> bool:
+    regex = _js_regex(_require(pattern, str, "regextest"))
+    return regex.search(_require(text, str, "regextest")) is not None
+
+
+def _fn_regexmatch(pattern: Any, text: Any) -> bool:
+    regex = _js_regex(f"^(?:{_require(pattern, str, 'regexmatch')})$")
+    return regex.search(_require(text, str, "regexmatch")) is not None
+
+
+@_vectorized
+def _fn_regexreplace(text: Any, pattern: Any, replacement: Any) -> str:
+    regex = _js_regex(_require(pattern, str, "regexreplace"))
+    template = _js_replacement(_require(replacement, str, "regexreplace"))
+    return regex.sub(template, _require(text, str, "regexreplace"))
+
+
+def _fn_split(text: Any, delimiter: Any, limit: Any = None) -> list[str]:
+    regex = _js_regex(_require(delimiter, str, "split"))
+    parts = ["" if part is None else part for part in regex.split(_require(text, str, "split"))]
+    return parts[: int(limit)] if limit is not None else parts
+
+
+@_vectorized
+def _fn_substring(text: Any, start: Any, end: Any = None) -> str:
+    value = _require(text, str, "substring")
+    length = len(value)
+    begin = min(max(int(start), 0), length)
+    stop = length if end is None else min(max(int(end), 0), length)
+    begin, stop = min(begin, stop), max(begin, stop)
+    return str(value[begin:stop])
+
+
+@_vectorized
+def _fn_truncate(text: Any, length: Any, suffix: Any = "...") -> str:
+    value = _require(text, str, "truncate")
+    ending = _require(suffix, str, "truncate")
+    limit = int(_require(length, (int, float), "truncate"))
+    if len(value) <= limit:
+        return str(value)
+    return f"{value[: max(limit - len(ending), 0)]}{ending}"
+
+
+def _padding(text: Any, length: Any, padding: Any, function: str) -> str:
+    value = _require(text, str, function)
+    fill = _require(padding, str, function)
+    missing = int(_require(length, (int, float), function)) - len(value)
+    if missing <= 0 or not fill:
+        return ""
+    return str((fill * (missing // len(fill) + 1))[:missing])
+
+
+@_vectorized
+def _fn_padleft(text: Any, length: Any, padding: Any = " ") -> str:
+    return _padding(text, length, padding, "padleft") + str(text)
+
+
+@_vectorized
+def _fn_padright(text: Any, length: Any, padding: Any = " ") -> str:
+    return str(text) + _padding(text, length, padding, "padright")
+
+
+@_vectorized
+def _fn_striptime(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    return _start_of_day(_require(value, datetime, "striptime"))
+
+
+def _fn_typeof(value: Any) -> str:
+    return type_name(value)
+
+
+# name -> (implementation, minimum arguments, maximum arguments or None)
+_FUNCTIONS: dict[str, tuple[Callable[..., Any], int, int | None]] = {
+    "contains": (_fn_contains, 2, 2),
+    "icontains": (_fn_icontains, 2, 2),
+    "econtains": (_fn_econtains, 2, 2),
+    "containsword": (_fn_containsword, 2, 2),
+    "startswith": (_fn_startswith, 2, 2),
+    "endswith": (_fn_endswith, 2, 2),
+    "lower": (_fn_lower, 1, 1),
+    "upper": (_fn_upper, 1, 1),
+    "length": (_fn_length, 1, 1),
+    "default": (_fn_default, 2, 2),
+    "ldefault": (_fn_ldefault, 2, 2),
+    "choice": (_fn_choice, 3, 3),
+    "date": (_fn_date, 1, 1),
+    "dur": (_fn_dur, 1, 1),
+    "number": (_fn_number, 1, 1),
+    "string": (_fn_string, 1, 1),
+    "round": (_fn_round, 1, 2),
+    "trunc": (_fn_trunc, 1, 1),
+    "floor": (_fn_floor, 1, 1),
+    "ceil": (_fn_ceil, 1, 1),
+    "min": (_fn_min, 1, None),
+    "max": (_fn_max, 1, None),
+    "sum": (_fn_sum, 1, 1),
+    "product": (_fn_product, 1, 1),
+    "average": (_fn_average, 1, 1),
+    "nonnull": (_fn_nonnull, 1, 1),
+    "firstvalue": (_fn_firstvalue, 1, 1),
+    "all": (_fn_all, 1, None),
+    "any": (_fn_any, 1, None),
+    "none": (_fn_none, 1, 1),
+    "join": (_fn_join, 1, 2),
+    "unique": (_fn_unique, 1, 1),
+    "reverse": (_fn_reverse, 1, 1),
+    "sort": (_fn_sort, 1, 1),
+    "flat": (_fn_flat, 1, 2),
+    "slice": (_fn_slice, 1, 3),
+    "list": (_fn_list, 0, None),
+    "array": (_fn_list, 0, None),
+    "object": (_fn_object, 0, None),
+    "replace": (_fn_replace, 3, 3),
+    "regextest": (_fn_regextest, 2, 2),
+    "regexmatch": (_fn_regexmatch, 2, 2),
+    "regexreplace": (_fn_regexreplace, 3, 3),
+    "split": (_fn_split, 2, 3),
+    "substring": (_fn_substring, 2, 3),
+    "truncate": (_fn_truncate, 2, 3),
+    "padleft": (_fn_padleft, 2, 3),
+    "padright": (_fn_padright, 2, 3),
+    "striptime": (_fn_striptime, 1, 1),
+    "typeof": (_fn_typeof, 1, 1),
+}
+
+SUPPORTED_FUNCTIONS = frozenset(_FUNCTIONS)
+
+
+# --- Compilation ---------------------------------------------------------------
+
+
+class _Page:
+    """A note being evaluated, with parsed timestamps cached."""
+
+    __slots__ = ("note", "_dates")
+
+    def __init__(self, note: NoteMetadata) -> None:
+        self.note = note
+        self._dates: dict[str, datetime | None] = {}
+
+    def date(self, attribute: str) -> datetime | None:
+        if attribute not in self._dates:
+            text = getattr(self.note, attribute)
+            self._dates[attribute] = parse_iso_date(text) if text else None
+        return self._dates[attribute]
+
+
+Evaluator = Callable[[_Page], Any]
+
+
+def _day_of(page: _Page, attribute: str) -> datetime | None:
+    moment = page.date(attribute)
+    return _start_of_day(moment) if moment is not None else None
+
+
+_FILE_FIELDS: dict[str, Evaluator] = {
+    "path": lambda page: page.note.path,
+    "name": lambda page: page.note.name,
+    "folder": lambda page: page.note.folder,
+    "ext": lambda page: page.note.ext,
+    "size": lambda page: page.note.size,
+    "ctime": lambda page: page.date("ctime"),
+    "mtime": lambda page: page.date("mtime"),
+    "day": lambda page: page.date("day"),
+    "cday": lambda page: _day_of(page, "ctime"),
+    "mday": lambda page: _day_of(page, "mtime"),
+    "tags": lambda page: page.note.tags,
+    "etags": lambda page: page.note.etags,
+    "aliases": lambda page: page.note.aliases,
+    "frontmatter": lambda page: page.note.frontmatter,
+}
+
+
+def _constant(value: Any) -> Evaluator:
+    return lambda page: value
+
+
+def _compile(expr: Expr, now: datetime) -> Evaluator:
+    if isinstance(expr, Literal):
+        return _constant(expr.value)
+    if isinstance(expr, LinkLiteral):
+        raise UnsupportedDqlError("Link literals are not supported by the local evaluator")
+    if isinstance(expr, RawLiteral):
+        raise UnsupportedDqlError(f"Unexpected unquoted literal {expr.text!r}")
+    if isinstance(expr, Variable):
+        name = expr.name
+        if name in ("file", "this"):
+            raise UnsupportedDqlError(
+                f"'{name}' as a value is not supported by the local evaluator"
+            )
+        return lambda page: _frontmatter_field(page.note, name)
+    if isinstance(expr, Member):
+        if isinstance(expr.target, Variable) and expr.target.name == "file":
+            getter = _FILE_FIELDS.get(expr.name)
+            if getter is None:
+                raise UnsupportedDqlError(f"file.{expr.name} is not in the metadata snapshot")
+            return getter
+        target = _compile(expr.target, now)
+        member = expr.name
+        return lambda page: _member(target(page), member)
+    if isinstance(expr, Index):
+        container = _compile(expr.target, now)
+        key = _compile(expr.index, now)
+        return lambda page: _index(container(page), key(page))
+    if isinstance(expr, Call):
+        return _compile_call(expr, now)
+    if isinstance(expr, Unary):
+        operand = _compile(expr.operand, now)
+        unary_op = expr.op
+        return lambda page: _unary(unary_op, operand(page))
+    left = _compile(expr.left, now)
+    right = _compile(expr.right, now)
+    binary_op = expr.op
+    return lambda page: _binary(binary_op, left(page), right(page))
+
+
+def _compile_call(expr: Call, now: datetime) -> Evaluator:
+    name = expr.name
+    if name in ("date", "dur") and len(expr.args) == 1 and isinstance(expr.args[0], RawLiteral):
+        text = expr.args[0].text
+        value = parse_date(text, now) if name == "date" else parse_duration(text)
+        if value is None:
+            raise UnsupportedDqlError(f"Cannot interpret {name}({text})")
+        return _constant(value)
+    spec = _FUNCTIONS.get(name)
+    if spec is None:
+        raise UnsupportedDqlError(f"Function {name}() is not supported by the local evaluator")
+    function, minimum, maximum = spec
+    if len(expr.args) < minimum or (maximum is not None and len(expr.args) > maximum):
+        raise UnsupportedDqlError(f"Unsupported number of arguments for {name}()")
+    args = [_compile(arg, now) for arg in expr.args]
+    return lambda page: function(*(arg(page) for arg in args))
+
+
+def _check_source(source: Source) -> None:
+    if isinstance(source, NegatedSource):
+        _check_source(source.source)
+    elif isinstance(source, BinarySource):
+        _check_source(source.left)
+        _check_source(source.right)
+    elif not isinstance(source, TagSource | FolderSource):
+        raise UnsupportedDqlError("Link sources are not supported by the local evaluator")
+
+
+def resolve_source(source: Source, snapshot: MetadataSnapshot) -> set[str] | None:
+    """Resolve a FROM source to note paths using the snapshot indexes.
+
+    Args:
+        source: Parsed FROM source
+        snapshot: Metadata snapshot
+
+    Returns:
+        Matching paths, or None if the source depends on links
+    """
+    if isinstance(source, TagSource):
+        return snapshot.paths_with_tag(source.tag)
+    if isinstance(source, FolderSource):
+        return snapshot.paths_in_folder(source.path)
+    if isinstance(source, NegatedSource):
+        inner = resolve_source(source.source, snapshot)
+        return None if inner is None else set(snapshot.by_path) - inner
+    if isinstance(source, BinarySource):
+        left = resolve_source(source.left, snapshot)
+        right = resolve_source(source.right, snapshot)
+        if left is None or right is None:
+            return None
+        return left & right if source.op == "and" else left | right
+    return None
+
+
+@dataclass
+class CompiledQuery:
+    """TABLE query compiled for local evaluation.
+
+    Attributes:
+        query: Parsed query
+        columns: (header, evaluator) per TABLE field
+        steps: Data commands as ("where", evaluator), ("sort", [(evaluator, descending)])
+            or ("limit", count), in source order
+    """
+
+    query: Query
+    columns: list[tuple[str, Evaluator]]
+    steps: list[tuple[str, Any]]
+
+
+def compile_query(query: Query, now: datetime | None = None) -> CompiledQuery:
+    """Compile a parsed TABLE query for local evaluation.
+
+    Args:
+        query: Parsed query
+        now: Reference time for date(today) and friends (default: now, local zone)
+
+    Returns:
+        CompiledQuery
+
+    Raises:
+        UnsupportedDqlError: If the query is outside the locally supported subset
+    """
+    if query.without_id:
+        raise UnsupportedDqlError("TABLE WITHOUT ID is not supported by the local evaluator")
+    if query.source is not None:
+        _check_source(query.source)
+    reference = now or datetime.now().astimezone()
+
+    columns = [(field.name, _compile(field.expression, reference)) for field in query.fields]
+    steps: list[tuple[str, Any]] = []
+    for command in query.commands:
+        if isinstance(command, WhereCommand):
+            steps.append(("where", _compile(command.expression, reference)))
+        elif isinstance(command, SortCommand):
+            keys = [(_compile(expr, reference), descending) for expr, descending in command.keys]
+            steps.append(("sort", keys))
+        elif isinstance(command, LimitCommand):
+            steps.append(("limit", command.count))
+        elif isinstance(command, GroupByCommand | FlattenCommand):
+            keyword = "GROUP BY" if isinstance(command, GroupByCommand) else "FLATTEN"
+            raise UnsupportedDqlError(f"{keyword} is not supported by the local evaluator")
+    return CompiledQuery(query, columns, steps)
+
+
+def _compare_rows(left: list[Any], right: list[Any], keys: list[tuple[Evaluator, bool]]) -> int:
+    for left_value, right_value, (_, descending) in zip(left, right, keys, strict=True):
+        result = compare_values(left_value, right_value)
+        if result:
+            return -result if descending else result
+    return 0
+
+
+def _sort_rows(rows: list[_Page], keys: list[tuple[Evaluator, bool]]) -> list[_Page]:
+    decorated = [([key(row) for key, _ in keys], row) for row in rows]
+
+    def compare(left: tuple[list[Any], _Page], right: tuple[list[Any], _Page]) -> int:
+        return _compare_rows(left[0], right[0], keys)
+
+    # list.sort is stable, like Dataview's sort
+    decorated.sort(key=functools.cmp_to_key(compare))
+    return [row for _, row in decorated]
+
+
+def _run(
+    compiled: CompiledQuery, notes: Iterable[NoteMetadata], page_order: bool
+) -> list[dict[str, Any]]:
+    rows = [_Page(note) for note in notes]
+    ordering: list[tuple[Evaluator, bool]] = []
+    for kind, argument in compiled.steps:
+        if kind == "where":
+            rows = [row for row in rows if is_truthy(argument(row))]
+        elif kind == "sort":
+            keys: list[tuple[Evaluator, bool]] = argument
+            rows = _sort_rows(rows, keys)
+            ordering = keys + ordering
+        elif kind == "limit" and len(rows) > argument:
+            if argument > 0 and not page_order:
+                if not ordering:
+                    raise UnsupportedDqlError("LIMIT without SORT depends on Dataview's page order")
+                last, first_dropped = rows[argument - 1], rows[argument]
+                last_keys = [key(last) for key, _ in ordering]
+                dropped_keys = [key(first_dropped) for key, _ in ordering]
+                if _compare_rows(last_keys, dropped_keys, ordering) == 0:
+                    raise UnsupportedDqlError("LIMIT splits rows that sort equal")
+            rows = rows[:argument]
+
+    return [
+        {
+            "filename": row.note.path,
+            "result": {header: to_json(column(row)) for header, column in compiled.columns},
+        }
+        for row in rows
+    ]
+
+
+def evaluate_query(
+    query: Query,
+    snapshot: MetadataSnapshot,
+    candidates: Iterable[str] | None = None,
+    now: datetime | None = None,
+    page_order: bool = False,
+) -> list[dict[str, Any]]:
+    """Evaluate a TABLE query against the metadata snapshot.
+
+    Rows have the shape the plugin returns: ``{"filename": path, "result":
+    {header: value}}``. Rows that sort equal, and all rows of a query without
+    SORT, keep snapshot order, which may differ from the order the plugin
+    lists them in.
+
+    Args:
+        query: Parsed TABLE query
+        snapshot: Metadata snapshot
+        candidates: Optional superset of matching paths from the planner's indexes
+        now: Reference time for date(today) and friends
+        page_order: The snapshot lists notes in Dataview's page order (as the
+            mock server's vault does), so LIMIT may cut rows without a SORT
+            or between rows that sort equal
+
+    Returns:
+        Result rows
+
+    Raises:
+        UnsupportedDqlError: If the query, or a value it meets, cannot be
+            evaluated locally with the same result as the server
+    """
+    compiled = compile_query(query, now)
+    allowed: set[str] | None = None
+    if query.source is not None:
+        allowed = resolve_source(query.source, snapshot)
+    if candidates is not None:
+        restriction = set(candidates)
+        allowed = restriction if allowed is None else allowed & restriction
+    notes = (
+        snapshot.notes
+        if allowed is None
+        else [note for note in snapshot.notes if note.path in allowed]
+    )
+    try:
+        return _run(compiled, notes, page_order)
+    except (ArithmeticError, TypeError, ValueError, re.error) as e:
+        raise UnsupportedDqlError(f"Local evaluation failed: {e}") from e
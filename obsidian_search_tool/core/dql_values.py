@@ -0,0 +1,298 @@
+"""Dataview date and duration values.
+
+Implements the subset of Luxon behaviour Dataview relies on for ``date()``
+and ``dur()``: relative date literals (today, sow, eom, ...), ISO date
+parsing, calendar-aware duration arithmetic and ISO serialization in the
+format Dataview emits over the REST API.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+_UNIT_ALIASES = {
+    "years": "years",
+    "year": "years",
+    "yrs": "years",
+    "yr": "years",
+    "y": "years",
+    "months": "months",
+    "month": "months",
+    "mo": "months",
+    "weeks": "weeks",
+    "week": "weeks",
+    "wks": "weeks",
+    "wk": "weeks",
+    "w": "weeks",
+    "days": "days",
+    "day": "days",
+    "d": "days",
+    "hours": "hours",
+    "hour": "hours",
+    "hrs": "hours",
+    "hr": "hours",
+    "h": "hours",
+    "minutes": "minutes",
+    "minute": "minutes",
+    "mins": "minutes",
+    "min": "minutes",
+    "m": "minutes",
+    "seconds": "seconds",
+    "second": "seconds",
+    "secs": "seconds",
+    "sec": "seconds",
+    "s": "seconds",
+    "milliseconds": "milliseconds",
+    "millisecond": "milliseconds",
+    "ms": "milliseconds",
+}
+
+_DURATION_PART = re.compile(r"(-?\d+(?:\.\d+)?)\s*([a-zA-Z]+)")
+
+
+@dataclass(frozen=True)
+class Duration:
+    """Calendar-aware duration, equivalent to a Luxon Duration."""
+
+    years: float = 0
+    months: float = 0
+    weeks: float = 0
+    days: float = 0
+    hours: float = 0
+    minutes: float = 0
+    seconds: float = 0
+    milliseconds: float = 0
+
+    def __neg__(self) -> Duration:
+        return Duration(*(-value for value in self._values()))
+
+    def __add__(self, other: Duration) -> Duration:
+        return Duration(*(a + b for a, b in zip(self._values(), other._values(), strict=True)))
+
+    def __sub__(self, other: Duration) -> Duration:
+        return self + (-other)
+
+    def _values(self) -> tuple[float, ...]:
+        return (
+            self.years,
+            self.months,
+            self.weeks,
+            self.days,
+            self.hours,
+            self.minutes,
+            self.seconds,
+            self.milliseconds,
+        )
+
+    def to_milliseconds(self) -> float:
+        """Approximate length in milliseconds (30-day months, 365-day years), as Luxon."""
+        days = self.years * 365 + self.months * 30 + self.weeks * 7 + self.days
+        seconds = days * 86400 + self.hours * 3600 + self.minutes * 60 + self.seconds
+        return seconds * 1000 + self.milliseconds
+
+    def to_iso(self) -> str:
+        """Serialize as ISO 8601, as Luxon's Duration.toJSON()."""
+        date_part = "".join(
+            f"{_format_number(value)}{unit}"
+            for value, unit in (
+                (self.years, "Y"),
+                (self.months, "M"),
+                (self.weeks, "W"),
+                (self.days, "D"),
+            )
+            if value
+        )
+        seconds = self.seconds + self.milliseconds / 1000
+        time_part = "".join(
+            f"{_format_number(value)}{unit}"
+            for value, unit in ((self.hours, "H"), (self.minutes, "M"), (seconds, "S"))
+            if value
+        )
+        if not date_part and not time_part:
+            return "PT0S"
+        return f"P{date_part}{'T' + time_part if time_part else ''}"
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def parse_duration(text: str) -> Duration | None:
+    """Parse a Dataview duration such as "7 days" or "1h 30m".
+
+    Args:
+        text: Duration text
+
+    Returns:
+        Duration, or None if the text is not a duration
+    """
+    cleaned = text.strip().lower()
+    if not cleaned:
+        return None
+    parts: dict[str, float] = {}
+    position = 0
+    for match in _DURATION_PART.finditer(cleaned):
+        between = cleaned[position : match.start()]
+        if between.strip(" ,") and between.strip(" ,") != "and":
+            return None
+        unit = _UNIT_ALIASES.get(match.group(2))
+        if unit is None:
+            return None
+        parts[unit] = parts.get(unit, 0) + float(match.group(1))
+        position = match.end()
+    if not parts or cleaned[position:].strip(" ,"):
+        return None
+    return Duration(**{unit: _compact(value) for unit, value in parts.items()})
+
+
+def _compact(value: float) -> float:
+    return int(value) if value.is_integer() else value
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    month_index = moment.month - 1 + months
+    year = moment.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
+def add_duration(moment: datetime, duration: Duration) -> datetime:
+    """Add a duration to a date using calendar arithmetic for years and months.
+
+    Args:
+        moment: Date
+        duration: Duration to add
+
+    Returns:
+        Shifted date
+    """
+    whole_months = int(duration.years * 12 + duration.months)
+    shifted = _add_months(moment, whole_months) if whole_months else moment
+    return shifted + timedelta(
+        weeks=duration.weeks,
+        days=duration.days,
+        hours=duration.hours,
+        minutes=duration.minutes,
+        seconds=duration.seconds,
+        milliseconds=duration.milliseconds,
+    )
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _end_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=23, minute=59, second=59, microsecond=999000)
+
+
+def relative_date(literal: str, now: datetime | None = None) -> datetime | None:
+    """Resolve a Dataview relative date literal (today, now, sow, eoy, ...).
+
+    Args:
+        literal: Literal name
+        now: Reference time (default: current local time)
+
+    Returns:
+        Resolved date, or None if the literal is unknown
+    """
+    current = now or datetime.now().astimezone()
+    today = _start_of_day(current)
+    name = literal.strip().lower()
+    if name == "now":
+        return current
+    if name == "today":
+        return today
+    if name == "yesterday":
+        return today - timedelta(days=1)
+    if name == "tomorrow":
+        return today + timedelta(days=1)
+    if name == "sow":
+        return today - timedelta(days=today.weekday())
+    if name == "eow":
+        return _end_of_day(today + timedelta(days=6 - today.weekday()))
+    if name == "som":
+        return today.replace(day=1)
+    if name == "eom":
+        last = calendar.monthrange(today.year, today.month)[1]
+        return _end_of_day(today.replace(day=last))
+    if name == "soy":
+        return today.replace(month=1, day=1)
+    if name == "eoy":
+        return _end_of_day(today.replace(month=12, day=31))
+    return None
+
+
+def parse_date(text: str, now: datetime | None = None) -> datetime | None:
+    """Parse a Dataview date: a relative literal or an ISO 8601 date/time.
+
+    Dates without a zone are interpreted in the local zone, as Dataview does.
+
+    Args:
+        text: Date text
+        now: Reference time for relative literals
+
+    Returns:
+        Timezone-aware datetime, or None if the text is not a date
+    """
+    relative = relative_date(text, now)
+    if relative is not None:
+        return relative
+    return parse_iso_date(text)
+
+
+def parse_iso_date(text: str) -> datetime | None:
+    """Parse an ISO 8601 date/time, as Dataview does for field values.
+
+    Unlike parse_date(), relative literals such as "today" are not dates here.
+
+    Args:
+        text: Date text
+
+    Returns:
+        Timezone-aware datetime, or None if the text is not an ISO date
+    """
+    cleaned = text.strip()
+    if not re.match(r"^\d{4}-\d{2}(-\d{2})?", cleaned):
+        return None
+    if re.fullmatch(r"\d{4}-\d{2}", cleaned):
+        cleaned = f"{cleaned}-01"
+    try:
+        parsed = datetime.fromisoformat(cleaned.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed
+
+
+def to_epoch_ms(moment: datetime) -> float:
+    """Convert a datetime to epoch milliseconds."""
+    return moment.timestamp() * 1000
+
+
+def format_date(moment: datetime) -> str:
+    """Serialize a date as Luxon's DateTime.toJSON() does.
+
+    Args:
+        moment: Timezone-aware datetime
+
+    Returns:
+        ISO 8601 string with milliseconds and offset, e.g. 2025-01-05T00:00:00.000+01:00
+    """
+    base = moment.strftime("%Y-%m-%dT%H:%M:%S")
+    offset = moment.strftime("%z") or "+0000"
+    return f"{base}.{moment.microsecond // 1000:03d}{offset[:3]}:{offset[3:]}"
+
+
+def is_date(value: Any) -> bool:
+    """Return True if value is a datetime."""
+    return isinstance(value, datetime)
@@ -0,0 +1,425 @@
+"""Bulk export of search results into SQLite.
+
+Rows are streamed from the API into a table in batches, so memory stays
+bounded by one page of results however many rows the query returns:
+
+1. With a page size, a DQL query is run as a series of keyset pages: each
+   page adds ``WHERE file.path > <last path>``, ``SORT file.path ASC`` and
+   ``LIMIT <page size>`` to the query. Without one, the query is run once.
+2. Column types are inferred from the first rows (INTEGER, REAL or TEXT);
+   lists and objects are stored as JSON text.
+3. Rows are inserted with ``executemany`` in batches, inside transactions
+   spanning many batches, with the database in WAL mode.
+4. Indexes are created once the rows are loaded, which is much cheaper than
+   maintaining them during the load.
+
+New and replaced tables are loaded under a staging name and renamed into
+place when the load completes, so a failed export leaves the database as it
+was. Appending inserts into the existing table directly; rows committed
+before a failure stay.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from obsidian_search_tool.core.dql import (
+    DqlError,
+    FlattenCommand,
+    GroupByCommand,
+    LimitCommand,
+    parse_query,
+)
+
+if TYPE_CHECKING:
+    from obsidian_search_tool.core.client import ObsidianClient
+
+logger = logging.getLogger(__name__)
+
+FAIL = "fail"
+REPLACE = "replace"
+APPEND = "append"
+IF_EXISTS = (FAIL, REPLACE, APPEND)
+
+DEFAULT_BATCH_SIZE = 5_000
+DEFAULT_TRANSACTION_ROWS = 100_000
+DEFAULT_SAMPLE_SIZE = 1_000
+
+FILENAME_COLUMN = "filename"
+RESULT_COLUMN = "result"
+_STAGING_PREFIX = "_staging_"
+
+
+class ExportError(Exception):
+    """Raised when an export cannot be planned or loaded."""
+
+
+@dataclass(frozen=True)
+class Column:
+    """A table column and where its values come from.
+
+    Attributes:
+        name: Column name in the table
+        key: Key in the row's result object (None: the filename, "": the whole result)
+        type: Declared SQLite type (INTEGER, REAL or TEXT)
+    """
+
+    name: str
+    key: str | None
+    type: str
+
+
+@dataclass
+class ExportResult:
+    """Outcome of an export.
+
+    Attributes:
+        database: Database file
+        table: Table the rows were written to
+        rows: Rows written
+        pages: Queries sent
+        columns: Table columns
+        indexes: Indexed columns
+        duration_ms: Wall time of the whole export
+    """
+
+    database: str
+    table: str
+    rows: int = 0
+    pages: int = 0
+    columns: list[Column] = field(default_factory=list)
+    indexes: list[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for JSON output."""
+        return {
+            "database": self.database,
+            "table": self.table,
+            "rows": self.rows,
+            "pages": self.pages,
+            "columns": [{"name": c.name, "type": c.type} for c in self.columns],
+            "indexes": self.indexes,
+            "duration_ms": self.duration_ms,
+        }
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table, column or index name for SQLite."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def page_query(query: str, page_size: int, after: str | None = None) -> str:
+    """Return the DQL query for one keyset page.
+
+    Args:
+        query: TABLE query without LIMIT, GROUP BY, FLATTEN or WITHOUT ID
+        page_size: Maximum rows per page
+        after: Path of the last row of the previous page (None: first page)
+
+    Returns:
+        DQL query string
+
+    Raises:
+        ExportError: If the query cannot be paginated
+    """
+    try:
+        parsed = parse_query(query)
+    except DqlError as e:
+        raise ExportError(f"Cannot paginate query: {e}") from e
+    if parsed.without_id or any(
+        isinstance(command, LimitCommand | GroupByCommand | FlattenCommand)
+        for command in parsed.commands
+    ):
+        raise ExportError(
+            "Queries with LIMIT, GROUP BY, FLATTEN or WITHOUT ID cannot be paginated; "
+            "export them without a page size"
+        )
+    commands = [command.text for command in parsed.commands]
+    if after is not None:
+        commands.append(f"WHERE file.path > {json.dumps(after)}")
+    commands.extend(["SORT file.path ASC", f"LIMIT {page_size}"])
+    return parsed.render(commands=commands)
+
+
+def _search(client: ObsidianClient, query: str, query_type: str) -> list[Any]:
+    """Run one export query and return its rows.
+
+    Raises:
+        ObsidianAPIError: If the query fails or returns incomplete results
+    """
+    from obsidian_search_tool.core.client import ObsidianAPIError
+
+    if query_type == "dataview":
+        response = client.search_dataview(query)
+    else:
+        response = client.search_jsonlogic(query)
+    if not response.success or response.incomplete:
+        error = response.error or {}
+        raise ObsidianAPIError(
+            f"Export query failed: {error.get('message', 'Unknown error')}",
+            int(error.get("status_code", 500)),
+            str(error.get("code", "API_ERROR")),
+        )
+    return response.results
+
+
+def iter_pages(
+    client: ObsidianClient,
+    query: str,
+    query_type: str = "dataview",
+    page_size: int | None = None,
+) -> Iterator[list[Any]]:
+    """Yield the rows of a query page by page.
+
+    Args:
+        client: Client to query with
+        query: DQL or JsonLogic query
+        query_type: "dataview" or "jsonlogic"
+        page_size: Rows per keyset page (None: one request for all rows)
+
+    Yields:
+        Lists of result rows
+
+    Raises:
+        ExportError: If the query cannot be paginated
+        ObsidianAPIError: If a query fails
+    """
+    if page_size is None:
+        yield _search(client, query, query_type)
+        return
+    if query_type != "dataview":
+        raise ExportError("Only Dataview queries can be paginated")
+    # Validate before the first request
+    page_query(query, page_size)
+    after = None
+    while True:
+        page = _search(client, page_query(query, page_size, after), query_type)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after = page[-1].get(FILENAME_COLUMN) if isinstance(page[-1], dict) else None
+        if not isinstance(after, str):
+            raise ExportError("Paginated rows must carry a filename")
+
+
+def _sqlite_type(values: Iterable[Any]) -> str:
+    """Return the narrowest SQLite type holding every non-null value."""
+    kind = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool | int):
+            kind = kind or "INTEGER"
+            continue
+        if isinstance(value, float):
+            kind = "REAL"
+            continue
+        return "TEXT"
+    return kind or "TEXT"
+
+
+def _cell(value: Any) -> Any:
+    """Convert a result value to something SQLite stores."""
+    if value is None or isinstance(value, str | int | float):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def infer_columns(sample: Sequence[Any]) -> list[Column]:
+    """Infer table columns and their types from sample rows.
+
+    Object results become one column per key, in first-seen order; other
+    results become a single result column. Columns without a non-null
+    value in the sample are declared TEXT.
+
+    Args:
+        sample: Result rows
+
+    Returns:
+        Columns, starting with the filename
+    """
+    keys: dict[str, None] = {}
+    objects = True
+    for row in sample:
+        result = row.get("result") if isinstance(row, dict) else row
+        if isinstance(result, dict):
+            keys.update(dict.fromkeys(result))
+        else:
+            objects = False
+    columns = [Column(FILENAME_COLUMN, None, "TEXT")]
+    if not objects or not keys:
+        values = (row.get("result") if isinstance(row, dict) else row for row in sample)
+        columns.append(Column(RESULT_COLUMN, "", _sqlite_type(_cell(v) for v in values)))
+        return columns
+    # SQLite compares identifiers case-insensitively
+    taken = {FILENAME_COLUMN}
+    for key in keys:
+        name, suffix = key, 2
+        while name.lower() in taken:
+            name, suffix = f"{key}_{suffix}", suffix + 1
+        taken.add(name.lower())
+        values = (
+            row["result"].get(key)
+            for row in sample
+            if isinstance(row, dict) and isinstance(row.get("result"), dict)
+        )
+        columns.append(Column(name, key, _sqlite_type(_cell(v) for v in values)))
+    return columns
+
+
+def _row_values(row: Any, columns: Sequence[Column]) -> tuple[Any, ...]:
+    if not isinstance(row, dict):
+        row = {"result": row}
+    result = row.get("result")
+    values = []
+    for column in columns:
+        if column.key is None:
+            values.append(row.get(FILENAME_COLUMN))
+        elif column.key == "":
+            values.append(_cell(result))
+        else:
+            values.append(_cell(result.get(column.key)) if isinstance(result, dict) else None)
+    return tuple(values)
+
+
+def _table_columns(connection: sqlite3.Connection, table: str) -> list[str]:
+    rows = connection.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+    return [str(row[1]) for row in rows]
+
+
+def export_sqlite(
+    client: ObsidianClient,
+    database: Path,
+    table: str,
+    query: str,
+    query_type: str = "dataview",
+    page_size: int | None = None,
+    if_exists: str = FAIL,
+    indexes: Sequence[str] = (FILENAME_COLUMN,),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    transaction_rows: int = DEFAULT_TRANSACTION_ROWS,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> ExportResult:
+    """Run a query and load its rows into a SQLite table.
+
+    Args:
+        client: Client to query with; give it no result cache (cache_ttl=0)
+        database: SQLite database file (created if missing)
+        table: Table name
+        query: DQL or JsonLogic query
+        query_type: "dataview" or "jsonlogic"
+        page_size: Rows per keyset page (None: one request for all rows)
+        if_exists: What to do when the table exists: fail, replace or append
+        indexes: Columns to index after the load
+        batch_size: Rows per executemany call
+        transaction_rows: Rows per transaction
+        sample_size: Rows used to infer column types
+
+    Returns:
+        ExportResult
+
+    Raises:
+        ExportError: If the table exists (with fail), or the query or columns do not fit
+        ObsidianAPIError: If a query fails
+    """
+    if if_exists not in IF_EXISTS:
+        raise ExportError(
+            f"Unknown if_exists '{if_exists}', expected one of: {', '.join(IF_EXISTS)}"
+        )
+    started = time.perf_counter()
+    result = ExportResult(str(database), table)
+    database.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode; transactions are issued explicitly below
+    connection = sqlite3.connect(database, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        existing = _table_columns(connection, table)
+        if existing and if_exists == FAIL:
+            raise ExportError(f"Table '{table}' already exists; replace or append to it")
+        append = bool(existing) and if_exists == APPEND
+
+        def counted(pages: Iterator[list[Any]]) -> Iterator[Any]:
+            for page in pages:
+                result.pages += 1
+                logger.debug("Export page %d: %d rows", result.pages, len(page))
+                yield from page
+
+        rows = counted(iter_pages(client, query, query_type, page_size))
+        sample = list(itertools.islice(rows, sample_size))
+        result.columns = infer_columns(sample)
+        names = [column.name for column in result.columns]
+        missing = [name for name in indexes if name not in names]
+        if missing:
+            raise ExportError(f"Cannot index unknown columns: {', '.join(missing)}")
+        if append:
+            known = {name.lower() for name in existing}
+            extra = [name for name in names if name.lower() not in known]
+            if extra:
+                raise ExportError(f"Table '{table}' has no columns: {', '.join(extra)}")
+
+        target = table if append else f"{_STAGING_PREFIX}{table}"
+        quoted = ", ".join(quote_identifier(name) for name in names)
+        if not append:
+            definitions = ", ".join(
+                f"{quote_identifier(column.name)} {column.type}" for column in result.columns
+            )
+            connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(target)}")
+            connection.execute(f"CREATE TABLE {quote_identifier(target)} ({definitions})")
+        insert = (
+            f"INSERT INTO {quote_identifier(target)} ({quoted}) "
+            f"VALUES ({', '.join('?' * len(names))})"
+        )
+
+        stream = itertools.chain(sample, rows)
+        pending = 0
+        connection.execute("BEGIN")
+        try:
+            while batch := [
+                _row_values(row, result.columns) for row in itertools.islice(stream, batch_size)
+            ]:
+                connection.executemany(insert, batch)
+                result.rows += len(batch)
+                pending += len(batch)
+                if pending >= transaction_rows:
+                    connection.execute("COMMIT")
+                    connection.execute("BEGIN")
+                    pending = 0
+            if not append:
+                if existing:
+                    connection.execute(f"DROP TABLE {quote_identifier(table)}")
+                connection.execute(
+                    f"ALTER TABLE {quote_identifier(target)} RENAME TO {quote_identifier(table)}"
+                )
+            for name in indexes:
+                index = quote_identifier(f"idx_{table}_{name}")
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} "
+                    f"ON {quote_identifier(table)} ({quote_identifier(name)})"
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            if not append:
+                connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(target)}")
+            raise
+        result.indexes = list(indexes)
+    finally:
+        connection.close()
+    result.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Exported %d rows in %d pages to %s:%s", result.rows, result.pages, database, table)
+    return result
@@ -0,0 +1,184 @@
+"""JsonLogic query fusion.
+
+Combines a batch of JsonLogic queries into one ``or`` request to ``/search/``.
+The fused rule returns, for every file matching any sub-query, the values of
+all variables the sub-queries read. Results are then split per original query
+by re-evaluating each sub-predicate locally, so N plugin scans become one.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from obsidian_search_tool.core.jsonlogic import (
+    UnsupportedJsonLogicError,
+    apply,
+    check_supported,
+    collect_vars,
+    is_truthy,
+)
+
+# Default projected for fields a note does not have, telling them apart from
+# fields whose value is null (a var default applies to the first, not the second)
+MISSING_FIELD = "\u0000missing"
+
+
+class FusionError(Exception):
+    """Raised when a fused response cannot be split back into sub-results."""
+
+    pass
+
+
+@dataclass
+class FusedBatch:
+    """A group of JsonLogic queries answered by a single request.
+
+    Attributes:
+        indexes: Positions of the fused queries in the original batch
+        rules: Parsed rules, aligned with indexes
+        fields: Variable paths fetched for local re-evaluation
+        query: Fused JsonLogic query string sent to the API
+    """
+
+    indexes: list[int]
+    rules: list[Any]
+    fields: list[str]
+    query: str
+
+
+def _minimal_paths(paths: set[str]) -> list[str]:
+    """Drop paths already covered by a shorter prefix path."""
+    result: list[str] = []
+    for path in sorted(paths):
+        if not any(path.startswith(f"{kept}.") for kept in result):
+            result.append(path)
+    return result
+
+
+def build_fused_query(rules: Sequence[Any], fields: Sequence[str]) -> str:
+    """Build the fused JsonLogic query string.
+
+    Matching files return an array with one value per field, MISSING_FIELD
+    for fields the file does not have. The array always holds ``filename``
+    first, so it is never empty (and therefore truthy).
+
+    Args:
+        rules: Parsed sub-query rules
+        fields: Variable paths to return, starting with "filename"
+
+    Returns:
+        JSON-encoded fused rule
+    """
+    projection = [{"var": [field, MISSING_FIELD]} for field in fields]
+    fused = {"if": [{"or": list(rules)}, projection, False]}
+    return json.dumps(fused, separators=(",", ":"), ensure_ascii=False)
+
+
+def plan_fusion(
+    queries: Sequence[str], max_batch_size: int = 100
+) -> tuple[list[FusedBatch], list[int]]:
+    """Group queries into fused batches.
+
+    Queries that are not valid JSON, use operations the local evaluator does
+    not support, or compute variable paths dynamically are left standalone.
+
+    Args:
+        queries: JsonLogic query strings
+        max_batch_size: Maximum number of sub-queries per fused request
+
+    Returns:
+        Tuple of (fused batches, indexes of queries to run individually)
+    """
+    fusable: list[tuple[int, Any, set[str]]] = []
+    standalone: list[int] = []
+
+    for index, query in enumerate(queries):
+        try:
+            rule = json.loads(query)
+            check_supported(rule)
+            paths = collect_vars(rule)
+        except ValueError, UnsupportedJsonLogicError:
+            standalone.append(index)
+            continue
+        if "" in paths:
+            # Rules reading the whole context would pull every note's content
+            standalone.append(index)
+            continue
+        fusable.append((index, rule, paths))
+
+    batches: list[FusedBatch] = []
+    batch_size = max(max_batch_size, 1)
+    for start in range(0, len(fusable), batch_size):
+        chunk = fusable[start : start + batch_size]
+        if len(chunk) < 2:
+            standalone.extend(index for index, _, _ in chunk)
+            continue
+        batch_paths: set[str] = set()
+        for _, _, rule_paths in chunk:
+            batch_paths |= rule_paths
+        batch_paths.discard("filename")
+        fields = ["filename", *_minimal_paths(batch_paths)]
+        rules = [rule for _, rule, _ in chunk]
+        batches.append(
+            FusedBatch(
+                indexes=[index for index, _, _ in chunk],
+                rules=rules,
+                fields=fields,
+                query=build_fused_query(rules, fields),
+            )
+        )
+
+    standalone.sort()
+    return batches, standalone
+
+
+def _build_context(fields: Sequence[str], values: Sequence[Any]) -> dict[str, Any]:
+    """Rebuild a nested note context from fetched field values.
+
+    Missing fields are left out so that ``var`` defaults apply as they would
+    on the server; null values are kept, since a default does not replace them.
+    """
+    context: dict[str, Any] = {}
+    for field, value in zip(fields, values, strict=True):
+        if value == MISSING_FIELD:
+            continue
+        parts = field.split(".")
+        target = context
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return context
+
+
+def split_fused_results(batch: FusedBatch, results: Any) -> list[list[dict[str, Any]]]:
+    """Split a fused response into one result list per sub-query.
+
+    Args:
+        batch: The fused batch that produced the response
+        results: Parsed ``/search/`` response for the fused query
+
+    Returns:
+        Result lists aligned with batch.indexes, in server order
+
+    Raises:
+        FusionError: If the response does not have the expected shape
+    """
+    if not isinstance(results, list):
+        raise FusionError("Fused search did not return a result list")
+
+    split: list[list[dict[str, Any]]] = [[] for _ in batch.rules]
+    for row in results:
+        values = row.get("result") if isinstance(row, dict) else None
+        if not isinstance(values, list) or len(values) != len(batch.fields):
+            raise FusionError("Fused search returned an unexpected result shape")
+        context = _build_context(batch.fields, values)
+        filename = row.get("filename", values[0])
+        for position, rule in enumerate(batch.rules):
+            value = apply(rule, context)
+            if is_truthy(value):
+                split[position].append({"filename": filename, "result": value})
+    return split
@@ -0,0 +1,165 @@
+"""HDR-style latency histogram.
+
+Values are recorded into log-linear buckets: each power-of-two range is split
+into a fixed number of linear sub-buckets, so every recorded value is kept to
+within 1% relative precision at any magnitude, in memory proportional to the
+number of distinct buckets used. Percentiles report the highest value
+equivalent to the bucket, as HdrHistogram does.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# 2**7 sub-buckets per power of two: values within 1/128 (< 1%) of each other share a bucket
+SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def _bucket(value: int) -> tuple[int, int]:
+    """Return (exponent, sub-bucket) for a non-negative value."""
+    exponent = max(value.bit_length() - SUB_BUCKET_BITS - 1, 0)
+    return exponent, value >> exponent
+
+
+def _highest_equivalent(exponent: int, sub_bucket: int) -> int:
+    return ((sub_bucket + 1) << exponent) - 1
+
+
+@dataclass(frozen=True)
+class PercentileRow:
+    """One line of a percentile distribution.
+
+    Attributes:
+        value: Highest value at or below this percentile
+        percentile: Percentile (0-100)
+        total_count: Number of values at or below ``value``
+    """
+
+    value: int
+    percentile: float
+    total_count: int
+
+    @property
+    def inverse(self) -> float | None:
+        """1/(1-percentile), the "one in N" rarity HdrHistogram prints."""
+        remaining = 1 - self.percentile / 100
+        return 1 / remaining if remaining > 0 else None
+
+
+class LatencyHistogram:
+    """Histogram of non-negative integer values (for example microseconds).
+
+    Not thread-safe: give each thread its own histogram and merge() them.
+
+    Attributes:
+        count: Number of recorded values
+        total: Sum of recorded values
+        min: Smallest recorded value (0 when empty)
+        max: Largest recorded value (0 when empty)
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._counts: dict[tuple[int, int], int] = {}
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record a value.
+
+        Args:
+            value: Value to record (negative values are clamped to 0)
+            count: Number of occurrences
+
+        Raises:
+            ValueError: If count is not positive
+        """
+        if count <= 0:
+            raise ValueError(f"Count must be positive, got {count}")
+        value = max(value, 0)
+        key = _bucket(value)
+        self._counts[key] = self._counts.get(key, 0) + count
+        self.min = value if self.count == 0 else min(self.min, value)
+        self.max = max(self.max, value)
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add all values recorded in another histogram.
+
+        Args:
+            other: Histogram to merge in
+        """
+        if other.count == 0:
+            return
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values (0.0 when empty)."""
+        return self.total / self.count if self.count else 0.0
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Return the value at a percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Highest value equivalent to the bucket holding the percentile,
+            capped at the recorded maximum (0 when empty)
+        """
+        if self.count == 0:
+            return 0
+        if percentile <= 0:
+            return self.min
+        target = max(min(percentile, 100.0) / 100 * self.count, 1)
+        running = 0
+        for key in sorted(self._counts):
+            running += self._counts[key]
+            if running >= target:
+                return min(_highest_equivalent(*key), self.max)
+        return self.max
+
+    def percentile_distribution(self) -> list[PercentileRow]:
+        """Return the HdrHistogram-style percentile distribution.
+
+        Rows are taken at 0%, 50%, 75%, 87.5%, ... halving the remaining
+        distance to 100% each step, until the remaining fraction covers less
+        than one recorded value; the last row is 100%.
+
+        Returns:
+            Percentile rows in increasing order
+        """
+        if self.count == 0:
+            return []
+        rows: list[PercentileRow] = []
+        ordered = sorted(self._counts.items())
+        remaining = 1.0
+        percentile = 0.0
+        while remaining * self.count >= 1:
+            value = self.value_at_percentile(percentile)
+            rows.append(PercentileRow(value, percentile, self._count_at_or_below(value, ordered)))
+            remaining /= 2
+            percentile = 100 * (1 - remaining)
+        rows.append(PercentileRow(self.max, 100.0, self.count))
+        return rows
+
+    def _count_at_or_below(self, value: int, ordered: list[tuple[tuple[int, int], int]]) -> int:
+        total = 0
+        for key, count in ordered:
+            if (key[1] << key[0]) > value:
+                break
+            total += count
+        return total
@@ -0,0 +1,97 @@
+"""Request lifecycle hooks for ObsidianClient.
+
+Hooks are plain callables registered per client for four events:
+
+- ``before_request(request)``: called before the cache lookup and before the
+  request is sent. Hooks may rewrite ``request.url``, ``request.headers`` or
+  ``request.body``.
+- ``after_response(request, response)``: called after a successful response
+  has been decoded.
+- ``on_error(request, error)``: called with the ObsidianClientError about to
+  be raised. Hooks observe errors; they cannot suppress them.
+- ``on_cache_hit(request, value)``: called when a search is answered from
+  the client's result cache instead of the network.
+
+Hooks run in registration order on the calling thread, and exceptions they
+raise propagate to the caller. With no hooks registered the client only pays
+for a truthiness check per event.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from obsidian_search_tool.core.timings import RequestTimings
+
+HOOK_EVENTS = ("before_request", "after_response", "on_error", "on_cache_hit")
+
+
+@dataclass
+class HookRequest:
+    """A request as seen (and possibly rewritten) by hooks.
+
+    Attributes:
+        method: HTTP method
+        url: Full request URL
+        headers: HTTP headers
+        body: Request body, if any
+    """
+
+    method: str
+    url: str
+    headers: dict[str, str]
+    body: str | None
+
+    @property
+    def cache_key(self) -> tuple[str, str, str, str | None]:
+        """Key identifying this request in the result cache."""
+        return (self.method, self.url, self.headers.get("Content-Type", ""), self.body)
+
+
+@dataclass
+class HookResponse:
+    """A decoded response passed to after-response hooks.
+
+    Attributes:
+        status_code: HTTP status code
+        value: Decoded JSON body
+        timings: Per-phase timings of the request
+    """
+
+    status_code: int
+    value: Any
+    timings: RequestTimings
+
+
+@dataclass
+class ClientHooks:
+    """Registered callbacks, one list per event."""
+
+    before_request: list[Callable[[HookRequest], None]] = field(default_factory=list)
+    after_response: list[Callable[[HookRequest, HookResponse], None]] = field(default_factory=list)
+    on_error: list[Callable[[HookRequest, Exception], None]] = field(default_factory=list)
+    on_cache_hit: list[Callable[[HookRequest, Any], None]] = field(default_factory=list)
+
+    def callbacks(self, event: str) -> list[Callable[..., None]]:
+        """Return the callback list for an event.
+
+        Args:
+            event: One of HOOK_EVENTS
+
+        Returns:
+            The mutable list of callbacks
+
+        Raises:
+            ValueError: If the event is unknown
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(
+                f"Unknown hook event '{event}'. Expected one of: {', '.join(HOOK_EVENTS)}"
+            )
+        callbacks: list[Callable[..., None]] = getattr(self, event)
+        return callbacks
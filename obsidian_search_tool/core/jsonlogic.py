@@ -0,0 +1,494 @@
+"""Local JsonLogic evaluator.
+
+Evaluates JsonLogic rules against an in-memory note context with the same
+semantics as json-logic-js, the engine used by the Obsidian Local REST API
+plugin. This lets the client re-check predicates locally, for example to
+split the results of a fused query per original sub-query.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import fnmatch
+import math
+import re
+from collections.abc import Callable, Iterator
+from typing import Any
+
+
+class UnsupportedJsonLogicError(Exception):
+    """Raised when a rule uses an operation the local evaluator cannot handle."""
+
+    pass
+
+
+_MISSING = object()
+
+# Operations whose second argument is evaluated against each array element
+# instead of the note context.
+_SCOPED_OPERATIONS = {"map", "filter", "all", "none", "some", "reduce"}
+
+
+def is_truthy(value: Any) -> bool:
+    """Return JsonLogic truthiness (empty arrays are falsy, unlike plain JS).
+
+    Args:
+        value: Value to test
+
+    Returns:
+        True if the value is truthy
+    """
+    if isinstance(value, list):
+        return len(value) > 0
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    return bool(value)
+
+
+def _to_number(value: Any) -> float:
+    """Convert a value to a number using JavaScript coercion rules."""
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
+        stripped = value.strip()
+        if not stripped:
+            return 0.0
+        try:
+            return float(stripped)
+        except ValueError:
+            return math.nan
+    if isinstance(value, list):
+        if not value:
+            return 0.0
+        if len(value) == 1:
+            return _to_number(value[0])
+    return math.nan
+
+
+def _parse_float(value: Any) -> float:
+    """Mimic JavaScript parseFloat() as used by the arithmetic operations."""
+    if isinstance(value, bool) or value is None:
+        return math.nan
+    if isinstance(value, int | float):
+        return float(value)
+    match = re.match(r"\s*([+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?)", str(value))
+    return float(match.group(1)) if match else math.nan
+
+
+def _to_string(value: Any) -> str:
+    """Convert a value to a string using JavaScript String() rules."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return str(normalize_number(value))
+    if isinstance(value, list):
+        return ",".join("" if item is None else _to_string(item) for item in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return str(value)
+
+
+def normalize_number(value: Any) -> Any:
+    """Render integral floats as ints so results serialize like JavaScript numbers.
+
+    Args:
+        value: Any JSON value
+
+    Returns:
+        The value with integral floats converted to int
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _strict_equals(a: Any, b: Any) -> bool:
+    """JavaScript === for JSON values."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, int | float) and isinstance(b, int | float):
+        return a == b
+    if isinstance(a, list | dict) or isinstance(b, list | dict):
+        return a is b
+    return type(a) is type(b) and a == b
+
+
+def _loose_equals(a: Any, b: Any) -> bool:
+    """JavaScript == for JSON values."""
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, list | dict) and isinstance(b, list | dict):
+        return a is b
+    if isinstance(a, list | dict):
+        return _loose_equals(_to_string(a), b)
+    if isinstance(b, list | dict):
+        return _loose_equals(a, _to_string(b))
+    if isinstance(a, str) and isinstance(b, str):
+        return a == b
+    return _to_number(a) == _to_number(b)
+
+
+def _less_than(a: Any, b: Any) -> bool:
+    """JavaScript < for JSON values."""
+    if isinstance(a, str) and isinstance(b, str):
+        return a < b
+    left, right = _to_number(a), _to_number(b)
+    return left < right
+
+
+def _less_equal(a: Any, b: Any) -> bool:
+    """JavaScript <= for JSON values."""
+    if isinstance(a, str) and isinstance(b, str):
+        return a <= b
+    left, right = _to_number(a), _to_number(b)
+    return left <= right
+
+
+def get_var(data: Any, path: Any, default: Any = None) -> Any:
+    """Resolve a dotted ``var`` path against data.
+
+    Args:
+        data: Context object
+        path: Dotted path (e.g. "frontmatter.tags"), index, or empty for the whole context
+        default: Value returned when the path does not resolve
+
+    Returns:
+        The resolved value, or default
+    """
+    if path is None or path == "" or (isinstance(path, list) and not path):
+        return data
+    current = data
+    for part in str(normalize_number(path)).split("."):
+        if current is None:
+            return default
+        if isinstance(current, dict):
+            current = current.get(part, _MISSING)
+        elif isinstance(current, list | str):
+            try:
+                current = current[int(part)]
+            except ValueError, IndexError:
+                current = _MISSING
+        else:
+            current = _MISSING
+        if current is _MISSING:
+            return default
+    return current
+
+
+def _glob_match(pattern: Any, value: Any) -> bool:
+    """Plugin-specific ``glob`` operation."""
+    if not isinstance(pattern, str) or not isinstance(value, str):
+        return False
+    return fnmatch.fnmatchcase(value, pattern)
+
+
+def _regexp_match(pattern: Any, value: Any) -> bool:
+    """Plugin-specific ``regexp`` operation."""
+    if not isinstance(pattern, str) or not isinstance(value, str):
+        return False
+    return re.search(pattern, value) is not None
+
+
+def _in(needle: Any, haystack: Any) -> bool:
+    if isinstance(haystack, str):
+        return _to_string(needle) in haystack
+    if isinstance(haystack, list):
+        return any(_strict_equals(needle, item) for item in haystack)
+    return False
+
+
+def _substr(source: Any, start: Any, length: Any = None) -> str:
+    text = _to_string(source)
+    begin = int(_to_number(start))
+    if begin < 0:
+        begin = max(len(text) + begin, 0)
+    if length is None:
+        return text[begin:]
+    size = int(_to_number(length))
+    if size < 0:
+        return text[begin : len(text) + size]
+    return text[begin : begin + size]
+
+
+def _add(*args: Any) -> float:
+    return sum((_parse_float(arg) for arg in args), 0.0)
+
+
+def _multiply(*args: Any) -> float:
+    result = 1.0
+    for arg in args:
+        result *= _parse_float(arg)
+    return result
+
+
+def _subtract(a: Any, b: Any = _MISSING) -> float:
+    if b is _MISSING:
+        return -_to_number(a)
+    return _to_number(a) - _to_number(b)
+
+
+def _divide(a: Any, b: Any) -> float:
+    denominator = _to_number(b)
+    numerator = _to_number(a)
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.inf if numerator > 0 else -math.inf
+    return numerator / denominator
+
+
+def _modulo(a: Any, b: Any) -> float:
+    denominator = _to_number(b)
+    if denominator == 0:
+        return math.nan
+    return math.fmod(_to_number(a), denominator)
+
+
+def _merge(*args: Any) -> list[Any]:
+    merged: list[Any] = []
+    for arg in args:
+        if isinstance(arg, list):
+            merged.extend(arg)
+        else:
+            merged.append(arg)
+    return merged
+
+
+def _compare_chain(compare: Callable[[Any, Any], bool], *args: Any) -> bool:
+    return all(compare(args[i], args[i + 1]) for i in range(len(args) - 1))
+
+
+_SIMPLE_OPERATIONS: dict[str, Callable[..., Any]] = {
+    "==": lambda a, b=None: _loose_equals(a, b),
+    "===": lambda a, b=None: _strict_equals(a, b),
+    "!=": lambda a, b=None: not _loose_equals(a, b),
+    "!==": lambda a, b=None: not _strict_equals(a, b),
+    ">": lambda a, b=None: _less_than(b, a),
+    ">=": lambda a, b=None: _less_equal(b, a),
+    "<": lambda *args: _compare_chain(_less_than, *args),
+    "<=": lambda *args: _compare_chain(_less_equal, *args),
+    "!!": lambda a=None: is_truthy(a),
+    "!": lambda a=None: not is_truthy(a),
+    "%": _modulo,
+    "log": lambda a=None: a,
+    "in": lambda a=None, b=None: _in(a, b),
+    # json-logic-js joins the arguments, so null and undefined become ""
+    "cat": lambda *args: "".join("" if arg is None else _to_string(arg) for arg in args),
+    "substr": _substr,
+    "+": _add,
+    "*": _multiply,
+    "-": _subtract,
+    "/": _divide,
+    "min": lambda *args: min((_to_number(a) for a in args), default=None),
+    "max": lambda *args: max((_to_number(a) for a in args), default=None),
+    "merge": _merge,
+    "glob": lambda pattern=None, value=None: _glob_match(pattern, value),
+    "regexp": lambda pattern=None, value=None: _regexp_match(pattern, value),
+}
+
+SUPPORTED_OPERATIONS = frozenset(
+    set(_SIMPLE_OPERATIONS)
+    | {"var", "missing", "missing_some", "if", "?:", "and", "or"}
+    | _SCOPED_OPERATIONS
+)
+
+
+def _is_rule(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1
+
+
+def _split(rule: dict[str, Any]) -> tuple[str, list[Any]]:
+    operation, args = next(iter(rule.items()))
+    if not isinstance(args, list):
+        args = [args]
+    return operation, args
+
+
+def apply(rule: Any, data: Any = None) -> Any:
+    """Evaluate a JsonLogic rule against data.
+
+    Args:
+        rule: Parsed JsonLogic rule
+        data: Context object (e.g. {"filename": ..., "frontmatter": {...}})
+
+    Returns:
+        Result of the rule
+
+    Raises:
+        UnsupportedJsonLogicError: If the rule uses an unknown operation
+
+    Examples:
+        >>> apply({"in": [{"var": "frontmatter.tags"}, "project"]}, ctx)
+    """
+    if isinstance(rule, list):
+        return [apply(item, data) for item in rule]
+    if not _is_rule(rule):
+        return rule
+
+    operation, args = _split(rule)
+
+    if operation in ("if", "?:"):
+        index = 0
+        while index < len(args) - 1:
+            if is_truthy(apply(args[index], data)):
+                return apply(args[index + 1], data)
+            index += 2
+        return apply(args[index], data) if index == len(args) - 1 else None
+
+    if operation == "and":
+        current: Any = None
+        for arg in args:
+            current = apply(arg, data)
+            if not is_truthy(current):
+                return current
+        return current
+
+    if operation == "or":
+        current = None
+        for arg in args:
+            current = apply(arg, data)
+            if is_truthy(current):
+                return current
+        return current
+
+    if operation in ("filter", "map", "all", "none", "some"):
+        items = apply(args[0], data) if args else None
+        scoped = args[1] if len(args) > 1 else None
+        if not isinstance(items, list):
+            return [] if operation in ("filter", "map") else operation == "none"
+        if operation == "filter":
+            return [item for item in items if is_truthy(apply(scoped, item))]
+        if operation == "map":
+            return [apply(scoped, item) for item in items]
+        if operation == "all":
+            return bool(items) and all(is_truthy(apply(scoped, item)) for item in items)
+        if operation == "none":
+            return not any(is_truthy(apply(scoped, item)) for item in items)
+        return any(is_truthy(apply(scoped, item)) for item in items)
+
+    if operation == "reduce":
+        items = apply(args[0], data) if args else None
+        accumulator = apply(args[2], data) if len(args) > 2 else None
+        if not isinstance(items, list):
+            return accumulator
+        for item in items:
+            accumulator = apply(args[1], {"current": item, "accumulator": accumulator})
+        return accumulator
+
+    values = [apply(arg, data) for arg in args]
+
+    if operation == "var":
+        path = values[0] if values else None
+        default = values[1] if len(values) > 1 else None
+        return get_var(data, path, default)
+
+    if operation == "missing":
+        keys = values[0] if values and isinstance(values[0], list) else values
+        return [key for key in keys if get_var(data, key) in (None, "")]
+
+    if operation == "missing_some":
+        need = int(_to_number(values[0])) if values else 0
+        keys = values[1] if len(values) > 1 and isinstance(values[1], list) else []
+        missing = [key for key in keys if get_var(data, key) in (None, "")]
+        return [] if len(keys) - len(missing) >= need else missing
+
+    function = _SIMPLE_OPERATIONS.get(operation)
+    if function is None:
+        raise UnsupportedJsonLogicError(f"Unsupported JsonLogic operation: {operation}")
+    return normalize_number(function(*values))
+
+
+def _walk(rule: Any, scoped: bool = False) -> Iterator[tuple[str, list[Any], bool]]:
+    """Yield (operation, args, scoped) for every rule node."""
+    if isinstance(rule, list):
+        for item in rule:
+            yield from _walk(item, scoped)
+        return
+    if not _is_rule(rule):
+        return
+    operation, args = _split(rule)
+    yield operation, args, scoped
+    for index, arg in enumerate(args):
+        yield from _walk(arg, scoped or (operation in _SCOPED_OPERATIONS and index > 0))
+
+
+def check_supported(rule: Any) -> None:
+    """Verify that a rule can be evaluated locally.
+
+    Args:
+        rule: Parsed JsonLogic rule
+
+    Raises:
+        UnsupportedJsonLogicError: If the rule uses an unknown operation
+    """
+    for operation, _, _ in _walk(rule):
+        if operation not in SUPPORTED_OPERATIONS:
+            raise UnsupportedJsonLogicError(f"Unsupported JsonLogic operation: {operation}")
+
+
+def collect_vars(rule: Any) -> set[str]:
+    """Collect the context paths a rule reads.
+
+    Variables inside the per-element scope of map/filter/reduce style
+    operations refer to array elements and are not included.
+
+    Args:
+        rule: Parsed JsonLogic rule
+
+    Returns:
+        Set of dotted variable paths
+
+    Raises:
+        UnsupportedJsonLogicError: If a variable path is computed dynamically
+    """
+    paths: set[str] = set()
+    for operation, args, scoped in _walk(rule):
+        if scoped:
+            continue
+        if operation == "var":
+            path = args[0] if args else ""
+            if _is_rule(path) or isinstance(path, list):
+                raise UnsupportedJsonLogicError("Dynamic var paths cannot be evaluated locally")
+            paths.add(str(normalize_number(path)) if path is not None else "")
+        elif operation in ("missing", "missing_some"):
+            keys = args[1] if operation == "missing_some" and len(args) > 1 else args
+            if operation == "missing" and len(args) == 1 and isinstance(args[0], list):
+                keys = args[0]
+            for key in keys if isinstance(keys, list) else [keys]:
+                if _is_rule(key) or isinstance(key, list):
+                    raise UnsupportedJsonLogicError(
+                        "Dynamic missing keys cannot be evaluated locally"
+                    )
+                paths.add(str(key))
+    return paths
+
+
+def normalize_rule(rule: Any) -> Any:
+    """Reduce a rule to its shape for grouping similar queries.
+
+    Literal arguments become ``"?"``; operations and ``var`` paths are kept.
+
+    Args:
+        rule: Parsed JsonLogic rule
+
+    Returns:
+        Rule with the same structure and literals replaced
+
+    Examples:
+        >>> normalize_rule({"in": ["project", {"var": "tags"}]})
+        {'in': ['?', {'var': 'tags'}]}
+    """
+    if isinstance(rule, list):
+        return [normalize_rule(item) for item in rule]
+    if not _is_rule(rule):
+        return "?"
+    operation, args = next(iter(rule.items()))
+    if operation in ("var", "missing", "missing_some"):
+        return rule
+    return {operation: normalize_rule(args)}
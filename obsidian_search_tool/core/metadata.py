@@ -0,0 +1,452 @@
+"""Local vault metadata snapshot and indexes.
+
+A snapshot mirrors the per-note metadata Dataview knows about (path, size,
+timestamps, tags and raw frontmatter). It is fetched with a single DQL query,
+stored under the cache directory and indexed in memory so selective predicates
+can be answered without asking the plugin to scan the vault.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from obsidian_search_tool.core.storage import (
+    cache_codec_from_env,
+    default_cache_dir,
+    read_json,
+    vault_key,
+    write_json_atomic,
+)
+
+if TYPE_CHECKING:
+    from obsidian_search_tool.core.client import ObsidianClient
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_QUERY = (
+    'TABLE file.size AS "size", file.ctime AS "ctime", file.mtime AS "mtime", '
+    'file.day AS "day", file.tags AS "tags", file.etags AS "etags", '
+    'file.aliases AS "aliases", file.frontmatter AS "frontmatter"'
+)
+
+
+def parse_timestamp(value: Any) -> float | None:
+    """Parse a Dataview ISO timestamp to epoch milliseconds.
+
+    Args:
+        value: ISO 8601 string as serialized by Dataview
+
+    Returns:
+        Epoch milliseconds, or None if the value is not a timestamp
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp() * 1000
+
+
+@dataclass
+class NoteMetadata:
+    """Metadata for a single note.
+
+    Attributes:
+        path: Path relative to the vault root (file.path)
+        size: File size in bytes
+        ctime: Creation time as serialized by Dataview
+        mtime: Modification time as serialized by Dataview
+        day: Date parsed from the file name, if any
+        tags: All tags with subtags broken down (file.tags)
+        etags: Explicit tags (file.etags)
+        aliases: Aliases from frontmatter
+        frontmatter: Raw frontmatter
+    """
+
+    path: str
+    size: int = 0
+    ctime: str | None = None
+    mtime: str | None = None
+    day: str | None = None
+    tags: list[str] = field(default_factory=list)
+    etags: list[str] = field(default_factory=list)
+    aliases: list[str] = field(default_factory=list)
+    frontmatter: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """File name without extension (file.name)."""
+        basename = self.path.rsplit("/", 1)[-1]
+        return basename.rsplit(".", 1)[0] if "." in basename else basename
+
+    @property
+    def folder(self) -> str:
+        """Folder containing the file (file.folder)."""
+        return self.path.rsplit("/", 1)[0] if "/" in self.path else ""
+
+    @property
+    def ext(self) -> str:
+        """File extension (file.ext)."""
+        basename = self.path.rsplit("/", 1)[-1]
+        return basename.rsplit(".", 1)[1] if "." in basename else ""
+
+    @cached_property
+    def mtime_ms(self) -> float | None:
+        """Modification time as epoch milliseconds."""
+        return parse_timestamp(self.mtime)
+
+    @cached_property
+    def ctime_ms(self) -> float | None:
+        """Creation time as epoch milliseconds."""
+        return parse_timestamp(self.ctime)
+
+    def jsonlogic_context(self) -> dict[str, Any]:
+        """Build the JsonLogic context the plugin would evaluate for this note.
+
+        Content is not mirrored, so rules reading ``content`` cannot use it.
+
+        Returns:
+            Context with filename, frontmatter and stat
+        """
+        return {
+            "filename": self.path,
+            "frontmatter": self.frontmatter,
+            "stat": {"ctime": self.ctime_ms, "mtime": self.mtime_ms, "size": self.size},
+        }
+
+
+def _string_list(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(item) for item in value if item is not None]
+    return []
+
+
+def _note_from_row(row: dict[str, Any]) -> NoteMetadata:
+    result = row.get("result") or {}
+    frontmatter = result.get("frontmatter")
+    return NoteMetadata(
+        path=str(row.get("filename", "")),
+        size=int(result.get("size") or 0),
+        ctime=result.get("ctime"),
+        mtime=result.get("mtime"),
+        day=result.get("day"),
+        tags=_string_list(result.get("tags")),
+        etags=_string_list(result.get("etags")),
+        aliases=_string_list(result.get("aliases")),
+        frontmatter=frontmatter if isinstance(frontmatter, dict) else {},
+    )
+
+
+class MetadataSnapshot:
+    """In-memory vault metadata with lazily built indexes.
+
+    Attributes:
+        notes: Notes in the order Dataview returned them
+        base_url: API base URL the snapshot was taken from
+        fetched_at: Epoch seconds when the snapshot was taken
+    """
+
+    def __init__(self, notes: Iterable[NoteMetadata], base_url: str, fetched_at: float) -> None:
+        """Initialize snapshot.
+
+        Args:
+            notes: Note metadata
+            base_url: API base URL the snapshot was taken from
+            fetched_at: Epoch seconds when the snapshot was taken
+        """
+        self.notes = list(notes)
+        self.base_url = base_url
+        self.fetched_at = fetched_at
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return max(time.time() - self.fetched_at, 0.0)
+
+    @cached_property
+    def by_path(self) -> dict[str, NoteMetadata]:
+        """Notes keyed by path."""
+        return {note.path: note for note in self.notes}
+
+    @cached_property
+    def _sorted_paths(self) -> list[str]:
+        return sorted(self.by_path)
+
+    @cached_property
+    def _tag_index(self) -> dict[str, set[str]]:
+        index: dict[str, set[str]] = {}
+        for note in self.notes:
+            for tag in note.tags:
+                index.setdefault(tag.lower(), set()).add(note.path)
+        return index
+
+    @cached_property
+    def _mtime_index(self) -> tuple[list[float], list[str]]:
+        pairs = sorted(
+            (note.mtime_ms, note.path) for note in self.notes if note.mtime_ms is not None
+        )
+        return [mtime for mtime, _ in pairs], [path for _, path in pairs]
+
+    @cached_property
+    def _frontmatter_index(self) -> dict[str, list[tuple[str, Any]]]:
+        index: dict[str, list[tuple[str, Any]]] = {}
+        for note in self.notes:
+            for key, value in note.frontmatter.items():
+                index.setdefault(key, []).append((note.path, value))
+        return index
+
+    def paths_with_prefix(self, prefix: str) -> set[str]:
+        """Return paths starting with prefix.
+
+        Args:
+            prefix: Path prefix
+
+        Returns:
+            Matching paths
+        """
+        paths = self._sorted_paths
+        start = bisect.bisect_left(paths, prefix)
+        matches: set[str] = set()
+        for path in paths[start:]:
+            if not path.startswith(prefix):
+                break
+            matches.add(path)
+        return matches
+
+    def paths_in_folder(self, folder: str) -> set[str]:
+        """Return paths matched by a Dataview folder source (``FROM "folder"``).
+
+        Matches the folder and its subfolders, or a single file by path.
+
+        Args:
+            folder: Folder or file path
+
+        Returns:
+            Matching paths
+        """
+        folder = folder.strip("/")
+        if not folder:
+            return set(self.by_path)
+        matches = self.paths_with_prefix(f"{folder}/")
+        for candidate in (folder, f"{folder}.md"):
+            if candidate in self.by_path:
+                matches.add(candidate)
+        return matches
+
+    def paths_with_tag(self, tag: str) -> set[str]:
+        """Return paths whose file.tags contain tag (case-insensitive, as ``FROM #tag``).
+
+        Args:
+            tag: Tag including the leading '#'
+
+        Returns:
+            Matching paths
+        """
+        return set(self._tag_index.get(tag.lower(), set()))
+
+    @cached_property
+    def _exact_tag_index(self) -> dict[str, set[str]]:
+        index: dict[str, set[str]] = {}
+        for note in self.notes:
+            for tag in note.tags:
+                index.setdefault(tag, set()).add(note.path)
+        return index
+
+    def paths_with_tag_matching(self, text: str, exact: bool = False) -> set[str]:
+        """Return paths with a file.tags entry equal to or containing text (case-sensitive).
+
+        Mirrors ``econtains(file.tags, text)`` (exact) and ``contains(file.tags, text)``,
+        which matches substrings of list elements.
+
+        Args:
+            text: Tag text, usually including the leading '#'
+            exact: Require an exact tag match
+
+        Returns:
+            Matching paths
+        """
+        if exact:
+            return set(self._exact_tag_index.get(text, set()))
+        matches: set[str] = set()
+        for tag, paths in self._exact_tag_index.items():
+            if text in tag:
+                matches |= paths
+        return matches
+
+    def paths_in_mtime_range(
+        self,
+        low: float | None = None,
+        high: float | None = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> set[str]:
+        """Return paths with modification time in a range of epoch milliseconds.
+
+        Args:
+            low: Lower bound (None for unbounded)
+            high: Upper bound (None for unbounded)
+            low_inclusive: Include notes equal to low
+            high_inclusive: Include notes equal to high
+
+        Returns:
+            Matching paths
+        """
+        mtimes, paths = self._mtime_index
+        start = 0
+        end = len(mtimes)
+        if low is not None:
+            start = (bisect.bisect_left if low_inclusive else bisect.bisect_right)(mtimes, low)
+        if high is not None:
+            end = (bisect.bisect_right if high_inclusive else bisect.bisect_left)(mtimes, high)
+        return set(paths[start:end])
+
+    def paths_where_frontmatter(self, key: str, predicate: Callable[[Any], bool]) -> set[str]:
+        """Return paths whose frontmatter key satisfies predicate.
+
+        Only notes that have the key are tested.
+
+        Args:
+            key: Frontmatter key
+            predicate: Test applied to the raw value
+
+        Returns:
+            Matching paths
+        """
+        return {path for path, value in self._frontmatter_index.get(key, []) if predicate(value)}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize snapshot for storage."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "base_url": self.base_url,
+            "fetched_at": self.fetched_at,
+            "notes": [asdict(note) for note in self.notes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MetadataSnapshot:
+        """Deserialize a stored snapshot.
+
+        Args:
+            data: Output of to_dict()
+
+        Returns:
+            MetadataSnapshot
+
+        Raises:
+            ValueError: If the stored format version is not supported
+        """
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported metadata snapshot version: {data.get('version')}")
+        notes = [NoteMetadata(**note) for note in data.get("notes", [])]
+        return cls(notes, str(data.get("base_url", "")), float(data.get("fetched_at", 0)))
+
+    @classmethod
+    def from_search_results(cls, results: list[dict[str, Any]], base_url: str) -> MetadataSnapshot:
+        """Build a snapshot from the results of SNAPSHOT_QUERY.
+
+        Args:
+            results: Raw ``/search/`` results
+            base_url: API base URL the results came from
+
+        Returns:
+            MetadataSnapshot
+        """
+        notes = [_note_from_row(row) for row in results if isinstance(row, dict)]
+        return cls(notes, base_url, time.time())
+
+
+def snapshot_path(base_url: str, cache_dir: Path | None = None) -> Path:
+    """Return the storage path of the snapshot for a vault endpoint.
+
+    Args:
+        base_url: API base URL
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Snapshot file path
+    """
+    return (cache_dir or default_cache_dir()) / "metadata" / f"{vault_key(base_url)}.json"
+
+
+def fetch_snapshot(client: ObsidianClient) -> MetadataSnapshot:
+    """Fetch a fresh metadata snapshot from the vault.
+
+    Args:
+        client: Obsidian client
+
+    Returns:
+        MetadataSnapshot
+
+    Raises:
+        ObsidianAPIError: If the snapshot query fails
+    """
+    from obsidian_search_tool.core.client import ObsidianAPIError
+
+    response = client.search_dataview(SNAPSHOT_QUERY)
+    if not response.success:
+        error = response.error or {}
+        raise ObsidianAPIError(
+            f"Metadata snapshot query failed: {error.get('message', 'Unknown error')}",
+            int(error.get("status_code", 500)),
+            str(error.get("code", "API_ERROR")),
+        )
+    snapshot = MetadataSnapshot.from_search_results(response.results, client.base_url)
+    logger.info("Fetched metadata snapshot: %d notes", len(snapshot))
+    return snapshot
+
+
+def save_snapshot(snapshot: MetadataSnapshot, cache_dir: Path | None = None) -> Path:
+    """Store a snapshot under the cache directory.
+
+    The file is compressed with the OBSIDIAN_CACHE_CODEC codec, if set.
+
+    Args:
+        snapshot: Snapshot to store
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Path the snapshot was written to
+    """
+    path = snapshot_path(snapshot.base_url, cache_dir)
+    write_json_atomic(path, snapshot.to_dict(), cache_codec_from_env())
+    return path
+
+
+def load_snapshot(base_url: str, cache_dir: Path | None = None) -> MetadataSnapshot | None:
+    """Load the stored snapshot for a vault endpoint.
+
+    Args:
+        base_url: API base URL
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        MetadataSnapshot, or None if no valid snapshot is stored
+    """
+    path = snapshot_path(base_url, cache_dir)
+    try:
+        return MetadataSnapshot.from_dict(read_json(path))
+    except FileNotFoundError:
+        return None
+    except (ValueError, TypeError) as e:
+        logger.warning("Ignoring unreadable metadata snapshot %s: %s", path, e)
+        return None
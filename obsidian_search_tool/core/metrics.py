@@ -0,0 +1,503 @@
+"""In-process metrics with OpenMetrics exposition.
+
+Counters and histograms are sharded per thread: each thread updates its own
+dict without taking a lock, and the shards are only summed when metrics are
+collected. A lock is taken once per thread, when its shard is created.
+Gauges hold a single value per label set and are set directly.
+
+Every ObsidianClient records into REGISTRY unless given another registry.
+The registry can be rendered as OpenMetrics text, written to a file, or
+served over HTTP for Prometheus-compatible scrapers:
+
+    >>> from obsidian_search_tool.core.metrics import REGISTRY
+    >>> server = REGISTRY.serve(port=9464)  # GET http://127.0.0.1:9464/metrics
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from obsidian_search_tool.core.storage import open_atomic
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Request latency buckets in seconds, from a local cache-warm query to a full vault scan
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{int(value)}"
+
+
+class _Metric:
+    """Base class holding a metric's name, help text and label names."""
+
+    kind = "unknown"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _check(self, labels: Labels) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {len(labels)} values"
+            )
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        """Yield (sample name suffix, label values, value) for exposition."""
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        """Yield OpenMetrics lines for this metric."""
+        yield f"# TYPE {self.name} {self.kind}"
+        yield f"# HELP {self.name} {self.documentation}"
+        for suffix, labels, value in self.samples():
+            names = self.labelnames
+            if suffix == "_bucket":
+                names = (*names, "le")
+            yield f"{self.name}{suffix}{_format_labels(names, labels)} {_format_value(value)}"
+
+
+class _Sharded(_Metric):
+    """Metric whose per-label state lives in one dict per thread."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._local = threading.local()
+        self._shards: list[dict[Labels, Any]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict[Labels, Any]:
+        try:
+            shard: dict[Labels, Any] = self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _snapshots(self) -> list[dict[Labels, Any]]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic with respect to the owning thread's updates
+        return [shard.copy() for shard in shards]
+
+
+class Counter(_Sharded):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Increase the counter.
+
+        Args:
+            labels: Label values, in labelnames order
+            amount: Non-negative increment
+        """
+        shard = self._shard()
+        current = shard.get(labels)
+        if current is None:
+            self._check(labels)
+            current = 0
+        shard[labels] = current + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current total for a label set."""
+        return float(sum(shard.get(labels, 0) for shard in self._snapshots()))
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        """Yield one _total sample per label set."""
+        totals: dict[Labels, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        for labels in sorted(totals):
+            yield "_total", labels, totals[labels]
+
+
+class Histogram(_Sharded):
+    """Distribution of observed values in fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            buckets: Increasing upper bounds; +Inf is added automatically
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value
+            labels: Label values, in labelnames order
+        """
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            self._check(labels)
+            # Bucket counts (last is +Inf), then sum, then count
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        """Yield cumulative _bucket samples, then _count and _sum, per label set."""
+        merged: dict[Labels, list[float]] = {}
+        for shard in self._snapshots():
+            for labels, state in shard.items():
+                total = merged.setdefault(labels, [0] * len(state))
+                for index, value in enumerate(state):
+                    total[index] += value
+        bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for labels in sorted(merged):
+            state = merged[labels]
+            cumulative = 0.0
+            for bound, count in zip(bounds, state[: len(bounds)], strict=True):
+                cumulative += count
+                yield "_bucket", (*labels, bound), cumulative
+            yield "_count", labels, state[-1]
+            yield "_sum", labels, state[-2]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, such as a current limit."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """Initialize the gauge.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Set the gauge.
+
+        Args:
+            value: New value
+            labels: Label values, in labelnames order
+        """
+        if labels not in self._values:
+            self._check(labels)
+        self._values[labels] = value
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current value for a label set (0 if never set)."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        """Yield one sample per label set."""
+        values = self._values.copy()
+        for labels in sorted(values):
+            yield "", labels, values[labels]
+
+
+class MetricsServer:
+    """Background HTTP server exposing a registry at /metrics.
+
+    Attributes:
+        url: URL of the metrics endpoint
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int) -> None:
+        """Start serving.
+
+        Args:
+            registry: Registry to expose
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("Metrics request: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        bound_host, bound_port = self._server.server_address[:2]
+        self.url = f"http://{bound_host!s}:{bound_port}/metrics"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("Serving metrics at %s", self.url)
+
+    def close(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class MetricsRegistry:
+    """Named collection of metrics."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered with another type")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter with this name, creating it if needed.
+
+        Args:
+            name: Metric name without the _total suffix
+            documentation: Help text
+            labelnames: Label names
+
+        Returns:
+            Counter
+
+        Raises:
+            ValueError: If the name is registered with another type or labels
+        """
+        counter: Counter = self._get_or_create(Counter(name, documentation, labelnames))
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram with this name, creating it if needed.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            buckets: Increasing upper bounds
+
+        Returns:
+            Histogram
+
+        Raises:
+            ValueError: If the name is registered with another type or labels
+        """
+        histogram: Histogram = self._get_or_create(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+        return histogram
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Return the gauge with this name, creating it if needed.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+
+        Returns:
+            Gauge
+
+        Raises:
+            ValueError: If the name is registered with another type or labels
+        """
+        gauge: Gauge = self._get_or_create(Gauge(name, documentation, labelnames))
+        return gauge
+
+    def metrics(self) -> Iterable[_Metric]:
+        """Return registered metrics in name order."""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render(self) -> str:
+        """Render all metrics as OpenMetrics text, terminated by # EOF."""
+        return "".join(self._lines())
+
+    def _lines(self) -> Iterator[str]:
+        for metric in self.metrics():
+            for line in metric.render():
+                yield f"{line}\n"
+        yield "# EOF\n"
+
+    def write(self, path: Path) -> None:
+        """Write the OpenMetrics text to a file atomically.
+
+        Suitable for node_exporter's textfile collector or a one-off dump.
+
+        Args:
+            path: Destination file
+        """
+        with open_atomic(path) as handle:
+            handle.writelines(self._lines())
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> MetricsServer:
+        """Serve the metrics over HTTP on a background thread.
+
+        Args:
+            port: Port to bind (0 picks a free port)
+            host: Interface to bind (default: localhost only)
+
+        Returns:
+            The running MetricsServer; call close() to stop it
+        """
+        return MetricsServer(self, host, port)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class ClientMetrics:
+    """Metric handles recorded by ObsidianClient.
+
+    Attributes:
+        requests: Requests sent, by method and query type
+        errors: Failed requests, by error code
+        cache_hits: Lookups answered from the result cache
+        cache_misses: Cacheable requests that had to be sent
+        cache_stale_hits: Expired results served while refreshed in the background
+        response_bytes: Response body bytes received, by query type
+        rows: Result rows received, by query type
+        latency: Request latency in seconds, by query type
+        concurrency_limit: Adaptive concurrency limit, by endpoint
+        in_flight: Requests currently in flight, by endpoint
+        queue_wait: Seconds spent waiting for a concurrency slot, by priority class
+        retries: Retries sent after transient failures, by error code
+        coalesced: Searches answered by an identical request already in flight
+        circuit_open: Whether the endpoint's circuit breaker is open, by endpoint
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Register (or look up) the client metrics in a registry.
+
+        Args:
+            registry: Registry to record into
+        """
+        self.requests = registry.counter(
+            "obsidian_requests", "Requests sent to the Local REST API", ("method", "query_type")
+        )
+        self.errors = registry.counter(
+            "obsidian_request_errors", "Failed requests by error code", ("code",)
+        )
+        self.cache_hits = registry.counter(
+            "obsidian_cache_hits", "Searches answered from the result cache"
+        )
+        self.cache_misses = registry.counter(
+            "obsidian_cache_misses", "Cacheable searches sent to the API"
+        )
+        self.cache_stale_hits = registry.counter(
+            "obsidian_cache_stale_hits", "Expired results served while refreshed in the background"
+        )
+        self.response_bytes = registry.counter(
+            "obsidian_response_bytes", "Response body bytes received", ("query_type",)
+        )
+        self.rows = registry.counter(
+            "obsidian_result_rows", "Result rows received", ("query_type",)
+        )
+        self.latency = registry.histogram(
+            "obsidian_request_duration_seconds",
+            "Request latency from send to decoded response",
+            ("query_type",),
+        )
+        self.concurrency_limit = registry.gauge(
+            "obsidian_concurrency_limit", "Adaptive concurrency limit", ("endpoint",)
+        )
+        self.in_flight = registry.gauge(
+            "obsidian_requests_in_flight", "Requests currently in flight", ("endpoint",)
+        )
+        self.queue_wait = registry.histogram(
+            "obsidian_queue_wait_seconds",
+            "Time spent waiting for a concurrency slot",
+            ("priority",),
+        )
+        self.coalesced = registry.counter(
+            "obsidian_coalesced_requests",
+            "Searches answered by an identical request already in flight",
+            ("query_type",),
+        )
+        self.retries = registry.counter(
+            "obsidian_request_retries", "Retries sent after transient failures", ("code",)
+        )
+        self.circuit_open = registry.gauge(
+            "obsidian_circuit_open",
+            "1 while the circuit breaker fails requests fast",
+            ("endpoint",),
+        )
+
+
+def query_type_label(content_type: str) -> str:
+    """Map a request Content-Type to a query_type label value.
+
+    Args:
+        content_type: Request Content-Type header
+
+    Returns:
+        "dataview", "jsonlogic" or "none"
+    """
+    if "dataview" in content_type:
+        return "dataview"
+    if "jsonlogic" in content_type:
+        return "jsonlogic"
+    return "none"
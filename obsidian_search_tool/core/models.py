@@ -1,5 +1,8 @@
 """Data models for Obsidian Search Tool.
 
+Formatters only read responses, so one response can be formatted by many
+threads at once as long as no thread modifies it meanwhile.
+
 Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
@@ -90,3 +93,13 @@ class SearchResponse:
     def result_count(self) -> int:
         """Get the number of results."""
         return len(self.results)
+
+    @property
+    def incomplete(self) -> bool:
+        """Whether the results are partial because a deadline ran out or a vault failed."""
+        return bool(self.data and self.data.get("incomplete"))
+
+    @property
+    def stale(self) -> bool:
+        """Whether the results come from an expired cache entry being refreshed."""
+        return bool(self.data and self.data.get("stale"))
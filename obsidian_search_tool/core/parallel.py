@@ -0,0 +1,61 @@
+"""Run CPU-bound work on many results across threads.
+
+On the free-threaded build (``python3.14t``) threads execute Python code on
+all cores at once, so decoding and formatting several large responses on a
+thread pool scales with the cores, without the pickling and start-up cost of
+processes. With the GIL the same work runs one thread at a time and a pool
+only adds overhead, so the default there is a single worker, which runs the
+work inline.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+
+def gil_enabled() -> bool:
+    """Return whether this interpreter runs with the GIL (True before Python 3.13)."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def default_workers() -> int:
+    """Return OBSIDIAN_WORKERS, or the CPU count without the GIL and 1 with it."""
+    configured = os.getenv("OBSIDIAN_WORKERS")
+    if configured:
+        return max(int(configured), 1)
+    return 1 if gil_enabled() else os.cpu_count() or 1
+
+
+def map_parallel(
+    function: Callable[[Any], Any], items: Sequence[Any], workers: int | None = None
+) -> list[Any]:
+    """Apply function to every item on a thread pool, keeping input order.
+
+    Each call runs in a copy of the caller's context, so an active deadline
+    and priority class apply in the workers too. If calls raise, the
+    exception of the earliest such item is re-raised after all calls finish.
+
+    Args:
+        function: Callable taking one item
+        items: Items to process
+        workers: Pool size (default: default_workers()); 1 runs inline
+
+    Returns:
+        Results in input order
+    """
+    count = default_workers() if workers is None else max(workers, 1)
+    count = min(count, len(items))
+    if count <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="parallel") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, function, item) for item in items]
+        return [future.result() for future in futures]
@@ -0,0 +1,666 @@
+"""Hybrid query planner.
+
+Splits a JsonLogic rule or a DQL query into conjuncts and routes every
+indexable conjunct (filename prefix, tag membership, mtime range, frontmatter
+equality) to the local metadata snapshot. Only the residual predicate goes to
+the plugin, restricted to the candidate files the indexes produced. Queries
+that are fully indexable are answered without a server round trip when the
+result can be reproduced locally, and DQL TABLE queries within the subset
+of dql_eval are evaluated entirely against the snapshot.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from obsidian_search_tool.core import jsonlogic
+from obsidian_search_tool.core.dql import (
+    Binary,
+    Call,
+    DqlError,
+    Expr,
+    Index,
+    Literal,
+    Query,
+    RawLiteral,
+    SortCommand,
+    UnsupportedDqlError,
+    WhereCommand,
+    format_expression,
+    member_path,
+    parse_query,
+    split_conjuncts,
+)
+from obsidian_search_tool.core.dql_eval import compile_query, evaluate_query, resolve_source
+from obsidian_search_tool.core.dql_values import (
+    Duration,
+    add_duration,
+    parse_date,
+    parse_duration,
+    to_epoch_ms,
+)
+from obsidian_search_tool.core.metadata import MetadataSnapshot
+from obsidian_search_tool.core.models import SearchResponse
+
+if TYPE_CHECKING:
+    from obsidian_search_tool.core.client import ObsidianClient
+
+logger = logging.getLogger(__name__)
+
+# Cost model, in abstract units roughly proportional to milliseconds
+REQUEST_COST = 5.0
+DQL_ROW_COST = 0.05
+JSONLOGIC_CONTEXT_COST = 0.2
+JSONLOGIC_EVAL_COST = 0.3
+CANDIDATE_COST = 0.01
+LOCAL_ROW_COST = 0.001
+LOCAL_EVAL_COST = 0.01
+
+# Rewritten queries list candidate paths explicitly; beyond this the query
+# text itself becomes the bottleneck and a full scan is cheaper.
+MAX_RESTRICTED_CANDIDATES = 500
+
+DEFAULT_MAX_AGE = 3600.0
+
+_JSONLOGIC_LOCAL_ROOTS = {"filename", "frontmatter", "stat"}
+
+
+@dataclass
+class PlanStep:
+    """One conjunct of the query and how it is answered.
+
+    Attributes:
+        predicate: Conjunct text
+        access: "index:prefix", "index:tag", "index:mtime", "index:frontmatter",
+            "index:scan" (local evaluation) or "server"
+        matches: Number of snapshot notes matching the conjunct (index steps only)
+    """
+
+    predicate: str
+    access: str
+    matches: int | None = None
+
+
+@dataclass
+class QueryPlan:
+    """Execution plan for a search.
+
+    Attributes:
+        query: Original query
+        search_type: "dataview" or "jsonlogic"
+        strategy: "server" (unchanged query), "server-restricted" (residual
+            limited to candidates), "local" (answered from the snapshot) or
+            "local-empty" (indexes prove there are no results)
+        steps: Per-conjunct access paths
+        server_query: Query sent to the plugin (None for local strategies)
+        candidates: Candidate paths from the indexes (None without indexes)
+        total_notes: Notes in the snapshot
+        estimated_cost: Estimated cost of the chosen plan
+        full_scan_cost: Estimated cost of sending the query unchanged
+        snapshot_age: Snapshot age in seconds (None without a snapshot)
+        reason: Why the planner fell back to the server, if it did
+        fallback_strategy: Server strategy used if local evaluation gives up at run time
+        fallback_query: Query sent to the plugin in that case
+    """
+
+    query: str
+    search_type: str
+    strategy: str
+    steps: list[PlanStep] = field(default_factory=list)
+    server_query: str | None = None
+    candidates: list[str] | None = None
+    total_notes: int = 0
+    estimated_cost: float = 0.0
+    full_scan_cost: float = 0.0
+    snapshot_age: float | None = None
+    reason: str | None = None
+    fallback_strategy: str | None = None
+    fallback_query: str | None = None
+    _local_rule: Any = None
+    _local_query: Any = None
+    _value_rule: Any = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize plan for --explain output."""
+        return {
+            "query": self.query,
+            "search_type": self.search_type,
+            "strategy": self.strategy,
+            "steps": [
+                {"predicate": step.predicate, "access": step.access, "matches": step.matches}
+                for step in self.steps
+            ],
+            "server_query": self.server_query,
+            "candidate_count": len(self.candidates) if self.candidates is not None else None,
+            "total_notes": self.total_notes,
+            "estimated_cost": round(self.estimated_cost, 3),
+            "full_scan_cost": round(self.full_scan_cost, 3),
+            "snapshot_age_seconds": (
+                round(self.snapshot_age, 1) if self.snapshot_age is not None else None
+            ),
+            "reason": self.reason,
+            "fallback_query": self.fallback_query,
+        }
+
+
+def default_max_age() -> float:
+    """Maximum snapshot age in seconds (OBSIDIAN_METADATA_MAX_AGE, default 3600)."""
+    return float(os.getenv("OBSIDIAN_METADATA_MAX_AGE", str(DEFAULT_MAX_AGE)))
+
+
+def _server_plan(
+    query: str, search_type: str, reason: str, snapshot: MetadataSnapshot | None
+) -> QueryPlan:
+    total = len(snapshot) if snapshot is not None else 0
+    cost = _full_scan_cost(search_type, total)
+    return QueryPlan(
+        query=query,
+        search_type=search_type,
+        strategy="server",
+        steps=[PlanStep(query, "server")],
+        server_query=query,
+        total_notes=total,
+        estimated_cost=cost,
+        full_scan_cost=cost,
+        snapshot_age=snapshot.age if snapshot is not None else None,
+        reason=reason,
+    )
+
+
+def _full_scan_cost(search_type: str, total: int) -> float:
+    if search_type == "jsonlogic":
+        return REQUEST_COST + total * (JSONLOGIC_CONTEXT_COST + JSONLOGIC_EVAL_COST)
+    return REQUEST_COST + total * DQL_ROW_COST
+
+
+def plan_query(
+    query: str,
+    search_type: str,
+    snapshot: MetadataSnapshot | None,
+    max_age: float | None = None,
+) -> QueryPlan:
+    """Build an execution plan for a query.
+
+    Args:
+        query: DQL or JsonLogic query string
+        search_type: "dataview" or "jsonlogic"
+        snapshot: Local metadata snapshot (None if unavailable)
+        max_age: Maximum snapshot age in seconds (default: default_max_age())
+
+    Returns:
+        QueryPlan
+    """
+    if snapshot is None:
+        return _server_plan(query, search_type, "No metadata snapshot available", None)
+    limit = max_age if max_age is not None else default_max_age()
+    if snapshot.age > limit:
+        return _server_plan(
+            query,
+            search_type,
+            f"Metadata snapshot is older than {limit:.0f}s",
+            snapshot,
+        )
+    if search_type == "jsonlogic":
+        return _plan_jsonlogic(query, snapshot)
+    return _plan_dataview(query, snapshot)
+
+
+# --- JsonLogic -----------------------------------------------------------------
+
+
+def _jsonlogic_access(rule: Any, paths: set[str]) -> str:
+    """Classify which index answers a locally evaluable conjunct."""
+    roots = {path.split(".")[0] for path in paths}
+    operation = next(iter(rule)) if isinstance(rule, dict) and len(rule) == 1 else None
+    if paths == {"filename"} and operation == "glob":
+        return "index:prefix"
+    if paths == {"frontmatter.tags"}:
+        return "index:tag"
+    if paths == {"stat.mtime"}:
+        return "index:mtime"
+    if roots == {"frontmatter"} and len(paths) == 1:
+        return "index:frontmatter"
+    return "index:scan"
+
+
+def _glob_prefix(rule: Any) -> str | None:
+    """Return the literal prefix of ``{"glob": ["prefix*", {"var": "filename"}]}``."""
+    pattern = rule.get("glob", [None])[0] if isinstance(rule, dict) else None
+    if not isinstance(pattern, str) or not pattern.endswith("*"):
+        return None
+    prefix = pattern[:-1]
+    if any(char in prefix for char in "*?[]"):
+        return None
+    return prefix
+
+
+def _jsonlogic_candidates(
+    rule: Any, access: str, paths: set[str], snapshot: MetadataSnapshot
+) -> set[str]:
+    """Evaluate a conjunct over the snapshot, using an index where one applies."""
+
+    def matches(path: str) -> bool:
+        context = snapshot.by_path[path].jsonlogic_context()
+        return jsonlogic.is_truthy(jsonlogic.apply(rule, context))
+
+    pool: set[str] | None = None
+    if access == "index:prefix":
+        prefix = _glob_prefix(rule)
+        if prefix is not None:
+            pool = snapshot.paths_with_prefix(prefix)
+    elif access in ("index:tag", "index:frontmatter"):
+        key = next(iter(paths)).split(".", 1)[1]
+        # A rule that holds for notes lacking the key cannot use the posting list
+        if not jsonlogic.is_truthy(jsonlogic.apply(rule, {"frontmatter": {}})):
+            return snapshot.paths_where_frontmatter(
+                key,
+                lambda value: jsonlogic.is_truthy(
+                    jsonlogic.apply(rule, {"frontmatter": {key: value}})
+                ),
+            )
+    if pool is None:
+        pool = set(snapshot.by_path)
+    return {path for path in pool if matches(path)}
+
+
+def _plan_jsonlogic(query: str, snapshot: MetadataSnapshot) -> QueryPlan:
+    try:
+        rule = json.loads(query)
+    except ValueError:
+        return _server_plan(query, "jsonlogic", "Query is not valid JSON", snapshot)
+
+    is_conjunction = isinstance(rule, dict) and len(rule) == 1 and "and" in rule
+    conjuncts = list(rule["and"]) if is_conjunction else [rule]
+    if not conjuncts:
+        return _server_plan(query, "jsonlogic", "Empty conjunction", snapshot)
+
+    steps: list[PlanStep] = []
+    residual: list[Any] = []
+    candidates: set[str] | None = None
+    for conjunct in conjuncts:
+        text = json.dumps(conjunct, separators=(",", ":"))
+        try:
+            jsonlogic.check_supported(conjunct)
+            paths = jsonlogic.collect_vars(conjunct)
+        except jsonlogic.UnsupportedJsonLogicError:
+            paths = {""}
+        if not paths or any(
+            path == "" or path.split(".")[0] not in _JSONLOGIC_LOCAL_ROOTS for path in paths
+        ):
+            steps.append(PlanStep(text, "server"))
+            residual.append(conjunct)
+            continue
+        access = _jsonlogic_access(conjunct, paths)
+        matched = _jsonlogic_candidates(conjunct, access, paths, snapshot)
+        steps.append(PlanStep(text, access, len(matched)))
+        candidates = matched if candidates is None else candidates & matched
+
+    total = len(snapshot)
+    full_cost = _full_scan_cost("jsonlogic", total)
+    plan = QueryPlan(
+        query=query,
+        search_type="jsonlogic",
+        strategy="server",
+        steps=steps,
+        server_query=query,
+        total_notes=total,
+        full_scan_cost=full_cost,
+        estimated_cost=full_cost,
+        snapshot_age=snapshot.age,
+    )
+    if candidates is None:
+        plan.reason = "No indexable conjuncts"
+        return plan
+
+    ordered = [note.path for note in snapshot.notes if note.path in candidates]
+    plan.candidates = ordered
+    if not ordered:
+        plan.strategy = "local-empty"
+        plan.server_query = None
+        plan.estimated_cost = total * LOCAL_ROW_COST
+        return plan
+    if not residual:
+        plan.strategy = "local"
+        plan.server_query = None
+        plan.estimated_cost = total * LOCAL_ROW_COST
+        plan._local_rule = rule
+        return plan
+
+    restricted_cost = (
+        REQUEST_COST
+        + total * JSONLOGIC_CONTEXT_COST
+        + len(ordered) * (JSONLOGIC_EVAL_COST + CANDIDATE_COST)
+        + total * LOCAL_ROW_COST
+    )
+    if len(ordered) > MAX_RESTRICTED_CANDIDATES or restricted_cost >= full_cost:
+        plan.reason = "Restricting to candidates is not cheaper than a full scan"
+        return plan
+
+    restriction = {"in": [{"var": "filename"}, ordered]}
+    plan.strategy = "server-restricted"
+    plan.server_query = json.dumps({"and": [restriction, *residual]}, ensure_ascii=False)
+    plan.estimated_cost = restricted_cost
+    # The value of an ``and`` is its last conjunct; recompute it locally when
+    # that conjunct was answered by an index rather than sent to the server.
+    if is_conjunction and conjuncts[-1] is not residual[-1]:
+        plan._value_rule = conjuncts[-1]
+    return plan
+
+
+# --- Dataview ------------------------------------------------------------------
+
+
+def _fold_constant(expr: Expr) -> Any:
+    """Evaluate a constant date/duration/number expression, or return None."""
+    if isinstance(expr, Literal):
+        return expr.value
+    if isinstance(expr, Call) and expr.name.lower() in ("date", "dur") and len(expr.args) == 1:
+        argument = expr.args[0]
+        if isinstance(argument, RawLiteral):
+            text = argument.text
+        elif isinstance(argument, Literal) and isinstance(argument.value, str):
+            text = argument.value
+        else:
+            return None
+        return parse_date(text) if expr.name.lower() == "date" else parse_duration(text)
+    if isinstance(expr, Binary) and expr.op in ("+", "-"):
+        left = _fold_constant(expr.left)
+        right = _fold_constant(expr.right)
+        if left is None or not isinstance(right, Duration):
+            return None
+        if isinstance(left, Duration):
+            return left + right if expr.op == "+" else left - right
+        if isinstance(left, datetime):
+            return add_duration(left, right if expr.op == "+" else -right)
+    return None
+
+
+_FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "=": "=", "!=": "!="}
+
+
+def _frontmatter_key(expr: Expr) -> str | None:
+    path = member_path(expr)
+    if path is not None and path.startswith("file.frontmatter.") and path.count(".") == 2:
+        return path.split(".")[2]
+    if (
+        isinstance(expr, Index)
+        and member_path(expr.target) == "file.frontmatter"
+        and isinstance(expr.index, Literal)
+        and isinstance(expr.index.value, str)
+    ):
+        return expr.index.value
+    return None
+
+
+def _dql_equals(value: Any, expected: Any) -> bool:
+    if isinstance(expected, bool) or isinstance(value, bool):
+        return value is expected
+    if isinstance(expected, int | float) and isinstance(value, int | float):
+        return float(value) == float(expected)
+    return isinstance(value, str) and isinstance(expected, str) and value == expected
+
+
+def _dql_conjunct(expr: Expr, snapshot: MetadataSnapshot) -> tuple[str, set[str]] | None:
+    """Answer a WHERE conjunct from the indexes, or return None if not indexable."""
+    if isinstance(expr, Call) and len(expr.args) == 2:
+        name = expr.name.lower()
+        target, argument = expr.args
+        value = _fold_constant(argument)
+        if name == "startswith" and member_path(target) == "file.path" and isinstance(value, str):
+            return "index:prefix", snapshot.paths_with_prefix(value)
+        if (
+            name in ("contains", "econtains")
+            and member_path(target) == "file.tags"
+            and isinstance(value, str)
+        ):
+            # contains() also matches substrings of list elements; econtains() does not
+            return "index:tag", snapshot.paths_with_tag_matching(value, exact=name == "econtains")
+        return None
+
+    if not isinstance(expr, Binary) or expr.op not in _FLIPPED:
+        return None
+    op, left, right = expr.op, expr.left, expr.right
+    if _fold_constant(left) is not None and _fold_constant(right) is None:
+        op, left, right = _FLIPPED[op], right, left
+    value = _fold_constant(right)
+    if value is None:
+        return None
+
+    path = member_path(left)
+    if path == "file.folder" and op == "=" and isinstance(value, str):
+        folder = value.strip("/")
+        return "index:prefix", {
+            candidate
+            for candidate in snapshot.paths_with_prefix(f"{folder}/" if folder else "")
+            if snapshot.by_path[candidate].folder == folder
+        }
+    if path == "file.mtime" and isinstance(value, datetime) and op != "!=":
+        bound = to_epoch_ms(value)
+        if op == "=":
+            return "index:mtime", snapshot.paths_in_mtime_range(bound, bound)
+        if op in (">", ">="):
+            return "index:mtime", snapshot.paths_in_mtime_range(low=bound, low_inclusive=op == ">=")
+        return "index:mtime", snapshot.paths_in_mtime_range(high=bound, high_inclusive=op == "<=")
+
+    key = _frontmatter_key(left)
+    if key is not None and op in ("=", "!=") and isinstance(value, str | int | float | bool):
+        predicate: Callable[[Any], bool] = lambda raw: _dql_equals(raw, value)  # noqa: E731
+        matched = snapshot.paths_where_frontmatter(key, predicate)
+        if op == "!=":
+            # Dataview treats a missing field as null, which is != any literal
+            matched = set(snapshot.by_path) - matched
+        return "index:frontmatter", matched
+    return None
+
+
+def _quote(path: str) -> str:
+    escaped = path.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _leading_conjuncts(parsed: Query) -> list[Expr]:
+    """WHERE conjuncts that filter pages before any LIMIT, GROUP BY or FLATTEN.
+
+    Later WHERE clauses act on a truncated or reshaped row set, so they cannot
+    narrow the pages the query starts from.
+    """
+    conjuncts: list[Expr] = []
+    for command in parsed.commands:
+        if isinstance(command, WhereCommand):
+            conjuncts.extend(split_conjuncts(command.expression))
+        elif not isinstance(command, SortCommand):
+            break
+    return conjuncts
+
+
+def _plan_dataview(query: str, snapshot: MetadataSnapshot) -> QueryPlan:
+    try:
+        parsed = parse_query(query)
+    except DqlError as e:
+        return _server_plan(query, "dataview", f"Query not understood by planner: {e}", snapshot)
+
+    steps: list[PlanStep] = []
+    candidates: set[str] | None = None
+    residual = False
+
+    if parsed.source is not None and parsed.source_text is not None:
+        matched = resolve_source(parsed.source, snapshot)
+        if matched is None:
+            steps.append(PlanStep(f"FROM {parsed.source_text}", "server"))
+            residual = True
+        else:
+            steps.append(PlanStep(f"FROM {parsed.source_text}", "index:source", len(matched)))
+            candidates = matched
+
+    leading = _leading_conjuncts(parsed)
+    if parsed.where is not None and len(split_conjuncts(parsed.where)) > len(leading):
+        residual = True
+    for conjunct in leading:
+        text = format_expression(conjunct)
+        answer = _dql_conjunct(conjunct, snapshot)
+        if answer is None:
+            steps.append(PlanStep(text, "server"))
+            residual = True
+            continue
+        access, matched = answer
+        steps.append(PlanStep(text, access, len(matched)))
+        candidates = matched if candidates is None else candidates & matched
+
+    total = len(snapshot)
+    full_cost = _full_scan_cost("dataview", total)
+    plan = QueryPlan(
+        query=query,
+        search_type="dataview",
+        strategy="server",
+        steps=steps,
+        server_query=query,
+        total_notes=total,
+        estimated_cost=full_cost,
+        full_scan_cost=full_cost,
+        snapshot_age=snapshot.age,
+    )
+    if candidates is None:
+        plan.reason = "No indexable conjuncts"
+        return _plan_local_dataview(plan, parsed, snapshot)
+
+    ordered = sorted(candidates)
+    plan.candidates = ordered
+    if not ordered:
+        plan.strategy = "local-empty"
+        plan.server_query = None
+        plan.estimated_cost = total * LOCAL_ROW_COST
+        return plan
+
+    restricted_cost = (
+        REQUEST_COST + len(ordered) * (DQL_ROW_COST + CANDIDATE_COST) + total * LOCAL_ROW_COST
+    )
+    if len(ordered) > MAX_RESTRICTED_CANDIDATES or restricted_cost >= full_cost:
+        plan.reason = "Restricting to candidates is not cheaper than a full scan"
+    else:
+        # Keep the full WHERE so the server applies exactly the original predicate;
+        # only the set of pages Dataview visits shrinks.
+        restriction = " or ".join(_quote(path) for path in ordered)
+        source = (
+            f"({parsed.source_text}) and ({restriction})" if parsed.source_text else restriction
+        )
+        plan.strategy = "server-restricted"
+        plan.server_query = parsed.render(source_text=source)
+        plan.estimated_cost = restricted_cost
+        if not residual:
+            plan.reason = "Fully indexable; server still computes the projected columns"
+    return _plan_local_dataview(plan, parsed, snapshot)
+
+
+def _plan_local_dataview(plan: QueryPlan, parsed: Query, snapshot: MetadataSnapshot) -> QueryPlan:
+    """Switch a server plan to local evaluation when the query is in the local subset."""
+    try:
+        compile_query(parsed)
+    except UnsupportedDqlError as e:
+        if plan.reason is None:
+            plan.reason = f"Not evaluable locally: {e}"
+        return plan
+
+    scanned = len(plan.candidates) if plan.candidates is not None else len(snapshot)
+    local_cost = len(snapshot) * LOCAL_ROW_COST + scanned * LOCAL_EVAL_COST
+    if local_cost >= plan.estimated_cost:
+        return plan
+    plan.fallback_strategy = plan.strategy
+    plan.fallback_query = plan.server_query
+    plan.strategy = "local"
+    plan.server_query = None
+    plan.estimated_cost = local_cost
+    plan.reason = None
+    plan._local_query = parsed
+    for step in plan.steps:
+        if step.access == "server":
+            step.access = "index:scan"
+    return plan
+
+
+# --- Execution -----------------------------------------------------------------
+
+
+def execute_plan(
+    client: ObsidianClient, plan: QueryPlan, snapshot: MetadataSnapshot | None
+) -> SearchResponse:
+    """Execute a plan.
+
+    Local strategies return notes in snapshot order, which may differ from
+    the order the plugin would list them in (SORT still applies). A local
+    DQL plan that meets something it cannot evaluate runs its fallback
+    server query instead, transparently.
+
+    Args:
+        client: Obsidian client
+        plan: Plan from plan_query()
+        snapshot: Snapshot the plan was built from (None for server plans)
+
+    Returns:
+        SearchResponse for the original query; ``data["plan"]`` holds the strategy
+    """
+    logger.info("Executing %s plan: strategy=%s", plan.search_type, plan.strategy)
+
+    strategy = plan.strategy
+    server_query = plan.server_query or plan.query
+    if strategy in ("local", "local-empty"):
+        results: list[dict[str, Any]] | None = []
+        if strategy == "local" and snapshot is not None:
+            results = _execute_local(plan, snapshot)
+        if results is not None:
+            data = {
+                "query": plan.query,
+                "search_type": plan.search_type,
+                "timestamp": datetime.now(UTC).isoformat(),
+                "results": results,
+                "plan": strategy,
+            }
+            return SearchResponse(success=True, data=data, error=None)
+        strategy = plan.fallback_strategy or "server"
+        server_query = plan.fallback_query or plan.query
+
+    if plan.search_type == "jsonlogic":
+        response = client.search_jsonlogic(server_query)
+    else:
+        response = client.search_dataview(server_query)
+
+    if not response.success or response.data is None:
+        return response
+
+    # The client's response may be shared through its result cache: copy, never mutate
+    rows = [dict(row) for row in response.results]
+    if plan._value_rule is not None and snapshot is not None:
+        for row in rows:
+            note = snapshot.by_path.get(str(row.get("filename", "")))
+            if note is not None:
+                row["result"] = jsonlogic.apply(plan._value_rule, note.jsonlogic_context())
+    data = {**response.data, "query": plan.query, "plan": strategy}
+    if "results" in data:
+        data["results"] = rows
+    return SearchResponse(success=True, data=data, error=response.error)
+
+
+def _execute_local(plan: QueryPlan, snapshot: MetadataSnapshot) -> list[dict[str, Any]] | None:
+    """Evaluate a local plan; None means the server must answer instead."""
+    if plan._local_query is not None:
+        try:
+            return evaluate_query(plan._local_query, snapshot, plan.candidates)
+        except UnsupportedDqlError as e:
+            logger.info("Local evaluation gave up, falling back to server: %s", e)
+            return None
+
+    results: list[dict[str, Any]] = []
+    for path in plan.candidates or []:
+        context = snapshot.by_path[path].jsonlogic_context()
+        value = jsonlogic.apply(plan._local_rule, context)
+        if jsonlogic.is_truthy(value):
+            results.append({"filename": path, "result": value})
+    return results
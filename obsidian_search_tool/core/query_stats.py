@@ -0,0 +1,460 @@
+"""Query statistics store and slow-query log.
+
+Records each search a client sends (query shape, latency, rows, response
+size and outcome) in a local SQLite database, so the most expensive
+queries can be found later with the ``stats`` command.
+
+Queries are grouped by their normalized form: DQL and JsonLogic literals are
+replaced with ``?`` so queries that differ only in constants share one
+fingerprint. Recording is opt-in (OBSIDIAN_STATS_DB) and bounded:
+
+- a sample rate keeps only a fraction of fast queries, while queries at or
+  above the slow threshold are always kept. Each record carries a weight
+  (1/sample_rate for sampled ones, 1 for slow ones), so counts and totals
+  estimate every execution rather than favouring slow queries;
+- retention keeps the newest ``max_rows`` records.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from obsidian_search_tool.core.dql import normalize_query
+from obsidian_search_tool.core.hooks import HookRequest, HookResponse
+from obsidian_search_tool.core.jsonlogic import normalize_rule
+from obsidian_search_tool.core.metrics import query_type_label
+
+if TYPE_CHECKING:
+    from obsidian_search_tool.core.client import ObsidianClient, ObsidianClientError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_MS = 1000.0
+DEFAULT_MAX_ROWS = 100_000
+SORT_KEYS = ("total", "p95", "count")
+# Retention runs every this many inserts rather than on each one
+_PRUNE_INTERVAL = 256
+
+# Aggregates per fingerprint, weighting each record by the executions it
+# stands for. p95 is the fastest latency whose cumulative weight reaches 95%;
+# the example is the newest query text.
+_TOP_QUERIES = """
+WITH ranked AS (
+    SELECT fingerprint, latency_ms,
+        SUM(weight) OVER (PARTITION BY fingerprint ORDER BY latency_ms, id) AS below,
+        SUM(weight) OVER (PARTITION BY fingerprint) AS executions
+    FROM queries
+), percentile AS (
+    SELECT fingerprint, MIN(latency_ms) AS p95_ms FROM ranked
+    WHERE below >= 0.95 * executions - 1e-9 GROUP BY fingerprint
+), grouped AS (
+    SELECT fingerprint, MAX(id) AS last_id, SUM(weight) AS executions,
+        SUM(CASE WHEN status = 'ok' THEN 0 ELSE weight END) AS errors,
+        SUM(latency_ms * weight) AS total_ms, MAX(latency_ms) AS max_ms,
+        SUM(CASE WHEN status = 'ok' THEN weight ELSE 0 END) AS ok,
+        SUM(CASE WHEN status = 'ok' THEN COALESCE(rows, 0) * weight ELSE 0 END) AS rows_total,
+        SUM(CASE WHEN status = 'ok' THEN COALESCE(response_bytes, 0) * weight ELSE 0 END)
+            AS bytes_total
+    FROM queries GROUP BY fingerprint
+)
+SELECT g.fingerprint, q.query_type, q.canonical, q.query, g.executions, g.errors, g.total_ms,
+    g.max_ms, p.p95_ms, g.ok, g.rows_total, g.bytes_total
+FROM grouped g JOIN queries q ON q.id = g.last_id JOIN percentile p USING (fingerprint)
+ORDER BY {order} DESC, g.last_id DESC LIMIT ?
+"""
+_SORT_COLUMNS = {"total": "g.total_ms", "p95": "p.p95_ms", "count": "g.executions"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    query_type TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    canonical TEXT NOT NULL,
+    query TEXT NOT NULL,
+    latency_ms REAL NOT NULL,
+    rows INTEGER,
+    response_bytes INTEGER,
+    status TEXT NOT NULL,
+    weight REAL NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS queries_fingerprint ON queries (fingerprint);
+CREATE INDEX IF NOT EXISTS queries_latency ON queries (latency_ms);
+"""
+
+
+def canonicalize(query: str, query_type: str) -> str:
+    """Return the normalized form of a query.
+
+    Args:
+        query: Query text
+        query_type: "dataview" or "jsonlogic"
+
+    Returns:
+        Normalized query; JsonLogic rules are re-serialized compactly
+    """
+    if query_type == "jsonlogic":
+        try:
+            rule = json.loads(query)
+        except json.JSONDecodeError:
+            return " ".join(query.split())
+        return json.dumps(normalize_rule(rule), separators=(",", ":"), sort_keys=True)
+    return normalize_query(query)
+
+
+def fingerprint(canonical: str, query_type: str) -> str:
+    """Return a stable 16-character id for a normalized query.
+
+    Args:
+        canonical: Normalized query
+        query_type: "dataview" or "jsonlogic"
+
+    Returns:
+        Hex fingerprint
+    """
+    return hashlib.sha256(f"{query_type}\n{canonical}".encode()).hexdigest()[:16]
+
+
+@dataclass
+class QueryStat:
+    """Aggregate statistics for one query fingerprint.
+
+    Attributes:
+        fingerprint: Fingerprint of the normalized query
+        query_type: "dataview" or "jsonlogic"
+        canonical: Normalized query
+        example: Most recent query text with this fingerprint
+        count: Estimated executions (records weighted by their sampling)
+        errors: Estimated executions that failed
+        total_ms: Estimated sum of latencies
+        mean_ms: Mean latency
+        p95_ms: 95th percentile latency (weighted nearest rank)
+        max_ms: Maximum latency
+        mean_rows: Mean result rows of successful executions
+        mean_bytes: Mean response size of successful executions
+    """
+
+    fingerprint: str
+    query_type: str
+    canonical: str
+    example: str
+    count: int
+    errors: int
+    total_ms: float
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+    mean_rows: float
+    mean_bytes: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize with latencies rounded to microseconds."""
+        data = asdict(self)
+        for key in ("total_ms", "mean_ms", "p95_ms", "max_ms", "mean_rows", "mean_bytes"):
+            data[key] = round(data[key], 3)
+        return data
+
+
+@dataclass
+class QueryRecord:
+    """One recorded query execution.
+
+    Attributes:
+        recorded_at: Unix time the query completed
+        query_type: "dataview" or "jsonlogic"
+        fingerprint: Fingerprint of the normalized query
+        query: Query text as sent
+        latency_ms: Latency in milliseconds
+        rows: Result rows (None on error)
+        response_bytes: Response size (None on error)
+        status: "ok" or the error code
+    """
+
+    recorded_at: float
+    query_type: str
+    fingerprint: str
+    query: str
+    latency_ms: float
+    rows: int | None
+    response_bytes: int | None
+    status: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize with an ISO-8601 timestamp."""
+        data = asdict(self)
+        data["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.recorded_at))
+        data["latency_ms"] = round(self.latency_ms, 3)
+        return data
+
+
+class QueryStatsStore:
+    """SQLite-backed store of query executions.
+
+    Safe to share between threads; writes are serialized by a lock.
+
+    Attributes:
+        path: Database file
+        sample_rate: Fraction of fast queries recorded (0-1)
+        slow_ms: Latency at or above which queries are always recorded
+        max_rows: Maximum records kept
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sample_rate: float = 1.0,
+        slow_ms: float = DEFAULT_SLOW_MS,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Open (and create if needed) a stats database.
+
+        Args:
+            path: Database file
+            sample_rate: Fraction of fast queries recorded (0-1)
+            slow_ms: Latency at or above which queries are always recorded
+            max_rows: Maximum records kept
+            rng: Random source for sampling (for tests)
+
+        Raises:
+            ValueError: If sample_rate is outside 0-1 or max_rows is not positive
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {sample_rate}")
+        if max_rows <= 0:
+            raise ValueError(f"max_rows must be positive, got {max_rows}")
+        self.path = path
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_rows = max_rows
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._inserts = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(queries)")}
+        if "weight" not in columns:
+            # Databases created before records were weighted
+            self._connection.execute(
+                "ALTER TABLE queries ADD COLUMN weight REAL NOT NULL DEFAULT 1"
+            )
+
+    @classmethod
+    def from_env(cls) -> QueryStatsStore | None:
+        """Open the store configured by environment variables.
+
+        OBSIDIAN_STATS_DB enables recording. OBSIDIAN_STATS_SAMPLE (default 1),
+        OBSIDIAN_SLOW_QUERY_MS (default 1000) and OBSIDIAN_STATS_MAX_ROWS
+        (default 100000) tune it.
+
+        Returns:
+            QueryStatsStore, or None when OBSIDIAN_STATS_DB is not set
+        """
+        path = os.getenv("OBSIDIAN_STATS_DB")
+        if not path:
+            return None
+        return cls(
+            Path(path).expanduser(),
+            sample_rate=float(os.getenv("OBSIDIAN_STATS_SAMPLE", "1")),
+            slow_ms=float(os.getenv("OBSIDIAN_SLOW_QUERY_MS", str(DEFAULT_SLOW_MS))),
+            max_rows=int(os.getenv("OBSIDIAN_STATS_MAX_ROWS", str(DEFAULT_MAX_ROWS))),
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def record(
+        self,
+        query: str,
+        query_type: str,
+        latency_ms: float,
+        rows: int | None = None,
+        response_bytes: int | None = None,
+        status: str = "ok",
+    ) -> bool:
+        """Record one query execution, subject to sampling.
+
+        Args:
+            query: Query text as sent
+            query_type: "dataview" or "jsonlogic"
+            latency_ms: Latency in milliseconds
+            rows: Result rows
+            response_bytes: Response size
+            status: "ok" or the error code
+
+        Returns:
+            Whether the execution was stored
+        """
+        weight = 1.0
+        if latency_ms < self.slow_ms:
+            if self._rng.random() >= self.sample_rate:
+                return False
+            weight = 1 / self.sample_rate
+        canonical = canonicalize(query, query_type)
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO queries (recorded_at, query_type, fingerprint, canonical, query,"
+                " latency_ms, rows, response_bytes, status, weight)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    query_type,
+                    fingerprint(canonical, query_type),
+                    canonical,
+                    query,
+                    latency_ms,
+                    rows,
+                    response_bytes,
+                    status,
+                    weight,
+                ),
+            )
+            self._inserts += 1
+            if self._inserts % _PRUNE_INTERVAL == 1:
+                self._prune()
+        return True
+
+    def _prune(self) -> None:
+        """Delete the oldest records beyond max_rows (caller holds the lock)."""
+        deleted = self._connection.execute(
+            "DELETE FROM queries WHERE id <= (SELECT MAX(id) FROM queries) - ?", (self.max_rows,)
+        ).rowcount
+        if deleted:
+            logger.debug("Pruned %d query stats records", deleted)
+
+    def top_queries(self, sort: str = "total", limit: int = 10) -> list[QueryStat]:
+        """Aggregate executions per fingerprint.
+
+        Args:
+            sort: "total" (total time), "p95" (95th percentile latency) or "count"
+            limit: Number of fingerprints to return
+
+        Returns:
+            QueryStat list, most expensive first
+
+        Raises:
+            ValueError: If sort is unknown
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {SORT_KEYS}")
+        with self._lock:
+            self._prune()
+            rows = self._connection.execute(
+                _TOP_QUERIES.format(order=_SORT_COLUMNS[sort]), (limit,)
+            ).fetchall()
+        return [_stat(row) for row in rows]
+
+    def slow_queries(self, threshold_ms: float | None = None, limit: int = 20) -> list[QueryRecord]:
+        """Return the slowest recorded executions at or above a threshold.
+
+        Args:
+            threshold_ms: Minimum latency (default: the store's slow_ms)
+            limit: Maximum records
+
+        Returns:
+            QueryRecord list, slowest first
+        """
+        threshold = self.slow_ms if threshold_ms is None else threshold_ms
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT recorded_at, query_type, fingerprint, query, latency_ms, rows,"
+                " response_bytes, status FROM queries WHERE latency_ms >= ?"
+                " ORDER BY latency_ms DESC LIMIT ?",
+                (threshold, limit),
+            ).fetchall()
+        return [QueryRecord(*row) for row in rows]
+
+    def count(self) -> int:
+        """Return the number of stored records."""
+        with self._lock:
+            total: int = self._connection.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        return total
+
+    def attach(self, client: ObsidianClient) -> None:
+        """Record every search the client sends, using its request hooks.
+
+        Cache hits are not recorded: they never reach the API. A response
+        whose before_request hook did not run on the same thread has no
+        known latency and is skipped. Storage errors are logged, never
+        raised through the client.
+
+        Args:
+            client: Client to observe
+        """
+        started = threading.local()
+
+        def before_request(request: HookRequest) -> None:
+            started.value = time.perf_counter()
+
+        def elapsed_ms() -> float | None:
+            start: float | None = getattr(started, "value", None)
+            started.value = None
+            return None if start is None else (time.perf_counter() - start) * 1000
+
+        def safe_record(request: HookRequest, latency_ms: float | None, **fields: Any) -> None:
+            query_type = query_type_label(request.headers.get("Content-Type", ""))
+            if query_type == "none" or not request.body:
+                return
+            if latency_ms is None:
+                logger.debug("No start time for %s %s, not recording", request.method, request.url)
+                return
+            try:
+                self.record(request.body, query_type, latency_ms, **fields)
+            except sqlite3.Error as e:
+                logger.warning("Could not record query statistics: %s", e)
+
+        def after_response(request: HookRequest, response: HookResponse) -> None:
+            value = response.value
+            safe_record(
+                request,
+                elapsed_ms(),
+                rows=len(value) if isinstance(value, list) else None,
+                response_bytes=response.timings.response_bytes if response.timings else None,
+            )
+
+        def on_error(request: HookRequest, error: ObsidianClientError) -> None:
+            from obsidian_search_tool.core.client import error_code
+
+            safe_record(request, elapsed_ms(), status=error_code(error))
+
+        client.add_hook("before_request", before_request)
+        client.add_hook("after_response", after_response)
+        client.add_hook("on_error", on_error)
+
+
+def _stat(row: tuple[Any, ...]) -> QueryStat:
+    """Build a QueryStat from a row of _TOP_QUERIES."""
+    fp, query_type, canonical, example, executions, errors, total_ms, max_ms, p95_ms = row[:9]
+    ok, rows_total, bytes_total = row[9:]
+    return QueryStat(
+        fingerprint=fp,
+        query_type=query_type,
+        canonical=canonical,
+        example=example,
+        count=round(executions),
+        errors=round(errors),
+        total_ms=total_ms,
+        mean_ms=total_ms / executions,
+        p95_ms=p95_ms,
+        max_ms=max_ms,
+        mean_rows=rows_total / ok if ok else 0.0,
+        mean_bytes=bytes_total / ok if ok else 0.0,
+    )
@@ -0,0 +1,260 @@
+"""Retries and circuit breaking for requests to one Obsidian instance.
+
+Searches are read-only, so a search that fails on a transient error (a
+timeout, a refused connection, a 5xx while Obsidian re-indexes) can be sent
+again. Retries wait with exponential backoff and full jitter, so clients that
+failed together do not retry together.
+
+Two safeguards keep retries from adding load to an endpoint that is already
+struggling:
+
+- RetryBudget: every request earns a fraction of a retry token and every
+  retry spends one. Retries stay a bounded fraction of the traffic however
+  many callers fail at once.
+- CircuitBreaker: after several consecutive transient failures the endpoint
+  is considered down. Requests fail immediately instead of each waiting out
+  the timeout. After a cool-down one probe request is let through, and its
+  outcome closes the circuit or opens it again.
+
+Budgets and breakers are shared by every client of an endpoint in the process.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRIES = 2
+DEFAULT_CIRCUIT_THRESHOLD = 5
+
+# HTTP statuses worth retrying; other errors would fail the same way again
+RETRYABLE_STATUS = frozenset({500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to wait before retrying.
+
+    Attributes:
+        retries: Retries after the first attempt (0 disables retrying)
+        base_delay: Backoff ceiling of the first retry, in seconds
+        max_delay: Highest backoff ceiling, in seconds
+    """
+
+    retries: int = DEFAULT_RETRIES
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def delay(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Return the wait before a retry, using full jitter.
+
+        Args:
+            attempt: Retries already made (0 for the first retry)
+            rng: Random source (for tests)
+
+        Returns:
+            Seconds to wait, uniform between 0 and the backoff ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return (rng or random).uniform(0, ceiling)
+
+
+class RetryBudget:
+    """Token bucket bounding retries to a fraction of requests.
+
+    Attributes:
+        ratio: Tokens earned per request (retries per request in the long run)
+        capacity: Most tokens held; also the burst of retries allowed at start
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10.0) -> None:
+        """Initialize a full budget.
+
+        Args:
+            ratio: Tokens earned per request
+            capacity: Most tokens held
+        """
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens available."""
+        with self._lock:
+            return self._tokens
+
+    def deposit(self) -> None:
+        """Earn tokens for a request sent."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.capacity)
+
+    def withdraw(self) -> bool:
+        """Spend a token for a retry.
+
+        Returns:
+            Whether the retry may be sent
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint keeps failing.
+
+    Attributes:
+        failure_threshold: Consecutive transient failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before a probe is allowed
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_THRESHOLD,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe is allowed
+            clock: Monotonic clock (for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state
+
+    def retry_after(self) -> float:
+        """Return the seconds until a probe will be allowed (0 if not open)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now.
+
+        Once the cool-down has passed, the first caller is let through as the
+        probe; others keep failing fast until its outcome is recorded.
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Record that the endpoint answered (any non-transient outcome)."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit closed: endpoint is answering again")
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        "Circuit opened after %d consecutive failures; failing fast for %.0fs",
+                        self._failures,
+                        self.reset_timeout,
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+    def abandon(self) -> None:
+        """Record a request that ended without showing the endpoint's health.
+
+        A probe cut short by the caller's deadline lets the next caller probe.
+        """
+        with self._lock:
+            self._probing = False
+
+
+_budgets: dict[str, RetryBudget] = {}
+_breakers: dict[tuple[str, int], CircuitBreaker] = {}
+_shared_lock = threading.Lock()
+
+
+def retries_from_env(default: int = DEFAULT_RETRIES) -> int:
+    """Return OBSIDIAN_RETRIES, or default when unset (0 disables retrying)."""
+    return int(os.getenv("OBSIDIAN_RETRIES", str(default)))
+
+
+def circuit_threshold_from_env(default: int = DEFAULT_CIRCUIT_THRESHOLD) -> int:
+    """Return OBSIDIAN_CIRCUIT_THRESHOLD, or default when unset (0 disables the breaker)."""
+    return int(os.getenv("OBSIDIAN_CIRCUIT_THRESHOLD", str(default)))
+
+
+def shared_budget(base_url: str) -> RetryBudget:
+    """Return the retry budget shared by all clients of an endpoint.
+
+    Args:
+        base_url: API base URL
+
+    Returns:
+        RetryBudget, created on first use
+    """
+    key = base_url.rstrip("/")
+    with _shared_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = RetryBudget()
+        return budget
+
+
+def shared_breaker(base_url: str, failure_threshold: int) -> CircuitBreaker:
+    """Return the circuit breaker shared by all clients of an endpoint.
+
+    Args:
+        base_url: API base URL
+        failure_threshold: Consecutive transient failures that open the circuit
+
+    Returns:
+        CircuitBreaker, created on first use
+    """
+    key = (base_url.rstrip("/"), failure_threshold)
+    with _shared_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(failure_threshold)
+        return breaker
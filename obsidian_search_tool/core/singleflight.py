@@ -0,0 +1,146 @@
+"""Request coalescing for identical in-flight searches.
+
+When many callers send the same search at the same moment, for example a
+swarm of agents right after a vault sync, only the first one (the leader)
+sends it. The others wait for the leader and receive the same decoded result
+or the same exception. Coalescing ends when the leader's request completes;
+the result cache, when enabled, keeps answering after that.
+
+Searches are matched on a canonical form of the query, so formatting
+differences such as whitespace, keyword case or JSON key order do not prevent
+sharing. The API key is part of the key, so callers with different
+credentials never share a result.
+
+The sync client is used from asyncio through ``asyncio.to_thread`` or an
+executor, so coalescing across threads also covers concurrent tasks.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from obsidian_search_tool.core.dql import normalize_query
+from obsidian_search_tool.core.hooks import HookRequest
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Run a function once per key for all concurrent callers."""
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        """Return the number of keys with a call in flight."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(
+        self, key: Hashable, fn: Callable[[], Any], timeout: float | None = None
+    ) -> tuple[Any, bool]:
+        """Call fn, or wait for the call already in flight for this key.
+
+        Args:
+            key: Identity of the call
+            fn: Function to run if no call is in flight for the key
+            timeout: Seconds a follower waits at most (None waits indefinitely)
+
+        Returns:
+            Tuple of (result, whether it was shared from another caller's call)
+
+        Raises:
+            TimeoutError: If a follower's wait times out
+            Exception: Whatever fn raised, in the leader and every follower
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if leader:
+            try:
+                value = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            else:
+                call.value = value
+                return value, False
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for an identical request in flight")
+        if call.error is not None:
+            raise call.error
+        return call.value, True
+
+
+def canonical_body(body: str | None, query_type: str) -> str | None:
+    """Return a canonical form of a search body for matching identical queries.
+
+    Args:
+        body: Request body
+        query_type: "dataview", "jsonlogic" or "none"
+
+    Returns:
+        Body with formatting differences removed; other bodies unchanged
+    """
+    if body is None:
+        return None
+    if query_type == "dataview":
+        return normalize_query(body, keep_literals=True)
+    if query_type == "jsonlogic":
+        try:
+            return json.dumps(json.loads(body), separators=(",", ":"), sort_keys=True)
+        except json.JSONDecodeError:
+            return body
+    return body
+
+
+def flight_key(request: HookRequest, query_type: str) -> tuple[str, ...]:
+    """Return the key under which identical requests are coalesced.
+
+    Args:
+        request: Request about to be sent
+        query_type: "dataview", "jsonlogic" or "none"
+
+    Returns:
+        Tuple of credentials, method, URL, Content-Type and canonical body
+    """
+    return (
+        request.headers.get("Authorization", ""),
+        request.method,
+        request.url,
+        request.headers.get("Content-Type", ""),
+        canonical_body(request.body, query_type) or "",
+    )
+
+
+def coalesce_from_env(default: bool = True) -> bool:
+    """Return whether OBSIDIAN_COALESCE enables coalescing (default when unset; 0 disables)."""
+    configured = os.getenv("OBSIDIAN_COALESCE")
+    return default if configured is None else configured != "0"
+
+
+# Calls shared by every client in the process
+SHARED = SingleFlight()
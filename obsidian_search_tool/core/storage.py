@@ -0,0 +1,245 @@
+"""Local on-disk storage helpers.
+
+Shared by every feature that keeps state between CLI invocations (metadata
+snapshots, saved views and similar) and by file outputs. Files are written
+atomically so concurrent readers never observe a partially written file.
+
+Files can be compressed with gzip or Zstandard. Zstandard comes from the
+standard library's ``compression.zstd`` (Python 3.14+) and is imported only
+when used. Writers compress as they go, so memory does not grow with the
+output; readers detect the codec from the file's first bytes, so switching
+codecs never strands existing files.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import secrets
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, BinaryIO, TextIO, cast
+
+NONE = "none"
+GZIP = "gzip"
+ZSTD = "zstd"
+CODECS = (NONE, GZIP, ZSTD)
+
+_MAGIC = {b"\x1f\x8b": GZIP, b"\x28\xb5\x2f\xfd": ZSTD}
+_SUFFIXES = {".gz": GZIP, ".zst": ZSTD, ".zstd": ZSTD}
+
+# Characters encoded per write, bounding the bytes held at once for large texts
+_CHUNK = 1 << 20
+
+# Temp files are created like open() creates files, so the kernel applies the
+# umask (mkstemp would create them 0600)
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+_TEMP_ATTEMPTS = 100
+
+
+def default_cache_dir() -> Path:
+    """Return the directory used for local state.
+
+    Resolved from OBSIDIAN_CACHE_DIR, then $XDG_CACHE_HOME/obsidian-search-tool,
+    then ~/.cache/obsidian-search-tool.
+
+    Returns:
+        Cache directory path (not created)
+    """
+    configured = os.getenv("OBSIDIAN_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    xdg_cache = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "obsidian-search-tool"
+
+
+def vault_key(base_url: str) -> str:
+    """Return a short, filesystem-safe key identifying a vault endpoint.
+
+    Args:
+        base_url: API base URL
+
+    Returns:
+        16-character hex key
+    """
+    return hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+
+
+def check_codec(codec: str) -> str:
+    """Check that a codec is known and available in this interpreter.
+
+    Args:
+        codec: "none", "gzip" or "zstd"
+
+    Returns:
+        The codec
+
+    Raises:
+        ValueError: If the codec is unknown, or zstd without compression.zstd
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}', expected one of: {', '.join(CODECS)}")
+    if codec == ZSTD:
+        _zstd()
+    return codec
+
+
+def cache_codec_from_env() -> str:
+    """Return OBSIDIAN_CACHE_CODEC, the codec for stored state (default: none).
+
+    Raises:
+        ValueError: If the codec is unknown or unavailable
+    """
+    return check_codec(os.getenv("OBSIDIAN_CACHE_CODEC", NONE).strip().lower() or NONE)
+
+
+def codec_for_path(path: Path) -> str:
+    """Return the codec implied by a file name (.gz, .zst or .zstd; else none)."""
+    return _SUFFIXES.get(path.suffix.lower(), NONE)
+
+
+def _zstd() -> Any:
+    try:
+        from compression import zstd  # type: ignore[import-not-found,unused-ignore]
+    except ImportError:
+        raise ValueError("zstd compression needs Python 3.14+ (compression.zstd)") from None
+    return zstd
+
+
+def _compressor(raw: BinaryIO, codec: str) -> BinaryIO:
+    if codec == GZIP:
+        return cast(BinaryIO, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0))
+    if codec == ZSTD:
+        return cast(BinaryIO, _zstd().ZstdFile(raw, mode="wb"))
+    return raw
+
+
+def _create_temp(path: Path) -> tuple[int, str]:
+    """Create a new temp file next to path with the permissions open() would give it."""
+    for _ in range(_TEMP_ATTEMPTS):
+        name = str(path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(name, _TEMP_FLAGS, 0o666), name
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No unused temporary file name next to {path}")
+
+
+@contextmanager
+def open_atomic(path: Path, codec: str = NONE) -> Iterator[TextIO]:
+    """Open a text file that replaces path atomically when the block succeeds.
+
+    Text is encoded as UTF-8 and compressed as it is written. The file gets
+    the permissions a plain open() would give it and is synced to disk
+    before it replaces path. If the block raises, the destination is left
+    untouched.
+
+    Args:
+        path: Destination file
+        codec: "none", "gzip" or "zstd"
+
+    Yields:
+        Writable text stream
+
+    Raises:
+        ValueError: If the codec is unknown or unavailable
+    """
+    check_codec(codec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            stream = _compressor(raw, codec)
+            text = io.TextIOWrapper(cast(IO[bytes], stream), encoding="utf-8", newline="")
+            try:
+                yield text
+            finally:
+                # Flushes and lets go of the stream without closing it
+                text.detach()
+            if stream is not raw:
+                # Writes the compressor's trailer; raw is closed by the with block
+                stream.close()
+            raw.flush()
+            os.fsync(fd)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: Path, data: Any, codec: str = NONE) -> None:
+    """Write JSON to path atomically (temp file + rename).
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        codec: "none", "gzip" or "zstd"
+    """
+    with open_atomic(path, codec) as handle:
+        json.dump(data, handle, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_text_atomic(path: Path, text: str, codec: str = NONE) -> None:
+    """Write text to path atomically (temp file + rename).
+
+    Args:
+        path: Destination file
+        text: Content to write
+        codec: "none", "gzip" or "zstd"
+    """
+    with open_atomic(path, codec) as handle:
+        for start in range(0, len(text), _CHUNK):
+            handle.write(text[start : start + _CHUNK])
+
+
+@contextmanager
+def open_text(path: Path) -> Iterator[TextIO]:
+    """Open a file for reading text, decompressing gzip or zstd content.
+
+    Args:
+        path: File to read
+
+    Yields:
+        Readable text stream
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is zstd-compressed and compression.zstd is missing
+    """
+    with path.open("rb") as raw:
+        header = raw.read(4)
+        raw.seek(0)
+        codec = _MAGIC.get(header[:2]) or _MAGIC.get(header) or NONE
+        stream = cast(IO[bytes], raw)
+        if codec == GZIP:
+            stream = cast(IO[bytes], gzip.GzipFile(fileobj=raw, mode="rb"))
+        elif codec == ZSTD:
+            stream = _zstd().ZstdFile(raw, mode="rb")
+        with io.TextIOWrapper(stream, encoding="utf-8") as text:
+            yield text
+
+
+def read_json(path: Path) -> Any:
+    """Read a JSON file, compressed or not.
+
+    Args:
+        path: File to read
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not valid JSON or cannot be decompressed
+    """
+    try:
+        with open_text(path) as handle:
+            return json.load(handle)
+    except (gzip.BadGzipFile, EOFError) as e:
+        raise ValueError(f"Cannot decompress {path}: {e}") from e
@@ -0,0 +1,192 @@
+"""Lightweight tracing spans in Chrome trace event format.
+
+Spans mark phases of a run (search, request, decode, format). When tracing
+is enabled they are recorded as complete ("X") events and written as JSON
+that chrome://tracing, Perfetto (ui.perfetto.dev) and speedscope open
+directly. Spans on the same thread nest by time, so no parent bookkeeping
+is needed.
+
+When tracing is disabled, span() returns a shared no-op context manager:
+the cost is one global lookup and an attribute check per span.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_NOOP: AbstractContextManager[None] = nullcontext()
+
+
+class Tracer:
+    """Collects trace events in memory until written.
+
+    Attributes:
+        path: File the trace is written to
+        events: Recorded trace events
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the tracer.
+
+        Args:
+            path: File the trace is written to
+        """
+        self.path = path
+        self.events: list[dict[str, Any]] = []
+        self._pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def timestamp(self) -> int:
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter_ns() - self._origin) // 1000
+
+    def add(self, event: dict[str, Any]) -> None:
+        """Record an event, filling in the process and thread ids.
+
+        Args:
+            event: Trace event without pid and tid
+        """
+        event["pid"] = self._pid
+        event["tid"] = threading.get_ident()
+        with self._lock:
+            self.events.append(event)
+
+    def write(self) -> None:
+        """Write the trace file, including thread names."""
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": thread.ident,
+                "args": {"name": thread.name},
+            }
+            for thread in threading.enumerate()
+        ]
+        with self._lock:
+            events = names + self.events
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        logger.info("Wrote %d trace events to %s", len(events), self.path)
+
+
+class Span:
+    """Context manager recording one complete event.
+
+    Attributes:
+        args: Arguments shown with the span; may be updated while it is open
+    """
+
+    __slots__ = ("_tracer", "_name", "_category", "_start", "args")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict[str, Any]) -> None:
+        """Initialize the span.
+
+        Args:
+            tracer: Tracer receiving the event
+            name: Span name
+            category: Event category
+            args: Arguments shown with the span
+        """
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._start = 0
+        self.args = args
+
+    def __enter__(self) -> Span:
+        """Start timing."""
+        self._start = self._tracer.timestamp()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Record the event, noting the exception type if one was raised."""
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer.add(
+            {
+                "name": self._name,
+                "cat": self._category,
+                "ph": "X",
+                "ts": self._start,
+                "dur": self._tracer.timestamp() - self._start,
+                "args": self.args,
+            }
+        )
+
+
+_tracer: Tracer | None = None
+
+
+def start_tracing(path: Path) -> Tracer:
+    """Enable tracing for the process.
+
+    Args:
+        path: File the trace is written to by stop_tracing()
+
+    Returns:
+        The active Tracer
+    """
+    global _tracer
+    _tracer = Tracer(path)
+    return _tracer
+
+
+def stop_tracing() -> Path | None:
+    """Disable tracing and write the trace file.
+
+    Returns:
+        Path of the written trace, or None if tracing was not enabled
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return None
+    tracer.write()
+    return tracer.path
+
+
+def tracing_enabled() -> bool:
+    """Return whether spans are currently recorded."""
+    return _tracer is not None
+
+
+def span(name: str, category: str = "obsidian", **args: Any) -> AbstractContextManager[Any]:
+    """Open a span.
+
+    Args:
+        name: Span name, for example "request"
+        category: Event category
+        **args: Arguments shown with the span
+
+    Returns:
+        A Span when tracing is enabled, otherwise a no-op context manager
+
+    Examples:
+        >>> with span("format", rows=120):
+        ...     output = format_search_json(response)
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return Span(tracer, name, category, args)
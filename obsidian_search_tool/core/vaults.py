@@ -0,0 +1,438 @@
+"""Named vault profiles and multi-vault fan-out search.
+
+Profiles are read from a TOML file, one table per vault:
+
+.. code-block:: toml
+
+    [vaults.work]
+    base_url = "http://127.0.0.1:27123"
+    api_key_env = "WORK_OBSIDIAN_API_KEY"   # or api_key = "..."
+    timeout = 10
+
+    [vaults.research]
+    base_url = "http://127.0.0.1:27124"
+    api_key = "..."
+
+search_vaults() sends one query to several vaults concurrently and merges
+the rows. For DQL queries with SORT, each vault returns its rows sorted, so
+the results are combined with a k-way merge (heapq.merge) on the SORT keys
+and cut at the query's LIMIT. Sort keys that are not projected columns are
+added to the query as hidden columns and removed after the merge. A vault
+that fails or times out is reported with its error; the rows of the others
+are still returned.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import re
+import time
+import tomllib
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from obsidian_search_tool.core.client import ObsidianClient, ObsidianClientError, error_code
+from obsidian_search_tool.core.dql import DqlError, LimitCommand, SortCommand, parse_query
+from obsidian_search_tool.core.dql_eval import compare_values
+from obsidian_search_tool.core.dql_values import parse_iso_date
+from obsidian_search_tool.core.models import SearchResponse
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the hidden columns carrying sort keys; removed before rows are returned
+_SORT_COLUMN = "__sort_"
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(T[\d:.]+(Z|[+-]\d{2}:?\d{2})?)?")
+
+
+class VaultConfigError(Exception):
+    """Raised when the vault profiles file is missing, invalid or lacks a profile."""
+
+
+def default_vaults_file() -> Path:
+    """Return the vault profiles file.
+
+    Resolved from OBSIDIAN_VAULTS_FILE, then
+    $XDG_CONFIG_HOME/obsidian-search-tool/vaults.toml, then
+    ~/.config/obsidian-search-tool/vaults.toml.
+
+    Returns:
+        Profiles file path (may not exist)
+    """
+    configured = os.getenv("OBSIDIAN_VAULTS_FILE")
+    if configured:
+        return Path(configured).expanduser()
+    xdg_config = os.getenv("XDG_CONFIG_HOME")
+    base = Path(xdg_config).expanduser() if xdg_config else Path.home() / ".config"
+    return base / "obsidian-search-tool" / "vaults.toml"
+
+
+@dataclass(frozen=True)
+class VaultProfile:
+    """Connection settings of one named vault.
+
+    Attributes:
+        name: Profile name, used to tag result rows
+        base_url: API base URL
+        api_key: API key (empty to fall back to OBSIDIAN_API_KEY)
+        timeout: Request timeout in seconds (None for OBSIDIAN_TIMEOUT)
+    """
+
+    name: str
+    base_url: str
+    api_key: str = field(default="", repr=False)
+    timeout: int | None = None
+
+    def client(self, resilient: bool = False) -> ObsidianClient:
+        """Create a client for this vault.
+
+        Args:
+            resilient: Turn on retries, the circuit breaker, the concurrency
+                limit and coalescing by default (see ObsidianClient)
+
+        Returns:
+            ObsidianClient
+
+        Raises:
+            ObsidianAuthError: If no API key is configured
+        """
+        return ObsidianClient(
+            base_url=self.base_url, api_key=self.api_key, timeout=self.timeout, resilient=resilient
+        )
+
+
+def _profile(name: str, table: Any) -> VaultProfile:
+    if not isinstance(table, dict):
+        raise VaultConfigError(f"Vault '{name}' must be a table")
+    base_url = table.get("base_url")
+    if not isinstance(base_url, str) or not base_url:
+        raise VaultConfigError(f"Vault '{name}' needs a base_url")
+    api_key = table.get("api_key", "")
+    key_env = table.get("api_key_env")
+    if key_env:
+        api_key = os.getenv(str(key_env), "")
+        if not api_key:
+            raise VaultConfigError(f"Vault '{name}': environment variable {key_env} is not set")
+    timeout = table.get("timeout")
+    if timeout is not None and (not isinstance(timeout, int) or timeout <= 0):
+        raise VaultConfigError(f"Vault '{name}': timeout must be a positive integer")
+    return VaultProfile(name, base_url, str(api_key), timeout)
+
+
+def load_profiles(path: Path | None = None) -> dict[str, VaultProfile]:
+    """Read vault profiles.
+
+    Args:
+        path: Profiles file (default: default_vaults_file())
+
+    Returns:
+        Profiles by name, in file order
+
+    Raises:
+        VaultConfigError: If the file is missing or invalid
+    """
+    path = path or default_vaults_file()
+    try:
+        with path.open("rb") as handle:
+            document = tomllib.load(handle)
+    except FileNotFoundError:
+        raise VaultConfigError(f"Vault profiles file not found: {path}") from None
+    except tomllib.TOMLDecodeError as e:
+        raise VaultConfigError(f"Invalid vault profiles file {path}: {e}") from e
+    vaults = document.get("vaults")
+    if not isinstance(vaults, dict) or not vaults:
+        raise VaultConfigError(f"No [vaults.<name>] tables in {path}")
+    return {name: _profile(name, table) for name, table in vaults.items()}
+
+
+def select_profiles(names: Sequence[str], path: Path | None = None) -> list[VaultProfile]:
+    """Look up profiles by name; "all" selects every profile.
+
+    Args:
+        names: Profile names
+        path: Profiles file (default: default_vaults_file())
+
+    Returns:
+        Profiles in the order given, without duplicates
+
+    Raises:
+        VaultConfigError: If a name is unknown or the file is invalid
+    """
+    profiles = load_profiles(path)
+    if list(names) == ["all"]:
+        return list(profiles.values())
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise VaultConfigError(
+            f"Unknown vault(s): {', '.join(unknown)}. Known: {', '.join(profiles)}"
+        )
+    return [profiles[name] for name in dict.fromkeys(names)]
+
+
+@dataclass(frozen=True)
+class MergePlan:
+    """How per-vault results are combined.
+
+    Attributes:
+        query: Query text sent to every vault (with hidden sort columns)
+        sort: (hidden column, descending) per merge key, most significant first
+        limit: Global row limit (None for no limit)
+    """
+
+    query: str
+    sort: tuple[tuple[str, bool], ...] = ()
+    limit: int | None = None
+
+
+def plan_merge(query: str, query_type: str) -> MergePlan:
+    """Derive the merge order and limit from a query.
+
+    Like Dataview, a later SORT takes precedence and earlier ones break ties.
+    Queries that are not DQL, or do not parse, are concatenated in vault order.
+
+    Args:
+        query: Query text
+        query_type: "dataview" or "jsonlogic"
+
+    Returns:
+        MergePlan
+    """
+    if query_type != "dataview":
+        return MergePlan(query)
+    try:
+        parsed = parse_query(query)
+    except DqlError:
+        return MergePlan(query)
+    ordering: list[tuple[str, bool]] = []
+    limit: int | None = None
+    for command in parsed.commands:
+        if isinstance(command, SortCommand):
+            keys = zip(command.key_texts, (descending for _, descending in command.keys))
+            ordering = list(keys) + ordering
+        elif isinstance(command, LimitCommand):
+            limit = command.count if limit is None else min(limit, command.count)
+    if not ordering:
+        return MergePlan(query, limit=limit)
+    columns = ", ".join(
+        f'{text} AS "{_SORT_COLUMN}{position}"' for position, (text, _) in enumerate(ordering)
+    )
+    header = f"{parsed.header}{', ' if parsed.fields else ' '}{columns}"
+    sort = tuple(
+        (f"{_SORT_COLUMN}{position}", descending)
+        for position, (_, descending) in enumerate(ordering)
+    )
+    return MergePlan(replace(parsed, header=header).render(), sort, limit)
+
+
+def _decode(value: Any) -> Any:
+    """Turn serialized dates back into dates so they compare as Dataview does."""
+    if isinstance(value, str) and _ISO_DATE.fullmatch(value):
+        return parse_iso_date(value) or value
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+class _MergeKey:
+    """Orders rows by the hidden sort columns of a MergePlan."""
+
+    __slots__ = ("values", "directions")
+
+    def __init__(self, row: dict[str, Any], sort: tuple[tuple[str, bool], ...]) -> None:
+        result = row.get("result")
+        result = result if isinstance(result, dict) else {}
+        self.values = [_decode(result.get(column)) for column, _ in sort]
+        self.directions = [descending for _, descending in sort]
+
+    def __lt__(self, other: _MergeKey) -> bool:
+        for left, right, descending in zip(self.values, other.values, self.directions, strict=True):
+            order = compare_values(left, right)
+            if order:
+                return order > 0 if descending else order < 0
+        return False
+
+
+def sort_rows(rows: list[Any], sort: tuple[tuple[str, bool], ...]) -> list[Any]:
+    """Sort rows by the hidden sort columns of a MergePlan.
+
+    Args:
+        rows: Result rows carrying the hidden sort columns
+        sort: (hidden column, descending) per key, most significant first
+
+    Returns:
+        Sorted rows; rows that sort equal keep their order
+    """
+    return sorted(rows, key=lambda row: _MergeKey(row, sort))
+
+
+def merge_rows(results: Sequence[tuple[str, list[Any]]], plan: MergePlan) -> Iterator[Any]:
+    """Merge per-vault rows into one stream.
+
+    Rows are tagged with a "vault" field. Rows that sort equal keep vault order.
+
+    Args:
+        results: (vault name, rows) per vault, each sorted by the plan's keys
+        plan: Merge plan
+
+    Yields:
+        Rows in global order, up to the plan's limit
+    """
+    hidden = {column for column, _ in plan.sort}
+
+    def tagged(vault: str, rows: list[Any]) -> Iterator[Any]:
+        for row in rows:
+            yield {"vault": vault, **row} if isinstance(row, dict) else {"vault": vault, "row": row}
+
+    streams = [tagged(vault, rows) for vault, rows in results]
+    if plan.sort:
+        merged: Iterator[Any] = heapq.merge(*streams, key=lambda row: _MergeKey(row, plan.sort))
+    else:
+        merged = itertools.chain.from_iterable(streams)
+    for row in itertools.islice(merged, plan.limit):
+        result = row.get("result")
+        if hidden and isinstance(result, dict):
+            row["result"] = {key: value for key, value in result.items() if key not in hidden}
+        yield row
+
+
+@dataclass
+class VaultResult:
+    """Outcome of the query on one vault.
+
+    Attributes:
+        vault: Profile name
+        rows: Rows returned (empty on error)
+        elapsed_ms: Time until the vault answered or failed
+        error: Error details, or None on success
+    """
+
+    vault: str
+    rows: list[Any]
+    elapsed_ms: float
+    error: dict[str, Any] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize without the rows."""
+        data: dict[str, Any] = {
+            "vault": self.vault,
+            "ok": self.error is None,
+            "rows": len(self.rows),
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+def _query_vault(
+    profile: VaultProfile,
+    query: str,
+    query_type: str,
+    client_factory: Callable[[VaultProfile], ObsidianClient],
+) -> VaultResult:
+    started = time.perf_counter()
+    try:
+        client = client_factory(profile)
+        if query_type == "jsonlogic":
+            response = client.search_jsonlogic(query)
+        else:
+            response = client.search_dataview(query)
+    except ObsidianClientError as e:
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.warning("Vault %s failed: %s", profile.name, e)
+        return VaultResult(profile.name, [], elapsed, {"code": error_code(e), "message": str(e)})
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.incomplete:
+        logger.warning("Vault %s did not answer before the deadline", profile.name)
+        reason = (response.data or {}).get("incomplete_reason", "")
+        return VaultResult(
+            profile.name, [], elapsed, {"code": "DEADLINE_EXCEEDED", "message": reason}
+        )
+    if not response.success:
+        error = response.error or {}
+        logger.warning("Vault %s failed: %s", profile.name, error.get("message"))
+        return VaultResult(
+            profile.name,
+            [],
+            elapsed,
+            {"code": str(error.get("code", "API_ERROR")), "message": error.get("message", "")},
+        )
+    logger.debug("Vault %s: %d rows in %.1f ms", profile.name, response.result_count, elapsed)
+    return VaultResult(profile.name, response.results, elapsed)
+
+
+def search_vaults(
+    profiles: Sequence[VaultProfile],
+    query: str,
+    query_type: str = "dataview",
+    client_factory: Callable[[VaultProfile], ObsidianClient] | None = None,
+) -> SearchResponse:
+    """Run one query on several vaults concurrently and merge the results.
+
+    Args:
+        profiles: Vaults to query
+        query: Query text
+        query_type: "dataview" or "jsonlogic"
+        client_factory: Creates the client for a profile (default: VaultProfile.client)
+
+    Returns:
+        SearchResponse whose data adds "vaults" (per-vault outcome) and
+        "incomplete" (some vault failed). It is unsuccessful only when every
+        vault failed and none of them because the active deadline ran out.
+    """
+    plan = plan_merge(query, query_type)
+    factory = client_factory or VaultProfile.client
+    logger.info("Searching %d vaults: %.100s", len(profiles), query)
+    with ThreadPoolExecutor(max_workers=max(len(profiles), 1), thread_name_prefix="vault") as pool:
+        # Each worker runs in a copy of this context so an active deadline applies there too
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                _query_vault,
+                profile,
+                plan.query,
+                query_type,
+                factory,
+            )
+            for profile in profiles
+        ]
+        outcomes = [future.result() for future in futures]
+
+    succeeded = [outcome for outcome in outcomes if outcome.error is None]
+    statuses = [outcome.to_dict() for outcome in outcomes]
+    timed_out = any(
+        outcome.error is not None and outcome.error["code"] == "DEADLINE_EXCEEDED"
+        for outcome in outcomes
+    )
+    if not succeeded and not timed_out:
+        return SearchResponse(
+            success=False,
+            data=None,
+            error={
+                "message": "Every vault failed: "
+                + "; ".join(f"{o.vault}: {(o.error or {}).get('message')}" for o in outcomes),
+                "code": "ALL_VAULTS_FAILED",
+                "status_code": 503,
+                "vaults": statuses,
+            },
+        )
+    rows = list(merge_rows([(outcome.vault, outcome.rows) for outcome in succeeded], plan))
+    data = {
+        "query": query,
+        "search_type": query_type,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "results": rows,
+        "vaults": statuses,
+        "incomplete": len(succeeded) < len(outcomes),
+    }
+    return SearchResponse(success=True, data=data, error=None)
@@ -0,0 +1,456 @@
+"""Materialized saved queries (views).
+
+A view is a named DQL query whose result is stored under the cache directory,
+so dashboards read it instantly with ``views get`` instead of running the
+query on every render. ``views refresh`` brings views up to date, each on its
+own schedule, and does so incrementally when the query allows it:
+
+1. A key query with the view's FROM and WHERE but a single file.mtime column
+   lists the notes that match now. Stored rows missing from it belong to
+   notes that were deleted or no longer match, and are dropped.
+2. The view's query with an added ``WHERE file.mtime > date(<watermark>)``
+   returns only the rows of notes modified since the last refresh. They
+   replace or extend the stored rows, and the newest mtime seen becomes the
+   next watermark.
+
+Merged rows are re-sorted by the query's SORT keys, kept in hidden columns of
+each stored row. Queries with LIMIT, GROUP BY or FLATTEN, TABLE WITHOUT ID
+queries and queries the local parser cannot read are always refreshed in
+full. So is a view whose key query reports a match that was not modified
+since the watermark, for example because its WHERE clause compares against
+today's date. Values derived from other notes, such as file.inlinks, do not
+move the watermark; a full refresh picks them up.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from obsidian_search_tool.core.dql import (
+    DqlError,
+    FlattenCommand,
+    GroupByCommand,
+    LimitCommand,
+    WhereCommand,
+    parse_query,
+)
+from obsidian_search_tool.core.metadata import parse_timestamp
+from obsidian_search_tool.core.storage import (
+    cache_codec_from_env,
+    default_cache_dir,
+    read_json,
+    vault_key,
+    write_json_atomic,
+)
+from obsidian_search_tool.core.vaults import plan_merge, sort_rows
+from obsidian_search_tool.core.watch import diff_rows, row_hash, row_key
+
+if TYPE_CHECKING:
+    from obsidian_search_tool.core.client import ObsidianClient
+
+logger = logging.getLogger(__name__)
+
+VIEW_VERSION = 1
+
+FULL = "full"
+INCREMENTAL = "incremental"
+
+_MTIME_COLUMN = "__mtime"
+_HIDDEN_PREFIX = "__"
+_VIEW_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+
+class ViewError(Exception):
+    """Raised for invalid view names."""
+
+
+@dataclass(frozen=True)
+class RefreshPlan:
+    """Queries used to refresh a view.
+
+    Attributes:
+        query: View query with hidden mtime and sort columns
+        sort: (hidden column, descending) per SORT key, most significant first
+        key_query: Query listing the notes that match now (None: full refresh only)
+    """
+
+    query: str
+    sort: tuple[tuple[str, bool], ...] = ()
+    key_query: str | None = None
+
+
+def plan_refresh(query: str) -> RefreshPlan:
+    """Derive the queries that materialize and refresh a view.
+
+    Args:
+        query: DQL query of the view
+
+    Returns:
+        RefreshPlan; queries the local parser cannot read are sent unchanged
+    """
+    merge = plan_merge(query, "dataview")
+    try:
+        parsed = parse_query(merge.query)
+    except DqlError:
+        return RefreshPlan(query)
+    column = f'file.mtime AS "{_MTIME_COLUMN}"'
+    header = f"{parsed.header}{', ' if parsed.fields else ' '}{column}"
+    full_query = replace(parsed, header=header).render()
+    if parsed.without_id or any(
+        isinstance(command, LimitCommand | GroupByCommand | FlattenCommand)
+        for command in parsed.commands
+    ):
+        return RefreshPlan(full_query, merge.sort)
+    key_query = replace(parsed, header=f"TABLE {column}").render(
+        commands=[command.text for command in parsed.commands if isinstance(command, WhereCommand)]
+    )
+    return RefreshPlan(full_query, merge.sort, key_query)
+
+
+def visible(row: Any) -> Any:
+    """Return a stored row without its hidden columns."""
+    if not isinstance(row, dict) or not isinstance(row.get("result"), dict):
+        return row
+    result = {k: v for k, v in row["result"].items() if not k.startswith(_HIDDEN_PREFIX)}
+    return {**row, "result": result}
+
+
+def _newest(rows: list[Any], watermark: str | None) -> str | None:
+    """Return the latest hidden mtime among rows, starting from watermark."""
+    newest, newest_ms = watermark, parse_timestamp(watermark)
+    for row in rows:
+        result = row.get("result") if isinstance(row, dict) else None
+        value = result.get(_MTIME_COLUMN) if isinstance(result, dict) else None
+        moment = parse_timestamp(value)
+        if moment is not None and (newest_ms is None or moment > newest_ms):
+            newest, newest_ms = value, moment
+    return newest
+
+
+@dataclass
+class SavedView:
+    """A saved query and its materialized result.
+
+    Attributes:
+        name: View name
+        query: DQL query
+        base_url: API base URL the rows come from
+        interval: Seconds between scheduled refreshes (None: every refresh run)
+        rows: Result rows, including the hidden mtime and sort columns
+        watermark: Newest file.mtime among the rows, as serialized by Dataview
+        refreshed_at: Epoch seconds of the last refresh (None if never refreshed)
+        last_refresh: Mode and row counts of the last refresh
+    """
+
+    name: str
+    query: str
+    base_url: str
+    interval: float | None = None
+    rows: list[Any] = field(default_factory=list)
+    watermark: str | None = None
+    refreshed_at: float | None = None
+    last_refresh: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the last refresh (None if never refreshed)."""
+        return None if self.refreshed_at is None else time.time() - self.refreshed_at
+
+    def due(self, now: float | None = None) -> bool:
+        """Return whether a scheduled refresh run should refresh this view.
+
+        Args:
+            now: Epoch seconds (default: current time)
+
+        Returns:
+            True if never refreshed, unscheduled, or the interval has elapsed
+        """
+        if self.refreshed_at is None or self.interval is None:
+            return True
+        return (time.time() if now is None else now) - self.refreshed_at >= self.interval
+
+    def results(self) -> list[Any]:
+        """Return the stored rows as the query returns them."""
+        return [visible(row) for row in self.rows]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize view for storage."""
+        return {
+            "version": VIEW_VERSION,
+            "name": self.name,
+            "query": self.query,
+            "base_url": self.base_url,
+            "interval": self.interval,
+            "watermark": self.watermark,
+            "refreshed_at": self.refreshed_at,
+            "last_refresh": self.last_refresh,
+            "rows": self.rows,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SavedView:
+        """Deserialize a stored view.
+
+        Args:
+            data: Output of to_dict()
+
+        Returns:
+            SavedView
+
+        Raises:
+            ValueError: If the stored format version is not supported
+        """
+        if data.get("version") != VIEW_VERSION:
+            raise ValueError(f"Unsupported view version: {data.get('version')}")
+        interval = data.get("interval")
+        refreshed_at = data.get("refreshed_at")
+        return cls(
+            name=str(data["name"]),
+            query=str(data["query"]),
+            base_url=str(data.get("base_url", "")),
+            interval=None if interval is None else float(interval),
+            rows=list(data.get("rows", [])),
+            watermark=data.get("watermark"),
+            refreshed_at=None if refreshed_at is None else float(refreshed_at),
+            last_refresh=dict(data.get("last_refresh", {})),
+        )
+
+
+def _search(client: ObsidianClient, query: str) -> list[Any]:
+    """Run a refresh query and return its rows.
+
+    Raises:
+        ObsidianAPIError: If the query fails
+    """
+    from obsidian_search_tool.core.client import ObsidianAPIError
+
+    response = client.search_dataview(query)
+    if not response.success:
+        error = response.error or {}
+        raise ObsidianAPIError(
+            f"View refresh query failed: {error.get('message', 'Unknown error')}",
+            int(error.get("status_code", 500)),
+            str(error.get("code", "API_ERROR")),
+        )
+    return response.results
+
+
+def _incremental_rows(
+    client: ObsidianClient, plan: RefreshPlan, view: SavedView, stored: dict[str, Any]
+) -> list[Any] | None:
+    """Merge the rows changed since the watermark into the stored rows.
+
+    Returns:
+        Merged rows, or None if the view needs a full refresh
+    """
+    assert plan.key_query is not None and view.watermark is not None
+    matching = {row_key(row) for row in _search(client, plan.key_query)}
+    since = f"WHERE file.mtime > date({json.dumps(view.watermark)})"
+    changed = {row_key(row): row for row in _search(client, f"{plan.query}\n{since}")}
+    unseen = matching - stored.keys() - changed.keys()
+    if unseen:
+        logger.info(
+            "View %s: %d matching notes are older than the watermark; refreshing in full",
+            view.name,
+            len(unseen),
+        )
+        return None
+
+    rows = []
+    for key, row in stored.items():
+        if key in changed:
+            rows.append(changed.pop(key))
+        elif key in matching:
+            rows.append(row)
+    rows.extend(changed.values())
+    return sort_rows(rows, plan.sort) if plan.sort else rows
+
+
+def refresh_view(client: ObsidianClient, view: SavedView, full: bool = False) -> None:
+    """Bring a view's rows up to date.
+
+    Updates rows, watermark, refreshed_at and last_refresh in place.
+
+    Args:
+        client: Client to query with; give it no result cache (cache_ttl=0)
+        view: View to refresh
+        full: Re-run the whole query even if an incremental refresh is possible
+
+    Raises:
+        ObsidianAPIError: If a refresh query fails
+    """
+    started = time.perf_counter()
+    plan = plan_refresh(view.query)
+    stored = {row_key(row): row for row in view.rows}
+    rows = None
+    if not full and plan.key_query is not None and view.watermark is not None:
+        rows = _incremental_rows(client, plan, view, stored)
+    mode = FULL if rows is None else INCREMENTAL
+    if rows is None:
+        rows = _search(client, plan.query)
+
+    def hashed(rows: list[Any]) -> dict[str, tuple[str, Any]]:
+        return {row_key(row): (row_hash(visible(row)), row) for row in rows}
+
+    events = Counter(event.event for event in diff_rows(hashed(view.rows), hashed(rows), 0))
+    view.rows = rows
+    view.watermark = _newest(rows, view.watermark if mode == INCREMENTAL else None)
+    view.refreshed_at = time.time()
+    view.last_refresh = {
+        "mode": mode,
+        "rows": len(rows),
+        "added": events["added"],
+        "changed": events["changed"],
+        "removed": events["removed"],
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(
+        "Refreshed view %s (%s): %d rows, %d added, %d changed, %d removed",
+        view.name,
+        mode,
+        len(rows),
+        events["added"],
+        events["changed"],
+        events["removed"],
+    )
+
+
+def validate_name(name: str) -> str:
+    """Check that a view name is usable as a file name.
+
+    Args:
+        name: View name
+
+    Returns:
+        The name
+
+    Raises:
+        ViewError: If the name is empty, too long or has unsupported characters
+    """
+    if not _VIEW_NAME.fullmatch(name):
+        raise ViewError(
+            f"Invalid view name {name!r}: use up to 64 letters, digits, '.', '_' or '-'"
+        )
+    return name
+
+
+def views_dir(base_url: str, cache_dir: Path | None = None) -> Path:
+    """Return the directory holding the views of a vault endpoint.
+
+    Args:
+        base_url: API base URL
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Views directory path
+    """
+    return (cache_dir or default_cache_dir()) / "views" / vault_key(base_url)
+
+
+def view_path(base_url: str, name: str, cache_dir: Path | None = None) -> Path:
+    """Return the storage path of a view.
+
+    Args:
+        base_url: API base URL
+        name: View name
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        View file path
+
+    Raises:
+        ViewError: If the name is invalid
+    """
+    return views_dir(base_url, cache_dir) / f"{validate_name(name)}.json"
+
+
+def save_view(view: SavedView, cache_dir: Path | None = None) -> Path:
+    """Store a view under the cache directory.
+
+    The file is compressed with the OBSIDIAN_CACHE_CODEC codec, if set.
+
+    Args:
+        view: View to store
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Path the view was written to
+    """
+    path = view_path(view.base_url, view.name, cache_dir)
+    write_json_atomic(path, view.to_dict(), cache_codec_from_env())
+    return path
+
+
+def _read_view(path: Path) -> SavedView | None:
+    try:
+        return SavedView.from_dict(read_json(path))
+    except FileNotFoundError:
+        return None
+    except (ValueError, TypeError, KeyError) as e:
+        logger.warning("Ignoring unreadable view %s: %s", path, e)
+        return None
+
+
+def load_view(base_url: str, name: str, cache_dir: Path | None = None) -> SavedView | None:
+    """Load a stored view.
+
+    Args:
+        base_url: API base URL
+        name: View name
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        SavedView, or None if no valid view of that name is stored
+
+    Raises:
+        ViewError: If the name is invalid
+    """
+    return _read_view(view_path(base_url, name, cache_dir))
+
+
+def list_views(base_url: str, cache_dir: Path | None = None) -> list[SavedView]:
+    """Load every stored view of a vault endpoint.
+
+    Args:
+        base_url: API base URL
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Views sorted by name
+    """
+    directory = views_dir(base_url, cache_dir)
+    if not directory.is_dir():
+        return []
+    views = (_read_view(path) for path in sorted(directory.glob("*.json")))
+    return [view for view in views if view is not None]
+
+
+def delete_view(base_url: str, name: str, cache_dir: Path | None = None) -> bool:
+    """Delete a stored view.
+
+    Args:
+        base_url: API base URL
+        name: View name
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Whether a view was deleted
+
+    Raises:
+        ViewError: If the name is invalid
+    """
+    path = view_path(base_url, name, cache_dir)
+    if not path.exists():
+        return False
+    path.unlink()
+    return True
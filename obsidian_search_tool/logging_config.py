@@ -1,14 +1,60 @@
 """Centralized logging configuration with multi-level verbosity support.
 
 This module provides setup_logging() for configuring logging based on
-verbosity count from CLI arguments (-v, -vv, -vvv).
+verbosity count from CLI arguments (-v, -vv, -vvv), and an optional
+structured JSON Lines sink enabled with OBSIDIAN_LOG_JSON.
+
+Log calls use %-style arguments (logger.debug("x=%s", x)) rather than
+f-strings so that messages below the active level are never formatted.
 
 Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+import json
 import logging
+import os
 import sys
+import threading
+from datetime import UTC, datetime
+from typing import Any
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_setup_lock = threading.Lock()
+# Settings of the last setup_logging() call and the root handlers it installed
+_installed: tuple[tuple[Any, ...], list[logging.Handler]] | None = None
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects.
+
+    Each line has ts, level, logger and message, plus any fields passed with
+    ``extra=`` and the formatted exception under ``exc`` when present.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render a record as JSON.
+
+        Args:
+            record: Log record
+
+        Returns:
+            JSON object on one line
+        """
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
 
 
 def setup_logging(verbose_count: int = 0) -> None:
@@ -17,6 +63,15 @@ def setup_logging(verbose_count: int = 0) -> None:
     Maps CLI verbosity count to Python logging levels and configures
     both application and dependent library loggers.
 
+    When OBSIDIAN_LOG_JSON is set, records are also written as JSON Lines to
+    that file ("-" for stderr, replacing the text output). The JSON sink
+    records at INFO or the verbosity level, whichever is more detailed.
+
+    Calls repeating the settings in effect (verbosity, OBSIDIAN_LOG_JSON and
+    sys.stderr) keep the installed handlers instead of closing and replacing
+    them, so threads logging in the meantime are not disturbed. The function
+    is safe to call from several threads.
+
     Args:
         verbose_count: Number of -v flags (0-3+)
             0: WARNING level (quiet mode)
@@ -40,13 +95,38 @@ def setup_logging(verbose_count: int = 0) -> None:
     else:
         level = logging.WARNING
 
-    # Configure root logger
-    logging.basicConfig(
-        level=level,
-        format="[%(levelname)s] %(message)s",
-        stream=sys.stderr,
-        force=True,  # Override any existing configuration
-    )
+    global _installed
+    json_target = os.getenv("OBSIDIAN_LOG_JSON")
+    settings = (level, verbose_count >= 3, json_target, sys.stderr)
+    with _setup_lock:
+        if (
+            _installed is not None
+            and _installed[0] == settings
+            and logging.getLogger().handlers == _installed[1]
+        ):
+            return
+
+        # Configure root logger
+        if json_target == "-":
+            handler: logging.Handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(JsonLogFormatter())
+            handlers = [handler]
+        else:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+            handler.setLevel(level)
+            handlers = [handler]
+            if json_target:
+                json_handler = logging.FileHandler(json_target, encoding="utf-8")
+                json_handler.setFormatter(JsonLogFormatter())
+                handlers.append(json_handler)
+                level = min(level, logging.INFO)
+        logging.basicConfig(
+            level=level,
+            handlers=handlers,
+            force=True,  # Override any existing configuration
+        )
+        _installed = (settings, handlers)
 
     # Configure dependent library loggers at TRACE level (-vvv)
     if verbose_count >= 3:
@@ -0,0 +1,13 @@
+"""Offline test and benchmark support.
+
+Provides a mock Obsidian Local REST API server and a synthetic vault
+generator so the client can be exercised without a running Obsidian.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from obsidian_search_tool.testing.server import MockObsidianServer
+from obsidian_search_tool.testing.vault import SyntheticVault, generate_vault
+
+__all__ = ["MockObsidianServer", "SyntheticVault", "generate_vault"]
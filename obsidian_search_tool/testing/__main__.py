@@ -0,0 +1,64 @@
+"""Run the mock Obsidian Local REST API server.
+
+Usage:
+    python -m obsidian_search_tool.testing --notes 10000 --port 27124
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import click
+
+from obsidian_search_tool.testing.server import MockObsidianServer
+from obsidian_search_tool.testing.vault import generate_vault
+
+
+@click.command()
+@click.option("--notes", default=1000, show_default=True, help="Number of synthetic notes")
+@click.option("--seed", default=0, show_default=True, help="Vault and error injection seed")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind")
+@click.option("--port", default=27124, show_default=True, help="Port to bind")
+@click.option("--api-key", default="test-key", show_default=True, help="Bearer token to accept")
+@click.option("--latency", default=0.0, show_default=True, help="Seconds added to every response")
+@click.option("--jitter", default=0.0, show_default=True, help="Max random extra latency")
+@click.option("--error-rate", default=0.0, show_default=True, help="Probability of an error")
+@click.option("--error-status", default=500, show_default=True, help="HTTP status of errors")
+@click.option("--padding", default=0, show_default=True, help="Bytes of padding per response")
+@click.option("--memoize", is_flag=True, help="Serve repeated searches from memory")
+def main(
+    notes: int,
+    seed: int,
+    host: str,
+    port: int,
+    api_key: str,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    error_status: int,
+    padding: int,
+    memoize: bool,
+) -> None:
+    """Serve a synthetic vault through a mock Local REST API."""
+    vault = generate_vault(notes, seed)
+    server = MockObsidianServer(
+        vault,
+        api_key=api_key,
+        host=host,
+        port=port,
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        error_status=error_status,
+        response_padding=padding,
+        memoize=memoize,
+        seed=seed,
+    )
+    click.echo(f"Serving {len(vault)} notes at {server.url} (API key: {api_key})", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""Mock Obsidian Local REST API server.
+
+Serves ``GET /`` and ``POST /search/`` for a synthetic vault so the client
+can be exercised, load-tested and regression-tested without Obsidian. DQL
+queries are answered by the local DQL evaluator and JsonLogic queries by the
+local JsonLogic evaluator, so results follow the plugin's semantics for the
+subset those evaluators support; anything else gets a 400 response. Both are
+checked against recorded plugin responses in tests/golden.
+
+Latency, response size and error injection are configurable so benchmarks
+can model a slow or flaky vault.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any
+
+from obsidian_search_tool.core.dql import DqlError, parse_query
+from obsidian_search_tool.core.dql_eval import evaluate_query
+from obsidian_search_tool.core.jsonlogic import (
+    UnsupportedJsonLogicError,
+    apply,
+    check_supported,
+    collect_vars,
+    is_truthy,
+)
+from obsidian_search_tool.testing.vault import SyntheticVault
+
+# Pieces a response body is split into when body_delay is set
+_BODY_PIECES = 10
+
+DATAVIEW_CONTENT_TYPE = "application/vnd.olrapi.dataview.dql+txt"
+JSONLOGIC_CONTENT_TYPE = "application/vnd.olrapi.jsonlogic+json"
+
+
+class MockObsidianServer:
+    """Local stand-in for the Obsidian Local REST API.
+
+    Attributes:
+        vault: Vault served by the mock
+        api_key: Bearer token clients must send
+        latency: Seconds added before every response
+        jitter: Maximum extra seconds added at random to the latency
+        error_rate: Probability (0-1) that a request fails with error_status
+        error_status: HTTP status of injected errors
+        response_padding: Whitespace bytes appended to every search response
+        body_delay: Seconds spent sending each response body
+        memoize: Whether repeated searches are served from memory
+        requests_served: Number of requests handled so far
+    """
+
+    def __init__(
+        self,
+        vault: SyntheticVault,
+        api_key: str = "test-key",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        response_padding: int = 0,
+        body_delay: float = 0.0,
+        memoize: bool = False,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server (call start() to serve).
+
+        Args:
+            vault: Vault to serve
+            api_key: Bearer token clients must send
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds added before every response
+            jitter: Maximum extra seconds added at random to the latency
+            error_rate: Probability (0-1) that a request fails with error_status
+            error_status: HTTP status of injected errors
+            response_padding: Whitespace bytes appended to every search response,
+                inflating transfer size without changing the decoded result
+            body_delay: Seconds spent sending each response body, written in
+                pieces after the headers like a slow link would deliver it
+            memoize: Serve repeated searches from a cache of encoded responses, so
+                benchmarks measure the client rather than the mock's evaluators
+            seed: Seed for jitter and error injection
+        """
+        self.vault = vault
+        self.api_key = api_key
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response_padding = response_padding
+        self.body_delay = body_delay
+        self.memoize = memoize
+        self.requests_served = 0
+        self._responses: dict[tuple[str, str], tuple[int, bytes]] = {}
+        self._snapshot = vault.snapshot()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._httpd = _MockHTTPServer((host, port), self)
+
+    @property
+    def url(self) -> str:
+        """Base URL clients should use."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def replace_vault(self, vault: SyntheticVault) -> None:
+        """Serve a different vault from the next request on.
+
+        Args:
+            vault: Vault to serve, for example with notes edited or removed
+        """
+        with self._lock:
+            self.vault = vault
+            self._snapshot = vault.snapshot()
+            self._responses.clear()
+
+    def start(self) -> MockObsidianServer:
+        """Serve requests on a background thread.
+
+        Returns:
+            The server, for chaining
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self) -> MockObsidianServer:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _delay_and_fail(self) -> bool:
+        """Count the request, apply latency and decide on error injection."""
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def search(self, content_type: str, body: str) -> tuple[int, Any]:
+        """Answer a /search/ request.
+
+        Args:
+            content_type: Request Content-Type
+            body: Request body
+
+        Returns:
+            Tuple of (HTTP status, JSON payload)
+        """
+        if content_type == DATAVIEW_CONTENT_TYPE:
+            try:
+                query = parse_query(body)
+                return 200, evaluate_query(query, self._snapshot, page_order=True)
+            except DqlError as e:
+                return 400, {"message": str(e), "errorCode": 40000}
+        if content_type == JSONLOGIC_CONTENT_TYPE:
+            try:
+                rule = json.loads(body)
+                check_supported(rule)
+                return 200, self._search_jsonlogic(rule)
+            except (ValueError, UnsupportedJsonLogicError) as e:
+                return 400, {"message": str(e), "errorCode": 40000}
+        return 400, {"message": f"Unsupported content type: {content_type}", "errorCode": 40000}
+
+    def encoded_search(self, content_type: str, body: str) -> tuple[int, bytes]:
+        """Answer a /search/ request with an encoded, padded JSON body.
+
+        Args:
+            content_type: Request Content-Type
+            body: Request body
+
+        Returns:
+            Tuple of (HTTP status, response body)
+        """
+        key = (content_type, body)
+        if self.memoize and key in self._responses:
+            return self._responses[key]
+        status, payload = self.search(content_type, body)
+        padding = self.response_padding if status == 200 else 0
+        response = (status, _encode(payload) + b" " * padding)
+        if self.memoize:
+            self._responses[key] = response
+        return response
+
+    def _search_jsonlogic(self, rule: Any) -> list[dict[str, Any]]:
+        reads_content = any(path.split(".")[0] == "content" for path in collect_vars(rule))
+        results: list[dict[str, Any]] = []
+        for note in self._snapshot.notes:
+            context = note.jsonlogic_context()
+            if reads_content:
+                context["content"] = self.vault.content(note.path)
+            value = apply(rule, context)
+            if is_truthy(value):
+                results.append({"filename": note.path, "result": value})
+        return results
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], mock: MockObsidianServer) -> None:
+        super().__init__(address, _Handler)
+        self.mock = mock
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients that time out hang up mid-response; that is expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockObsidianLocalRestApi/1.0"
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # waits for the client's delayed ACK (~40 ms). Node's HTTP server sets it too.
+    disable_nagle_algorithm = True
+    server: _MockHTTPServer
+
+    @property
+    def mock(self) -> MockObsidianServer:
+        return self.server.mock
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        self._send_bytes(status, _encode(payload))
+
+    def _send_bytes(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.mock.body_delay <= 0:
+            self.wfile.write(body)
+            return
+        step = -(-len(body) // _BODY_PIECES)
+        for start in range(0, len(body), step):
+            time.sleep(self.mock.body_delay / _BODY_PIECES)
+            self.wfile.write(body[start : start + step])
+
+    def _authorized(self) -> bool:
+        return self.headers.get("Authorization") == f"Bearer {self.mock.api_key}"
+
+    def _read_body(self) -> str:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length).decode("utf-8") if length else ""
+
+    def _inject_error(self) -> bool:
+        if not self.mock._delay_and_fail():
+            return False
+        status = self.mock.error_status
+        self._send_json(status, {"message": "Injected error", "errorCode": status * 100})
+        return True
+
+    def do_GET(self) -> None:
+        if self._inject_error():
+            return
+        if self.path != "/":
+            self._send_json(404, {"message": "Not Found", "errorCode": 40400})
+            return
+        self._send_json(
+            200,
+            {
+                "status": "OK",
+                "service": "Obsidian Local REST API",
+                "authenticated": self._authorized(),
+                "versions": {"self": "mock"},
+            },
+        )
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        if self._inject_error():
+            return
+        if self.path != "/search/":
+            self._send_json(404, {"message": "Not Found", "errorCode": 40400})
+            return
+        if not self._authorized():
+            self._send_json(401, {"message": "Authorization required", "errorCode": 40101})
+            return
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        self._send_bytes(*self.mock.encoded_search(content_type, body))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
@@ -0,0 +1,194 @@
+"""Synthetic vault generator.
+
+Generates deterministic vaults of any size (1k to 1M notes) with the shape of
+a real PARA-style vault: daily notes, project and area notes with frontmatter
+(status, priority, author, dates, aliases), nested tags and wiki links between
+notes. Metadata is generated up front; note bodies are derived from the seed
+on demand, so large vaults stay affordable in memory.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
+from typing import Any
+
+from obsidian_search_tool.core.metadata import MetadataSnapshot, NoteMetadata
+
+FOLDERS = [
+    ("daily", 30),
+    ("projects", 20),
+    ("areas", 15),
+    ("resources", 20),
+    ("archive", 10),
+    ("inbox", 5),
+]
+TAGS = [
+    "project",
+    "project/aws",
+    "project/ml",
+    "project/home",
+    "meeting",
+    "idea",
+    "reading",
+    "todo",
+    "review",
+    "person",
+]
+STATUSES = ["active", "waiting", "done", "someday"]
+AUTHORS = ["Ada", "Ben", "Kai", "Lin", "Sam", "Noor"]
+WORDS = (
+    "vault note idea search query index table latency cache graph link tag project "
+    "meeting review draft summary plan agent model data pipeline metric budget owner "
+    "release deadline research reading paper result insight question answer task"
+).split()
+
+_FOLDER_NAMES = [name for name, _ in FOLDERS]
+_FOLDER_WEIGHTS = list(itertools.accumulate(weight for _, weight in FOLDERS))
+_EPOCH = datetime(2020, 1, 1, tzinfo=UTC)
+_SPAN_DAYS = 5 * 365
+
+
+def _timestamp(moment: datetime) -> str:
+    """Serialize a datetime the way Dataview does (millisecond precision)."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}+00:00"
+
+
+def _with_parents(tags: list[str]) -> list[str]:
+    """Break nested tags down into their parents, like file.tags."""
+    expanded: list[str] = []
+    for tag in tags:
+        parts = tag.split("/")
+        for depth in range(1, len(parts) + 1):
+            candidate = "/".join(parts[:depth])
+            if candidate not in expanded:
+                expanded.append(candidate)
+    return expanded
+
+
+@dataclass
+class SyntheticVault:
+    """A generated vault.
+
+    Attributes:
+        notes: Note metadata in page order
+        seed: Seed the vault was generated from
+    """
+
+    notes: list[NoteMetadata]
+    seed: int
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    @cached_property
+    def _index(self) -> dict[str, int]:
+        return {note.path: position for position, note in enumerate(self.notes)}
+
+    def content(self, path: str) -> str:
+        """Return the markdown body of a note, generated deterministically.
+
+        Args:
+            path: Note path
+
+        Returns:
+            Markdown content with frontmatter-free body text, inline tags and links
+        """
+        position = self._index[path]
+        note = self.notes[position]
+        rng = random.Random(self.seed * 1_000_003 + position)
+        lines = [f"# {note.name}", ""]
+        for _ in range(rng.randint(1, 4)):
+            lines.append(" ".join(rng.choices(WORDS, k=rng.randint(12, 40))) + ".")
+            lines.append("")
+        for _ in range(rng.randint(0, 5)):
+            target = self.notes[rng.randrange(len(self.notes))]
+            lines.append(f"- See [[{target.name}]]")
+        if note.etags:
+            lines.append("")
+            lines.append(" ".join(note.etags))
+        return "\n".join(lines)
+
+    def snapshot(self, base_url: str = "http://127.0.0.1:27123") -> MetadataSnapshot:
+        """Build a metadata snapshot of the vault.
+
+        Args:
+            base_url: API base URL to record in the snapshot
+
+        Returns:
+            MetadataSnapshot listing the notes in page order
+        """
+        return MetadataSnapshot(self.notes, base_url, time.time())
+
+
+def _note(rng: random.Random, position: int) -> NoteMetadata:
+    folder = rng.choices(_FOLDER_NAMES, cum_weights=_FOLDER_WEIGHTS)[0]
+    created = _EPOCH + timedelta(seconds=rng.randrange(_SPAN_DAYS * 86400))
+    modified = created + timedelta(seconds=rng.randrange(180 * 86400))
+
+    frontmatter: dict[str, Any] = {}
+    explicit: list[str] = []
+    day: str | None = None
+    if folder == "daily":
+        # Daily notes are named after their day; suffix keeps names unique
+        day_value = created.date()
+        path = f"daily/{day_value.isoformat()}-{position}.md"
+        day = _timestamp(datetime(day_value.year, day_value.month, day_value.day, tzinfo=UTC))
+        if rng.random() < 0.3:
+            explicit.append("#meeting")
+    else:
+        path = f"{folder}/note-{position:07d}.md"
+        explicit.extend(f"#{tag}" for tag in rng.sample(TAGS, rng.randint(0, 3)))
+        frontmatter["status"] = rng.choice(STATUSES)
+        frontmatter["priority"] = rng.randint(1, 5)
+        frontmatter["created"] = created.date().isoformat()
+        if rng.random() < 0.6:
+            authors = rng.sample(AUTHORS, rng.randint(1, 2))
+            frontmatter["author"] = authors[0] if len(authors) == 1 else authors
+        if rng.random() < 0.3:
+            due = created.date() + timedelta(days=rng.randint(1, 90))
+            frontmatter["due"] = due.isoformat()
+        if rng.random() < 0.1:
+            frontmatter["aliases"] = [f"alias-{position}"]
+    if explicit:
+        frontmatter["tags"] = [tag.lstrip("#") for tag in explicit]
+
+    return NoteMetadata(
+        path=path,
+        size=rng.randint(200, 8000),
+        ctime=_timestamp(created),
+        mtime=_timestamp(modified),
+        day=day,
+        tags=_with_parents(explicit),
+        etags=explicit,
+        aliases=list(frontmatter.get("aliases", [])),
+        frontmatter=frontmatter,
+    )
+
+
+def generate_vault(note_count: int, seed: int = 0) -> SyntheticVault:
+    """Generate a synthetic vault.
+
+    The same note_count and seed always produce the same vault.
+
+    Args:
+        note_count: Number of notes to generate
+        seed: Random seed
+
+    Returns:
+        SyntheticVault
+
+    Raises:
+        ValueError: If note_count is negative
+    """
+    if note_count < 0:
+        raise ValueError(f"Note count must not be negative, got {note_count}")
+    rng = random.Random(seed)
+    return SyntheticVault([_note(rng, position) for position in range(note_count)], seed)
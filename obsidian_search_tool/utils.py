@@ -1,18 +1,24 @@
 """Utility functions for obsidian-search-tool.
 
+Formatters depend only on their arguments and never modify them, so they can
+format responses on many threads at once (see format_search_many).
+
 Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
 import json
-import logging
-import sys
-from typing import Any
+from collections.abc import Callable, Sequence
+from typing import Any, TextIO
 
 from rich.console import Console
 from rich.table import Table
 
+from obsidian_search_tool import logging_config
+from obsidian_search_tool.core.compact import dump_compact, dumps_compact, encode_compact
 from obsidian_search_tool.core.models import AuthResponse, SearchResponse, StatusResponse
+from obsidian_search_tool.core.parallel import map_parallel
+from obsidian_search_tool.core.planner import QueryPlan
 
 console = Console()
 
@@ -21,7 +27,7 @@ def setup_logging(verbose: bool | int = False) -> None:
     """Configure logging for the application.
 
     DEPRECATED: Use obsidian_search_tool.logging_config.setup_logging() instead.
-    This function is kept for backward compatibility.
+    This function is kept for backward compatibility and delegates to it.
 
     Args:
         verbose: Enable verbose logging (bool for legacy, int for multi-level)
@@ -31,21 +37,7 @@ def setup_logging(verbose: bool | int = False) -> None:
         verbose_count = 1 if verbose else 0
     else:
         verbose_count = verbose
-
-    # Map to logging levels
-    if verbose_count == 0:
-        level = logging.WARNING
-    elif verbose_count == 1:
-        level = logging.INFO
-    else:
-        level = logging.DEBUG
-
-    logging.basicConfig(
-        level=level,
-        format="[%(levelname)s] %(message)s",
-        stream=sys.stderr,
-        force=True,
-    )
+    logging_config.setup_logging(verbose_count)
 
 
 def format_json(data: dict[str, Any]) -> str:
@@ -60,6 +52,19 @@ def format_json(data: dict[str, Any]) -> str:
     return json.dumps(data, indent=2, ensure_ascii=False)
 
 
+def write_json(data: dict[str, Any], fh: TextIO) -> None:
+    """Write data to a text stream as format_json() formats it.
+
+    The JSON is written as it is encoded, so the whole text is never held in
+    memory at once.
+
+    Args:
+        data: Dictionary to serialize as JSON
+        fh: Writable text stream
+    """
+    json.dump(data, fh, indent=2, ensure_ascii=False)
+
+
 def format_status_json(response: StatusResponse) -> str:
     """Format status response as JSON.
 
@@ -111,11 +116,81 @@ def format_search_json(response: SearchResponse) -> str:
     Returns:
         JSON string representation
     """
+    return format_json(_search_payload(response))
+
+
+def write_search_json(response: SearchResponse, fh: TextIO) -> None:
+    """Write search response to a text stream as format_search_json() formats it.
+
+    Args:
+        response: SearchResponse object
+        fh: Writable text stream
+    """
+    write_json(_search_payload(response), fh)
+
+
+def _search_payload(response: SearchResponse) -> dict[str, Any]:
     if response.success:
-        data = {"success": True, "data": response.data}
-    else:
-        data = {"success": False, "error": response.error}
-    return format_json(data)
+        return {"success": True, "data": response.data}
+    return {"success": False, "error": response.error}
+
+
+def format_search_compact(response: SearchResponse, max_cell: int | None = None) -> str:
+    """Format search response as compact, single-line JSON.
+
+    Results are encoded column-wise with dictionary-encoded repeated values
+    (see obsidian_search_tool.core.compact); other data fields are kept.
+
+    Args:
+        response: SearchResponse object
+        max_cell: Truncate strings longer than this many characters (None keeps all)
+
+    Returns:
+        JSON string without whitespace
+    """
+    return dumps_compact(_compact_payload(response, max_cell))
+
+
+def write_search_compact(response: SearchResponse, fh: TextIO, max_cell: int | None = None) -> None:
+    """Write search response to a text stream as format_search_compact() formats it.
+
+    Args:
+        response: SearchResponse object
+        fh: Writable text stream
+        max_cell: Truncate strings longer than this many characters (None keeps all)
+    """
+    dump_compact(_compact_payload(response, max_cell), fh)
+
+
+def _compact_payload(response: SearchResponse, max_cell: int | None) -> dict[str, Any]:
+    if not response.success:
+        return {"success": False, "error": response.error}
+    data = {key: value for key, value in (response.data or {}).items() if key != "results"}
+    data.update(encode_compact(response.results, max_cell))
+    return {"success": True, "data": data}
+
+
+def format_search_many(
+    responses: Sequence[SearchResponse],
+    formatter: Callable[[SearchResponse], str] = format_search_json,
+    workers: int | None = None,
+) -> list[str]:
+    """Format several search responses, in parallel where that helps.
+
+    On the free-threaded build the responses are formatted on a thread pool,
+    one core each; with the GIL they are formatted one after another.
+
+    Args:
+        responses: SearchResponse objects
+        formatter: Formatter applied to each response (default: format_search_json)
+        workers: Threads to use (default: OBSIDIAN_WORKERS, else the CPU count
+            without the GIL and 1 with it)
+
+    Returns:
+        Formatted outputs in input order
+    """
+    outputs: list[str] = map_parallel(formatter, responses, workers)
+    return outputs
 
 
 def format_status_text(response: StatusResponse) -> str:
@@ -183,6 +258,12 @@ def format_search_text(response: SearchResponse) -> str:
     lines.append(f"**Query:** {response.query}")
     lines.append(f"**Timestamp:** {response.timestamp}")
     lines.append(f"**Results Found:** {response.result_count} notes")
+    if response.incomplete:
+        reason = (response.data or {}).get("incomplete_reason", "some vaults failed")
+        lines.append(f"**Incomplete:** {reason}")
+    if response.stale:
+        age = (response.data or {}).get("cache_age_seconds", 0)
+        lines.append(f"**Stale:** cached {age:.0f}s ago, refreshing in the background")
     lines.append("")
 
     if response.result_count == 0:
@@ -197,6 +278,8 @@ def format_search_text(response: SearchResponse) -> str:
         if isinstance(result, dict):
             # Try to extract filename from result
             filename = result.get("filename", result.get("file", result.get("path", "Unknown")))
+            if "vault" in result:
+                filename = f"{result['vault']}: {filename}"
             # Create clickable link using OSC 8 (supported by some terminals)
             # Format: \x1b]8;;file://path\x1b\\text\x1b]8;;\x1b\\
             lines.append(f"- {filename}")
@@ -251,6 +334,81 @@ def format_search_table(response: SearchResponse) -> str:
     return output.getvalue()
 
 
+def format_plan_json(plan: QueryPlan) -> str:
+    """Format query plan as JSON.
+
+    Args:
+        plan: QueryPlan object
+
+    Returns:
+        JSON string representation
+    """
+    return format_json({"success": True, "data": plan.to_dict()})
+
+
+def format_plan_text(plan: QueryPlan) -> str:
+    """Format query plan as markdown text.
+
+    Args:
+        plan: QueryPlan object
+
+    Returns:
+        Markdown-formatted string
+    """
+    data = plan.to_dict()
+    lines = ["# Query Plan", ""]
+    lines.append(f"**Query Type:** {plan.search_type.capitalize()}")
+    lines.append(f"**Query:** {plan.query}")
+    lines.append(f"**Strategy:** {plan.strategy}")
+    lines.append(
+        f"**Estimated Cost:** {data['estimated_cost']} (full scan: {data['full_scan_cost']})"
+    )
+    if data["candidate_count"] is not None:
+        lines.append(f"**Candidates:** {data['candidate_count']} of {plan.total_notes} notes")
+    if plan.reason:
+        lines.append(f"**Note:** {plan.reason}")
+    lines.append("")
+    lines.append("## Steps")
+    lines.append("")
+    for step in plan.steps:
+        matches = f" ({step.matches} matches)" if step.matches is not None else ""
+        lines.append(f"- `{step.access}` {step.predicate}{matches}")
+    if plan.server_query and plan.server_query != plan.query:
+        lines.extend(["", "## Server Query", "", plan.server_query])
+    if plan.fallback_query:
+        lines.extend(["", "## Fallback Server Query", "", plan.fallback_query])
+    return "\n".join(lines)
+
+
+def format_timings_text(timings: dict[str, Any]) -> str:
+    """Format a ``--timings`` report as markdown text.
+
+    Args:
+        timings: Report from timings_report()
+
+    Returns:
+        Markdown-formatted string
+    """
+    peak = timings["peak_memory_bytes"]
+    peak_text = f"{peak / (1024 * 1024):.1f} MiB" if peak is not None else "N/A"
+    lines = ["## Timings", ""]
+    lines.append(f"**Requests:** {timings['requests']}")
+    phases = [
+        ("Connect", "connect_ms"),
+        ("Time to First Byte", "ttfb_ms"),
+        ("Transfer", "transfer_ms"),
+        ("Decode", "decode_ms"),
+        ("Format", "format_ms"),
+        ("Total", "total_ms"),
+    ]
+    for label, key in phases:
+        lines.append(f"**{label}:** {timings[key]:.1f} ms")
+    lines.append(f"**Response Bytes:** {timings['response_bytes']}")
+    lines.append(f"**Rows:** {timings['rows']}")
+    lines.append(f"**Peak Memory:** {peak_text}")
+    return "\n".join(lines)
+
+
 def format_error_json(message: str, code: str = "ERROR", status_code: int = 500) -> str:
     """Format error as JSON response.
 
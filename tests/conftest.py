@@ -0,0 +1,30 @@
+"""Shared fixtures for the test suite.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from collections.abc import Iterator
+
+import pytest
+
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault, generate_vault
+
+
+@pytest.fixture(scope="session")
+def vault() -> SyntheticVault:
+    """A small deterministic synthetic vault."""
+    return generate_vault(200, seed=7)
+
+
+@pytest.fixture
+def mock_server(vault: SyntheticVault) -> Iterator[MockObsidianServer]:
+    """A mock Local REST API serving the synthetic vault on a free port."""
+    with MockObsidianServer(vault) as server:
+        yield server
+
+
+@pytest.fixture
+def base_url(mock_server: MockObsidianServer) -> str:
+    """Base URL of the mock server."""
+    return mock_server.url
@@ -0,0 +1,74 @@
+"""Record the golden Local REST API responses from a live Obsidian vault.
+
+Usage:
+    # 1. Create the golden notes in a new, otherwise empty vault
+    python tests/golden/capture.py write-vault ~/vaults/golden
+
+    # 2. Open the vault in Obsidian with Dataview and Local REST API enabled,
+    #    then re-record every expected result from the plugin
+    OBSIDIAN_API_KEY=... python tests/golden/capture.py capture
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import click
+
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.models import SearchResponse
+
+FIXTURES = Path(__file__).parent / "plugin_responses.json"
+
+
+def _results(response: SearchResponse) -> list[dict[str, Any]]:
+    if not response.success:
+        raise click.ClickException(f"{response.query}: {response.error}")
+    return response.results
+
+
+@click.group()
+def main() -> None:
+    """Maintain tests/golden/plugin_responses.json."""
+
+
+@main.command("write-vault")
+@click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+def write_vault(directory: Path) -> None:
+    """Write the golden notes as markdown files with YAML frontmatter."""
+    golden = json.loads(FIXTURES.read_text(encoding="utf-8"))
+    for note in golden["vault"]:
+        path = directory / note["path"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # JSON values are valid YAML flow values
+        lines = [f"{key}: {json.dumps(value)}" for key, value in note["frontmatter"].items()]
+        if lines:
+            lines = ["---", *lines, "---"]
+        lines.append(f"# {path.stem}")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    click.echo(f"Wrote {len(golden['vault'])} notes to {directory}", err=True)
+
+
+@main.command()
+def capture() -> None:
+    """Replace every expected result with the live plugin's response."""
+    golden = json.loads(FIXTURES.read_text(encoding="utf-8"))
+    client = ObsidianClient(cache_ttl=0)
+    for case in golden["jsonlogic"]:
+        case["results"] = _results(client.search_jsonlogic(json.dumps(case["query"])))
+    for case in golden["dataview"]:
+        case["results"] = _results(client.search_dataview(case["query"]))
+    golden["source"] = (
+        f"Captured from the Local REST API at {client.base_url} "
+        f"on {datetime.now(UTC).date().isoformat()} with tests/golden/capture.py."
+    )
+    FIXTURES.write_text(f"{json.dumps(golden, indent=2, ensure_ascii=False)}\n", encoding="utf-8")
+    click.echo(f"Updated {FIXTURES}", err=True)
+
+
+if __name__ == "__main__":
+    main()
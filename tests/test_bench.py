@@ -0,0 +1,94 @@
+"""Tests for the latency histogram and the bench load generator.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from obsidian_search_tool.core.bench import BenchQuery, load_corpus, run_benchmark
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.histogram import LatencyHistogram
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+CORPUS = [
+    BenchQuery('TABLE status FROM "projects" LIMIT 5'),
+    BenchQuery('{"in": ["project", {"var": "tags"}]}', "jsonlogic"),
+]
+
+
+def test_histogram_percentiles_and_merge() -> None:
+    """Test percentiles stay within bucket precision and merging adds counts."""
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in range(1, 5001):
+        first.record(value)
+    second.record(100_000, count=10)
+    first.merge(second)
+    assert first.count == 5010
+    assert first.min == 1 and first.max == 100_000
+    assert abs(first.value_at_percentile(50) - 2505) / 2505 < 0.01
+    assert first.value_at_percentile(100) == 100_000
+    rows = first.percentile_distribution()
+    assert rows[0].percentile == 0.0 and rows[-1].percentile == 100.0
+    assert [row.value for row in rows] == sorted(row.value for row in rows)
+    assert rows[-1].total_count == 5010
+
+
+def test_load_corpus(tmp_path: Path) -> None:
+    """Test corpus lines as strings and objects, and rejection of bad lines."""
+    corpus = tmp_path / "queries.ndjson"
+    corpus.write_text(
+        json.dumps("TABLE file.name")
+        + "\n\n"
+        + json.dumps({"query": {"var": "tags"}, "type": "JsonLogic"})
+        + "\n",
+        encoding="utf-8",
+    )
+    assert load_corpus(corpus) == [
+        BenchQuery("TABLE file.name"),
+        BenchQuery('{"var": "tags"}', "jsonlogic"),
+    ]
+    corpus.write_text('{"query": "x", "type": "sql"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="unknown query type"):
+        load_corpus(corpus)
+
+
+@pytest.mark.parametrize("rate", [None, 200.0])
+def test_run_benchmark(mock_server: MockObsidianServer, rate: float | None) -> None:
+    """Test closed- and open-loop runs against the mock server."""
+    result = run_benchmark(
+        CORPUS,
+        duration=0.3,
+        concurrency=2,
+        rate=rate,
+        client_factory=lambda: ObsidianClient(
+            base_url=mock_server.url, api_key="test-key", cache_ttl=0, coalesce=False
+        ),
+    )
+    assert result.requests > 0
+    assert result.failed == 0
+    assert mock_server.requests_served >= result.requests
+    data = result.to_dict()
+    assert data["mode"] == ("closed-loop" if rate is None else "open-loop")
+    assert data["latency_ms"]["p50"] <= data["latency_ms"]["max"]
+    if rate is not None:
+        # The schedule, not the server, bounds open-loop throughput
+        assert result.requests <= rate * 0.3 + 1
+
+
+def test_run_benchmark_counts_errors_by_code(vault: SyntheticVault) -> None:
+    """Test failed requests are grouped by error code."""
+    with MockObsidianServer(vault, error_rate=1.0, error_status=503) as server:
+        result = run_benchmark(
+            CORPUS,
+            duration=0.2,
+            concurrency=2,
+            client_factory=lambda: ObsidianClient(
+                base_url=server.url, api_key="test-key", cache_ttl=0, retries=0, circuit_threshold=0
+            ),
+        )
+    assert result.requests > 0
+    assert result.errors == {"SERVER_ERROR": result.requests}
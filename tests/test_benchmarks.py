@@ -0,0 +1,38 @@
+"""Tests for the benchmark suite's statistics and baseline comparison.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from typing import Any
+
+from benchmarks.compare import compare_reports
+from benchmarks.suite import measure, percentile
+
+
+def _report(p50: float, peak: int) -> dict[str, Any]:
+    row = {"stage": "format_json", "rows": 1000, "p50_ms": p50, "p99_ms": 2.0}
+    return {"results": [{**row, "peak_memory_bytes": peak}]}
+
+
+def test_percentile_nearest_rank() -> None:
+    """Test nearest-rank percentiles."""
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 0.5) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    """Test that only metrics growing beyond the threshold are regressions."""
+    comparisons = compare_reports(_report(1.0, 1000), _report(1.05, 1500), threshold=0.1)
+    flagged = {item.metric for item in comparisons if item.regression}
+    assert flagged == {"peak_memory_bytes"}
+
+
+def test_measure_reports_latency_and_memory() -> None:
+    """Test that measure() times iterations and traces allocations."""
+    result = measure("alloc", 10, lambda: [0] * 100_000, min_time=0.0, min_iterations=5)
+    assert result.iterations == 5
+    assert result.p50_ms > 0
+    assert result.peak_memory_bytes >= 800_000
@@ -0,0 +1,121 @@
+"""Tests for ObsidianClient against the mock Local REST API server.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import threading
+
+import pytest
+import requests
+
+from obsidian_search_tool.core.client import (
+    ObsidianAuthError,
+    ObsidianClient,
+    ObsidianConnectionError,
+)
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault, generate_vault
+
+
+def _client(server: MockObsidianServer, api_key: str = "test-key") -> ObsidianClient:
+    return ObsidianClient(base_url=server.url, api_key=api_key, timeout=5)
+
+
+def test_status_and_auth(mock_server: MockObsidianServer) -> None:
+    """Test the status endpoint and rejection of a wrong API key."""
+    assert _client(mock_server).status().status == "connected"
+    with pytest.raises(ObsidianAuthError):
+        _client(mock_server, api_key="wrong").search_dataview("TABLE file.name")
+
+
+def test_dataview_search(mock_server: MockObsidianServer, vault: SyntheticVault) -> None:
+    """Test DQL TABLE queries return rows in the plugin's shape."""
+    response = _client(mock_server).search_dataview(
+        'TABLE status, priority FROM "projects" WHERE priority >= 4 SORT file.name LIMIT 5'
+    )
+    assert response.success
+    assert 0 < response.result_count <= 5
+    for row in response.results:
+        note = next(note for note in vault.notes if note.path == row["filename"])
+        assert row["filename"].startswith("projects/")
+        assert row["result"] == {
+            "status": note.frontmatter["status"],
+            "priority": note.frontmatter["priority"],
+        }
+
+    response = _client(mock_server).search_dataview("LIST FROM #project")
+    assert not response.success
+    assert response.error is not None and response.error["status_code"] == 400
+
+
+def test_jsonlogic_search_reads_content(
+    mock_server: MockObsidianServer, vault: SyntheticVault
+) -> None:
+    """Test JsonLogic queries over filename and generated note content."""
+    client = _client(mock_server)
+    response = client.search_jsonlogic('{"glob": ["daily/*", {"var": "filename"}]}')
+    expected = [note.path for note in vault.notes if note.path.startswith("daily/")]
+    assert [row["filename"] for row in response.results] == expected
+
+    target = vault.notes[0].name
+    response = client.search_jsonlogic(json.dumps({"in": [f"[[{target}]]", {"var": "content"}]}))
+    assert all(f"[[{target}]]" in vault.content(row["filename"]) for row in response.results)
+
+
+def test_fused_batch_matches_individual_queries(mock_server: MockObsidianServer) -> None:
+    """Test that fused batches return what the queries return one by one."""
+    client = _client(mock_server)
+    queries = [
+        '{"in": ["project", {"var": "frontmatter.tags"}]}',
+        '{"==": [{"var": "frontmatter.status"}, "active"]}',
+        '{"glob": ["inbox/*", {"var": "filename"}]}',
+    ]
+    served = mock_server.requests_served
+    fused = client.search_jsonlogic_batch(queries)
+    assert mock_server.requests_served == served + 1
+    for query, response in zip(queries, fused, strict=True):
+        assert response.results == client.search_jsonlogic(query).results
+
+
+def test_error_injection_and_latency(vault: SyntheticVault) -> None:
+    """Test injected server errors and response latency."""
+    with MockObsidianServer(vault, error_rate=1.0, error_status=503) as server:
+        response = _client(server).search_dataview("TABLE file.name")
+        assert response.error is not None
+        assert response.error["code"] == "SERVER_ERROR"
+        assert response.error["status_code"] == 503
+
+    with MockObsidianServer(vault, latency=1.5) as server:
+        with pytest.raises(ObsidianConnectionError):
+            ObsidianClient(base_url=server.url, api_key="test-key", timeout=1).status()
+
+
+def test_generate_vault_is_deterministic() -> None:
+    """Test that the same seed yields the same vault."""
+    first, second = generate_vault(50, seed=3), generate_vault(50, seed=3)
+    assert first.notes == second.notes
+    assert first.content(first.notes[10].path) == second.content(second.notes[10].path)
+    assert generate_vault(50, seed=4).notes != first.notes
+    assert all(tag.startswith("#") for note in first.notes for tag in note.tags)
+
+
+def test_close_closes_sessions_of_all_threads(
+    mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test sessions opened by other threads are closed, finished threads' ones early."""
+    closed: list[requests.Session] = []
+    monkeypatch.setattr(requests.Session, "close", lambda session: closed.append(session))
+    client = _client(mock_server)
+    for _ in range(3):
+        thread = threading.Thread(target=client.status)
+        thread.start()
+        thread.join()
+    # Each new session closes those of threads that have finished
+    assert len(closed) == 2
+
+    with client:
+        client.status()
+    assert len(closed) == 4
+    client.status()
+    assert len(closed) == 4
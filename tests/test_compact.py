@@ -0,0 +1,92 @@
+"""Tests for the compact output format and its decoder.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool import decode_compact, encode_compact
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.models import SearchResponse
+from obsidian_search_tool.testing import MockObsidianServer
+from obsidian_search_tool.utils import (
+    format_search_compact,
+    format_search_json,
+    write_search_compact,
+    write_search_json,
+)
+
+ROWS = [
+    {"filename": "projects/alpha.md", "result": {"status": "active", "n": 1, "tags": ["a", "b"]}},
+    {"filename": "projects/beta.md", "result": {"status": "done", "n": 2, "tags": ["a"]}},
+    {"filename": "projects/gamma.md", "result": {"status": "active", "n": None, "tags": []}},
+    {"filename": "top.md", "result": {"status": "active", "n": 3, "tags": ["b"]}},
+]
+
+
+def test_encode_and_decode_round_trip() -> None:
+    """Test dictionary and path encoding, and decoding back to the API rows."""
+    payload = encode_compact(ROWS)
+    assert payload["columns"] == ["filename", "status", "n", "tags"]
+    assert payload["keys"] == 1
+    assert payload["encodings"] == ["path", "dict", None, "dict"]
+    assert payload["dicts"][0] == ["projects", ""]
+    assert payload["rows"][0] == [[0, "alpha.md"], 0, 1, [0, 1]]
+    assert payload["rows"][3] == [[1, "top.md"], 0, 3, [1]]
+    assert decode_compact(json.loads(json.dumps(payload))) == ROWS
+
+    for rows in ([], ["a", "b"], [{"filename": "x.md", "result": True}]):
+        assert decode_compact(encode_compact(rows)) == rows
+    with pytest.raises(ValueError, match="Unsupported compact format"):
+        decode_compact({"format": "compact/0"})
+
+
+def test_truncation_and_unique_values() -> None:
+    """Test long strings are cut and columns of unique values stay as they are."""
+    rows = [{"filename": f"n{i}.md", "result": {"body": f"{i}" * 50}} for i in range(3)]
+    payload = encode_compact(rows, max_cell=10)
+    assert payload["encodings"] == [None, None]
+    assert payload["truncated"] == 3
+    assert decode_compact(payload)[0]["result"]["body"] == "000000000…"
+
+
+def test_compact_output_is_smaller(mock_server: MockObsidianServer) -> None:
+    """Test the compact format against format_search_json on mock results."""
+    query = 'TABLE file.folder, status, priority, file.tags FROM "projects"'
+    response = SearchResponse(
+        success=True,
+        data={"query": query, "search_type": "dataview", "results": ROWS * 50},
+        error=None,
+    )
+    compact = format_search_compact(response)
+    assert len(compact) * 2 < len(format_search_json(response))
+    data = json.loads(compact)["data"]
+    assert data["query"] == query and decode_compact(data) == ROWS * 50
+
+    runner = CliRunner()
+    env = {"OBSIDIAN_BASE_URL": mock_server.url, "OBSIDIAN_API_KEY": "test-key"}
+    result = runner.invoke(main, ["search", "--format", "compact", query], env=env)
+    assert result.exit_code == 0, result.output
+    assert result.stdout.count("\n") == 1
+    plain = runner.invoke(main, ["search", query], env=env)
+    assert (
+        decode_compact(json.loads(result.stdout)["data"])
+        == json.loads(plain.stdout)["data"]["results"]
+    )
+
+
+def test_writers_match_formatters() -> None:
+    """Test the streaming writers produce exactly what the formatters return."""
+    response = SearchResponse(success=True, data={"query": "q", "results": ROWS}, error=None)
+    for formatted, write in (
+        (format_search_json(response), write_search_json),
+        (format_search_compact(response, 5), lambda r, fh: write_search_compact(r, fh, 5)),
+    ):
+        stream = io.StringIO()
+        write(response, stream)
+        assert stream.getvalue() == formatted
@@ -0,0 +1,163 @@
+"""Tests for the adaptive concurrency limiter.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from obsidian_search_tool.core.client import ObsidianAPIError, ObsidianClient
+from obsidian_search_tool.core.concurrency import (
+    AdaptiveLimiter,
+    current_priority,
+    priority_scope,
+)
+from obsidian_search_tool.core.deadline import Deadline, deadline_scope
+from obsidian_search_tool.core.metrics import MetricsRegistry
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+QUERY = 'TABLE file.name FROM "projects"'
+
+
+def _round(limiter: AdaptiveLimiter, latency: float | None, overloaded: bool = False) -> None:
+    """Fill every slot, then complete all requests."""
+    taken = 0
+    while limiter.acquire(timeout=0):
+        taken += 1
+    for _ in range(taken):
+        limiter.release(latency, overloaded)
+
+
+def test_aimd() -> None:
+    """Test additive increase under use and one multiplicative cut per window."""
+    # Completions while the limit is mostly unused do not raise it
+    idle = AdaptiveLimiter(max_limit=6, initial_limit=4)
+    assert idle.acquire()
+    idle.release(0.01)
+    assert idle.limit == 4
+
+    limiter = AdaptiveLimiter(max_limit=6)
+    assert limiter.limit == 2
+    for _ in range(10):
+        _round(limiter, 0.01)
+    assert limiter.limit == 6
+
+    # Only the first of the failures sent under the old limit cuts it
+    _round(limiter, None, overloaded=True)
+    assert int(limiter.limit) == 4
+    for _ in range(10):
+        _round(limiter, None, overloaded=True)
+    assert limiter.limit == 1
+    assert limiter.in_flight == 0
+
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(max_limit=0)
+
+
+def test_latency_rise_lowers_limit() -> None:
+    """Test a smoothed latency above the baseline tolerance counts as overload."""
+    limiter = AdaptiveLimiter(max_limit=8, initial_limit=8)
+    for _ in range(3):
+        _round(limiter, 0.01)
+    assert limiter.limit == 8
+    for _ in range(3):
+        _round(limiter, 0.1)
+    assert limiter.limit < 8
+
+
+def test_client_shares_limit(vault: SyntheticVault) -> None:
+    """Test clients of one endpoint share the limit and a deadline bounds the wait."""
+    registry = MetricsRegistry()
+    with MockObsidianServer(vault, latency=0.1) as server:
+        clients = [
+            ObsidianClient(
+                base_url=server.url,
+                api_key="test-key",
+                cache_ttl=0,
+                metrics=registry,
+                max_concurrency=1,
+                coalesce=False,
+            )
+            for _ in range(2)
+        ]
+        assert clients[0].limiter is clients[1].limiter
+        started = time.perf_counter()
+        with ThreadPoolExecutor(4) as pool:
+            responses = list(pool.map(lambda i: clients[i % 2].search_dataview(QUERY), range(4)))
+        assert time.perf_counter() - started >= 0.4
+        assert all(response.success for response in responses)
+
+        holding = threading.Thread(target=clients[0].search_dataview, args=(QUERY,))
+        holding.start()
+        time.sleep(0.02)
+        served = server.requests_served
+        with deadline_scope(Deadline(0.03)):
+            response = clients[1].search_dataview(QUERY)
+        holding.join()
+    assert response.incomplete
+    assert "waiting for a request slot" in response.data["incomplete_reason"]  # type: ignore[index]
+    assert server.requests_served == served
+
+    labels = (server.url,)
+    assert registry.gauge("obsidian_concurrency_limit", "", ("endpoint",)).value(labels) == 1
+    assert registry.gauge("obsidian_requests_in_flight", "", ("endpoint",)).value(labels) == 0
+
+
+def test_server_errors_lower_limit(vault: SyntheticVault) -> None:
+    """Test 5xx responses cut the limit and unlimited clients have no limiter."""
+    with MockObsidianServer(vault) as server:
+        client = ObsidianClient(
+            base_url=server.url, api_key="test-key", cache_ttl=0, max_concurrency=8
+        )
+        limiter = client.limiter
+        assert limiter is not None
+        limiter.limit = 8.0
+        server.error_rate = 1.0
+        for _ in range(8):
+            with pytest.raises(ObsidianAPIError):
+                client._make_request("GET", "/")
+        assert limiter.limit < 8
+        assert ObsidianClient(base_url=server.url, api_key="x", max_concurrency=0).limiter is None
+
+
+def test_priority_schedule() -> None:
+    """Test waiting requests are served by weighted fair queuing across classes."""
+    limiter = AdaptiveLimiter(max_limit=1)
+    assert limiter.acquire(priority="bulk")
+    order: list[str] = []
+
+    def request(priority: str) -> None:
+        assert limiter.acquire(priority=priority)
+        order.append(priority)
+        limiter.release(0.001, priority=priority)
+
+    classes = ["bulk"] * 6 + ["normal"] * 3 + ["interactive"] * 2
+    threads = [threading.Thread(target=request, args=(priority,)) for priority in classes]
+    for thread in threads:
+        thread.start()
+    while sum(limiter.queued().values()) < len(classes):
+        time.sleep(0.001)
+    limiter.release(0.001, priority="bulk")
+    for thread in threads:
+        thread.join()
+    # Bulk just had a slot, so the other classes go first, in proportion to their weights
+    assert [priority[0] for priority in order] == list("ininnbbbbbb")
+
+
+def test_priority_caps_and_scope() -> None:
+    """Test bulk requests cannot take every slot and unknown classes are rejected."""
+    limiter = AdaptiveLimiter(max_limit=4, initial_limit=4)
+    assert limiter.acquire(priority="bulk") and limiter.acquire(priority="bulk")
+    assert not limiter.acquire(timeout=0.02, priority="bulk")
+    assert limiter.queued() == {"interactive": 0, "normal": 0, "bulk": 0}
+    assert limiter.acquire(timeout=0, priority="interactive")
+
+    with priority_scope("bulk"):
+        assert current_priority() == "bulk"
+    assert current_priority() == "normal"
+    with pytest.raises(ValueError, match="Unknown priority"), priority_scope("urgent"):
+        pass
@@ -0,0 +1,116 @@
+"""Tests for end-to-end deadlines and partial results.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.deadline import Deadline, deadline_scope, parse_seconds
+from obsidian_search_tool.core.vaults import VaultProfile, search_vaults
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+QUERY = 'TABLE file.name FROM "projects"'
+
+
+def test_parse_seconds_and_budgets() -> None:
+    """Test duration parsing and the connect/read split of the time left."""
+    assert parse_seconds("2s") == 2.0
+    assert parse_seconds("500ms") == 0.5
+    assert parse_seconds("1.5m") == 90.0
+    assert parse_seconds("3") == 3.0
+    for text in ("", "0s", "2h", "-1"):
+        with pytest.raises(ValueError):
+            parse_seconds(text)
+
+    now = [100.0]
+    deadline = Deadline(2.0, clock=lambda: now[0])
+    assert deadline.request_timeout(30) == (0.5, 1.5)
+    assert deadline.request_timeout(1) == (0.5, 1.0)
+    now[0] = 103.0
+    assert deadline.expired() and deadline.remaining() == 0.0
+
+
+def test_slow_search_returns_incomplete(vault: SyntheticVault) -> None:
+    """Test a search that outlives the deadline returns an incomplete response."""
+    with MockObsidianServer(vault, latency=0.5) as server:
+        client = ObsidianClient(base_url=server.url, api_key="test-key", cache_ttl=0)
+        started = time.perf_counter()
+        with deadline_scope(Deadline(0.1)):
+            response = client.search_dataview(QUERY)
+        assert time.perf_counter() - started < 0.4
+    assert response.success and response.incomplete
+    assert response.results == []
+    assert "Deadline of 0.1s exceeded" in response.data["incomplete_reason"]  # type: ignore[index]
+
+
+def test_slow_body_returns_incomplete(vault: SyntheticVault) -> None:
+    """Test the deadline also bounds reading a body that keeps trickling in."""
+    with MockObsidianServer(vault, body_delay=1.0) as server:
+        client = ObsidianClient(base_url=server.url, api_key="test-key", cache_ttl=0)
+        started = time.perf_counter()
+        with deadline_scope(Deadline(0.3)):
+            response = client.search_dataview(QUERY)
+        assert time.perf_counter() - started < 0.7
+        assert response.success and response.incomplete
+        assert "while reading the response" in response.data["incomplete_reason"]  # type: ignore[index]
+
+        # The aborted connection is not reused for the next request
+        with deadline_scope(Deadline(5.0)):
+            response = client.search_dataview(QUERY)
+        assert not response.incomplete and response.result_count > 0
+
+
+def test_expired_deadline_sends_nothing(mock_server: MockObsidianServer) -> None:
+    """Test no request is sent once the deadline has run out, including fused batches."""
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key", cache_ttl=0)
+    assert not client.search_dataview(QUERY).incomplete
+    served = mock_server.requests_served
+    with deadline_scope(Deadline(0.001)):
+        time.sleep(0.01)
+        responses = client.search_jsonlogic_batch(
+            ['{"in": ["project", {"var": "tags"}]}', '{"==": [{"var": "status"}, "done"]}']
+        )
+    assert [response.incomplete for response in responses] == [True, True]
+    assert mock_server.requests_served == served
+
+
+def test_fan_out_keeps_fast_vaults(vault: SyntheticVault) -> None:
+    """Test the deadline reaches fan-out workers and slow vaults are reported."""
+    with (
+        MockObsidianServer(vault) as fast,
+        MockObsidianServer(vault, latency=1.0) as slow,
+    ):
+        profiles = [
+            VaultProfile("fast", fast.url, "test-key"),
+            VaultProfile("slow", slow.url, "test-key"),
+        ]
+        with deadline_scope(Deadline(0.3)):
+            response = search_vaults(profiles, QUERY)
+    assert response.success and response.incomplete
+    statuses = {status["vault"]: status for status in response.data["vaults"]}  # type: ignore[index]
+    assert statuses["fast"]["ok"]
+    assert statuses["slow"]["error"]["code"] == "DEADLINE_EXCEEDED"
+    assert response.result_count == statuses["fast"]["rows"] > 0
+
+
+def test_cli_deadline(vault: SyntheticVault, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test --deadline returns partial JSON and rejects malformed durations."""
+    with MockObsidianServer(vault, latency=0.5) as server:
+        monkeypatch.setenv("OBSIDIAN_BASE_URL", server.url)
+        monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+        runner = CliRunner()
+        result = runner.invoke(main, ["search", "--deadline", "100ms", QUERY])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.stdout)["data"]
+    assert data["incomplete"] is True and data["results"] == []
+
+    result = runner.invoke(main, ["search", "--deadline", "soon", QUERY])
+    assert result.exit_code == 2
+    assert "Invalid duration" in result.output
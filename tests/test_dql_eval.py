@@ -0,0 +1,131 @@
+"""Tests for the local DQL evaluator.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from obsidian_search_tool.core.dql import UnsupportedDqlError, parse_query
+from obsidian_search_tool.core.dql_eval import compare_values, evaluate_query
+from obsidian_search_tool.core.metadata import MetadataSnapshot, NoteMetadata
+from obsidian_search_tool.core.models import SearchResponse
+from obsidian_search_tool.core.planner import execute_plan, plan_query
+
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=timezone(timedelta(hours=1)))
+
+
+def _snapshot() -> MetadataSnapshot:
+    notes = [
+        NoteMetadata(
+            path="projects/aws.md",
+            size=2048,
+            mtime="2025-03-09T10:00:00.000+01:00",
+            tags=["#project", "#project/aws"],
+            frontmatter={"status": "active", "Due Date": "2025-03-15", "priority": 2},
+        ),
+        NoteMetadata(
+            path="projects/Beta.md",
+            size=512,
+            mtime="2025-01-01T10:00:00.000+01:00",
+            tags=["#projects"],
+            frontmatter={"status": "done", "priority": 1, "owner": "[[Ben]]"},
+        ),
+        NoteMetadata(
+            path="inbox/alpha.md",
+            size=100,
+            mtime="2025-03-01T10:00:00.000+01:00",
+            frontmatter={"priority": 2},
+        ),
+    ]
+    return MetadataSnapshot(notes, "http://127.0.0.1:27123", time.time())
+
+
+def _rows(query: str) -> list[dict[str, Any]]:
+    return evaluate_query(parse_query(query), _snapshot(), now=NOW)
+
+
+def test_where_sort_limit_rows() -> None:
+    """Test filtering, sorting and projection in the plugin's row shape."""
+    rows = _rows(
+        'TABLE file.name, file.size / 1024 AS "KB", file.mtime '
+        "WHERE file.mtime >= date(today) - dur(30 days) SORT file.size DESC LIMIT 1"
+    )
+    assert rows == [
+        {
+            "filename": "projects/aws.md",
+            "result": {"file.name": "aws", "KB": 2, "file.mtime": "2025-03-09T10:00:00.000+01:00"},
+        }
+    ]
+
+
+def test_contains_matches_substrings_of_list_elements() -> None:
+    """Test Dataview's contains()/econtains() distinction on lists."""
+    contains = _rows('TABLE file.name WHERE contains(file.tags, "#proj")')
+    econtains = _rows('TABLE file.name WHERE econtains(file.tags, "#project")')
+    assert [row["filename"] for row in contains] == ["projects/aws.md", "projects/Beta.md"]
+    assert [row["filename"] for row in econtains] == ["projects/aws.md"]
+
+
+def test_frontmatter_fields_are_parsed_like_dataview() -> None:
+    """Test canonical field names and date parsing of frontmatter values."""
+    rows = _rows("TABLE due-date, file.frontmatter.status FROM #project")
+    assert rows[0]["result"]["due-date"].startswith("2025-03-15T00:00:00.000")
+    assert rows[0]["result"]["file.frontmatter.status"] == "active"
+
+
+def test_sort_uses_locale_order_for_strings() -> None:
+    """Test that strings sort case-insensitively, as localeCompare does."""
+    rows = _rows("TABLE file.name SORT file.name ASC")
+    assert [row["result"]["file.name"] for row in rows] == ["alpha", "aws", "Beta"]
+    assert compare_values("a", "B") < 0
+    assert compare_values(None, 0) < 0
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "TABLE owner",
+        "TABLE file.name SORT priority DESC LIMIT 1",
+        "TABLE file.name LIMIT 1",
+        "TABLE file.outlinks",
+        "TABLE rows.file.name GROUP BY status",
+    ],
+)
+def test_unsupported_queries_raise(query: str) -> None:
+    """Test links, ambiguous LIMITs and unsupported commands are reported."""
+    with pytest.raises(UnsupportedDqlError):
+        _rows(query)
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    def search_dataview(self, query: str) -> SearchResponse:
+        self.queries.append(query)
+        data = {"query": query, "search_type": "dataview", "timestamp": "", "results": []}
+        return SearchResponse(success=True, data=data, error=None)
+
+
+def test_execute_plan_falls_back_to_server() -> None:
+    """Test that local plans run locally and fall back when evaluation gives up."""
+    snapshot = _snapshot()
+    client = _FakeClient()
+
+    plan = plan_query('TABLE status WHERE status = "active"', "dataview", snapshot)
+    assert plan.strategy == "local"
+    response = execute_plan(client, plan, snapshot)  # type: ignore[arg-type]
+    assert response.data is not None and response.data["plan"] == "local"
+    assert [row["filename"] for row in response.results] == ["projects/aws.md"]
+    assert client.queries == []
+
+    plan = plan_query("TABLE owner", "dataview", snapshot)
+    assert plan.strategy == "local"
+    response = execute_plan(client, plan, snapshot)  # type: ignore[arg-type]
+    assert response.data is not None and response.data["plan"] == "server"
+    assert client.queries == ["TABLE owner"]
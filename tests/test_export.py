@@ -0,0 +1,107 @@
+"""Tests for the SQLite export.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.export import (
+    ExportError,
+    export_sqlite,
+    infer_columns,
+    page_query,
+)
+from obsidian_search_tool.testing import MockObsidianServer
+
+QUERY = "TABLE status, priority, file.tags, file.size WHERE status"
+
+
+def test_page_query_and_column_types() -> None:
+    """Test keyset pages are appended to the query and types follow the sample."""
+    assert page_query(QUERY, 50, "a/b.md") == (
+        "TABLE status, priority, file.tags, file.size\nWHERE status\n"
+        'WHERE file.path > "a/b.md"\nSORT file.path ASC\nLIMIT 50'
+    )
+    with pytest.raises(ExportError, match="cannot be paginated"):
+        page_query("TABLE status LIMIT 5", 50)
+
+    rows = [
+        {"filename": "a.md", "result": {"n": 1, "x": 1.5, "s": "a", "l": [1], "S": None}},
+        {"filename": "b.md", "result": {"n": True, "x": 2, "s": None, "l": None, "S": None}},
+    ]
+    columns = infer_columns(rows)
+    assert [(c.name, c.type) for c in columns] == [
+        ("filename", "TEXT"),
+        ("n", "INTEGER"),
+        ("x", "REAL"),
+        ("s", "TEXT"),
+        ("l", "TEXT"),
+        ("S_2", "TEXT"),
+    ]
+    assert [(c.name, c.key) for c in infer_columns([{"filename": "a.md", "result": True}])] == [
+        ("filename", None),
+        ("result", ""),
+    ]
+
+
+def test_paged_export_matches_search(mock_server: MockObsidianServer, tmp_path: Path) -> None:
+    """Test small batches, transactions and pages load the same rows as one search."""
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key", cache_ttl=0)
+    expected = {row["filename"]: row["result"] for row in client.search_dataview(QUERY).results}
+    database = tmp_path / "vault.db"
+    result = export_sqlite(
+        client,
+        database,
+        "notes",
+        QUERY,
+        page_size=30,
+        indexes=("filename", "status"),
+        batch_size=7,
+        transaction_rows=20,
+        sample_size=10,
+    )
+    assert result.rows == len(expected) > 60
+    assert result.pages == len(expected) // 30 + 1
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert {row[1] for row in connection.execute("PRAGMA index_list(notes)")} == {
+        "idx_notes_filename",
+        "idx_notes_status",
+    }
+    stored = connection.execute('SELECT filename, status, priority, "file.tags" FROM notes')
+    for filename, status, priority, tags in stored:
+        assert status == expected[filename]["status"]
+        assert priority == expected[filename]["priority"]
+        assert json.loads(tags) == expected[filename]["file.tags"]
+    connection.close()
+
+
+def test_cli_if_exists(mock_server: MockObsidianServer, tmp_path: Path) -> None:
+    """Test fail, replace and append, and that failed loads leave the table as it was."""
+    runner = CliRunner()
+    env = {"OBSIDIAN_BASE_URL": mock_server.url, "OBSIDIAN_API_KEY": "test-key"}
+    database = str(tmp_path / "out.db")
+
+    def export(*args: str) -> dict[str, object]:
+        result = runner.invoke(main, ["export", "sqlite", database, *args, QUERY], env=env)
+        return dict(json.loads(result.stdout))
+
+    rows = export()["data"]["rows"]  # type: ignore[index]
+    assert export()["error"]["code"] == "EXPORT_ERROR"  # type: ignore[index]
+    assert export("--if-exists", "replace", "--index", "nope")["success"] is False
+    assert export("--if-exists", "append", "--page-size", "40")["success"] is True
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("SELECT count(*) FROM results").fetchone() == (rows * 2,)
+    tables = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    assert [name for (name,) in tables] == ["results"]
+    connection.close()
@@ -0,0 +1,107 @@
+"""Tests for JsonLogic evaluation and query fusion.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+
+import pytest
+
+from obsidian_search_tool.core.fusion import FusionError, plan_fusion, split_fused_results
+from obsidian_search_tool.core.jsonlogic import (
+    UnsupportedJsonLogicError,
+    apply,
+    check_supported,
+    collect_vars,
+)
+
+NOTES = [
+    {"filename": "daily/2025-01-01.md", "frontmatter": {"tags": ["daily", "meeting"]}},
+    {"filename": "projects/aws.md", "frontmatter": {"tags": ["project", "aws"], "size": 3}},
+    {"filename": "inbox.md", "frontmatter": {}},
+]
+
+
+def test_apply_tag_membership() -> None:
+    """Test the `in` operation against a frontmatter array."""
+    rule = {"in": ["project", {"var": "frontmatter.tags"}]}
+    assert [apply(rule, note) for note in NOTES] == [False, True, False]
+
+
+def test_apply_javascript_semantics() -> None:
+    """Test truthiness, loose equality and arithmetic follow json-logic-js."""
+    assert apply({"!!": [[]]}) is False
+    assert apply({"==": [1, "1"]}) is True
+    assert apply({"===": [1, "1"]}) is False
+    assert apply({"+": [1, "2"]}) == 3
+    assert apply({"cat": ["a", 1, True]}) == "a1true"
+    assert apply({"cat": ["a", None, {"var": "missing"}]}, {}) == "a"
+    assert apply({"var": ["missing.path", "fallback"]}, {}) == "fallback"
+    assert apply({"glob": ["daily/*", {"var": "filename"}]}, NOTES[0]) is True
+
+
+def test_unsupported_operation_is_detected() -> None:
+    """Test that unknown operations are rejected before local evaluation."""
+    with pytest.raises(UnsupportedJsonLogicError):
+        check_supported({"startsWith": [{"var": "filename"}, "daily/"]})
+
+
+def test_collect_vars_skips_scoped_variables() -> None:
+    """Test that element-scoped vars in map/filter are not collected."""
+    rule = {"some": [{"var": "frontmatter.tags"}, {"==": [{"var": ""}, "aws"]}]}
+    assert collect_vars(rule) == {"frontmatter.tags"}
+
+
+def _server_response(query: str, notes: list[dict[str, object]] = NOTES) -> list[dict[str, object]]:
+    """Evaluate a query the way the plugin does, over notes."""
+    rule = json.loads(query)
+    results = []
+    for note in notes:
+        value = apply(rule, note)
+        if value:
+            results.append({"filename": note["filename"], "result": value})
+    return results
+
+
+def test_fused_results_match_individual_queries() -> None:
+    """Test that splitting a fused response reproduces each query's own result."""
+    queries = [
+        '{"in": ["project", {"var": "frontmatter.tags"}]}',
+        '{"in": ["daily", {"var": "filename"}]}',
+        '{"startsWith": [{"var": "filename"}, "inbox"]}',
+        '{"var": "frontmatter.size"}',
+    ]
+    batches, standalone = plan_fusion(queries)
+    assert standalone == [2]
+    assert len(batches) == 1
+
+    batch = batches[0]
+    assert batch.fields == ["filename", "frontmatter.size", "frontmatter.tags"]
+    split = split_fused_results(batch, _server_response(batch.query))
+    for index, results in zip(batch.indexes, split, strict=True):
+        assert results == _server_response(queries[index])
+
+
+def test_split_rejects_unexpected_shape() -> None:
+    """Test that a response without projected fields is rejected."""
+    batches, _ = plan_fusion(['{"var": "filename"}', '{"var": "frontmatter.tags"}'])
+    with pytest.raises(FusionError):
+        split_fused_results(batches[0], [{"filename": "a.md", "result": True}])
+
+
+def test_fused_split_keeps_null_fields() -> None:
+    """Test var defaults apply to missing fields but not to null ones, as on the server."""
+    notes: list[dict[str, object]] = [
+        {"filename": "a.md", "frontmatter": {"status": None}},
+        {"filename": "b.md", "frontmatter": {}},
+        {"filename": "c.md", "frontmatter": {"status": "open"}},
+    ]
+    queries = [
+        '{"==": [{"var": ["frontmatter.status", "open"]}, "open"]}',
+        '{"==": [{"var": ["frontmatter.status", "x"]}, null]}',
+    ]
+    batches, _ = plan_fusion(queries)
+    split = split_fused_results(batches[0], _server_response(batches[0].query, notes))
+    assert split == [_server_response(query, notes) for query in queries]
+    assert [[row["filename"] for row in rows] for rows in split] == [["b.md", "c.md"], ["a.md"]]
@@ -0,0 +1,81 @@
+"""Golden tests against recorded Local REST API responses.
+
+The mock server and the local evaluators are checked against
+tests/golden/plugin_responses.json rather than against each other, so a
+difference from Dataview or json-logic-js fails here.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.metadata import MetadataSnapshot, NoteMetadata
+from obsidian_search_tool.core.planner import execute_plan, plan_query
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+GOLDEN = json.loads((Path(__file__).parent / "golden" / "plugin_responses.json").read_text())
+NOTES = [
+    NoteMetadata(
+        path=note["path"], tags=note["tags"], etags=note["tags"], frontmatter=note["frontmatter"]
+    )
+    for note in GOLDEN["vault"]
+]
+JSONLOGIC = [(json.dumps(case["query"]), case["results"]) for case in GOLDEN["jsonlogic"]]
+DATAVIEW = [(case["query"], case["results"]) for case in GOLDEN["dataview"]]
+
+
+def _unordered(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # The plugin lists JsonLogic matches in vault file order, which is unspecified
+    return sorted(rows, key=lambda row: row["filename"])
+
+
+@pytest.fixture(scope="module")
+def golden_server() -> Iterator[MockObsidianServer]:
+    """A mock Local REST API serving the golden vault."""
+    with MockObsidianServer(SyntheticVault(NOTES, seed=0)) as server:
+        yield server
+
+
+@pytest.fixture
+def client(golden_server: MockObsidianServer) -> ObsidianClient:
+    """A client of the golden vault without a result cache."""
+    return ObsidianClient(base_url=golden_server.url, api_key="test-key", cache_ttl=0)
+
+
+@pytest.mark.parametrize(("query", "expected"), JSONLOGIC)
+def test_jsonlogic_matches_plugin(
+    client: ObsidianClient, query: str, expected: list[dict[str, Any]]
+) -> None:
+    """Test the mock answers JsonLogic queries as the plugin does."""
+    response = client.search_jsonlogic(query)
+    assert response.success, response.error
+    assert _unordered(response.results) == _unordered(expected)
+
+
+def test_fused_batch_matches_plugin(client: ObsidianClient) -> None:
+    """Test splitting one fused request gives each query's recorded result."""
+    responses = client.search_jsonlogic_batch([query for query, _ in JSONLOGIC])
+    for (query, expected), response in zip(JSONLOGIC, responses, strict=True):
+        assert _unordered(response.results) == _unordered(expected), query
+
+
+@pytest.mark.parametrize(("query", "expected"), DATAVIEW)
+def test_dataview_matches_plugin(
+    client: ObsidianClient, query: str, expected: list[dict[str, Any]]
+) -> None:
+    """Test the mock and the local planner answer DQL queries as the plugin does."""
+    response = client.search_dataview(query)
+    assert response.success, response.error
+    assert response.results == expected
+
+    snapshot = MetadataSnapshot(NOTES, client.base_url, time.time())
+    plan = plan_query(query, "dataview", snapshot)
+    assert execute_plan(client, plan, snapshot).results == expected
@@ -0,0 +1,136 @@
+"""Tests for client lifecycle hooks and the result cache.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from obsidian_search_tool.core.cache import ResultCache
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.hooks import HookRequest, HookResponse
+from obsidian_search_tool.testing import MockObsidianServer
+
+
+def test_hooks_observe_and_rewrite_requests(base_url: str) -> None:
+    """Test before-request rewriting, after-response, errors and cache hits."""
+    client = ObsidianClient(base_url=base_url, api_key="test-key", cache_ttl=60)
+    events: list[tuple[str, Any]] = []
+
+    def tag(request: HookRequest) -> None:
+        request.headers["X-Trace"] = "1"
+        events.append(("before", request.body))
+
+    def after(request: HookRequest, response: HookResponse) -> None:
+        events.append(("after", response.timings.response_bytes > 0))
+
+    client.add_hook("before_request", tag)
+    client.add_hook("after_response", after)
+    client.add_hook("on_error", lambda request, error: events.append(("error", str(error))))
+    client.add_hook("on_cache_hit", lambda request, value: events.append(("hit", len(value))))
+
+    query = 'TABLE file.name FROM "projects" SORT file.name LIMIT 3'
+    client.search_dataview(query)
+    client.search_dataview(query)
+    response = client.search_dataview("LIST")
+    assert not response.success
+
+    assert events == [
+        ("before", query),
+        ("after", True),
+        ("before", query),
+        ("hit", 3),
+        ("before", "LIST"),
+        ("error", "Only TABLE dataview queries are supported"),
+    ]
+    assert client.timings.requests == 1
+
+    client.remove_hook("before_request", tag)
+    assert client.hooks.before_request == []
+    with pytest.raises(ValueError):
+        client.add_hook("on_retry", tag)
+
+
+def test_result_cache_expires_and_evicts() -> None:
+    """Test TTL expiry and least-recently-used eviction."""
+    now = [0.0]
+    cache = ResultCache(ttl=10, max_entries=2, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") is not None
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_result_cache_keeps_stale_entries_within_bound() -> None:
+    """Test expired entries are served stale until max_stale and refreshed once at a time."""
+    now = [0.0]
+    cache = ResultCache(ttl=10, clock=lambda: now[0], max_stale=5)
+    cache.put("a", 1)
+    assert cache.get_stale("a") is None
+    now[0] = 12.0
+    assert cache.get("a") is None
+    entry = cache.get_stale("a")
+    assert entry is not None and cache.age(entry) == 12.0
+    assert cache.start_refresh("a") and not cache.start_refresh("a")
+    cache.finish_refresh("a")
+    assert cache.start_refresh("a")
+    now[0] = 15.0
+    assert cache.get_stale("a") is None and len(cache) == 1
+    assert cache.get("a") is None and len(cache) == 0
+    with pytest.raises(ValueError):
+        ResultCache(ttl=10, max_stale=-1)
+
+
+def test_stale_while_revalidate(mock_server: MockObsidianServer) -> None:
+    """Test a stale result is returned at once, marked, and refreshed in the background."""
+    client = ObsidianClient(
+        base_url=mock_server.url, api_key="test-key", cache_ttl=0.2, cache_max_stale=30
+    )
+    query = 'TABLE file.name FROM "projects" SORT file.name LIMIT 3'
+    assert not client.search_dataview(query).stale
+    time.sleep(0.25)
+
+    refreshed = threading.Event()
+    client.add_hook("after_response", lambda request, response: refreshed.set())
+    mock_server.latency = 0.3
+    started = time.perf_counter()
+    response = client.search_dataview(query)
+    assert time.perf_counter() - started < 0.2
+    assert response.stale and response.data is not None
+    assert response.data["cache_age_seconds"] >= 0.2
+    assert response.result_count == 3
+    # A second stale read does not start another refresh
+    assert client.search_dataview(query).stale
+
+    assert refreshed.wait(5)
+    assert mock_server.requests_served == 2
+    assert not client.search_dataview(query).stale
+
+
+def test_stale_refresh_runs_before_request_hooks(
+    tmp_path: Path, mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a background refresh is recorded by hooks keeping per-request state."""
+    monkeypatch.setenv("OBSIDIAN_STATS_DB", str(tmp_path / "stats.db"))
+    client = ObsidianClient(
+        base_url=mock_server.url, api_key="test-key", cache_ttl=0.2, cache_max_stale=30
+    )
+    assert client.stats is not None
+    query = 'TABLE file.name FROM "projects" SORT file.name LIMIT 3'
+    client.search_dataview(query)
+    time.sleep(0.25)
+
+    refreshed = threading.Event()
+    client.add_hook("after_response", lambda request, response: refreshed.set())
+    assert client.search_dataview(query).stale
+    assert refreshed.wait(5)
+    assert client.stats.count() == 2
@@ -0,0 +1,118 @@
+"""Tests for the metrics registry and client instrumentation.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import threading
+import urllib.request
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.metrics import CONTENT_TYPE, REGISTRY, MetricsRegistry
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+
+def test_counter_shards_sum_across_threads() -> None:
+    """Test per-thread shards are combined when collected."""
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs", "Jobs run", ("kind",))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value(("a",)) == 8000
+    assert registry.counter("jobs", "Jobs run", ("kind",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("jobs", "Jobs run", ("kind",))
+    with pytest.raises(ValueError):
+        counter.inc(("a", "b"))
+
+
+def test_openmetrics_rendering() -> None:
+    """Test exposition of counters, cumulative histogram buckets and gauges."""
+    registry = MetricsRegistry()
+    registry.counter("hits", 'Hits with "quotes"', ("path",)).inc(('a"b',), 2)
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    registry.gauge("limit", "Current limit").set(7)
+    assert registry.render().splitlines() == [
+        "# TYPE hits counter",
+        '# HELP hits Hits with "quotes"',
+        'hits_total{path="a\\"b"} 2',
+        "# TYPE latency_seconds histogram",
+        "# HELP latency_seconds Latency",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_count 4",
+        "latency_seconds_sum 3.65",
+        "# TYPE limit gauge",
+        "# HELP limit Current limit",
+        "limit 7",
+        "# EOF",
+    ]
+
+
+def test_client_records_requests(base_url: str, vault: SyntheticVault) -> None:
+    """Test the client counts requests, bytes, rows, cache hits and errors."""
+    registry = MetricsRegistry()
+    client = ObsidianClient(base_url=base_url, api_key="test-key", cache_ttl=60, metrics=registry)
+    query = 'TABLE file.name FROM "projects"'
+    rows = client.search_dataview(query).result_count
+    client.search_dataview(query)
+    client.search_jsonlogic("not json")
+    metrics = client.metrics
+    assert metrics.requests.value(("POST", "dataview")) == 1
+    assert metrics.cache_hits.value() == 1
+    assert metrics.cache_misses.value() == 2
+    assert metrics.rows.value(("dataview",)) == rows > 0
+    assert metrics.response_bytes.value(("dataview",)) > 0
+    assert metrics.errors.value(("40000",)) == 1
+    assert 'obsidian_request_duration_seconds_count{query_type="dataview"} 1' in registry.render()
+
+
+def test_metrics_server_and_file(tmp_path: Path) -> None:
+    """Test the HTTP endpoint and the file dump serve the same text."""
+    registry = MetricsRegistry()
+    registry.counter("served", "Served").inc()
+    server = registry.serve(port=0)
+    try:
+        with urllib.request.urlopen(server.url) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            body = response.read().decode("utf-8")
+    finally:
+        server.close()
+    registry.write(tmp_path / "metrics.prom")
+    assert body == (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+    assert "served_total 1" in body
+
+
+def test_cli_metrics_file(
+    tmp_path: Path, mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test --metrics-file dumps the shared registry after the command."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    before = REGISTRY.counter("obsidian_requests", "", ("method", "query_type")).value(
+        ("POST", "dataview")
+    )
+    target = tmp_path / "metrics.prom"
+    result = CliRunner().invoke(main, ["--metrics-file", str(target), "search", "TABLE file.name"])
+    assert result.exit_code == 0, result.output
+    text = target.read_text(encoding="utf-8")
+    assert (
+        f'obsidian_requests_total{{method="POST",query_type="dataview"}} {int(before) + 1}' in text
+    )
+    assert text.endswith("# EOF\n")
@@ -0,0 +1,108 @@
+"""Tests for lazy and structured logging and tracing spans.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.tracing import span, start_tracing, stop_tracing, tracing_enabled
+from obsidian_search_tool.logging_config import JsonLogFormatter, setup_logging
+from obsidian_search_tool.testing import MockObsidianServer
+
+
+@pytest.fixture(autouse=True)
+def _reset_tracing() -> Iterator[None]:
+    yield
+    stop_tracing()
+
+
+class _Expensive:
+    formatted = 0
+
+    def __str__(self) -> str:
+        _Expensive.formatted += 1
+        return "expensive"
+
+
+def test_log_arguments_are_lazy(base_url: str) -> None:
+    """Test discarded log calls on the request path never format their arguments."""
+    setup_logging(0)
+    logging.getLogger("obsidian_search_tool").debug("value=%s", _Expensive())
+    client = ObsidianClient(base_url=base_url, api_key="test-key")
+    client.search_dataview('TABLE file.name FROM "projects" LIMIT 1')
+    assert _Expensive.formatted == 0
+
+
+def test_json_log_formatter_includes_extra_fields() -> None:
+    """Test JSON records carry the message, level and extra= fields."""
+    record = logging.makeLogRecord(
+        {"name": "x", "levelno": 20, "levelname": "INFO", "msg": "%d rows", "args": (3,)}
+    )
+    record.query = "TABLE file.name"
+    entry = json.loads(JsonLogFormatter().format(record))
+    assert entry["message"] == "3 rows"
+    assert entry["level"] == "INFO"
+    assert entry["query"] == "TABLE file.name"
+    assert "args" not in entry
+
+
+def test_json_log_file_sink(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test OBSIDIAN_LOG_JSON captures INFO records even without -v."""
+    log_file = tmp_path / "log.jsonl"
+    monkeypatch.setenv("OBSIDIAN_LOG_JSON", str(log_file))
+    setup_logging(0)
+    logging.getLogger("obsidian_search_tool.test").info("hello %s", "world")
+    logging.getLogger("obsidian_search_tool.test").debug("dropped")
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    lines = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert [line["message"] for line in lines] == ["hello world"]
+    monkeypatch.delenv("OBSIDIAN_LOG_JSON")
+    setup_logging(0)
+
+
+def test_span_is_noop_when_disabled() -> None:
+    """Test spans record nothing and yield None while tracing is off."""
+    assert not tracing_enabled()
+    with span("format", rows=1) as active:
+        assert active is None
+
+
+def test_spans_written_in_chrome_trace_format(tmp_path: Path, base_url: str) -> None:
+    """Test request and decode spans nest inside an enclosing span."""
+    tracer = start_tracing(tmp_path / "trace.json")
+    client = ObsidianClient(base_url=base_url, api_key="test-key")
+    with span("search"):
+        client.search_dataview('TABLE file.name FROM "projects" LIMIT 3')
+    assert stop_tracing() == tracer.path
+    events = json.loads(tracer.path.read_text(encoding="utf-8"))["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert set(spans) == {"search", "request", "decode"}
+    outer, request = spans["search"], spans["request"]
+    assert outer["ts"] <= request["ts"]
+    assert request["ts"] + request["dur"] <= outer["ts"] + outer["dur"]
+    assert request["args"]["status"] == 200
+    assert any(event["ph"] == "M" for event in events)
+
+
+def test_cli_trace_option(
+    tmp_path: Path, mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test --trace covers the search, request, decode and format phases."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    trace = tmp_path / "trace.json"
+    result = CliRunner().invoke(main, ["--trace", str(trace), "search", "TABLE file.name"])
+    assert result.exit_code == 0, result.output
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    names = {event["name"] for event in events if event["ph"] == "X"}
+    assert names == {"search", "request", "decode", "format"}
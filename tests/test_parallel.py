@@ -0,0 +1,94 @@
+"""Tests for sharing the client and formatters between threads.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import io
+import logging
+import sys
+import threading
+
+import pytest
+
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.deadline import Deadline, current_deadline, deadline_scope
+from obsidian_search_tool.core.parallel import map_parallel
+from obsidian_search_tool.logging_config import setup_logging
+from obsidian_search_tool.testing import MockObsidianServer
+from obsidian_search_tool.utils import format_search_compact, format_search_many
+
+QUERIES = [
+    '{"in": ["project", {"var": "frontmatter.tags"}]}',
+    '{"glob": ["daily/*", {"var": "filename"}]}',
+    '{"==": [{"var": "frontmatter.status"}, "active"]}',
+    '{"in": ["daily", {"var": "filename"}]}',
+]
+
+
+def test_map_parallel_keeps_order_and_context() -> None:
+    """Test results come back in input order with the caller's deadline active."""
+    with deadline_scope(Deadline(60)):
+        budgets = map_parallel(lambda _: current_deadline(), range(6), workers=3)
+    assert {deadline.budget if deadline else None for deadline in budgets} == {60}
+    assert map_parallel(lambda n: n * n, range(20), workers=4) == [n * n for n in range(20)]
+
+    def fail(n: int) -> int:
+        if n % 5 == 3:
+            raise ValueError(n)
+        return n
+
+    with pytest.raises(ValueError, match="3"):
+        map_parallel(fail, range(10), workers=4)
+
+
+def test_shared_client_uses_a_session_per_thread(mock_server: MockObsidianServer) -> None:
+    """Test one client serves concurrent batches with consistent results and timings."""
+    client = ObsidianClient(
+        base_url=mock_server.url, api_key="test-key", cache_ttl=0, coalesce=False
+    )
+    serial = client.search_jsonlogic_batch(QUERIES, fuse=False, workers=1)
+    sessions = [client._thread_session()]
+
+    def record_session() -> None:
+        sessions.append(client._thread_session())
+
+    workers = [threading.Thread(target=record_session) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+        worker.join()
+    assert client._thread_session() is sessions[0]
+    assert len({id(session) for session in sessions}) == 4
+
+    threads = [
+        threading.Thread(
+            target=client.search_jsonlogic_batch, args=(QUERIES,), kwargs={"workers": 4}
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.timings.requests == len(QUERIES) + 4
+
+    assert all(response.result_count > 0 for response in serial)
+    for fuse in (True, False):
+        responses = client.search_jsonlogic_batch(QUERIES, fuse=fuse, workers=4)
+        assert [r.results for r in responses] == [r.results for r in serial]
+        assert format_search_many(responses, format_search_compact, workers=4) == [
+            format_search_compact(response) for response in responses
+        ]
+
+
+def test_setup_logging_keeps_handlers_for_same_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test repeated setup keeps the installed handlers until a setting changes."""
+    monkeypatch.delenv("OBSIDIAN_LOG_JSON", raising=False)
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    setup_logging(1)
+    handlers = list(logging.getLogger().handlers)
+    setup_logging(1)
+    assert logging.getLogger().handlers == handlers
+    setup_logging(2)
+    assert logging.getLogger().handlers != handlers
+    assert logging.getLogger().level == logging.DEBUG
@@ -0,0 +1,162 @@
+"""Tests for the DQL parser and the hybrid query planner.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import time
+
+import pytest
+
+from obsidian_search_tool.core.dql import (
+    UnsupportedDqlError,
+    format_expression,
+    parse_query,
+    split_conjuncts,
+)
+from obsidian_search_tool.core.metadata import MetadataSnapshot, NoteMetadata
+from obsidian_search_tool.core.models import SearchResponse
+from obsidian_search_tool.core.planner import execute_plan, plan_query
+
+
+def _snapshot(age: float = 0.0) -> MetadataSnapshot:
+    notes = [
+        NoteMetadata(
+            path="daily/2025-01-01.md",
+            mtime="2025-01-01T09:00:00.000+00:00",
+            tags=["#daily"],
+            frontmatter={"tags": ["daily"], "status": "done"},
+        ),
+        NoteMetadata(
+            path="projects/aws.md",
+            mtime="2025-03-01T09:00:00.000+00:00",
+            tags=["#project", "#project/aws"],
+            frontmatter={"tags": ["project"], "status": "active"},
+        ),
+        NoteMetadata(path="inbox.md", mtime="2025-02-01T09:00:00.000+00:00"),
+    ]
+    return MetadataSnapshot(notes, "http://127.0.0.1:27123", time.time() - age)
+
+
+def test_parse_query_clauses() -> None:
+    """Test that a TABLE query is split into fields, source and commands."""
+    query = parse_query(
+        'TABLE file.name, author AS "Author" FROM #project and -"archive" '
+        'WHERE file.size > 1000 AND contains(author, "Ben") SORT file.mtime DESC LIMIT 5'
+    )
+    assert [field.name for field in query.fields] == ["file.name", "Author"]
+    assert query.source_text == '#project and -"archive"'
+    assert query.where is not None
+    assert [format_expression(c) for c in split_conjuncts(query.where)] == [
+        "file.size > 1000",
+        'contains(author, "Ben")',
+    ]
+    assert query.commands[-1].text == "LIMIT 5"
+
+
+def test_parse_query_rejects_list_queries() -> None:
+    """Test that non-TABLE queries are reported as unsupported."""
+    with pytest.raises(UnsupportedDqlError):
+        parse_query('LIST FROM "daily"')
+
+
+def test_dataview_plan_restricts_source_to_candidates() -> None:
+    """Test that indexable conjuncts restrict the pages Dataview visits."""
+    plan = plan_query(
+        "TABLE file.name FROM #project WHERE length(file.inlinks) > 0", "dataview", _snapshot()
+    )
+    assert plan.strategy == "server-restricted"
+    assert plan.candidates == ["projects/aws.md"]
+    assert plan.server_query is not None
+    assert 'FROM (#project) and ("projects/aws.md")' in plan.server_query
+    assert "WHERE length(file.inlinks) > 0" in plan.server_query
+    assert [step.access for step in plan.steps] == ["index:source", "server"]
+
+
+def test_dataview_plan_uses_mtime_and_frontmatter_indexes() -> None:
+    """Test mtime range and frontmatter equality conjuncts."""
+    plan = plan_query(
+        'TABLE file.name WHERE file.mtime >= date("2025-01-15") '
+        'AND file.frontmatter.status = "done"',
+        "dataview",
+        _snapshot(),
+    )
+    assert [step.access for step in plan.steps] == ["index:mtime", "index:frontmatter"]
+    assert [step.matches for step in plan.steps] == [2, 1]
+    assert plan.strategy == "local-empty"
+
+
+def test_stale_snapshot_falls_back_to_server() -> None:
+    """Test that an old snapshot is not trusted."""
+    plan = plan_query('TABLE file.name FROM "daily"', "dataview", _snapshot(age=7200), 3600)
+    assert plan.strategy == "server"
+    assert plan.reason is not None
+
+
+def test_jsonlogic_plan_answers_indexable_rule_locally() -> None:
+    """Test that a fully indexable JsonLogic rule needs no server request."""
+    snapshot = _snapshot()
+    rule = {
+        "and": [
+            {"glob": ["projects/*", {"var": "filename"}]},
+            {"in": ["project", {"var": "frontmatter.tags"}]},
+        ]
+    }
+    plan = plan_query(json.dumps(rule), "jsonlogic", snapshot)
+    assert plan.strategy == "local"
+    assert [step.access for step in plan.steps] == ["index:prefix", "index:tag"]
+
+    response = execute_plan(None, plan, snapshot)  # type: ignore[arg-type]
+    assert response.results == [{"filename": "projects/aws.md", "result": True}]
+
+
+def test_jsonlogic_plan_sends_residual_with_candidates() -> None:
+    """Test that content predicates go to the server limited to candidates."""
+    rule = {
+        "and": [
+            {"in": ["project", {"var": "frontmatter.tags"}]},
+            {"in": ["Claude", {"var": "content"}]},
+        ]
+    }
+    plan = plan_query(json.dumps(rule), "jsonlogic", _snapshot())
+    assert plan.strategy == "server-restricted"
+    assert plan.server_query is not None
+    assert json.loads(plan.server_query) == {
+        "and": [
+            {"in": [{"var": "filename"}, ["projects/aws.md"]]},
+            {"in": ["Claude", {"var": "content"}]},
+        ]
+    }
+
+
+def test_execute_plan_does_not_mutate_client_response() -> None:
+    """Test that planner fields are added to a copy, not the (cacheable) client response."""
+    rule = {
+        "and": [
+            {"in": ["project", {"var": "frontmatter.tags"}]},
+            {"in": ["Claude", {"var": "content"}]},
+        ]
+    }
+    snapshot = _snapshot()
+    plan = plan_query(json.dumps(rule), "jsonlogic", snapshot)
+    row = {"filename": "projects/aws.md", "result": True}
+    shared = SearchResponse(
+        success=True,
+        data={"query": plan.server_query, "search_type": "jsonlogic", "results": [row]},
+        error=None,
+    )
+
+    class StubClient:
+        def search_jsonlogic(self, query: str) -> SearchResponse:
+            return shared
+
+    response = execute_plan(StubClient(), plan, snapshot)  # type: ignore[arg-type]
+    assert response.data is not None and response.data["plan"] == "server-restricted"
+    assert response.query == json.dumps(rule)
+    assert shared.data == {
+        "query": plan.server_query,
+        "search_type": "jsonlogic",
+        "results": [{"filename": "projects/aws.md", "result": True}],
+    }
+    assert response.results[0] is not row
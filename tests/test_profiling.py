@@ -0,0 +1,80 @@
+"""Tests for --profile CPU and memory profiling.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import pstats
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.profiling import Profiler
+from obsidian_search_tool.testing import MockObsidianServer
+
+
+def _busy() -> int:
+    return sum(i * i for i in range(200_000))
+
+
+def test_cpu_profile_writes_pstats_and_collapsed_stacks(tmp_path: Path) -> None:
+    """Test CPU mode writes a loadable pstats file and collapsed stacks."""
+    with Profiler("cpu", tmp_path, prefix="unit") as profiler:
+        _busy()
+    pstats_path, collapsed_path = profiler.outputs
+    assert pstats_path.suffix == ".pstats" and pstats_path.name.startswith("unit-")
+    functions = {name for _, _, name in pstats.Stats(str(pstats_path)).stats}
+    assert "_busy" in functions
+    lines = collapsed_path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and stack
+    assert any("test_profiling:_busy" in line for line in lines)
+
+
+def test_mem_profile_reports_allocation_sites(tmp_path: Path) -> None:
+    """Test memory mode lists the sites that allocated the most."""
+    with Profiler("mem", tmp_path, top=5) as profiler:
+        kept = [bytearray(1024) for _ in range(512)]
+    (report_path,) = profiler.outputs
+    report = report_path.read_text(encoding="utf-8")
+    assert "Peak traced memory" in report
+    assert "allocation sites by size" in report
+    assert f"{Path(__file__).name}:" in report.split("#1:", 1)[1].splitlines()[0]
+    assert len(kept) == 512
+
+
+def test_unknown_mode_rejected(tmp_path: Path) -> None:
+    """Test an unknown mode raises ValueError."""
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        Profiler("io", tmp_path)
+
+
+def test_cli_profile_option(
+    tmp_path: Path, mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test --profile wraps a command and reports the files it wrote."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    result = CliRunner().invoke(
+        main, ["--profile", "mem", "--profile-dir", str(tmp_path), "search", "TABLE file.name"]
+    )
+    assert result.exit_code == 0, result.output
+    (report_path,) = tmp_path.glob("search-*.mem.txt")
+    assert f"Wrote {report_path}" in result.output
+
+
+def test_no_profiling_without_flag(
+    mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the profiling module is not even imported when the flag is off."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    monkeypatch.delitem(sys.modules, "obsidian_search_tool.core.profiling", raising=False)
+    result = CliRunner().invoke(main, ["status"])
+    assert result.exit_code == 0, result.output
+    assert "obsidian_search_tool.core.profiling" not in sys.modules
@@ -0,0 +1,179 @@
+"""Tests for the query statistics store and the stats command.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.dql import normalize_query
+from obsidian_search_tool.core.query_stats import QueryStatsStore, canonicalize, fingerprint
+from obsidian_search_tool.testing import MockObsidianServer
+
+
+def test_normalization_groups_literals() -> None:
+    """Test queries differing only in literals share a fingerprint."""
+    assert normalize_query('table file.name  from "daily" where priority >= 4') == (
+        "TABLE file.name FROM ? WHERE priority >= ?"
+    )
+    assert normalize_query("TABLE x FROM #project WHERE link = [[Note]]") == (
+        "TABLE x FROM #project WHERE link = ?"
+    )
+    first = canonicalize('{"in": ["project", {"var": "tags"}]}', "jsonlogic")
+    second = canonicalize('{"in":["area",{"var":"tags"}]}', "jsonlogic")
+    assert first == second == '{"in":["?",{"var":"tags"}]}'
+    assert fingerprint(first, "jsonlogic") != fingerprint(first, "dataview")
+
+
+def test_sampling_keeps_slow_queries(tmp_path: Path) -> None:
+    """Test fast queries are sampled while slow ones are always recorded."""
+    store = QueryStatsStore(
+        tmp_path / "stats.db", sample_rate=0.0, slow_ms=100, rng=random.Random(1)
+    )
+    assert not store.record("TABLE a", "dataview", 5.0)
+    assert store.record("TABLE a", "dataview", 150.0)
+    assert store.count() == 1
+    with pytest.raises(ValueError):
+        QueryStatsStore(tmp_path / "other.db", sample_rate=1.5)
+    store.close()
+
+
+def test_sampled_records_are_weighted(tmp_path: Path) -> None:
+    """Test sampled fast queries count for the executions they stand for."""
+    store = QueryStatsStore(
+        tmp_path / "stats.db", sample_rate=0.1, slow_ms=100, rng=random.Random(7)
+    )
+    for _ in range(2000):
+        store.record("TABLE fast", "dataview", 2.0, rows=4)
+    for _ in range(20):
+        store.record("TABLE slow", "dataview", 150.0)
+    assert store.count() < 300
+
+    fast, slow = store.top_queries("count")
+    assert fast.canonical == "TABLE fast" and 1700 < fast.count < 2300
+    assert fast.total_ms == pytest.approx(fast.count * 2.0, rel=0.01)
+    assert (fast.mean_ms, fast.mean_rows) == (pytest.approx(2.0), pytest.approx(4.0))
+    assert (slow.count, slow.total_ms) == (20, 3000.0)
+    assert store.top_queries("total")[0].canonical == "TABLE fast"
+    store.close()
+
+
+def test_old_database_gains_weights(tmp_path: Path) -> None:
+    """Test a database created before weights were stored keeps working."""
+    path = tmp_path / "stats.db"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE queries (id INTEGER PRIMARY KEY, recorded_at REAL NOT NULL,"
+        " query_type TEXT NOT NULL, fingerprint TEXT NOT NULL, canonical TEXT NOT NULL,"
+        " query TEXT NOT NULL, latency_ms REAL NOT NULL, rows INTEGER,"
+        " response_bytes INTEGER, status TEXT NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO queries VALUES (1, 0, 'dataview', ?, 'TABLE a', 'TABLE a', 5, 1, 10, 'ok')",
+        (fingerprint("TABLE a", "dataview"),),
+    )
+    connection.commit()
+    connection.close()
+
+    store = QueryStatsStore(path)
+    store.record("TABLE a", "dataview", 7.0)
+    assert [(stat.count, stat.total_ms) for stat in store.top_queries()] == [(2, 12.0)]
+    store.close()
+
+
+def test_top_queries_and_retention(tmp_path: Path) -> None:
+    """Test aggregation, ordering, p95 and the max_rows bound."""
+    store = QueryStatsStore(tmp_path / "stats.db", max_rows=50)
+    for i in range(20):
+        store.record(f'TABLE file.name FROM "f{i}"', "dataview", float(i + 1), rows=10)
+    for _ in range(30):
+        store.record('{"==": [{"var": "status"}, "done"]}', "jsonlogic", 2.0, rows=1)
+    store.record('TABLE file.name FROM "x"', "dataview", 500.0, status="40000")
+    assert store.count() == 51
+
+    # Aggregation prunes first: the oldest record (1 ms) is dropped
+    by_total = store.top_queries("total")
+    assert [stat.query_type for stat in by_total] == ["dataview", "jsonlogic"]
+    dql = by_total[0]
+    assert dql.canonical == "TABLE file.name FROM ?"
+    assert (dql.count, dql.errors) == (20, 1)
+    assert (dql.p95_ms, dql.max_ms) == (20.0, 500.0)
+    assert dql.mean_rows == 10
+    assert store.top_queries("count")[0].query_type == "jsonlogic"
+    assert [record.status for record in store.slow_queries(100)] == ["40000"]
+    assert store.count() == 50
+    store.close()
+
+
+def test_client_records_searches(
+    tmp_path: Path, mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a client with OBSIDIAN_STATS_DB records successes and errors."""
+    monkeypatch.setenv("OBSIDIAN_STATS_DB", str(tmp_path / "stats.db"))
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key")
+    assert client.stats is not None
+    response = client.search_dataview('TABLE file.name FROM "projects"')
+    client.search_jsonlogic("not json")
+    client.status()
+
+    stats = {stat.query_type: stat for stat in client.stats.top_queries()}
+    assert set(stats) == {"dataview", "jsonlogic"}
+    assert stats["dataview"].mean_rows == response.result_count
+    assert stats["dataview"].mean_bytes > 0
+    assert stats["jsonlogic"].errors == 1
+
+
+def test_cli_stats(
+    tmp_path: Path, mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the stats command in JSON and as a slow-query log."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    db = tmp_path / "stats.db"
+    runner = CliRunner()
+    result = runner.invoke(main, ["stats", "--db", str(db)])
+    assert result.exit_code == 1
+    assert json.loads(result.output)["error"]["code"] == "INPUT_ERROR"
+
+    monkeypatch.setenv("OBSIDIAN_STATS_DB", str(db))
+    for folder in ("projects", "daily"):
+        result = runner.invoke(main, ["search", f'TABLE file.name FROM "{folder}"'])
+        assert result.exit_code == 0, result.output
+
+    result = runner.invoke(main, ["stats", "--sort", "count"])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)["data"]
+    assert data["records"] == 2
+    assert [(stat["canonical"], stat["count"]) for stat in data["queries"]] == [
+        ("TABLE file.name FROM ?", 2)
+    ]
+
+    result = runner.invoke(main, ["stats", "--slow", "--threshold", "0", "--text"])
+    assert result.exit_code == 0, result.output
+    assert "# Slow Query Log" in result.output
+    assert 'FROM "daily"' in result.output
+
+
+def test_hook_skips_responses_without_start(
+    tmp_path: Path, mock_server: MockObsidianServer
+) -> None:
+    """Test the stats hook tolerates an after_response with no before_request."""
+    store = QueryStatsStore(tmp_path / "stats.db")
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key")
+    store.attach(client)
+    before = client.hooks.before_request.pop()
+    client.search_dataview('TABLE file.name FROM "projects"')
+    assert store.count() == 0
+
+    client.hooks.before_request.append(before)
+    client.search_dataview('TABLE file.name FROM "daily"')
+    assert store.count() == 1
+    store.close()
@@ -0,0 +1,131 @@
+"""Tests for retries, the retry budget and the circuit breaker.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import random
+import socket
+
+import pytest
+
+from obsidian_search_tool.core.client import (
+    ObsidianAPIError,
+    ObsidianCircuitOpenError,
+    ObsidianClient,
+    ObsidianConnectionError,
+)
+from obsidian_search_tool.core.metrics import MetricsRegistry
+from obsidian_search_tool.core.resilience import CircuitBreaker, RetryBudget, RetryPolicy
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+QUERY = 'TABLE file.name FROM "projects"'
+
+
+def test_backoff_and_budget() -> None:
+    """Test full-jitter delays stay under the capped ceiling and the budget refills."""
+    policy = RetryPolicy(retries=3, base_delay=0.1, max_delay=0.3)
+    rng = random.Random(1)
+    for attempt, ceiling in [(0, 0.1), (1, 0.2), (2, 0.3), (5, 0.3)]:
+        delays = [policy.delay(attempt, rng) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+    budget = RetryBudget(ratio=0.5, capacity=2)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_circuit_breaker_states() -> None:
+    """Test the breaker opens, lets one probe through after the cool-down and closes."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.retry_after() == 10
+
+    now[0] = 10.0
+    assert breaker.allow()
+    assert breaker.state == "half_open" and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_searches_retried_on_server_errors(vault: SyntheticVault) -> None:
+    """Test idempotent searches are retried and other requests are not."""
+    registry = MetricsRegistry()
+    with MockObsidianServer(vault, error_rate=1.0, error_status=503) as server:
+        client = ObsidianClient(
+            base_url=server.url,
+            api_key="test-key",
+            cache_ttl=0,
+            metrics=registry,
+            retries=2,
+            circuit_threshold=0,
+        )
+        response = client.search_dataview(QUERY)
+        assert not response.success and response.error is not None
+        assert response.error["code"] == "SERVER_ERROR"
+        assert server.requests_served == 3
+
+        with pytest.raises(ObsidianAPIError):
+            client._make_request("POST", "/search/", QUERY, "text/plain")
+        assert server.requests_served == 4
+
+        server.error_rate = 0.0
+        assert client.search_dataview(QUERY).success
+    retries = registry.counter("obsidian_request_retries", "", ("code",))
+    assert retries.value(("SERVER_ERROR",)) == 2
+
+
+def test_circuit_fails_fast_when_endpoint_down() -> None:
+    """Test repeated connection failures open the circuit and stop sending requests."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    registry = MetricsRegistry()
+    client = ObsidianClient(
+        base_url=url, api_key="test-key", metrics=registry, retries=1, circuit_threshold=2
+    )
+    with pytest.raises(ObsidianConnectionError) as first:
+        client.search_dataview(QUERY)
+    assert not isinstance(first.value, ObsidianCircuitOpenError)
+    with pytest.raises(ObsidianCircuitOpenError, match="Circuit open"):
+        client.search_dataview(QUERY)
+    assert registry.gauge("obsidian_circuit_open", "", ("endpoint",)).value((url,)) == 1
+
+
+def test_resilience_is_opt_in(base_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test library clients send requests as issued unless resilient or configured."""
+    for name in ("RETRIES", "CIRCUIT_THRESHOLD", "MAX_CONCURRENCY", "COALESCE"):
+        monkeypatch.delenv(f"OBSIDIAN_{name}", raising=False)
+    plain = ObsidianClient(base_url=base_url, api_key="test-key")
+    assert plain.retry_policy.retries == 0
+    assert (plain.breaker, plain.limiter, plain.flights) == (None, None, None)
+
+    resilient = ObsidianClient(base_url=base_url, api_key="test-key", resilient=True)
+    assert resilient.retry_policy.retries == 2
+    assert resilient.breaker is not None and resilient.limiter is not None
+    assert resilient.flights is not None
+
+    monkeypatch.setenv("OBSIDIAN_RETRIES", "3")
+    monkeypatch.setenv("OBSIDIAN_COALESCE", "1")
+    configured = ObsidianClient(base_url=base_url, api_key="test-key")
+    assert configured.retry_policy.retries == 3 and configured.flights is not None
+    assert configured.breaker is None
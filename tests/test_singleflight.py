@@ -0,0 +1,121 @@
+"""Tests for coalescing identical in-flight requests.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.deadline import Deadline, deadline_scope
+from obsidian_search_tool.core.metrics import MetricsRegistry
+from obsidian_search_tool.core.singleflight import SingleFlight, canonical_body
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+QUERY = 'TABLE file.name FROM "projects"'
+
+
+def test_single_flight_shares_result_and_error() -> None:
+    """Test concurrent callers share one call, its result and its exception."""
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow() -> list[int]:
+        calls.append(1)
+        release.wait()
+        return [1, 2]
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flights.do, "key", slow) for _ in range(4)]
+        while flights.in_flight() == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(value is results[0][0] for value, _ in results)
+    assert flights.in_flight() == 0
+
+    def failing() -> None:
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(flights.do, "key", failing) for _ in range(2)]
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+
+
+def test_canonical_body() -> None:
+    """Test formatting differences map to the same key but literals do not."""
+    assert canonical_body('table  file.name\nfrom "daily"', "dataview") == canonical_body(
+        'TABLE file.name FROM "daily"', "dataview"
+    )
+    assert canonical_body('TABLE file.name FROM "a  b"', "dataview") != canonical_body(
+        'TABLE file.name FROM "a b"', "dataview"
+    )
+    assert canonical_body('{"in": ["x", {"var": "tags"}]}', "jsonlogic") == canonical_body(
+        '{"in":["x",{"var":"tags"}]}', "jsonlogic"
+    )
+
+
+def test_identical_searches_coalesced(vault: SyntheticVault) -> None:
+    """Test threads and asyncio tasks share one request per distinct query."""
+    registry = MetricsRegistry()
+    with MockObsidianServer(vault, latency=0.2) as server:
+        clients = [
+            ObsidianClient(
+                base_url=server.url,
+                api_key="test-key",
+                cache_ttl=0,
+                metrics=registry,
+                coalesce=True,
+            )
+            for _ in range(2)
+        ]
+        # Fewer tasks than to_thread workers, so all of them are in flight together
+        queries = [QUERY, QUERY.lower(), f"  {QUERY}  ", QUERY]
+
+        async def swarm() -> list[object]:
+            return await asyncio.gather(
+                *(
+                    asyncio.to_thread(clients[i % 2].search_dataview, query)
+                    for i, query in enumerate(queries)
+                )
+            )
+
+        responses = asyncio.run(swarm())
+        assert server.requests_served == 1
+    assert all(r.results == responses[0].results for r in responses)  # type: ignore[attr-defined]
+    coalesced = registry.counter("obsidian_coalesced_requests", "", ("query_type",))
+    assert coalesced.value(("dataview",)) == len(queries) - 1
+
+
+def test_follower_deadline_and_opt_out(vault: SyntheticVault) -> None:
+    """Test a follower stops waiting at its own deadline and coalesce=False sends every request."""
+    with MockObsidianServer(vault, latency=0.3) as server:
+        client = ObsidianClient(base_url=server.url, api_key="test-key", cache_ttl=0, coalesce=True)
+        leader = threading.Thread(target=client.search_dataview, args=(QUERY,))
+        leader.start()
+        time.sleep(0.05)
+        with deadline_scope(Deadline(0.05)):
+            response = client.search_dataview(QUERY)
+        leader.join()
+        assert response.incomplete
+        assert "identical request" in response.data["incomplete_reason"]  # type: ignore[index]
+        assert server.requests_served == 1
+
+        separate = ObsidianClient(
+            base_url=server.url, api_key="test-key", cache_ttl=0, coalesce=False
+        )
+        with ThreadPoolExecutor(2) as pool:
+            list(pool.map(lambda _: separate.search_dataview(QUERY), range(2)))
+        assert server.requests_served == 3
@@ -0,0 +1,105 @@
+"""Tests for atomic, optionally compressed file storage.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.metadata import load_snapshot, save_snapshot
+from obsidian_search_tool.core.storage import (
+    codec_for_path,
+    open_atomic,
+    read_json,
+    write_json_atomic,
+    write_text_atomic,
+)
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+
+@pytest.mark.parametrize("codec", ["none", "gzip", "zstd"])
+def test_round_trip(tmp_path: Path, codec: str) -> None:
+    """Test compressed writes are read back, whatever the file is named."""
+    if codec == "zstd":
+        pytest.importorskip("compression.zstd")
+    path = tmp_path / "data.json"
+    data = {"rows": [{"filename": f"n{i}.md", "tags": ["ä", "b"]} for i in range(5000)]}
+    write_json_atomic(path, data, codec)
+    assert read_json(path) == data
+    text = "line\n" * 300_000
+    write_text_atomic(path, text, codec)
+    with path.open("rb") as raw:
+        stored = raw.read()
+    assert (len(stored) < len(text)) == (codec != "none")
+    if codec == "gzip":
+        assert gzip.decompress(stored).decode("utf-8") == text
+
+
+def test_failed_write_keeps_previous_file(tmp_path: Path) -> None:
+    """Test the destination is untouched and no temp file is left on failure."""
+    path = tmp_path / "out.json.gz"
+    write_json_atomic(path, {"v": 1}, codec_for_path(path))
+    with pytest.raises(RuntimeError), open_atomic(path, "gzip") as handle:
+        handle.write('{"v": 2')
+        raise RuntimeError("interrupted")
+    assert read_json(path) == {"v": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json.gz"]
+    with pytest.raises(ValueError, match="Unknown codec"):
+        write_text_atomic(path, "", "lz4")
+
+
+def test_cache_codec(
+    vault: SyntheticVault, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test OBSIDIAN_CACHE_CODEC compresses snapshots that still load."""
+    monkeypatch.setenv("OBSIDIAN_CACHE_CODEC", "gzip")
+    snapshot = vault.snapshot()
+    path = save_snapshot(snapshot, tmp_path)
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+    loaded = load_snapshot(snapshot.base_url, tmp_path)
+    assert loaded is not None and len(loaded) == len(vault)
+
+
+def test_cli_output(mock_server: MockObsidianServer, tmp_path: Path) -> None:
+    """Test search --output writes compressed files and nothing to stdout."""
+    runner = CliRunner()
+    env = {"OBSIDIAN_BASE_URL": mock_server.url, "OBSIDIAN_API_KEY": "test-key"}
+    target = tmp_path / "export.json.gz"
+    result = runner.invoke(main, ["search", "-o", str(target), "TABLE status"], env=env)
+    assert result.exit_code == 0, result.output
+    assert result.stdout == ""
+    data = json.loads(gzip.decompress(target.read_bytes()))
+    assert data["success"] and len(data["data"]["results"]) > 0
+
+    plan_target = tmp_path / "plan.json"
+    result = runner.invoke(
+        main, ["search", "--explain", "-o", str(plan_target), "TABLE status"], env=env
+    )
+    assert result.exit_code == 0, result.output
+    assert result.stdout == ""
+    assert "strategy" in json.loads(plan_target.read_text(encoding="utf-8"))["data"]
+
+    result = runner.invoke(
+        main, ["search", "-o", str(tmp_path / "x"), "--compress", "zstd", "TABLE status"], env=env
+    )
+    try:
+        import compression.zstd  # type: ignore[import-not-found,unused-ignore]  # noqa: F401
+    except ImportError:
+        assert json.loads(result.stdout)["error"]["code"] == "INPUT_ERROR"
+    else:
+        assert result.exit_code == 0, result.output
+
+
+def test_written_files_follow_umask(tmp_path: Path) -> None:
+    """Test atomic writes get the permissions of a plain open(), not mkstemp's 0600."""
+    plain = tmp_path / "plain.txt"
+    plain.write_text("x", encoding="utf-8")
+    path = tmp_path / "out.json"
+    write_json_atomic(path, {"v": 1})
+    assert path.stat().st_mode & 0o777 == plain.stat().st_mode & 0o777
@@ -0,0 +1,39 @@
+"""Tests for per-phase request timings.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.timings import RequestTimings, timings_report
+from obsidian_search_tool.testing import MockObsidianServer
+
+
+def test_client_records_request_phases(mock_server: MockObsidianServer) -> None:
+    """Test that connect time is only charged to requests that open a connection."""
+    mock_server.response_padding = 1000
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key")
+    response = client.search_dataview("TABLE file.name")
+    assert response.result_count == 200
+
+    first = client.last_timings
+    assert first is not None
+    assert first.connect_ms > 0
+    assert first.response_bytes > 1000
+
+    client.search_dataview("TABLE file.name")
+    second = client.last_timings
+    assert second is not None and second.connect_ms == 0
+    assert client.timings.requests == 2
+    assert client.timings.response_bytes == 2 * first.response_bytes
+
+
+def test_timings_report_fields() -> None:
+    """Test the report exposed in the JSON data block."""
+    request = RequestTimings(1, 1.23456, 2.0, 3.0, 4.0, 100)
+    report = timings_report(request, format_ms=5.0, rows=7, total_ms=20.0)
+    assert report["connect_ms"] == 1.235
+    assert report["format_ms"] == 5.0
+    assert report["rows"] == 7
+    assert report["response_bytes"] == 100
+    assert report["peak_memory_bytes"] is None or report["peak_memory_bytes"] > 0
@@ -0,0 +1,147 @@
+"""Tests for vault profiles and multi-vault search.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import socket
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.vaults import (
+    VaultConfigError,
+    VaultProfile,
+    load_profiles,
+    plan_merge,
+    search_vaults,
+    select_profiles,
+)
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault, generate_vault
+
+QUERY = 'TABLE status FROM "projects" SORT file.mtime DESC LIMIT 15'
+
+
+@pytest.fixture
+def servers() -> Iterator[list[MockObsidianServer]]:
+    """Two mock vaults with different notes."""
+    with (
+        MockObsidianServer(generate_vault(120, seed=1)) as first,
+        MockObsidianServer(generate_vault(120, seed=2)) as second,
+    ):
+        yield [first, second]
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def _write_profiles(path: Path, servers: list[MockObsidianServer]) -> Path:
+    path.write_text(
+        "\n".join(
+            f'[vaults.{name}]\nbase_url = "{server.url}"\napi_key = "test-key"\n'
+            for name, server in zip(("work", "research"), servers, strict=True)
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_plan_merge() -> None:
+    """Test sort keys become hidden columns and the LIMIT is global."""
+    plan = plan_merge("TABLE status SORT priority SORT file.mtime DESC LIMIT 5", "dataview")
+    assert plan.query.splitlines()[0] == (
+        'TABLE status, file.mtime AS "__sort_0", priority AS "__sort_1"'
+    )
+    assert plan.sort == (("__sort_0", True), ("__sort_1", False))
+    assert plan.limit == 5
+    assert plan_merge("TABLE WITHOUT ID file.name", "dataview").sort == ()
+    assert plan_merge('{"var": "x"}', "jsonlogic").query == '{"var": "x"}'
+
+
+def test_profiles(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test loading, api_key_env resolution and lookup errors."""
+    path = tmp_path / "vaults.toml"
+    path.write_text(
+        '[vaults.a]\nbase_url = "http://a"\napi_key_env = "A_KEY"\n\n'
+        '[vaults.b]\nbase_url = "http://b"\ntimeout = 5\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(VaultConfigError, match="A_KEY"):
+        load_profiles(path)
+    monkeypatch.setenv("A_KEY", "secret")
+    profiles = load_profiles(path)
+    assert profiles["a"].api_key == "secret"
+    assert profiles["b"] == VaultProfile("b", "http://b", "", 5)
+    assert [p.name for p in select_profiles(["all"], path)] == ["a", "b"]
+    assert [p.name for p in select_profiles(["b", "a", "b"], path)] == ["b", "a"]
+    with pytest.raises(VaultConfigError, match="Unknown vault"):
+        select_profiles(["c"], path)
+    with pytest.raises(VaultConfigError, match="not found"):
+        load_profiles(tmp_path / "missing.toml")
+
+
+def test_fan_out_merges_sorted_rows(servers: list[MockObsidianServer]) -> None:
+    """Test rows from all vaults are merged by the SORT keys, with a down vault reported."""
+    profiles = [
+        VaultProfile("work", servers[0].url, "test-key"),
+        VaultProfile("down", _closed_port_url(), "test-key", timeout=2),
+        VaultProfile("research", servers[1].url, "test-key"),
+    ]
+    response = search_vaults(profiles, QUERY)
+    assert response.success and response.data is not None
+    assert response.data["incomplete"] is True
+    assert [(v["vault"], v["ok"]) for v in response.data["vaults"]] == [
+        ("work", True),
+        ("down", False),
+        ("research", True),
+    ]
+    assert response.data["vaults"][1]["error"]["code"] == "CONNECTION_ERROR"
+
+    candidates = [
+        (note.mtime, name, note.path)
+        for name, server in (("work", servers[0]), ("research", servers[1]))
+        for note in server.vault.notes
+        if note.folder == "projects"
+    ]
+    expected = [(name, path) for _, name, path in sorted(candidates, reverse=True)[:15]]
+    assert [(row["vault"], row["filename"]) for row in response.results] == expected
+    assert all(set(row["result"]) == {"status"} for row in response.results)
+
+
+def test_cli_vaults(
+    tmp_path: Path, servers: list[MockObsidianServer], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test search --vaults output and configuration errors."""
+    monkeypatch.setenv("OBSIDIAN_VAULTS_FILE", str(_write_profiles(tmp_path / "v.toml", servers)))
+    runner = CliRunner()
+    result = runner.invoke(main, ["search", "--vaults", "work,research", QUERY])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)["data"]
+    assert len(data["results"]) == 15
+    assert {row["vault"] for row in data["results"]} == {"work", "research"}
+    assert data["incomplete"] is False
+
+    result = runner.invoke(main, ["search", "--vaults", "all", "--text", QUERY])
+    assert result.exit_code == 0, result.output
+    assert "## Vaults" in result.output
+    assert "- work: projects/" in result.output
+
+    result = runner.invoke(main, ["search", "--vaults", "nope", QUERY])
+    assert result.exit_code == 1
+    assert json.loads(result.stdout)["error"]["code"] == "CONFIG_ERROR"
+
+
+def test_all_vaults_down(vault: SyntheticVault) -> None:
+    """Test the response fails only when every vault fails."""
+    profiles = [VaultProfile("down", _closed_port_url(), "test-key", timeout=2)]
+    response = search_vaults(profiles, QUERY)
+    assert not response.success and response.error is not None
+    assert response.error["code"] == "ALL_VAULTS_FAILED"
@@ -0,0 +1,146 @@
+"""Tests for saved views and their incremental refresh.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.views import (
+    SavedView,
+    ViewError,
+    list_views,
+    load_view,
+    plan_refresh,
+    refresh_view,
+    save_view,
+)
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+QUERY = 'TABLE status, priority FROM "projects" WHERE status SORT priority DESC, file.name'
+
+
+def test_plan_refresh() -> None:
+    """Test hidden columns, the key query and queries limited to full refreshes."""
+    plan = plan_refresh(QUERY)
+    assert plan.query.startswith(
+        'TABLE status, priority, priority AS "__sort_0", file.name AS "__sort_1", '
+        'file.mtime AS "__mtime"\nFROM "projects"'
+    )
+    assert plan.sort == (("__sort_0", True), ("__sort_1", False))
+    assert plan.key_query == 'TABLE file.mtime AS "__mtime"\nFROM "projects"\nWHERE status'
+
+    assert plan_refresh('TABLE status FROM "projects" LIMIT 5').key_query is None
+    assert plan_refresh("TABLE WITHOUT ID file.name").key_query is None
+    assert plan_refresh("LIST FROM #project") == plan_refresh("LIST FROM #project")
+
+
+def test_incremental_refresh_merges_changes(
+    vault: SyntheticVault, mock_server: MockObsidianServer, tmp_path: Path
+) -> None:
+    """Test edits, deletions and new notes are merged in sorted order."""
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key", cache_ttl=0)
+    view = SavedView("projects", QUERY, client.base_url)
+    refresh_view(client, view)
+    assert view.last_refresh["mode"] == "full"
+    assert view.last_refresh["added"] == len(view.rows) > 3
+    assert all("__mtime" not in row["result"] for row in view.results())
+
+    rows = [row["filename"] for row in view.rows]
+    edited, deleted = rows[0], rows[1]
+    source = next(note for note in vault.notes if note.path == rows[2])
+    created = replace(
+        source,
+        path="projects/new-note.md",
+        mtime="2030-01-02T00:00:00.000+00:00",
+        frontmatter={**source.frontmatter, "priority": 0},
+    )
+    notes = [
+        replace(note, mtime="2030-01-01T00:00:00.000+00:00", frontmatter={"status": "done"})
+        if note.path == edited
+        else note
+        for note in vault.notes
+        if note.path != deleted
+    ]
+    mock_server.replace_vault(SyntheticVault([*notes, created], vault.seed))
+
+    served = mock_server.requests_served
+    refresh_view(client, view)
+    assert mock_server.requests_served == served + 2
+    assert view.last_refresh["mode"] == "incremental"
+    counts = {key: view.last_refresh[key] for key in ("added", "changed", "removed")}
+    assert counts == {"added": 1, "changed": 1, "removed": 1}
+    assert view.watermark == "2030-01-02T00:00:00.000+00:00"
+
+    expected = client.search_dataview(QUERY).results
+    assert view.results() == expected
+
+    save_view(view, tmp_path)
+    stored = load_view(client.base_url, "projects", tmp_path)
+    assert stored is not None and stored.results() == expected
+    assert [v.name for v in list_views(client.base_url, tmp_path)] == ["projects"]
+    with pytest.raises(ViewError):
+        load_view(client.base_url, "../escape", tmp_path)
+
+
+def test_unmodified_new_match_forces_full_refresh(
+    vault: SyntheticVault, mock_server: MockObsidianServer
+) -> None:
+    """Test a match older than the watermark is not missed."""
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key", cache_ttl=0)
+    view = SavedView("projects", QUERY, client.base_url)
+    refresh_view(client, view)
+    view.rows = view.rows[1:]
+    refresh_view(client, view)
+    assert view.last_refresh["mode"] == "full"
+    assert view.last_refresh["added"] == 1
+    assert view.results() == client.search_dataview(QUERY).results
+
+
+def test_cli_views(
+    mock_server: MockObsidianServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test saving, reading, listing, scheduled refreshes and deleting views."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    monkeypatch.setenv("OBSIDIAN_CACHE_DIR", str(tmp_path))
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["views", "save", "projects", "--every", "5m", QUERY])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["data"]["last_refresh"]["mode"] == "full"
+    result = runner.invoke(main, ["views", "save", "inbox", "--no-refresh", "TABLE file.name"])
+    assert result.exit_code == 0, result.output
+
+    served = mock_server.requests_served
+    result = runner.invoke(main, ["views", "get", "projects"])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.stdout)["data"]
+    assert data["view"] == "projects" and data["results"]
+    assert mock_server.requests_served == served
+
+    result = runner.invoke(main, ["views", "get", "inbox"])
+    assert json.loads(result.stdout)["error"]["code"] == "NOT_MATERIALIZED"
+
+    result = runner.invoke(main, ["views", "refresh"])
+    assert result.exit_code == 0, result.output
+    assert [view["name"] for view in json.loads(result.stdout)["data"]["views"]] == ["inbox"]
+
+    result = runner.invoke(main, ["views", "refresh", "projects"])
+    assert json.loads(result.stdout)["data"]["views"][0]["mode"] == "incremental"
+
+    result = runner.invoke(main, ["views", "list", "--text"])
+    assert "| projects |" in result.output and "| inbox |" in result.output
+
+    result = runner.invoke(main, ["views", "delete", "inbox"])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(main, ["views", "get", "inbox"])
+    assert result.exit_code == 1
+    assert json.loads(result.stdout)["error"]["code"] == "NOT_FOUND"
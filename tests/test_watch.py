@@ -0,0 +1,86 @@
+"""Tests for search --watch change detection.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from dataclasses import replace
+
+import pytest
+from click.testing import CliRunner
+
+from obsidian_search_tool.cli import main
+from obsidian_search_tool.core.client import ObsidianClient
+from obsidian_search_tool.core.watch import QueryWatcher
+from obsidian_search_tool.testing import MockObsidianServer, SyntheticVault
+
+QUERY = 'TABLE status, priority FROM "projects"'
+
+
+def test_watcher_reports_changes_and_skips_unchanged_polls(
+    vault: SyntheticVault, mock_server: MockObsidianServer
+) -> None:
+    """Test added/changed/removed events and probe-skipped polls."""
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key", cache_ttl=0)
+    watcher = QueryWatcher(client, QUERY, full_every=3)
+    first = watcher.poll()
+    projects = [note for note in vault.notes if note.folder == "projects"]
+    assert {event.event for event in first} == {"added"}
+    assert len(first) == len(projects)
+
+    served = mock_server.requests_served
+    assert watcher.poll() == []
+    assert mock_server.requests_served == served + 1  # the probe only
+    assert watcher.skipped == 1
+
+    edited, deleted = projects[0], projects[1]
+    notes = [
+        replace(note, mtime="2030-01-01T00:00:00.000+00:00", frontmatter={"status": "done"})
+        if note is edited
+        else note
+        for note in vault.notes
+        if note is not deleted
+    ]
+    mock_server.replace_vault(SyntheticVault(notes, vault.seed))
+    changes = watcher.poll()
+    assert [(event.event, event.key) for event in changes] == [
+        ("changed", edited.path),
+        ("removed", deleted.path),
+    ]
+    assert changes[0].row["result"]["status"] == "done"
+
+    # Deletions do not move the newest mtime; the periodic full run finds them
+    mock_server.replace_vault(SyntheticVault([n for n in notes if n is not projects[2]], 0))
+    assert watcher.poll() == []
+    assert watcher.poll() == []
+    assert [event.event for event in watcher.poll()] == ["removed"]
+    assert (watcher.polls, watcher.queries, watcher.skipped) == (6, 3, 3)
+
+
+def test_watch_continues_after_errors(mock_server: MockObsidianServer) -> None:
+    """Test a failed poll yields an error event and watching continues."""
+    client = ObsidianClient(base_url=mock_server.url, api_key="test-key", cache_ttl=0)
+    watcher = QueryWatcher(client, "not json", "jsonlogic", probe=False)
+    events = list(watcher.run(0.0, max_polls=2, sleep=lambda _: None))
+    assert [(event.event, event.poll) for event in events] == [("error", 1), ("error", 2)]
+    assert events[0].error is not None and events[0].error["code"] == "40000"
+    with pytest.raises(ValueError):
+        QueryWatcher(client, QUERY, full_every=0)
+
+
+def test_cli_watch_ndjson(mock_server: MockObsidianServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test search --watch prints one JSON object per change."""
+    monkeypatch.setenv("OBSIDIAN_BASE_URL", mock_server.url)
+    monkeypatch.setenv("OBSIDIAN_API_KEY", "test-key")
+    monkeypatch.setenv("OBSIDIAN_CACHE_TTL", "600")
+    runner = CliRunner()
+    result = runner.invoke(main, ["search", "--watch", "--polls", "2", "--interval", "0.01", QUERY])
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line) for line in result.output.splitlines()]
+    assert events and all(event["event"] == "added" and event["poll"] == 1 for event in events)
+    assert set(events[0]) == {"event", "poll", "key", "row", "timestamp"}
+
+    result = runner.invoke(main, ["search", "--watch", "--text", QUERY])
+    assert result.exit_code == 1
+    assert json.loads(result.output)["error"]["code"] == "INPUT_ERROR"